@@ -18,7 +18,7 @@ from contextlib import asynccontextmanager
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from src.logging_config import setup_logging
-from backend.routers import scenario, feedback, rag, files, logging as logging_router
+from backend.routers import scenario, feedback, rag, files, llm, logging as logging_router
 from backend.routers.v2.router import v2_router
 
 # 로깅 설정 초기화
@@ -95,8 +95,15 @@ async def lifespan(app: FastAPI):
     # 시작 시 실행
     logger.info("🚀 애플리케이션 시작...")
     await startup_rag_system()
+    from src.llm.warmup import get_model_warmer
+    get_model_warmer().start()
     yield
     # 종료 시 실행
+    await get_model_warmer().stop()
+    from src.llm.circuit_breaker import get_circuit_breaker
+    await get_circuit_breaker().stop()
+    from src.llm.endpoint_pool import close_endpoint_pool
+    await close_endpoint_pool()
     logger.info("🛑 애플리케이션 종료.")
 
 app = FastAPI(
@@ -120,6 +127,7 @@ app.include_router(scenario.router, prefix="/api/scenario", tags=["Scenario"])
 app.include_router(feedback.router, prefix="/api/feedback", tags=["Feedback"])
 app.include_router(rag.router, prefix="/api/rag", tags=["RAG"])
 app.include_router(files.router, prefix="/api/files", tags=["Files"])
+app.include_router(llm.router, prefix="/api/llm", tags=["LLM"])
 app.include_router(logging_router.router, prefix="/api", tags=["Logging"])
 
 # v2 API 라우터 등록 (CLI 연동용)
@@ -141,8 +149,15 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
-    return {"status": "healthy"}
+    """헬스 체크 엔드포인트 (LLM 모델 예열 상태 및 서킷 브레이커 상태 포함)"""
+    from src.llm.warmup import get_model_warmer
+    from src.llm.circuit_breaker import get_circuit_breaker
+    try:
+        llm_status = get_model_warmer().get_status()
+    except Exception as e:
+        logger.error(f"LLM 예열 상태 조회 실패: {str(e)}")
+        llm_status = {"state": "unknown", "error": str(e)}
+    return {"status": "healthy", "llm": llm_status, "llm_circuit": get_circuit_breaker().get_stats()["state"]}
 
 if __name__ == "__main__":
     # This is for development purposes only. 
@@ -10,16 +10,28 @@ class ScenarioGenerationRequest(BaseModel):
     """시나리오 생성 요청 모델"""
     repo_path: str = Field(..., description="Git 저장소 경로")
     use_performance_mode: bool = Field(default=True, description="성능 최적화 모드 사용 여부")
+    use_cache: bool = Field(default=True, description="동일 프롬프트의 LLM 응답 캐시 사용 여부")
+    fast_mode: Optional[bool] = Field(default=None, description="생각 과정(<thinking>) 없이 JSON만 생성하는 빠른 모드 (미지정 시 설정값)")
+    num_predict: Optional[int] = Field(default=None, gt=0, description="LLM 출력 토큰 상한 (미지정 시 변경 크기로 계산)")
+    structured_output: Optional[bool] = Field(default=None, description="JSON 스키마 기반 구조화 출력 사용 여부 (미지정 시 설정값)")
+    map_reduce: Optional[bool] = Field(default=None, description="큰 변경 내역을 모듈 단위 배치로 나눠 병렬 생성 후 병합 (미지정 시 설정값)")
 
 class AnalysisTextRequest(BaseModel):
     """분석 텍스트 기반 시나리오 생성 요청 모델"""
     analysis_text: str = Field(..., description="Git 저장소 분석 텍스트")
+    use_cache: bool = Field(default=True, description="동일 프롬프트의 LLM 응답 캐시 사용 여부")
+    fast_mode: Optional[bool] = Field(default=None, description="생각 과정(<thinking>) 없이 JSON만 생성하는 빠른 모드 (미지정 시 설정값)")
+    num_predict: Optional[int] = Field(default=None, gt=0, description="LLM 출력 토큰 상한 (미지정 시 변경 크기로 계산)")
+    structured_output: Optional[bool] = Field(default=None, description="JSON 스키마 기반 구조화 출력 사용 여부 (미지정 시 설정값)")
+    map_reduce: Optional[bool] = Field(default=None, description="큰 변경 내역을 모듈 단위 배치로 나눠 병렬 생성 후 병합 (미지정 시 설정값)")
 
 class AnalysisTextResponse(BaseModel):
     """분석 텍스트 기반 시나리오 생성 응답 모델"""
     download_url: str = Field(..., description="생성된 Excel 파일 다운로드 URL")
     filename: str = Field(..., description="생성된 파일명")
     message: str = Field(..., description="처리 결과 메시지")
+    llm_model: Optional[str] = Field(None, description="생성에 사용한 LLM 모델")
+    json_repair: Optional[Dict[str, Any]] = Field(None, description="LLM 응답 JSON 복구 내역 (repairs, 살린/버린 테스트 케이스 수). 복구가 없었으면 None")
 
 class TestCase(BaseModel):
     """개별 테스트 케이스 모델"""
@@ -30,13 +42,35 @@ class TestCase(BaseModel):
     예상결과: str = Field(..., description="예상 결과")
     Unit: Optional[str] = Field(None, description="Unit 테스트 플래그")
     Integration: Optional[str] = Field(None, description="Integration 테스트 플래그")
+    종류: Optional[str] = Field(None, description="테스트 종류 (Unit/Integration)")
+
+class LLMCallTelemetry(BaseModel):
+    """LLM 호출 처리량 지표 (Ollama eval 카운터 기반)"""
+    model: Optional[str] = Field(None, description="모델명")
+    calls: int = Field(1, description="합산된 LLM 호출 수 (분할 생성 시 배치 수)")
+    cache_hit: bool = Field(False, description="응답 캐시에서 제공되었는지 여부")
+    prompt_tokens: Optional[int] = Field(None, description="프롬프트 토큰 수")
+    output_tokens: Optional[int] = Field(None, description="생성된 토큰 수")
+    tokens_per_second: Optional[float] = Field(None, description="초당 생성 토큰 수")
+    prompt_tokens_per_second: Optional[float] = Field(None, description="초당 프롬프트 처리 토큰 수")
+    load_seconds: Optional[float] = Field(None, description="모델 로드 시간 (초)")
+    queue_seconds: Optional[float] = Field(None, description="LLM 호출 대기열 대기 시간 (초)")
+    total_seconds: Optional[float] = Field(None, description="요청부터 응답 완료까지의 시간 (초)")
 
 class ScenarioMetadata(BaseModel):
     """시나리오 생성 메타데이터"""
     llm_response_time: float = Field(..., description="LLM 응답 시간")
     prompt_size: int = Field(..., description="프롬프트 크기")
+    prompt_tokens: Optional[int] = Field(None, description="프롬프트 토큰 수 (대상 모델 토크나이저 기준)")
+    prompt_tokens_exact: bool = Field(False, description="토크나이저로 센 정확한 값인지 여부 (False면 근사값)")
     added_chunks: int = Field(..., description="추가된 RAG 청크 수")
     excel_filename: Optional[str] = Field(None, description="생성된 Excel 파일명")
+    cache_hit: bool = Field(False, description="LLM 응답 캐시 적중 여부")
+    map_reduce_batches: Optional[int] = Field(None, description="분할 생성 시 배치 수")
+    llm_telemetry: Optional[LLMCallTelemetry] = Field(None, description="LLM 처리량 지표")
+    llm_model: Optional[str] = Field(None, description="생성에 사용한 LLM 모델")
+    llm_routing: Optional[Dict[str, Any]] = Field(None, description="모델 선택 근거 (reason, 변경 내역 토큰 수, 예상/목표 응답 시간)")
+    json_repair: Optional[Dict[str, Any]] = Field(None, description="LLM 응답 JSON 복구 내역 (repairs, 살린/버린 테스트 케이스 수). 복구가 없었으면 None")
 
 class ScenarioResponse(BaseModel):
     """시나리오 생성 응답 모델"""
@@ -45,11 +79,20 @@ class ScenarioResponse(BaseModel):
     test_cases: List[TestCase] = Field(..., alias="Test Cases", description="테스트 케이스 목록")
     metadata: Optional[ScenarioMetadata] = Field(None, description="생성 메타데이터")
 
+def get_scenario_output_schema() -> Dict[str, Any]:
+    """LLM 구조화 출력(Ollama format)에 사용할 시나리오 JSON 스키마 (생성 메타데이터 제외)"""
+    schema = ScenarioResponse.model_json_schema(by_alias=True)
+    schema['properties'].pop('metadata', None)
+    schema.get('$defs', {}).pop('ScenarioMetadata', None)
+    schema['required'] = [name for name in schema.get('required', []) if name != 'metadata']
+    return schema
+
 class GenerationStatus(str, Enum):
     """생성 상태 열거형"""
     STARTED = "started"
     ANALYZING_GIT = "analyzing_git"
     STORING_RAG = "storing_rag"
+    QUEUED = "queued"
     CALLING_LLM = "calling_llm"
     PARSING_RESPONSE = "parsing_response"
     GENERATING_EXCEL = "generating_excel"
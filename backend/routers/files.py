@@ -113,6 +113,46 @@ async def download_excel_file(filename: str):
         logger.error(f"Excel 파일 다운로드 실패: filename={filename}, error={str(e)}")
         raise HTTPException(status_code=500, detail=f"파일 다운로드 중 오류가 발생했습니다: {str(e)}")
 
+@router.get("/download/zip/{filename:path}")
+async def download_zip_file(filename: str):
+    """일괄 생성 결과 zip 파일 다운로드 API"""
+    
+    logger.info(f"zip 파일 다운로드 요청: filename={filename}")
+    
+    try:
+        import urllib.parse
+        
+        outputs_dir = os.path.join(os.path.dirname(__file__), '../../outputs')
+        clean_filename = os.path.basename(urllib.parse.unquote(filename))
+        file_path = os.path.join(outputs_dir, clean_filename)
+        
+        if not clean_filename.endswith('.zip'):
+            logger.warning(f"zip 파일이 아님: {clean_filename}")
+            raise HTTPException(status_code=400, detail="zip 파일이 아닙니다.")
+        
+        if not os.path.exists(file_path):
+            logger.warning(f"zip 파일을 찾을 수 없음: {clean_filename}")
+            raise HTTPException(status_code=404, detail=f"파일을 찾을 수 없습니다: {clean_filename}")
+        
+        filename_utf8 = urllib.parse.quote(clean_filename, safe='')
+        logger.info(f"zip 파일 다운로드 성공: filename={clean_filename}, size={os.path.getsize(file_path)}")
+        
+        return FileResponse(
+            path=file_path,
+            media_type='application/zip',
+            filename=clean_filename,
+            headers={
+                "Content-Disposition": f"attachment; filename*=UTF-8''{filename_utf8}",
+                "Cache-Control": "no-cache, no-store, must-revalidate"
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"zip 파일 다운로드 실패: filename={filename}, error={str(e)}")
+        raise HTTPException(status_code=500, detail=f"파일 다운로드 중 오류가 발생했습니다: {str(e)}")
+
 @router.get("/list/outputs", response_model=FileListResponse)
 async def list_output_files():
     """출력 파일 목록 조회 API"""
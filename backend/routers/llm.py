@@ -0,0 +1,148 @@
+"""
+LLM 연동 상태 및 지표 관련 API 라우터
+"""
+
+from fastapi import APIRouter, HTTPException
+import os
+import sys
+import logging
+
+# 기존 모듈 import
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from src.llm.response_cache import get_llm_cache
+from src.llm.endpoint_pool import get_endpoint_pool
+from src.llm.scheduler import get_llm_scheduler
+from src.llm.prefix_cache import get_prefix_cache
+from src.llm.single_flight import get_single_flight
+from src.llm.call_policy import get_call_policy
+from src.llm.circuit_breaker import get_circuit_breaker
+from src.llm.telemetry import get_llm_telemetry
+from src.llm.model_router import get_model_router
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("/cache/stats")
+async def get_llm_cache_stats():
+    """LLM 응답 캐시 적중/미스 통계 조회 API"""
+    
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False}
+    
+    try:
+        stats = cache.get_stats()
+        stats["enabled"] = True
+        return stats
+        
+    except Exception as e:
+        logger.error(f"LLM 캐시 통계 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 캐시 통계 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.delete("/cache")
+async def clear_llm_cache():
+    """LLM 응답 캐시 전체 삭제 API"""
+    
+    cache = get_llm_cache()
+    if cache is None:
+        return {"enabled": False, "removed": 0}
+    
+    try:
+        removed = cache.clear()
+        logger.info(f"LLM 응답 캐시 삭제: 디스크 항목 {removed}개")
+        return {"enabled": True, "removed": removed}
+        
+    except Exception as e:
+        logger.error(f"LLM 캐시 삭제 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 캐시 삭제 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/endpoints")
+async def get_llm_endpoints():
+    """Ollama 엔드포인트별 상태(제외 여부, 진행 중 요청, 지연 시간) 조회 API"""
+    
+    try:
+        return {"endpoints": get_endpoint_pool().get_metrics()}
+        
+    except Exception as e:
+        logger.error(f"LLM 엔드포인트 상태 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 엔드포인트 상태 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/queue")
+async def get_llm_queue():
+    """LLM 호출 스케줄러의 동시 실행/대기열 현황 조회 API"""
+    
+    try:
+        return get_llm_scheduler().get_stats()
+        
+    except Exception as e:
+        logger.error(f"LLM 대기열 상태 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 대기열 상태 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/prefix-cache")
+async def get_prompt_prefix_cache():
+    """프롬프트 머리말 priming 상태 및 평균 프롬프트 평가량 조회 API"""
+    
+    try:
+        return get_prefix_cache().get_stats()
+        
+    except Exception as e:
+        logger.error(f"프롬프트 머리말 캐시 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"프롬프트 머리말 캐시 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/coalescing")
+async def get_llm_coalescing():
+    """진행 중인 동일 LLM 요청 합치기(single-flight) 현황 조회 API"""
+    
+    try:
+        return get_single_flight().get_stats()
+        
+    except Exception as e:
+        logger.error(f"LLM 요청 합치기 현황 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 요청 합치기 현황 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/policy")
+async def get_llm_call_policy():
+    """LLM 호출 정책(적응형 타임아웃/재시도/헤지) 통계와 모델별 지연 학습 상태 조회 API"""
+    
+    try:
+        return get_call_policy().get_stats()
+        
+    except Exception as e:
+        logger.error(f"LLM 호출 정책 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 호출 정책 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/circuit")
+async def get_llm_circuit_breaker():
+    """LLM 서킷 브레이커 상태(closed/open/half_open)와 차단/점검 통계 조회 API"""
+    
+    try:
+        return get_circuit_breaker().get_stats()
+        
+    except Exception as e:
+        logger.error(f"LLM 서킷 브레이커 상태 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 서킷 브레이커 상태 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/telemetry")
+async def get_llm_telemetry_stats():
+    """모델별 LLM 처리량 지표(초당 토큰 수, 프롬프트 토큰 수, 로드/대기 시간)의 최근 백분위수 조회 API"""
+    
+    try:
+        return get_llm_telemetry().get_stats()
+        
+    except Exception as e:
+        logger.error(f"LLM 처리량 지표 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 처리량 지표 조회 중 오류가 발생했습니다: {str(e)}")
+
+@router.get("/routing")
+async def get_llm_routing():
+    """요청별 모델 선택(라우팅) 설정 조회 API"""
+    
+    try:
+        return get_model_router().get_config()
+        
+    except Exception as e:
+        logger.error(f"LLM 모델 라우팅 설정 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 모델 라우팅 설정 조회 중 오류가 발생했습니다: {str(e)}")
@@ -2,11 +2,11 @@ import logging
 from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.responses import JSONResponse
 import json
-import re
 import os
 import time
 import asyncio
-from typing import List
+import math
+from typing import List, Optional, Dict, Any
 from pathlib import Path
 
 # Set up logger for this module
@@ -17,14 +17,21 @@ import sys
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from src.git_analyzer import get_git_analysis_text
-from src.llm_handler import call_ollama_llm, OllamaAPIError
+from src.llm_handler import acall_ollama_llm, collect_ollama_stream, OllamaAPIError, CircuitOpenError
+from src.llm.scheduler import Priority
+from src.llm.generation_options import build_generation_options
+from src.llm.token_counter import get_token_counter
+from src.llm.model_router import get_model_router
+from src.response_parser import parse_scenario_json_with_report
+from src.scenario_mapreduce import should_use_map_reduce, generate_scenario_map_reduce
 from src.excel_writer import save_results_to_excel
 from src.config_loader import load_config
-from src.prompt_loader import create_final_prompt, add_git_analysis_to_rag
+from src.prompt_loader import build_prompt_parts, add_git_analysis_to_rag
 from backend.models.scenario import (
     ScenarioGenerationRequest, 
     ScenarioResponse, 
     ScenarioMetadata,
+    get_scenario_output_schema,
     GenerationProgress, 
     GenerationStatus,
     AnalysisTextRequest,
@@ -33,6 +40,9 @@ from backend.models.scenario import (
 
 router = APIRouter()
 
+# 스트리밍 진행률 추정에 사용하는 예상 출력 토큰 수
+LLM_EXPECTED_TOKENS = 2000
+
 # WebSocket Connection Manager
 class ConnectionManager:
     def __init__(self):
@@ -58,113 +68,221 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
-async def _handle_generation_error(websocket: WebSocket, message: str, detail: str = ""):
+async def _handle_generation_error(websocket: WebSocket, message: str, detail: str = "",
+                                   details: Optional[Dict[str, Any]] = None):
     """Helper to log errors and send error messages via WebSocket."""
     logger.error(f"{message} - Detail: {detail}")
     await manager.send_progress(websocket, GenerationProgress(
         status=GenerationStatus.ERROR,
         message=message,
-        progress=0
+        progress=0,
+        details=details
     ))
 
-@router.websocket("/generate-ws")
-async def generate_scenario_ws(websocket: WebSocket):
-    await manager.connect(websocket)
-    
+async def _wait_for_disconnect(websocket: WebSocket):
+    """Returns once the client closes the socket (other incoming messages are ignored)."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+async def _run_until_disconnect(websocket: WebSocket, coro):
+    """
+    Runs coro while watching the socket. If the client disconnects first the
+    generation task is cancelled, which closes the in-flight Ollama stream and
+    frees its scheduler slot. Exceptions from coro are re-raised.
+    """
+    task = asyncio.create_task(coro)
+    watcher = asyncio.create_task(_wait_for_disconnect(websocket))
     try:
-        data = await websocket.receive_text()
-        request = ScenarioGenerationRequest(**json.loads(data))
+        done, _ = await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
 
-        if not (request.repo_path and Path(request.repo_path).is_dir()):
-            await _handle_generation_error(websocket, "유효한 Git 저장소 경로를 입력해주세요.")
-            return
-        
-        config = load_config()
-        if not config:
-            await _handle_generation_error(websocket, "설정 파일을 로드할 수 없습니다.")
-            return
+    if task in done:
+        return task.result()
+
+    logger.info("Client disconnected; cancelling scenario generation.")
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    raise WebSocketDisconnect()
 
-        async def send_progress(status: GenerationStatus, message: str, progress: float, details=None):
-            await manager.send_progress(websocket, GenerationProgress(
-                status=status, message=message, progress=progress, details=details
-            ))
+async def _generate_scenario(websocket: WebSocket, request: ScenarioGenerationRequest):
+    """Runs the WebSocket generation flow, reporting progress on the socket."""
+    if not (request.repo_path and Path(request.repo_path).is_dir()):
+        await _handle_generation_error(websocket, "유효한 Git 저장소 경로를 입력해주세요.")
+        return
+    
+    config = load_config()
+    if not config:
+        await _handle_generation_error(websocket, "설정 파일을 로드할 수 없습니다.")
+        return
 
-        # 1. Git Analysis
-        await send_progress(GenerationStatus.ANALYZING_GIT, "Git 변경 내역을 분석 중입니다...", 10)
-        await asyncio.sleep(1)
-        git_analysis = get_git_analysis_text(request.repo_path)
-        
-        # 2. RAG Storage
-        await send_progress(GenerationStatus.STORING_RAG, "분석 결과를 RAG 시스템에 저장 중입니다...", 20)
-        await asyncio.sleep(1)
-        added_chunks = add_git_analysis_to_rag(git_analysis, request.repo_path)
-        
-        # 3. LLM Call
-        await send_progress(GenerationStatus.CALLING_LLM, "LLM을 호출하여 시나리오를 생성 중입니다...", 30)
-        await asyncio.sleep(1)
-        
-        model_name = config.get("model_name", "qwen3:8b")
-        timeout = config.get("timeout", 600)
-        
-        final_prompt = create_final_prompt(
+    async def send_progress(status: GenerationStatus, message: str, progress: float, details=None):
+        await manager.send_progress(websocket, GenerationProgress(
+            status=status, message=message, progress=progress, details=details
+        ))
+
+    # 1. Git Analysis
+    await send_progress(GenerationStatus.ANALYZING_GIT, "Git 변경 내역을 분석 중입니다...", 10)
+    await asyncio.sleep(1)
+    git_analysis = get_git_analysis_text(request.repo_path)
+    
+    # 2. RAG Storage
+    await send_progress(GenerationStatus.STORING_RAG, "분석 결과를 RAG 시스템에 저장 중입니다...", 20)
+    await asyncio.sleep(1)
+    added_chunks = add_git_analysis_to_rag(git_analysis, request.repo_path)
+    
+    # 3. LLM Call
+    await send_progress(GenerationStatus.CALLING_LLM, "LLM을 호출하여 시나리오를 생성 중입니다...", 30)
+    await asyncio.sleep(1)
+    
+    model_route = get_model_router().route(git_analysis, request.fast_mode, request.num_predict,
+                                           default_model=config.get("model_name", "qwen3:8b"))
+    model_name = model_route['model']
+    timeout = config.get("timeout", 600)
+    
+    if should_use_map_reduce(git_analysis, request.map_reduce):
+        async def report_batch_progress(completed, total):
+            await send_progress(GenerationStatus.CALLING_LLM, f"분할 생성 중입니다... ({completed}/{total} 배치 완료)",
+                                30 + completed / total * 49, {
+                "completed_batches": completed,
+                "total_batches": total
+            })
+
+        start_time = time.time()
+        result_json, map_reduce_info = await generate_scenario_map_reduce(
+            git_analysis, model_name, timeout,
+            performance_mode=request.use_performance_mode, fast_mode=request.fast_mode,
+            num_predict=request.num_predict, structured_output=request.structured_output,
+            output_format=get_scenario_output_schema(), use_cache=request.use_cache,
+            priority=Priority.INTERACTIVE, on_batch_done=report_batch_progress
+        )
+        end_time = time.time()
+        prompt_size = map_reduce_info['prompt_size']
+        prompt_tokens = map_reduce_info['prompt_tokens']
+        prompt_tokens_exact = map_reduce_info['prompt_tokens_exact']
+        map_reduce_batches = map_reduce_info['batches']
+        llm_telemetry = map_reduce_info['llm_telemetry']
+        # 모든 배치가 응답 캐시에서 제공된 경우에만 캐시 적중
+        cache_hit = bool(llm_telemetry and llm_telemetry['cache_hit'])
+        json_repair = map_reduce_info['json_repair']
+    else:
+        generation = build_generation_options(
+            git_analysis, request.fast_mode, request.num_predict, request.structured_output
+        )
+        prompt_prefix, prompt_body = build_prompt_parts(
             git_analysis, 
             use_rag=True, 
             use_feedback_enhancement=True,
-            performance_mode=request.use_performance_mode
+            performance_mode=request.use_performance_mode,
+            fast_mode=generation['fast_mode'],
+            structured_output=generation['structured_output'],
+            model=model_name
         )
-        
+        output_format = get_scenario_output_schema() if generation['structured_output'] else ""
+        final_prompt = prompt_prefix + prompt_body if prompt_prefix is not None else None
+    
+        async def report_llm_progress(chunk):
+            # 토큰 수 기반 진행률 (30% → 79%), </json> 수신 전까지는 80%를 넘지 않음
+            llm_progress = min(79, 30 + chunk.token_count / LLM_EXPECTED_TOKENS * 49)
+            await send_progress(GenerationStatus.CALLING_LLM, "LLM이 시나리오를 생성 중입니다...", llm_progress, {
+                "generated_tokens": chunk.token_count,
+                "json_started": chunk.json_started,
+                "json_complete": chunk.json_complete
+            })
+
+        async def report_queue_position(position, estimated_wait):
+            await send_progress(GenerationStatus.QUEUED, f"LLM 호출 대기 중입니다... (대기 순번: {position})", 30, {
+                "queue_position": position,
+                "estimated_wait": round(estimated_wait)
+            })
+
         start_time = time.time()
-        raw_response = call_ollama_llm(final_prompt, model=model_name, timeout=timeout)
+        stream_result = await collect_ollama_stream(
+            final_prompt, model=model_name, format=output_format, timeout=timeout, on_progress=report_llm_progress,
+            use_cache=request.use_cache, priority=Priority.INTERACTIVE, on_queue=report_queue_position,
+            options=generation['options'], think=generation['think'], prompt_prefix=prompt_prefix
+        )
         end_time = time.time()
-        
-        if not raw_response:
+    
+        if not stream_result.text.strip():
             await _handle_generation_error(websocket, "LLM으로부터 응답을 받지 못했습니다.")
             return
-        
+    
         # 4. JSON Parsing
         await send_progress(GenerationStatus.PARSING_RESPONSE, "LLM 응답을 파싱 중입니다...", 80)
-        await asyncio.sleep(1)
-        json_match = re.search(r'<json>(.*?)</json>', raw_response, re.DOTALL)
-        if not json_match:
-            await _handle_generation_error(websocket, "LLM 응답에서 JSON 블록을 찾을 수 없습니다.")
-            return
-        
-        result_json = json.loads(json_match.group(1).strip())
-        
-        # 5. Excel File Generation
-        await send_progress(GenerationStatus.GENERATING_EXCEL, "Excel 파일을 생성 중입니다...", 90)
-        await asyncio.sleep(1)
+        result_json, json_repair = parse_scenario_json_with_report(stream_result.text)
+        prompt_size = len(final_prompt)
+        token_counter = get_token_counter()
+        prompt_tokens = token_counter.count(prompt_prefix, model_name) + token_counter.count(prompt_body, model_name)
+        prompt_tokens_exact = token_counter.is_exact(model_name)
+        cache_hit = stream_result.from_cache
+        map_reduce_batches = None
+        llm_telemetry = stream_result.telemetry
+    
+    # 5. Excel File Generation
+    await send_progress(GenerationStatus.GENERATING_EXCEL, "Excel 파일을 생성 중입니다...", 90)
+    await asyncio.sleep(1)
 
-        project_root = Path(__file__).resolve().parents[2]
-        template_path = project_root / "templates" / "template.xlsx"
-        final_filename = save_results_to_excel(result_json, str(template_path))
-        
-        # Completion
-        metadata = ScenarioMetadata(
-            llm_response_time=end_time - start_time,
-            prompt_size=len(final_prompt),
-            added_chunks=added_chunks,
-            excel_filename=final_filename
-        )
-        
-        response_data = {
-            "scenario_description": result_json.get("Scenario Description", ""),
-            "test_scenario_name": result_json.get("Test Scenario Name", ""),
-            "test_cases": result_json.get("Test Cases", []),
-            "metadata": metadata.model_dump()
-        }
-        
-        await send_progress(
-            GenerationStatus.COMPLETED, 
-            "시나리오 생성이 완료되었습니다!", 
-            100,
-            {"result": response_data}
-        )
+    project_root = Path(__file__).resolve().parents[2]
+    template_path = project_root / "templates" / "template.xlsx"
+    final_filename = save_results_to_excel(result_json, str(template_path))
+    
+    # Completion
+    metadata = ScenarioMetadata(
+        llm_response_time=end_time - start_time,
+        prompt_size=prompt_size,
+        prompt_tokens=prompt_tokens,
+        prompt_tokens_exact=prompt_tokens_exact,
+        added_chunks=added_chunks,
+        excel_filename=final_filename,
+        cache_hit=cache_hit,
+        map_reduce_batches=map_reduce_batches,
+        llm_telemetry=llm_telemetry,
+        llm_model=model_name,
+        llm_routing=model_route,
+        json_repair=json_repair
+    )
+    
+    response_data = {
+        "scenario_description": result_json.get("Scenario Description", ""),
+        "test_scenario_name": result_json.get("Test Scenario Name", ""),
+        "test_cases": result_json.get("Test Cases", []),
+        "metadata": metadata.model_dump()
+    }
+    
+    await send_progress(
+        GenerationStatus.COMPLETED, 
+        "시나리오 생성이 완료되었습니다!", 
+        100,
+        {"result": response_data}
+    )
+
+@router.websocket("/generate-ws")
+async def generate_scenario_ws(websocket: WebSocket):
+    await manager.connect(websocket)
+    
+    try:
+        data = await websocket.receive_text()
+        request = ScenarioGenerationRequest(**json.loads(data))
+        await _run_until_disconnect(websocket, _generate_scenario(websocket, request))
         
     except WebSocketDisconnect:
         logger.info("Client disconnected.")
     except json.JSONDecodeError as e:
         await _handle_generation_error(websocket, "JSON 파싱 오류가 발생했습니다.", str(e))
+    except CircuitOpenError as e:
+        await _handle_generation_error(websocket, str(e), details={
+            "circuit_state": "open",
+            "retry_after": math.ceil(e.retry_after)
+        })
     except OllamaAPIError as e:
         await _handle_generation_error(websocket, "LLM API 호출 중 오류가 발생했습니다.", str(e))
     except Exception as e:
@@ -210,36 +328,57 @@ async def generate_scenario_from_text(request: AnalysisTextRequest):
             raise HTTPException(status_code=500, detail="설정 파일을 로드할 수 없습니다.")
         
         # LLM 호출을 위한 프롬프트 생성
-        model_name = config.get("model_name", "qwen3:8b")
+        model_name = get_model_router().route(request.analysis_text, request.fast_mode, request.num_predict,
+                                              default_model=config.get("model_name", "qwen3:8b"))['model']
         timeout = config.get("timeout", 600)
         
-        # 분석 텍스트를 Git 분석 결과로 사용하여 프롬프트 생성
-        final_prompt = create_final_prompt(
-            request.analysis_text, 
-            use_rag=True, 
-            use_feedback_enhancement=True,
-            performance_mode=True  # CLI 요청은 성능 모드로 처리
-        )
-        
-        if not final_prompt:
-            raise HTTPException(status_code=500, detail="프롬프트 생성에 실패했습니다.")
+        if should_use_map_reduce(request.analysis_text, request.map_reduce):
+            # 큰 변경 내역은 모듈 단위 배치로 나눠 병렬 생성 후 병합
+            logger.info(f"LLM 모델 '{model_name}' 분할 생성 중...")
+            result_json, map_reduce_info = await generate_scenario_map_reduce(
+                request.analysis_text, model_name, timeout,
+                performance_mode=True, fast_mode=request.fast_mode,
+                num_predict=request.num_predict, structured_output=request.structured_output,
+                output_format=get_scenario_output_schema(), use_cache=request.use_cache,
+                priority=Priority.BATCH
+            )
+            json_repair = map_reduce_info['json_repair']
+        else:
+            # 분석 텍스트를 Git 분석 결과로 사용하여 프롬프트 생성
+            generation = build_generation_options(
+                request.analysis_text, request.fast_mode, request.num_predict, request.structured_output
+            )
+            prompt_prefix, prompt_body = build_prompt_parts(
+                request.analysis_text, 
+                use_rag=True, 
+                use_feedback_enhancement=True,
+                performance_mode=True,  # CLI 요청은 성능 모드로 처리
+                fast_mode=generation['fast_mode'],
+                structured_output=generation['structured_output'],
+                model=model_name
+            )
+            final_prompt = prompt_prefix + prompt_body if prompt_prefix is not None else None
         
-        # LLM 호출
-        logger.info(f"LLM 모델 '{model_name}' 호출 중...")
-        start_time = time.time()
-        raw_response = call_ollama_llm(final_prompt, model=model_name, timeout=timeout)
-        end_time = time.time()
+            if not final_prompt:
+                raise HTTPException(status_code=500, detail="프롬프트 생성에 실패했습니다.")
         
-        if not raw_response:
-            raise HTTPException(status_code=500, detail="LLM으로부터 응답을 받지 못했습니다.")
+            # LLM 호출
+            logger.info(f"LLM 모델 '{model_name}' 호출 중...")
+            start_time = time.time()
+            raw_response = await acall_ollama_llm(
+                final_prompt, model=model_name,
+                format=get_scenario_output_schema() if generation['structured_output'] else "",
+                timeout=timeout, use_cache=request.use_cache, priority=Priority.BATCH,
+                options=generation['options'], think=generation['think'], prompt_prefix=prompt_prefix
+            )
+            end_time = time.time()
         
-        # JSON 파싱
-        logger.info("LLM 응답 파싱 중...")
-        json_match = re.search(r'<json>(.*?)</json>', raw_response, re.DOTALL)
-        if not json_match:
-            raise HTTPException(status_code=500, detail="LLM 응답에서 JSON 블록을 찾을 수 없습니다.")
+            if not raw_response:
+                raise HTTPException(status_code=500, detail="LLM으로부터 응답을 받지 못했습니다.")
         
-        result_json = json.loads(json_match.group(1).strip())
+            # JSON 파싱
+            logger.info("LLM 응답 파싱 중...")
+            result_json, json_repair = parse_scenario_json_with_report(raw_response)
         
         # Excel 파일 생성
         logger.info("Excel 파일 생성 중...")
@@ -259,7 +398,9 @@ async def generate_scenario_from_text(request: AnalysisTextRequest):
         return AnalysisTextResponse(
             download_url=download_url,
             filename=filename,
-            message="시나리오가 성공적으로 생성되었습니다."
+            message="시나리오가 성공적으로 생성되었습니다.",
+            llm_model=model_name,
+            json_repair=json_repair
         )
         
     except HTTPException:
@@ -268,6 +409,9 @@ async def generate_scenario_from_text(request: AnalysisTextRequest):
     except json.JSONDecodeError as e:
         logger.error(f"JSON 파싱 오류: {e}")
         raise HTTPException(status_code=500, detail=f"JSON 파싱 오류: {str(e)}")
+    except CircuitOpenError as e:
+        logger.warning(f"LLM 서킷 브레이커 열림: {e}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
     except OllamaAPIError as e:
         logger.error(f"LLM API 오류: {e}")
         raise HTTPException(status_code=500, detail=f"LLM API 오류: {str(e)}")
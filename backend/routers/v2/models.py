@@ -4,7 +4,7 @@ CLI 연동을 위한 데이터 모델 정의
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from enum import Enum
 
 
@@ -13,6 +13,7 @@ class V2GenerationStatus(str, Enum):
     RECEIVED = "received"           # 요청 수신
     ANALYZING_GIT = "analyzing_git" # Git 분석 중
     STORING_RAG = "storing_rag"     # RAG 저장 중
+    QUEUED = "queued"               # LLM 호출 대기열에서 대기 중
     CALLING_LLM = "calling_llm"     # LLM 호출 중
     PARSING_RESPONSE = "parsing_response"  # 응답 파싱 중
     GENERATING_EXCEL = "generating_excel"  # Excel 생성 중
@@ -25,6 +26,11 @@ class V2GenerationRequest(BaseModel):
     client_id: str = Field(..., description="고유 클라이언트 식별자")
     repo_path: str = Field(..., description="Git 저장소 경로")
     use_performance_mode: bool = Field(True, description="성능 최적화 모드 사용 여부")
+    use_cache: bool = Field(True, description="동일 프롬프트의 LLM 응답 캐시 사용 여부")
+    fast_mode: Optional[bool] = Field(None, description="생각 과정(<thinking>) 없이 JSON만 생성하는 빠른 모드 (미지정 시 설정값)")
+    num_predict: Optional[int] = Field(None, gt=0, description="LLM 출력 토큰 상한 (미지정 시 변경 크기로 계산)")
+    structured_output: Optional[bool] = Field(None, description="JSON 스키마 기반 구조화 출력 사용 여부 (미지정 시 설정값)")
+    map_reduce: Optional[bool] = Field(None, description="큰 변경 내역을 모듈 단위 배치로 나눠 병렬 생성 후 병합 (미지정 시 설정값)")
 
 
 class V2ProgressMessage(BaseModel):
@@ -53,7 +59,69 @@ class V2ResultData(BaseModel):
     # 통계 정보 추가
     llm_response_time: float = Field(0.0, description="LLM 응답 시간 (초)")
     prompt_size: int = Field(0, description="프롬프트 크기 (문자 수)")
+    prompt_tokens: Optional[int] = Field(None, description="프롬프트 토큰 수 (대상 모델 토크나이저 기준)")
+    prompt_tokens_exact: bool = Field(False, description="토크나이저로 센 정확한 값인지 여부 (False면 근사값)")
     added_chunks: int = Field(0, description="RAG에 추가된 청크 수")
+    cache_hit: bool = Field(False, description="LLM 응답 캐시 적중 여부")
+    llm_telemetry: Optional[Dict[str, Any]] = Field(None, description="LLM 처리량 지표 (초당 토큰 수, 프롬프트 토큰 수, 로드/대기 시간)")
+    llm_model: Optional[str] = Field(None, description="생성에 사용한 LLM 모델")
+    llm_routing: Optional[Dict[str, Any]] = Field(None, description="모델 선택 근거 (reason, 변경 내역 토큰 수, 예상/목표 응답 시간)")
+    json_repair: Optional[Dict[str, Any]] = Field(None, description="LLM 응답 JSON 복구 내역 (repairs, 살린/버린 테스트 케이스 수). 복구가 없었으면 None")
     # 테스트 케이스 데이터 추가
     test_cases: list = Field(default_factory=list, description="테스트 케이스 목록")
-    test_scenario_name: str = Field("", description="테스트 시나리오 이름")
\ No newline at end of file
+    test_scenario_name: str = Field("", description="테스트 시나리오 이름")
+
+
+class V2BatchOutputFormat(str, Enum):
+    """일괄 생성 결과 파일 형식"""
+    WORKBOOK = "workbook"   # 항목별 시트 + 요약 시트를 가진 엑셀 파일 하나
+    ZIP = "zip"             # 항목별 엑셀 파일을 묶은 zip
+
+
+class V2BatchItem(BaseModel):
+    """일괄 생성 항목 (저장소, 기준 브랜치, 대상 브랜치)"""
+    repo_path: str = Field(..., description="Git 저장소 경로")
+    base_branch: str = Field("origin/develop", description="기준 브랜치명 또는 커밋")
+    head_branch: str = Field("HEAD", description="대상 브랜치명 또는 커밋")
+    name: Optional[str] = Field(None, description="결과 시트/파일에 표시할 이름 (미지정 시 대상 브랜치명)")
+
+
+class V2BatchRequest(BaseModel):
+    """여러 브랜치의 시나리오를 한 작업으로 생성하는 요청"""
+    client_id: str = Field(..., description="고유 클라이언트 식별자 (진행 상황 WebSocket에 사용)")
+    items: List[V2BatchItem] = Field(..., min_length=1, max_length=100, description="생성할 항목 목록")
+    output_format: V2BatchOutputFormat = Field(V2BatchOutputFormat.WORKBOOK, description="결과 파일 형식")
+    max_concurrent: Optional[int] = Field(None, gt=0, le=16, description="동시에 생성할 항목 수 (미지정 시 설정값)")
+    use_performance_mode: bool = Field(True, description="성능 최적화 모드 사용 여부")
+    use_cache: bool = Field(True, description="동일 프롬프트의 LLM 응답 캐시 사용 여부")
+    fast_mode: Optional[bool] = Field(None, description="생각 과정(<thinking>) 없이 JSON만 생성하는 빠른 모드 (미지정 시 설정값)")
+    num_predict: Optional[int] = Field(None, gt=0, description="LLM 출력 토큰 상한 (미지정 시 변경 크기로 계산)")
+    structured_output: Optional[bool] = Field(None, description="JSON 스키마 기반 구조화 출력 사용 여부 (미지정 시 설정값)")
+    map_reduce: Optional[bool] = Field(None, description="큰 변경 내역을 모듈 단위 배치로 나눠 병렬 생성 후 병합 (미지정 시 설정값)")
+
+
+class V2BatchItemResult(BaseModel):
+    """일괄 생성 항목별 결과 요약"""
+    index: int = Field(..., description="요청 항목 순번 (0부터)")
+    name: Optional[str] = Field(None, description="항목 이름")
+    repo_path: str = Field(..., description="Git 저장소 경로")
+    base_branch: str = Field(..., description="기준 브랜치명")
+    head_branch: str = Field(..., description="대상 브랜치명")
+    head_sha: Optional[str] = Field(None, description="대상 커밋 SHA")
+    status: str = Field(..., description="항목 상태 (completed/failed)")
+    test_case_count: int = Field(0, description="생성된 테스트 케이스 수")
+    llm_model: Optional[str] = Field(None, description="생성에 사용한 LLM 모델")
+    shared_with: Optional[int] = Field(None, description="같은 커밋 쌍이라 결과를 공유한 항목 순번")
+    error: Optional[str] = Field(None, description="실패 사유")
+
+
+class V2BatchResultData(BaseModel):
+    """일괄 생성 완료 시 전달되는 결과 데이터"""
+    filename: str = Field(..., description="생성된 결과 파일명 (.xlsx 또는 .zip)")
+    download_url: str = Field(..., description="파일 다운로드 URL")
+    output_format: V2BatchOutputFormat = Field(..., description="결과 파일 형식")
+    total_items: int = Field(..., description="전체 항목 수")
+    completed_items: int = Field(..., description="성공한 항목 수")
+    failed_items: int = Field(..., description="실패한 항목 수")
+    elapsed_seconds: float = Field(0.0, description="전체 소요 시간 (초)")
+    items: List[V2BatchItemResult] = Field(default_factory=list, description="항목별 결과")
@@ -7,7 +7,7 @@ import logging
 import json
 import asyncio
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Callable
 from pathlib import Path
 from websockets.exceptions import ConnectionClosedError
 
@@ -29,6 +29,12 @@ class V2ConnectionManager:
         self.connections: Dict[str, WebSocket] = {}
         # 연결 정리를 위한 락
         self._lock = asyncio.Lock()
+        # 연결이 끊겼을 때 호출할 콜백 (진행 중인 생성 작업 취소 등)
+        self._disconnect_listeners: List[Callable[[str], None]] = []
+
+    def add_disconnect_listener(self, listener: Callable[[str], None]):
+        """클라이언트 연결이 끊겼을 때 client_id로 호출될 콜백 등록"""
+        self._disconnect_listeners.append(listener)
     
     async def connect(self, client_id: str, websocket: WebSocket):
         """새로운 WebSocket 연결 등록"""
@@ -62,18 +68,32 @@ class V2ConnectionManager:
             logger.error(f"WebSocket 연결 설정 실패 {client_id}: {e}")
             raise
 
-    async def disconnect(self, client_id: str):
-        """WebSocket 연결 정리"""
+    async def disconnect(self, client_id: str, websocket: Optional[WebSocket] = None):
+        """
+        WebSocket 연결 정리
+
+        Args:
+            client_id: 클라이언트 식별자
+            websocket: 정리할 연결 (지정하면 이미 새 연결로 교체된 경우 무시)
+        """
         async with self._lock:
-            if client_id in self.connections:
-                try:
-                    websocket = self.connections[client_id]
-                    await websocket.close()
-                except:
-                    pass
-                finally:
-                    del self.connections[client_id]
-                    logger.info(f"WebSocket 연결 정리: {client_id}")
+            if client_id not in self.connections:
+                return
+            if websocket is not None and self.connections[client_id] is not websocket:
+                return
+            try:
+                await self.connections[client_id].close()
+            except:
+                pass
+            finally:
+                del self.connections[client_id]
+                logger.info(f"WebSocket 연결 정리: {client_id}")
+
+        for listener in self._disconnect_listeners:
+            try:
+                listener(client_id)
+            except Exception as e:
+                logger.warning(f"연결 종료 콜백 실행 실패 {client_id}: {e}")
 
     def is_connected(self, client_id: str) -> bool:
         """특정 클라이언트의 연결 상태 확인"""
@@ -194,6 +214,6 @@ async def handle_v2_websocket(websocket: WebSocket, client_id: str):
         logger.error(f"WebSocket 연결 처리 중 오류 {client_id}: {e}")
         
     finally:
-        # 연결 정리
-        await v2_connection_manager.disconnect(client_id)
+        # 연결 정리 (재연결로 교체된 이전 연결이면 새 연결은 유지)
+        await v2_connection_manager.disconnect(client_id, websocket)
         logger.info(f"WebSocket 연결 종료: {client_id}")
\ No newline at end of file
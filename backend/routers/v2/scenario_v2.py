@@ -5,6 +5,8 @@ CLI 연동을 위한 비동기 시나리오 생성 처리
 
 import logging
 import asyncio
+import math
+import time
 import uuid
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
@@ -20,24 +22,50 @@ from .models import (
     V2GenerationResponse, 
     V2ProgressMessage,
     V2GenerationStatus,
-    V2ResultData
+    V2ResultData,
+    V2BatchRequest,
+    V2BatchOutputFormat,
+    V2BatchItemResult,
+    V2BatchResultData
 )
 from .progress_websocket import v2_connection_manager
+from backend.models.scenario import get_scenario_output_schema
 from src.git_analyzer import get_git_analysis_text
-from src.llm_handler import call_ollama_llm, OllamaAPIError
-from src.excel_writer import save_results_to_excel
+from src.llm_handler import collect_ollama_stream, OllamaAPIError, CircuitOpenError
+from src.llm.scheduler import Priority
+from src.llm.generation_options import build_generation_options
+from src.llm.token_counter import get_token_counter
+from src.llm.model_router import get_model_router
+from src.response_parser import parse_scenario_json_with_report
+from src.scenario_mapreduce import should_use_map_reduce, generate_scenario_map_reduce
+from src.scenario_batch import run_scenario_batch, ITEM_COMPLETED, ITEM_FAILED
+from src.excel_writer import save_results_to_excel, save_batch_results_to_excel, save_batch_results_to_zip
 from src.config_loader import load_config
-from src.prompt_loader import create_final_prompt, add_git_analysis_to_rag
+from src.prompt_loader import build_prompt_parts, add_git_analysis_to_rag
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 스트리밍 진행률 추정에 사용하는 예상 출력 토큰 수
+LLM_EXPECTED_TOKENS = 2000
+
 # 활성 생성 작업 추적
 active_generations: Dict[str, asyncio.Task] = {}
 
 
+def _cancel_generation(client_id: str):
+    """클라이언트 WebSocket이 끊기면 진행 중인 생성 작업을 취소 (진행 중인 Ollama 요청도 중단됨)"""
+    task = active_generations.get(client_id)
+    if task is not None and not task.done():
+        logger.info(f"클라이언트 {client_id}의 연결이 끊겨 생성 작업을 취소합니다.")
+        task.cancel()
+
+
+v2_connection_manager.add_disconnect_listener(_cancel_generation)
+
+
 async def _handle_v2_generation(client_id: str, request: V2GenerationRequest):
     """백그라운드에서 실행되는 실제 생성 로직"""
     try:
@@ -86,51 +114,107 @@ async def _handle_v2_generation(client_id: str, request: V2GenerationRequest):
         })
         await asyncio.sleep(1)
 
-        model_name = config.get("model_name", "qwen3:8b")
+        model_route = get_model_router().route(git_analysis, request.fast_mode, request.num_predict,
+                                               default_model=config.get("model_name", "qwen3:8b"))
+        model_name = model_route['model']
         timeout = config.get("timeout", 600)
 
-        final_prompt = create_final_prompt(
-            git_analysis,
-            use_rag=True,
-            use_feedback_enhancement=True,
-            performance_mode=request.use_performance_mode
-        )
+        if should_use_map_reduce(git_analysis, request.map_reduce):
+            async def report_batch_progress(completed, total):
+                await send_progress(V2GenerationStatus.CALLING_LLM, f"분할 생성 중입니다... ({completed}/{total} 배치 완료)",
+                                    60 + completed / total * 19, {
+                    "added_chunks": added_chunks,
+                    "completed_batches": completed,
+                    "total_batches": total
+                })
+
+            start_time = time.time()
+            result_json, map_reduce_info = await generate_scenario_map_reduce(
+                git_analysis, model_name, timeout,
+                performance_mode=request.use_performance_mode, fast_mode=request.fast_mode,
+                num_predict=request.num_predict, structured_output=request.structured_output,
+                output_format=get_scenario_output_schema(), use_cache=request.use_cache,
+                priority=Priority.BATCH, on_batch_done=report_batch_progress
+            )
+            llm_response_time = time.time() - start_time
+            prompt_size = map_reduce_info['prompt_size']
+            prompt_tokens = map_reduce_info['prompt_tokens']
+            prompt_tokens_exact = map_reduce_info['prompt_tokens_exact']
+            llm_telemetry = map_reduce_info['llm_telemetry']
+            # 모든 배치가 응답 캐시에서 제공된 경우에만 캐시 적중
+            cache_hit = bool(llm_telemetry and llm_telemetry['cache_hit'])
+            json_repair = map_reduce_info['json_repair']
+        else:
+            generation = build_generation_options(
+                git_analysis, request.fast_mode, request.num_predict, request.structured_output
+            )
+            prompt_prefix, prompt_body = build_prompt_parts(
+                git_analysis,
+                use_rag=True,
+                use_feedback_enhancement=True,
+                performance_mode=request.use_performance_mode,
+                fast_mode=generation['fast_mode'],
+                structured_output=generation['structured_output'],
+                model=model_name
+            )
+            output_format = get_scenario_output_schema() if generation['structured_output'] else ""
+            final_prompt = prompt_prefix + prompt_body if prompt_prefix is not None else None
 
-        if not final_prompt:
-            raise ValueError("프롬프트 생성에 실패했습니다.")
+            if not final_prompt:
+                raise ValueError("프롬프트 생성에 실패했습니다.")
 
-        # LLM 호출 시뮬레이션 (실제로는 시간이 많이 걸림)
-        await send_progress(V2GenerationStatus.CALLING_LLM, "LLM 응답을 기다리는 중...", 60, {
-            "added_chunks": added_chunks,
-            "prompt_size": len(final_prompt)
-        })
-        
-        # LLM 응답 시간 측정
-        import time
-        start_time = time.time()
-        raw_response = call_ollama_llm(final_prompt, model=model_name, timeout=timeout)
-        end_time = time.time()
-        llm_response_time = end_time - start_time
+            # LLM 호출 시뮬레이션 (실제로는 시간이 많이 걸림)
+            await send_progress(V2GenerationStatus.CALLING_LLM, "LLM 응답을 기다리는 중...", 60, {
+                "added_chunks": added_chunks,
+                "prompt_size": len(final_prompt)
+            })
         
-        if not raw_response:
-            raise ValueError("LLM으로부터 응답을 받지 못했습니다.")
-
-        # 7. 응답 파싱
-        await send_progress(V2GenerationStatus.PARSING_RESPONSE, "LLM 응답을 파싱 중입니다...", 80, {
-            "added_chunks": added_chunks,
-            "prompt_size": len(final_prompt),
-            "llm_response_time": llm_response_time
-        })
-        await asyncio.sleep(0.5)
-
-        import json
-        import re
+            async def report_llm_progress(chunk):
+                # 토큰 수 기반 진행률 (60% → 79%)
+                llm_progress = min(79, 60 + chunk.token_count / LLM_EXPECTED_TOKENS * 19)
+                await send_progress(V2GenerationStatus.CALLING_LLM, "LLM이 시나리오를 생성 중입니다...", llm_progress, {
+                    "added_chunks": added_chunks,
+                    "prompt_size": len(final_prompt),
+                    "generated_tokens": chunk.token_count,
+                    "json_started": chunk.json_started,
+                    "json_complete": chunk.json_complete
+                })
+
+            async def report_queue_position(position, estimated_wait):
+                await send_progress(V2GenerationStatus.QUEUED, f"LLM 호출 대기 중입니다... (대기 순번: {position})", 60, {
+                    "added_chunks": added_chunks,
+                    "prompt_size": len(final_prompt),
+                    "queue_position": position,
+                    "estimated_wait": round(estimated_wait)
+                })
+
+            # LLM 응답 시간 측정
+            start_time = time.time()
+            stream_result = await collect_ollama_stream(
+                final_prompt, model=model_name, format=output_format, timeout=timeout, on_progress=report_llm_progress,
+                use_cache=request.use_cache, priority=Priority.BATCH, on_queue=report_queue_position,
+                options=generation['options'], think=generation['think'], prompt_prefix=prompt_prefix
+            )
+            end_time = time.time()
+            llm_response_time = end_time - start_time
         
-        json_match = re.search(r'<json>(.*?)</json>', raw_response, re.DOTALL)
-        if not json_match:
-            raise ValueError("LLM 응답에서 JSON 블록을 찾을 수 없습니다.")
-
-        result_json = json.loads(json_match.group(1).strip())
+            if not stream_result.text.strip():
+                raise ValueError("LLM으로부터 응답을 받지 못했습니다.")
+
+            # 7. 응답 파싱
+            await send_progress(V2GenerationStatus.PARSING_RESPONSE, "LLM 응답을 파싱 중입니다...", 80, {
+                "added_chunks": added_chunks,
+                "prompt_size": len(final_prompt),
+                "llm_response_time": llm_response_time
+            })
+
+            result_json, json_repair = parse_scenario_json_with_report(stream_result.text)
+            prompt_size = len(final_prompt)
+            token_counter = get_token_counter()
+            prompt_tokens = token_counter.count(prompt_prefix, model_name) + token_counter.count(prompt_body, model_name)
+            prompt_tokens_exact = token_counter.is_exact(model_name)
+            cache_hit = stream_result.from_cache
+            llm_telemetry = stream_result.telemetry
 
         # 8. Excel 파일 생성
         await send_progress(V2GenerationStatus.GENERATING_EXCEL, "Excel 파일을 생성 중입니다...", 90)
@@ -155,8 +239,15 @@ async def _handle_v2_generation(client_id: str, request: V2GenerationRequest):
             description=scenario_description,
             download_url=download_url,
             llm_response_time=llm_response_time,
-            prompt_size=len(final_prompt),
+            prompt_size=prompt_size,
+            prompt_tokens=prompt_tokens,
+            prompt_tokens_exact=prompt_tokens_exact,
             added_chunks=added_chunks,
+            cache_hit=cache_hit,
+            llm_telemetry=llm_telemetry,
+            llm_model=model_name,
+            llm_routing=model_route,
+            json_repair=json_repair,
             test_cases=test_cases,
             test_scenario_name=test_scenario_name
         )
@@ -171,6 +262,22 @@ async def _handle_v2_generation(client_id: str, request: V2GenerationRequest):
 
         logger.info(f"클라이언트 {client_id}의 시나리오 생성 완료: {filename}")
 
+    except asyncio.CancelledError:
+        logger.info(f"클라이언트 {client_id}의 시나리오 생성이 취소되었습니다.")
+        raise
+
+    except CircuitOpenError as e:
+        logger.warning(f"클라이언트 {client_id}의 시나리오 생성 중단 (LLM 서킷 브레이커 열림): {e}")
+
+        error_msg = V2ProgressMessage(
+            client_id=client_id,
+            status=V2GenerationStatus.ERROR,
+            message=str(e),
+            progress=0,
+            details={"circuit_state": "open", "retry_after": math.ceil(e.retry_after)}
+        )
+        await v2_connection_manager.send_progress(client_id, error_msg)
+
     except Exception as e:
         logger.exception(f"클라이언트 {client_id}의 시나리오 생성 중 오류 발생")
         
@@ -188,6 +295,110 @@ async def _handle_v2_generation(client_id: str, request: V2GenerationRequest):
             del active_generations[client_id]
 
 
+async def _handle_v2_batch(client_id: str, request: V2BatchRequest):
+    """백그라운드에서 실행되는 일괄 생성 로직. 항목별 진행 상황을 같은 WebSocket으로 전송합니다."""
+    total = len(request.items)
+    finished = 0
+
+    async def send_progress(status: V2GenerationStatus, message: str, progress: float,
+                            details: Optional[dict] = None, result: Optional[dict] = None):
+        await v2_connection_manager.send_progress(client_id, V2ProgressMessage(
+            client_id=client_id, status=status, message=message, progress=progress, details=details, result=result
+        ))
+
+    async def report_item(index: int, item_status: str, details: dict):
+        nonlocal finished
+        if item_status in (ITEM_COMPLETED, ITEM_FAILED):
+            finished += 1
+        item = request.items[index]
+        await send_progress(V2GenerationStatus.CALLING_LLM,
+                            f"일괄 생성 중입니다... ({finished}/{total} 항목 완료)",
+                            5 + finished / total * 85, {
+            "batch": True,
+            "item_index": index,
+            "item_name": item.name or item.head_branch,
+            "item_status": item_status,
+            "completed_items": finished,
+            "total_items": total,
+            **details
+        })
+
+    try:
+        await send_progress(V2GenerationStatus.RECEIVED, f"일괄 생성 요청을 수신했습니다. ({total}개 항목)", 5,
+                            {"batch": True, "total_items": total})
+
+        config = load_config()
+        if not config:
+            raise ValueError("설정 파일을 로드할 수 없습니다.")
+
+        start_time = time.time()
+        results = await run_scenario_batch(
+            [item.model_dump() for item in request.items],
+            model=config.get("model_name", "qwen3:8b"),
+            timeout=config.get("timeout", 600),
+            max_concurrent=request.max_concurrent,
+            on_item_update=report_item,
+            performance_mode=request.use_performance_mode,
+            fast_mode=request.fast_mode,
+            num_predict=request.num_predict,
+            structured_output=request.structured_output,
+            map_reduce=request.map_reduce,
+            output_format=get_scenario_output_schema(),
+            use_cache=request.use_cache
+        )
+        completed = sum(1 for result in results if result['status'] == ITEM_COMPLETED)
+        if not completed:
+            raise ValueError("모든 항목의 시나리오 생성이 실패했습니다.")
+
+        await send_progress(V2GenerationStatus.GENERATING_EXCEL, "결과 파일을 생성 중입니다...", 90)
+        project_root = Path(__file__).resolve().parents[3]
+        template_path = str(project_root / "templates" / "template.xlsx")
+        if request.output_format == V2BatchOutputFormat.ZIP:
+            final_filename = await asyncio.to_thread(save_batch_results_to_zip, results, template_path)
+            download_prefix = "/api/files/download/zip"
+        else:
+            final_filename = await asyncio.to_thread(save_batch_results_to_excel, results, template_path)
+            download_prefix = "/api/files/download/excel"
+        if not final_filename:
+            raise ValueError("결과 파일 생성에 실패했습니다.")
+
+        filename = Path(final_filename).name
+        result_data = V2BatchResultData(
+            filename=filename,
+            download_url=f"{download_prefix}/{filename}",
+            output_format=request.output_format,
+            total_items=total,
+            completed_items=completed,
+            failed_items=total - completed,
+            elapsed_seconds=round(time.time() - start_time, 1),
+            items=[V2BatchItemResult(
+                **{key: result[key] for key in ('index', 'name', 'repo_path', 'base_branch', 'head_branch',
+                                                'head_sha', 'status', 'llm_model', 'shared_with', 'error')},
+                test_case_count=len((result['result_json'] or {}).get("Test Cases", []))
+            ) for result in results]
+        )
+        await send_progress(V2GenerationStatus.COMPLETED,
+                            f"일괄 생성이 완료되었습니다! ({completed}/{total} 항목 성공)", 100,
+                            result=result_data.model_dump())
+        logger.info(f"클라이언트 {client_id}의 일괄 생성 완료: {filename} ({completed}/{total})")
+
+    except asyncio.CancelledError:
+        logger.info(f"클라이언트 {client_id}의 일괄 생성이 취소되었습니다.")
+        raise
+
+    except CircuitOpenError as e:
+        logger.warning(f"클라이언트 {client_id}의 일괄 생성 중단 (LLM 서킷 브레이커 열림): {e}")
+        await send_progress(V2GenerationStatus.ERROR, str(e), 0,
+                            {"circuit_state": "open", "retry_after": math.ceil(e.retry_after)})
+
+    except Exception as e:
+        logger.exception(f"클라이언트 {client_id}의 일괄 생성 중 오류 발생")
+        await send_progress(V2GenerationStatus.ERROR, f"일괄 생성 중 오류가 발생했습니다: {str(e)}", 0)
+
+    finally:
+        active_generations.pop(client_id, None)
+
+
 @router.post("/generate", response_model=V2GenerationResponse)
 async def generate_scenario_v2(request: V2GenerationRequest, background_tasks: BackgroundTasks):
     """
@@ -236,6 +447,40 @@ async def generate_scenario_v2(request: V2GenerationRequest, background_tasks: B
         )
 
 
+@router.post("/batch", response_model=V2GenerationResponse)
+async def generate_scenario_batch_v2(request: V2BatchRequest):
+    """
+    여러 브랜치의 시나리오를 한 작업으로 생성하는 v2 일괄 생성 API
+    
+    Args:
+        request: 클라이언트 ID, (저장소, 기준 브랜치, 대상 브랜치) 항목 목록, 결과 파일 형식
+    
+    Returns:
+        즉시 응답과 항목별 진행 상황을 확인할 WebSocket URL 제공
+    """
+    logger.info(f"v2 일괄 생성 요청 수신: client_id={request.client_id}, items={len(request.items)}")
+
+    if request.client_id in active_generations:
+        logger.warning(f"이미 진행 중인 작업: {request.client_id}")
+        raise HTTPException(
+            status_code=409,
+            detail=f"클라이언트 {request.client_id}의 작업이 이미 진행 중입니다."
+        )
+
+    invalid_paths = sorted({item.repo_path for item in request.items if not Path(item.repo_path).is_dir()})
+    if invalid_paths:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 Git 저장소 경로: {', '.join(invalid_paths)}")
+
+    task = asyncio.create_task(_handle_v2_batch(request.client_id, request))
+    active_generations[request.client_id] = task
+
+    return V2GenerationResponse(
+        client_id=request.client_id,
+        message=f"일괄 생성 작업이 시작되었습니다. ({len(request.items)}개 항목)",
+        websocket_url=f"ws://localhost:8000/api/v2/ws/progress/{request.client_id}"
+    )
+
+
 @router.get("/status/{client_id}")
 async def get_generation_status(client_id: str):
     """
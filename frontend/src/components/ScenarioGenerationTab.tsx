@@ -145,8 +145,12 @@ export default function ScenarioGenerationTab() {
             metadata: {
               llm_response_time: resultData.llm_response_time || 0,
               prompt_size: resultData.prompt_size || 0,
+              prompt_tokens: resultData.prompt_tokens,
+              prompt_tokens_exact: resultData.prompt_tokens_exact,
               added_chunks: resultData.added_chunks || 0,
-              excel_filename: resultData.filename
+              excel_filename: resultData.filename,
+              llm_model: resultData.llm_model,
+              llm_routing: resultData.llm_routing
             }
           }
 
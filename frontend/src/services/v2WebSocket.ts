@@ -15,7 +15,16 @@ export interface V2ProgressMessage {
     download_url: string
     llm_response_time?: number
     prompt_size?: number
+    prompt_tokens?: number
+    prompt_tokens_exact?: boolean
     added_chunks?: number
+    llm_model?: string
+    llm_routing?: Record<string, any>
+    json_repair?: {
+      repairs: string[]
+      test_cases: number
+      dropped_test_cases: number
+    }
     test_cases?: any[]
     test_scenario_name?: string
   }
@@ -25,6 +34,7 @@ export enum V2GenerationStatus {
   RECEIVED = 'received',
   ANALYZING_GIT = 'analyzing_git',
   STORING_RAG = 'storing_rag',
+  QUEUED = 'queued',
   CALLING_LLM = 'calling_llm',
   PARSING_RESPONSE = 'parsing_response',
   GENERATING_EXCEL = 'generating_excel',
@@ -159,6 +169,7 @@ export function getV2StatusMessage(status: V2GenerationStatus): string {
     [V2GenerationStatus.RECEIVED]: '요청을 수신했습니다.',
     [V2GenerationStatus.ANALYZING_GIT]: 'Git 변경 내역을 분석 중입니다...',
     [V2GenerationStatus.STORING_RAG]: '분석 결과를 RAG 시스템에 저장 중입니다...',
+    [V2GenerationStatus.QUEUED]: 'LLM 호출 대기열에서 순서를 기다리는 중입니다...',
     [V2GenerationStatus.CALLING_LLM]: 'LLM을 호출하여 시나리오를 생성 중입니다...',
     [V2GenerationStatus.PARSING_RESPONSE]: 'LLM 응답을 파싱 중입니다...',
     [V2GenerationStatus.GENERATING_EXCEL]: 'Excel 파일을 생성 중입니다...',
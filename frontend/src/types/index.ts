@@ -17,20 +17,51 @@ export interface ScenarioResponse {
   metadata?: {
     llm_response_time: number
     prompt_size: number
+    prompt_tokens?: number
+    prompt_tokens_exact?: boolean
     added_chunks: number
     excel_filename: string
+    llm_telemetry?: LLMCallTelemetry
+    llm_model?: string
+    llm_routing?: Record<string, any>
+    json_repair?: JSONRepairReport
   }
 }
 
+export interface JSONRepairReport {
+  repairs: string[]
+  test_cases: number
+  dropped_test_cases: number
+  repaired_batches?: number
+}
+
+export interface LLMCallTelemetry {
+  model?: string
+  calls: number
+  cache_hit: boolean
+  prompt_tokens?: number
+  output_tokens?: number
+  tokens_per_second?: number
+  prompt_tokens_per_second?: number
+  load_seconds?: number
+  queue_seconds?: number
+  total_seconds?: number
+}
+
 export interface ScenarioGenerationRequest {
   repo_path: string
   use_performance_mode: boolean
+  fast_mode?: boolean
+  num_predict?: number
+  structured_output?: boolean
+  map_reduce?: boolean
 }
 
 export const GenerationStatus = {
   STARTED: 'started',
   ANALYZING_GIT: 'analyzing_git',
   STORING_RAG: 'storing_rag',
+  QUEUED: 'queued',
   CALLING_LLM: 'calling_llm',
   PARSING_RESPONSE: 'parsing_response',
   GENERATING_EXCEL: 'generating_excel',
@@ -2,6 +2,9 @@
 import shutil
 import openpyxl
 import json
+import re
+import tempfile
+import zipfile
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -14,6 +17,7 @@ DEFAULT_TEMPLATE_PATH = PROJECT_ROOT / "templates" / "template.xlsx"
 OUTPUT_DIR = PROJECT_ROOT / "outputs"
 FILE_NAME_FORMAT = "{timestamp}_테스트_시나리오_결과.xlsx"
 TIME_FORMAT = "%Y%m%d_%H%M%S"
+BATCH_FILE_NAME_FORMAT = "{timestamp}_일괄_테스트_시나리오_결과{suffix}"
 NEWLINE_ESCAPE = "\\n"
 NEWLINE_CHAR = "\n"
 START_ROW = 11
@@ -27,6 +31,13 @@ TITLE_CELL = 'F4'
 DEFAULT_DESCRIPTION = "개요 생성 실패"
 DEFAULT_TITLE = "제목 생성 실패"
 
+# 일괄 생성 결과 요약
+SUMMARY_SHEET_TITLE = "요약"
+SUMMARY_FILE_NAME = "요약.json"
+SUMMARY_HEADERS = ["번호", "이름", "저장소", "기준 브랜치", "대상 브랜치", "상태", "테스트 케이스 수", "시트/파일", "오류"]
+MAX_SHEET_TITLE_LENGTH = 31
+INVALID_SHEET_TITLE_CHARS = re.compile(r'[\[\]:*?/\\]')
+
 
 def _generate_filename() -> str:
     """
@@ -188,4 +199,136 @@ def save_results_to_excel(result_json: Dict[str, Any], template_path: str = None
     workbook.save(final_filename)
     print(f"\n✅ 성공! '{final_filename}' 파일에 {len(test_cases)}개의 테스트 시나리오를 저장했습니다.")
     
-    return final_filename
\ No newline at end of file
+    return final_filename
+
+def _batch_output_path(suffix: str) -> Path:
+    """일괄 생성 결과 파일 경로 (같은 초에 여러 번 생성해도 겹치지 않도록 번호를 붙임)"""
+    timestamp = datetime.now().strftime(TIME_FORMAT)
+    path = OUTPUT_DIR / BATCH_FILE_NAME_FORMAT.format(timestamp=timestamp, suffix=suffix)
+    counter = 1
+    while path.exists():
+        path = OUTPUT_DIR / BATCH_FILE_NAME_FORMAT.format(timestamp=timestamp, suffix=f"_{counter}{suffix}")
+        counter += 1
+    return path
+
+
+def _item_label(item: Dict[str, Any]) -> str:
+    """일괄 생성 항목의 표시 이름 (지정하지 않으면 대상 브랜치명)"""
+    return item.get("name") or item.get("head_branch") or f"항목 {item['index'] + 1}"
+
+
+def _sheet_title(item: Dict[str, Any], used: set) -> str:
+    """엑셀 시트 이름 규칙(31자, 금지 문자, 중복 불가)에 맞춘 시트 이름"""
+    base = INVALID_SHEET_TITLE_CHARS.sub("_", f"{item['index'] + 1:02d}_{_item_label(item)}")[:MAX_SHEET_TITLE_LENGTH]
+    title, counter = base, 1
+    while title in used:
+        suffix = f"~{counter}"
+        title = base[:MAX_SHEET_TITLE_LENGTH - len(suffix)] + suffix
+        counter += 1
+    used.add(title)
+    return title
+
+
+def _summary_row(item: Dict[str, Any], location: str) -> List[Any]:
+    result_json = item.get("result_json") or {}
+    return [
+        item["index"] + 1,
+        _item_label(item),
+        item.get("repo_path", ""),
+        item.get("base_branch", ""),
+        item.get("head_branch", ""),
+        item.get("status", ""),
+        len(result_json.get("Test Cases", [])),
+        location,
+        item.get("error") or ""
+    ]
+
+
+def save_batch_results_to_excel(items: List[Dict[str, Any]], template_path: str = None) -> Optional[str]:
+    """
+    일괄 생성 결과를 하나의 엑셀 파일로 저장합니다. (항목별 시트 + 요약 시트)
+    
+    Args:
+        items: 항목별 결과 목록. 각 항목은 index, name, repo_path, base_branch, head_branch,
+               status, result_json(성공 시), error(실패 시)를 가짐
+        template_path: 엑셀 템플릿 파일 경로
+    
+    Returns:
+        생성된 엑셀 파일 경로 또는 None (실패 시)
+    """
+    if template_path is None:
+        template_path = str(DEFAULT_TEMPLATE_PATH)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    final_filename = str(_batch_output_path(".xlsx"))
+    if not _copy_template(template_path, final_filename):
+        return None
+
+    workbook = openpyxl.load_workbook(final_filename)
+    template_sheet = workbook.active
+    summary = workbook.create_sheet(SUMMARY_SHEET_TITLE, 0)
+    summary.append(SUMMARY_HEADERS)
+
+    used_titles = set(workbook.sheetnames)
+    for item in items:
+        location = ""
+        if item.get("result_json") is not None:
+            # 템플릿 시트를 복사해 항목별 시트로 사용
+            sheet = workbook.copy_worksheet(template_sheet)
+            sheet.title = location = _sheet_title(item, used_titles)
+            _fill_header_info(sheet, item["result_json"])
+            _fill_test_cases(sheet, item["result_json"].get("Test Cases", []))
+        summary.append(_summary_row(item, location))
+
+    workbook.remove(template_sheet)
+    workbook.active = 0
+    workbook.save(final_filename)
+    print(f"\n✅ 성공! '{final_filename}' 파일에 {len(items)}개 항목의 일괄 생성 결과를 저장했습니다.")
+    return final_filename
+
+
+def save_batch_results_to_zip(items: List[Dict[str, Any]], template_path: str = None) -> Optional[str]:
+    """
+    일괄 생성 결과를 항목별 엑셀 파일로 만들어 하나의 zip 파일로 묶습니다. (요약.json 포함)
+    
+    Args:
+        items: 항목별 결과 목록 (save_batch_results_to_excel과 동일)
+        template_path: 엑셀 템플릿 파일 경로
+    
+    Returns:
+        생성된 zip 파일 경로 또는 None (실패 시)
+    """
+    if template_path is None:
+        template_path = str(DEFAULT_TEMPLATE_PATH)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+    final_filename = str(_batch_output_path(".zip"))
+    used_names = set()
+    summary = []
+    copied = True
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            zipfile.ZipFile(final_filename, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for item in items:
+            location = ""
+            if item.get("result_json") is not None:
+                location = f"{_sheet_title(item, used_names)}.xlsx"
+                item_path = str(Path(temp_dir) / location)
+                copied = _copy_template(template_path, item_path)
+                if not copied:
+                    break
+                workbook = openpyxl.load_workbook(item_path)
+                _fill_header_info(workbook.active, item["result_json"])
+                _fill_test_cases(workbook.active, item["result_json"].get("Test Cases", []))
+                workbook.save(item_path)
+                archive.write(item_path, location)
+            summary.append(dict(zip(SUMMARY_HEADERS, _summary_row(item, location))))
+        if copied:
+            archive.writestr(SUMMARY_FILE_NAME, json.dumps(summary, ensure_ascii=False, indent=DATA_JSON_INDENT))
+
+    if not copied:
+        # 템플릿 복사에 실패하면 반쯤 쓴 zip 파일을 outputs에 남기지 않음
+        Path(final_filename).unlink(missing_ok=True)
+        return None
+
+    print(f"\n✅ 성공! '{final_filename}' 파일에 {len(items)}개 항목의 일괄 생성 결과를 저장했습니다.")
+    return final_filename
@@ -0,0 +1,118 @@
+"""
+Git 분석 결과 캐시
+(저장소 경로, 공통 조상 SHA, 대상 SHA, 분석 옵션) 해시를 키로 하는 2단계(메모리 LRU + SQLite) 캐시를 제공합니다.
+
+키가 브랜치명이 아니라 커밋 SHA이므로 저장된 결과는 바뀌지 않습니다. (브랜치가 움직이면 키가 달라짐)
+따라서 만료 시간 없이 디스크 크기 제한을 넘을 때만 오래 사용되지 않은 항목부터 제거합니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Any, Optional
+
+from .config_loader import load_config
+from .tiered_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_DB_PATH = "git_analysis_cache.db"
+DEFAULT_MEMORY_ENTRIES = 32
+DEFAULT_MAX_DISK_MB = 128
+
+
+def make_analysis_cache_key(repo_path: str, base_sha: str, head_sha: str, options: Dict[str, Any]) -> str:
+    """
+    Git 분석 결과 캐시 키를 생성합니다.
+
+    Args:
+        repo_path: Git 저장소 경로 (실제 경로로 정규화)
+        base_sha: 공통 조상 커밋 SHA
+        head_sha: 대상 커밋 SHA
+        options: 분석 결과에 영향을 주는 옵션 (파일당 최대 diff 줄 수 등)
+
+    Returns:
+        sha256 해시
+    """
+    material = {
+        'repo_path': os.path.realpath(repo_path),
+        'base_sha': base_sha,
+        'head_sha': head_sha,
+        'options': options
+    }
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class GitAnalysisCache(TieredCache):
+    """메모리 LRU + 디스크(SQLite) 2단계 Git 분석 결과 캐시"""
+
+    TABLE = "git_analyses"
+    VALUE_COLUMN = "analysis"
+    TIME_COLUMN = "analysis_time"
+    SCHEMA = (
+        '''
+        CREATE TABLE IF NOT EXISTS git_analyses (
+            cache_key TEXT PRIMARY KEY,
+            repo_path TEXT,
+            head_sha TEXT,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            size INTEGER NOT NULL,
+            analysis_time REAL DEFAULT 0,
+            analysis TEXT NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_git_analyses_access ON git_analyses(last_access)'
+    )
+    LABEL = "Git 분석"
+
+    def __init__(self,
+                 db_path: Optional[str] = DEFAULT_DB_PATH,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_MB * 1024 * 1024):
+        """
+        분석 결과 캐시 초기화 (만료 시간 없음)
+
+        Args:
+            db_path: 디스크 캐시 SQLite 파일 경로 (None이면 메모리 캐시만 사용)
+            memory_entries: 메모리 LRU 최대 항목 수
+            max_disk_bytes: 디스크 캐시 최대 크기 (분석 결과 바이트 합계)
+        """
+        super().__init__(db_path, memory_entries, max_disk_bytes)
+
+    def set(self, key: str, analysis: str, repo_path: str = "", head_sha: str = "", analysis_time: float = 0.0):
+        """
+        분석 결과를 캐시에 저장
+
+        Args:
+            key: make_analysis_cache_key()로 생성한 키
+            analysis: 저장할 분석 결과 텍스트
+            repo_path: 저장소 경로 (관리용)
+            head_sha: 대상 커밋 SHA (관리용)
+            analysis_time: 분석에 걸린 시간 (적중 시 절약 시간으로 집계)
+        """
+        self._store(key, analysis, analysis_time, repo_path=repo_path, head_sha=head_sha)
+
+
+# 전역 인스턴스 (지연 로딩)
+_git_analysis_cache: Optional[GitAnalysisCache] = None
+_git_analysis_cache_loaded = False
+
+
+def get_git_analysis_cache() -> Optional[GitAnalysisCache]:
+    """설정(config.json의 git.analysis_cache)을 반영한 분석 결과 캐시 싱글톤 반환. 비활성화 시 None."""
+    global _git_analysis_cache, _git_analysis_cache_loaded
+    if not _git_analysis_cache_loaded:
+        config = load_config() or {}
+        cache_config = config.get('git', {}).get('analysis_cache', {})
+        if cache_config.get('enabled', True):
+            _git_analysis_cache = GitAnalysisCache(
+                db_path=cache_config.get('db_path', DEFAULT_DB_PATH),
+                memory_entries=cache_config.get('memory_entries', DEFAULT_MEMORY_ENTRIES),
+                max_disk_bytes=int(cache_config.get('max_disk_mb', DEFAULT_MAX_DISK_MB) * 1024 * 1024)
+            )
+        _git_analysis_cache_loaded = True
+    return _git_analysis_cache
@@ -1,14 +1,73 @@
 import git
-from typing import List, Tuple, Optional
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence, Tuple, Optional, Dict, Any
+
+from .config_loader import load_config
+from .git_analysis_cache import get_git_analysis_cache, make_analysis_cache_key
+from .git_diff_stream import stream_file_diffs, unquote_path, FileDiff, LineLimit
+from .git_path_filters import (
+    get_path_filter_config, build_pathspecs, literal_excludes, list_changed_paths, detect_attribute_excluded,
+    is_generated_content, format_excluded_files,
+    EXCLUDE_REASON_FILTER, EXCLUDE_REASON_BINARY, EXCLUDE_REASON_GENERATED, EXCLUDE_REASON_BUDGET,
+    GENERATED_SCAN_LINES, PATHS_PER_COMMAND
+)
+from .llm.token_counter import estimate_tokens
+
+logger = logging.getLogger(__name__)
 
 # 상수 정의
 MAX_DIFF_LINES_PER_FILE = 20
+# 분석 결과 형식이 바뀌면 올려서 이전 캐시 항목을 무효화
+ANALYSIS_FORMAT_VERSION = 4
 COMMIT_MESSAGES_HEADER = "### 커밋 메시지 목록:"
 CODE_CHANGES_HEADER = "### 주요 코드 변경 내용 (diff):"
 DIFF_TRUNCATION_MESSAGE = "... (내용 생략) ..."
 COMMON_ANCESTOR_ERROR = "오류: 공통 조상을 찾을 수 없습니다."
 GIT_ERROR_PREFIX = "Git 분석 중 오류 발생: "
 
+# diff 예산 배분 (config.json의 git.diff_budget)
+DEFAULT_DIFF_BUDGET_LINES = 300
+DEFAULT_MIN_LINES_PER_FILE = 4
+# 토큰 예산 사용 시 numstat만으로 비용을 추정할 때 쓰는 diff 한 줄의 평균 토큰 수
+DIFF_TOKENS_PER_LINE = 12
+# 변경 줄 외에 파일마다 붙는 hunk 헤더와 앞뒤 문맥 줄 수 (추정치)
+HUNK_CONTEXT_LINES = 7
+# 배정량보다 넉넉히 읽어 두어야 뒤쪽의 더 중요한 hunk를 고를 수 있음
+HUNK_LOOKAHEAD = 4
+HUNK_HEADER_PREFIX = "@@"
+
+# 파일별 diff 병렬 추출 (config.json의 git.diff_workers, 기본값은 CPU 수)
+DEFAULT_MAX_DIFF_WORKERS = 8
+# 이보다 파일이 적으면 git 프로세스를 여러 개 띄우는 비용이 더 큼
+PARALLEL_DIFF_MIN_FILES = 40
+# 작업자 수보다 잘게 나눠 큰 파일이 몰린 조각 하나 때문에 다른 작업자가 노는 시간을 줄임
+DIFF_CHUNKS_PER_WORKER = 2
+
+# 파일 종류별 가중치 (경로 휴리스틱)
+LOW_VALUE_WEIGHT = 0.1
+TEST_WEIGHT = 0.8
+SOURCE_WEIGHT = 1.0
+CONFIG_WEIGHT = 0.6
+DOCS_WEIGHT = 0.4
+OTHER_WEIGHT = 0.5
+LOCKFILE_NAMES = {
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'poetry.lock', 'pipfile.lock',
+    'cargo.lock', 'composer.lock', 'gemfile.lock', 'go.sum'
+}
+LOW_VALUE_DIRS = {'vendor', 'node_modules', 'dist', 'build', 'third_party', 'generated', '__generated__'}
+LOW_VALUE_SUFFIXES = ('.lock', '.min.js', '.min.css', '.map', '.snap', '_pb2.py', '.pb.go')
+TEST_DIRS = {'test', 'tests', '__tests__', 'spec'}
+SOURCE_EXTENSIONS = {
+    '.py', '.java', '.kt', '.js', '.jsx', '.ts', '.tsx', '.vue', '.go', '.rs', '.c', '.cc', '.cpp',
+    '.h', '.hpp', '.cs', '.rb', '.php', '.swift', '.scala', '.sql', '.sh'
+}
+CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.ini', '.properties', '.xml', '.cfg', '.conf'}
+DOCS_EXTENSIONS = {'.md', '.txt', '.rst', '.adoc'}
+
 
 def get_merge_base_commits(repo: git.Repo, base_branch: str, head_branch: str) -> Optional[git.Commit]:
     """
@@ -47,57 +106,573 @@ def extract_commit_messages(repo: git.Repo, base_commit: git.Commit, head_commit
     return commit_messages
 
 
-def extract_code_changes(base_commit: git.Commit, head_commit: git.Commit) -> List[str]:
+def get_diff_budget_config() -> Dict[str, Any]:
+    """
+    diff 예산 배분 설정(config.json의 git.diff_budget)을 기본값과 합쳐 반환합니다.
+    
+    Returns:
+        enabled, max_lines, max_tokens(None이면 줄 단위), min_lines_per_file, max_lines_per_file(None이면 제한 없음)
+    """
+    config = load_config() or {}
+    budget_config = config.get('git', {}).get('diff_budget', {})
+    return {
+        'enabled': budget_config.get('enabled', True),
+        'max_lines': budget_config.get('max_lines', DEFAULT_DIFF_BUDGET_LINES),
+        'max_tokens': budget_config.get('max_tokens'),
+        'min_lines_per_file': budget_config.get('min_lines_per_file', DEFAULT_MIN_LINES_PER_FILE),
+        'max_lines_per_file': budget_config.get('max_lines_per_file')
+    }
+
+
+def collect_change_stats(repo: git.Repo, base_sha: str, head_sha: str,
+                         pathspecs: Sequence[str] = ()) -> Dict[str, Dict[str, Any]]:
+    """
+    파일별 변경 규모(numstat)와 커밋 이력 등장 횟수를 수집합니다.
+    
+    패치 본문을 읽기 전에 예산을 나누기 위한 값이므로 `git diff --numstat`과 `git log --name-only`만 사용합니다.
+    이름이 바뀐 파일은 diff 스트림과 같이 이전 경로를 키로 씁니다.
+    
+    Args:
+        repo: Git 저장소 객체
+        base_sha: 기준 커밋 SHA
+        head_sha: 대상 커밋 SHA
+        pathspecs: 대상 경로를 제한하는 git pathspec 목록
+    
+    Returns:
+        경로 -> {'added', 'deleted', 'binary', 'commits', 'new_path'}
+    """
+    stats: Dict[str, Dict[str, Any]] = {}
+    renamed_to: Dict[str, str] = {}
+
+    # -z 출력: "추가\t삭제\t경로\0", 이름 변경은 "추가\t삭제\t\0이전 경로\0새 경로\0"
+    pathspec_args = ('--', *pathspecs) if pathspecs else ()
+    tokens = repo.git.diff(base_sha, head_sha, '--numstat', '-z', '-M', '--no-textconv', *pathspec_args).split('\0')
+    index = 0
+    while index < len(tokens):
+        entry = tokens[index]
+        index += 1
+        if not entry:
+            continue
+        added, deleted, path = entry.split('\t', 2)
+        new_path = path
+        if not path:
+            path, new_path = tokens[index], tokens[index + 1]
+            index += 2
+            renamed_to[new_path] = path
+        binary = added == '-' or deleted == '-'
+        stats[path] = {
+            'added': 0 if binary else int(added),
+            'deleted': 0 if binary else int(deleted),
+            'binary': binary,
+            'commits': 0,
+            'new_path': new_path
+        }
+
+    # 브랜치의 여러 커밋에서 반복해서 수정된 파일일수록 변경의 중심일 가능성이 높음
+    log_output = repo.git.log(f'{base_sha}..{head_sha}', '--format=', '--name-only')
+    for line in log_output.splitlines():
+        if not line:
+            continue
+        path = unquote_path(line)
+        path = renamed_to.get(path, path)
+        if path in stats:
+            stats[path]['commits'] += 1
+
+    return stats
+
+
+def _path_weight(path: str) -> float:
+    """경로 휴리스틱에 따른 파일 종류 가중치"""
+    lowered = path.lower()
+    parts = lowered.split('/')
+    name = parts[-1]
+    extension = os.path.splitext(name)[1]
+
+    # 잠금 파일, 벤더/빌드 산출물, 자동 생성 파일은 시나리오 작성에 거의 도움이 되지 않음
+    if name in LOCKFILE_NAMES or lowered.endswith(LOW_VALUE_SUFFIXES) or LOW_VALUE_DIRS.intersection(parts[:-1]):
+        return LOW_VALUE_WEIGHT
+    if (TEST_DIRS.intersection(parts[:-1]) or name.startswith('test_')
+            or '.test.' in name or '.spec.' in name or os.path.splitext(name)[0].endswith('_test')):
+        return TEST_WEIGHT
+    if extension in SOURCE_EXTENSIONS:
+        return SOURCE_WEIGHT
+    if extension in CONFIG_EXTENSIONS:
+        return CONFIG_WEIGHT
+    if extension in DOCS_EXTENSIONS:
+        return DOCS_WEIGHT
+    return OTHER_WEIGHT
+
+
+def score_file(path: str, stats: Dict[str, Any]) -> float:
+    """
+    파일의 diff 예산 배분 점수를 계산합니다.
+    
+    변경 규모는 로그 스케일로 반영해 큰 파일 하나가 예산을 독차지하지 않게 하고,
+    파일 종류 가중치와 커밋 이력 등장 횟수를 곱합니다.
+    
+    Args:
+        path: 파일 경로
+        stats: collect_change_stats()의 파일별 값
+    
+    Returns:
+        점수 (이진 파일이나 내용 변경이 없는 파일은 0)
+    """
+    changed = stats['added'] + stats['deleted']
+    if stats['binary'] or changed == 0:
+        return 0.0
+    commit_factor = 1 + 0.5 * math.log2(max(stats['commits'], 1))
+    return math.log1p(changed) * _path_weight(path) * commit_factor
+
+
+def allocate_diff_budget(costs: Dict[str, int], scores: Dict[str, float], total: int,
+                         min_per_file: int, max_per_file: Optional[int] = None) -> Dict[str, int]:
+    """
+    전체 diff 예산을 점수에 비례해 파일별로 나눕니다.
+    
+    1) 점수가 높은 순서로 파일마다 최소량을 보장하고, 2) 남은 예산을 점수 비례로 나누되
+    파일 전체 diff 비용(또는 파일당 상한)을 넘는 몫은 다른 파일에 다시 나눕니다.
+    예산이 모든 파일의 최소량에 못 미치면 전체 diff가 최소량 안에 들어가는 작은 파일(이름 변경 등)을 먼저 채웁니다.
+    
+    Args:
+        costs: 파일별 전체 diff 비용 추정치 (줄 또는 토큰)
+        scores: 파일별 점수 (0이면 배정하지 않음)
+        total: 전체 예산
+        min_per_file: 파일당 최소 배정량
+        max_per_file: 파일당 최대 배정량 (None이면 제한 없음)
+    
+    Returns:
+        파일별 배정량
+    """
+    budgets = {path: 0 for path in costs}
+    caps = {path: min(cost, max_per_file) if max_per_file else cost for path, cost in costs.items()}
+    ranked = sorted((path for path in costs if scores.get(path, 0.0) > 0), key=lambda path: -scores[path])
+    remaining = total
+
+    # 정렬이 안정적이므로 작은 파일 묶음과 나머지 묶음 안에서는 점수 순서가 유지됨
+    for path in sorted(ranked, key=lambda path: caps[path] > min_per_file):
+        grant = min(min_per_file, caps[path], remaining)
+        budgets[path] = grant
+        remaining -= grant
+
+    active = [path for path in ranked if budgets[path] < caps[path]]
+    while remaining > 0 and active:
+        weight = sum(scores[path] for path in active)
+        spent = 0
+        for path in active:
+            grant = min(int(remaining * scores[path] / weight), caps[path] - budgets[path])
+            budgets[path] += grant
+            spent += grant
+        remaining -= spent
+        active = [path for path in active if budgets[path] < caps[path]]
+        if spent == 0:
+            # 비례 몫이 모두 1 미만이면 남은 단위를 점수 순으로 하나씩 배정
+            for path in active[:remaining]:
+                budgets[path] += 1
+            break
+
+    return budgets
+
+
+def select_hunks(lines: List[str], budget: int, line_cost: Callable[[str], int], truncated: bool = False) -> List[str]:
+    """
+    예산 안에서 가장 많은 변경 줄을 담은 hunk부터 골라 원래 순서대로 반환합니다.
+    
+    예산에 다 들어가지 않는 hunk를 만나면 그 hunk의 앞부분만 담고 멈춥니다.
+    빠진 부분 자리에는 생략 표시를 넣습니다.
+    
+    Args:
+        lines: 파일의 diff 줄 (첫 줄부터 hunk 헤더 '@@')
+        budget: 파일 배정량
+        line_cost: 줄 하나의 비용 (줄 단위면 1, 토큰 단위면 토큰 수)
+        truncated: lines 뒤에 읽지 않은 줄이 더 있는지 여부
+    
+    Returns:
+        선택된 diff 줄 리스트
+    """
+    hunks: List[List[str]] = []
+    for line in lines:
+        if line.startswith(HUNK_HEADER_PREFIX) or not hunks:
+            hunks.append([])
+        hunks[-1].append(line)
+
+    def changed_lines(hunk: List[str]) -> int:
+        return sum(1 for line in hunk[1:] if line[:1] in ('+', '-'))
+
+    ranked = sorted(range(len(hunks)), key=lambda index: -changed_lines(hunks[index]))
+    kept: Dict[int, int] = {}
+    remaining = budget
+    for index in ranked:
+        costs = [line_cost(line) for line in hunks[index]]
+        if sum(costs) <= remaining:
+            kept[index] = len(costs)
+            remaining -= sum(costs)
+            continue
+        count = 0
+        while count < len(costs) and costs[count] <= remaining:
+            remaining -= costs[count]
+            count += 1
+        # hunk 헤더만 남는 경우는 의미가 없음
+        if count > 1:
+            kept[index] = count
+        break
+
+    selected: List[str] = []
+    omitted = False
+    for index, hunk in enumerate(hunks):
+        count = kept.get(index, 0)
+        if count == 0:
+            omitted = True
+            continue
+        if omitted:
+            selected.append(DIFF_TRUNCATION_MESSAGE)
+        selected.extend(hunk[:count])
+        omitted = count < len(hunk)
+    if omitted or truncated:
+        selected.append(DIFF_TRUNCATION_MESSAGE)
+    return selected
+
+
+def plan_diff_paths(repo: git.Repo, base_sha: str, head_sha: str,
+                    filter_config: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], List[str], Dict[str, str]]:
+    """
+    패치를 만들기 전에 diff 대상 파일을 정합니다.
+    
+    포함/제외 glob은 pathspec으로 numstat 호출에 바로 넘기고, 남은 파일 중 이진 파일(numstat '-')과
+    .gitattributes의 생성/벤더 파일을 골라 개별 경로 pathspec으로 패치 호출에서 제외합니다.
+    
+    Args:
+        repo: Git 저장소 객체
+        base_sha: 기준 커밋 SHA
+        head_sha: 대상 커밋 SHA
+        filter_config: get_path_filter_config() 결과
+    
+    Returns:
+        (diff 대상 파일별 변경 통계, 패치 호출용 pathspec 목록, 제외된 파일 경로 -> 제외 사유)
+    """
+    pathspecs = build_pathspecs(filter_config)
+    stats = collect_change_stats(repo, base_sha, head_sha, pathspecs)
+    excluded: Dict[str, str] = {}
+
+    if pathspecs:
+        kept = set(stats) | {file_stats['new_path'] for file_stats in stats.values()}
+        for path in list_changed_paths(repo, base_sha, head_sha):
+            if path not in kept:
+                excluded[path] = EXCLUDE_REASON_FILTER
+
+    detected: Dict[str, str] = {}
+    if filter_config['skip_binary']:
+        detected.update((path, EXCLUDE_REASON_BINARY) for path, file_stats in stats.items() if file_stats['binary'])
+    if filter_config['skip_generated']:
+        candidates = [path for path in stats if path not in detected]
+        detected.update((path, EXCLUDE_REASON_GENERATED) for path in detect_attribute_excluded(repo, candidates))
+    for path in detected:
+        del stats[path]
+    excluded.update(detected)
+
+    return stats, pathspecs + literal_excludes(detected), excluded
+
+
+def get_diff_worker_count() -> int:
+    """파일별 diff 추출 작업자 수 (config.json의 git.diff_workers, 기본값: CPU 수와 DEFAULT_MAX_DIFF_WORKERS 중 작은 값)"""
+    config = load_config() or {}
+    workers = config.get('git', {}).get('diff_workers')
+    if workers is None:
+        workers = min(DEFAULT_MAX_DIFF_WORKERS, os.cpu_count() or 1)
+    return max(1, int(workers))
+
+
+def map_file_diffs(repo: git.Repo, base_sha: str, head_sha: str, stats: Dict[str, Dict[str, Any]],
+                   max_lines_per_file: LineLimit, pathspecs: Sequence[str],
+                   process: Callable[[FileDiff], Any]) -> List[Tuple[FileDiff, Any]]:
+    """
+    파일별 diff를 읽어 process로 가공한 결과를 git diff 출력 순서대로 반환합니다.
+    
+    파일이 많으면 변경 파일 목록을 연속된 조각으로 나누고, 조각마다 별도의 저장소 핸들과 git diff 프로세스로
+    작업자 풀에서 실행합니다.
+    패치 생성(git), 디코딩, 줄 수 제한, 가공(hunk 선택 등)이 모두 작업자에서 처리되며,
+    조각 결과를 원래 순서대로 이어 붙이므로 순차 처리와 결과가 같습니다.
+    
+    Args:
+        repo: Git 저장소 객체
+        base_sha: 기준 커밋 SHA
+        head_sha: 대상 커밋 SHA
+        stats: diff 대상 파일별 변경 통계 (numstat 순서 = git diff 출력 순서)
+        max_lines_per_file: 파일별로 보관할 최대 줄 수 (stream_file_diffs와 동일)
+        pathspecs: 순차 처리 시 패치 호출용 pathspec 목록
+        process: 파일 하나를 가공하는 함수 (작업자 스레드에서 호출)
+    
+    Returns:
+        (파일별 변경 내용, 가공 결과) 리스트
+    """
+    paths = list(stats)
+    workers = get_diff_worker_count()
+    if workers <= 1 or len(paths) < PARALLEL_DIFF_MIN_FILES:
+        return [(file_diff, process(file_diff))
+                for file_diff in stream_file_diffs(repo, base_sha, head_sha, max_lines_per_file, pathspecs)]
+
+    chunk_size = min(PATHS_PER_COMMAND, math.ceil(len(paths) / (workers * DIFF_CHUNKS_PER_WORKER)))
+    chunks = [paths[start:start + chunk_size] for start in range(0, len(paths), chunk_size)]
+
+    def run(chunk: List[str]) -> List[Tuple[FileDiff, Any]]:
+        # 이름이 바뀐 파일은 이전/새 경로가 같은 조각에 있어야 이름 변경으로 감지됨
+        chunk_pathspecs = [f":(top,literal){path}" for path in chunk]
+        chunk_pathspecs.extend(f":(top,literal){stats[path]['new_path']}"
+                               for path in chunk if stats[path]['new_path'] != path)
+        # GitPython 핸들은 스레드 안전하지 않으므로 조각마다 같은 저장소를 따로 엶
+        with git.Repo(repo.working_dir) as chunk_repo:
+            return [(file_diff, process(file_diff))
+                    for file_diff in stream_file_diffs(chunk_repo, base_sha, head_sha, max_lines_per_file,
+                                                       chunk_pathspecs)]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix='git-diff') as pool:
+        chunk_results = list(pool.map(run, chunks))
+    logger.info(f"diff 병렬 추출: 파일 {len(paths)}개, 조각 {len(chunks)}개, 작업자 {min(workers, len(chunks))}개")
+    return [item for chunk_result in chunk_results for item in chunk_result]
+
+
+def _collect_rendered(rendered: List[Tuple[FileDiff, Optional[List[str]]]], excluded: Dict[str, str]) -> List[str]:
+    """
+    가공된 파일별 diff를 이어 붙입니다.
+    (가공 결과가 None이면 자동 생성 파일, 빈 리스트면 예산 초과 파일로 제외 목록에 추가)
+    
+    개별 경로 pathspec 개수 제한으로 패치에 남은 제외 파일도 여기서 걸러집니다.
+    작업자 스레드가 아닌 호출 스레드에서 순서대로 제외 목록을 고치므로 결과가 항상 같습니다.
+    """
+    result = []
+    for file_diff, lines in rendered:
+        if file_diff.path in excluded:
+            continue
+        if not lines:
+            excluded[file_diff.path] = EXCLUDE_REASON_GENERATED if lines is None else EXCLUDE_REASON_BUDGET
+            continue
+        result.extend(lines)
+    return result
+
+
+def _extract_budgeted_changes(repo: git.Repo, base_sha: str, head_sha: str, budget_config: Dict[str, Any],
+                              stats: Dict[str, Dict[str, Any]], pathspecs: Sequence[str],
+                              excluded: Dict[str, str], skip_generated: bool) -> List[str]:
+    """
+    전체 예산을 점수 순으로 나눠 파일별 diff를 추출합니다. (점수가 높은 파일부터 출력)
+    
+    Args:
+        repo: Git 저장소 객체
+        base_sha: 기준 커밋 SHA
+        head_sha: 대상 커밋 SHA
+        budget_config: get_diff_budget_config() 결과
+        stats: diff 대상 파일별 변경 통계
+        pathspecs: 패치 호출용 pathspec 목록
+        excluded: 제외된 파일 목록 (내용으로 생성 파일을 알아내면 여기에 추가)
+        skip_generated: 자동 생성 표식이 있는 파일 제외 여부
+    
+    Returns:
+        파일별 diff 문자열 리스트
+    """
+    # 토큰 예산이면 줄 수 기반 설정과 비용 추정을 토큰으로 환산
+    token_mode = budget_config['max_tokens'] is not None
+    unit = DIFF_TOKENS_PER_LINE if token_mode else 1
+    total = budget_config['max_tokens'] if token_mode else budget_config['max_lines']
+    min_per_file = budget_config['min_lines_per_file'] * unit
+    max_per_file = budget_config['max_lines_per_file'] * unit if budget_config['max_lines_per_file'] else None
+    line_cost = (lambda line: estimate_tokens(line) + 1) if token_mode else (lambda line: 1)
+
+    scores = {path: score_file(path, file_stats) for path, file_stats in stats.items()}
+    costs = {path: (file_stats['added'] + file_stats['deleted'] + HUNK_CONTEXT_LINES) * unit
+             for path, file_stats in stats.items()}
+    budgets = allocate_diff_budget(costs, scores, total, min_per_file, max_per_file)
+
+    # 배정량이 0인 파일도 자동 생성 표식을 확인할 만큼은 읽음
+    scan_lines = GENERATED_SCAN_LINES if skip_generated else 0
+
+    def read_limit(path: str) -> int:
+        return max(math.ceil(budgets.get(path, min_per_file) / unit) * HUNK_LOOKAHEAD, scan_lines)
+
+    def render(file_diff: FileDiff) -> Optional[List[str]]:
+        if skip_generated and is_generated_content(file_diff.lines):
+            return None
+        budget = budgets.get(file_diff.path, min_per_file)
+        if budget == 0 and scores.get(file_diff.path, 0.0) > 0:
+            # 예산이 모자라 한 줄도 배정받지 못한 파일은 빈 구역 대신 이름만 나열
+            return []
+        return [f"--- 파일: {file_diff.path} ---"] + select_hunks(
+            file_diff.lines, budget, line_cost, truncated=file_diff.truncated)
+
+    rendered = map_file_diffs(repo, base_sha, head_sha, stats, read_limit, pathspecs, render)
+    rendered.sort(key=lambda item: -scores.get(item[0].path, 0.0))
+    logger.info(f"diff 예산 배분: 파일 {len(rendered)}개, 예산 {total}{' 토큰' if token_mode else '줄'}")
+    return _collect_rendered(rendered, excluded)
+
+
+def extract_code_changes(repo: git.Repo, base_commit: git.Commit, head_commit: git.Commit) -> List[str]:
     """
     코드 변경 내용(diff)을 추출합니다.
     
+    git diff 출력을 스트리밍하면서 전체 예산(git.diff_budget)을 변경 규모, 파일 종류, 경로, 커밋 이력 점수에 따라
+    파일별로 나누고, 파일마다 변경 줄이 많은 hunk부터 담습니다.
+    예산 배분을 끄면 파일별로 MAX_DIFF_LINES_PER_FILE 줄까지만 보관합니다.
+    경로 필터(git.path_filters)에 걸린 파일과 이진/생성/벤더 파일은 패치를 만들지 않고 이름만 나열합니다.
+    변경 파일이 많으면 파일별 diff를 작업자 풀(git.diff_workers)에서 나눠 추출합니다.
+    
     Args:
+        repo: Git 저장소 객체
         base_commit: 기준 커밋
         head_commit: 대상 커밋
     
     Returns:
         코드 변경 내용 문자열 리스트
     """
-    diffs = base_commit.diff(head_commit, create_patch=True)
     code_changes = [CODE_CHANGES_HEADER]
+    budget_config = get_diff_budget_config()
+    filter_config = get_path_filter_config()
     
-    for diff in diffs:
-        code_changes.extend(_process_single_diff(diff))
+    if not budget_config['enabled'] and not filter_config['enabled']:
+        for file_diff in stream_file_diffs(repo, base_commit.hexsha, head_commit.hexsha, MAX_DIFF_LINES_PER_FILE):
+            code_changes.extend(_format_file_diff(file_diff))
+        return code_changes
     
+    if not filter_config['enabled']:
+        filter_config = dict(filter_config, include=[], exclude=[], builtin_excludes=False,
+                             skip_binary=False, skip_generated=False)
+    stats, pathspecs, excluded = plan_diff_paths(repo, base_commit.hexsha, head_commit.hexsha, filter_config)
+    
+    if budget_config['enabled']:
+        code_changes.extend(_extract_budgeted_changes(repo, base_commit.hexsha, head_commit.hexsha, budget_config,
+                                                      stats, pathspecs, excluded, filter_config['skip_generated']))
+    else:
+        def render(file_diff: FileDiff) -> Optional[List[str]]:
+            if filter_config['skip_generated'] and is_generated_content(file_diff.lines):
+                return None
+            return _format_file_diff(file_diff)
+
+        rendered = map_file_diffs(repo, base_commit.hexsha, head_commit.hexsha, stats,
+                                  MAX_DIFF_LINES_PER_FILE, pathspecs, render)
+        code_changes.extend(_collect_rendered(rendered, excluded))
+    
+    excluded_files = format_excluded_files(excluded)
+    if excluded_files:
+        code_changes.append("")
+        code_changes.extend(excluded_files)
     return code_changes
 
 
-def _process_single_diff(diff) -> List[str]:
+def _format_file_diff(file_diff: FileDiff) -> List[str]:
     """
-    단일 diff 객체를 처리하여 문자열 리스트로 변환합니다.
+    파일 하나의 변경 내용을 문자열 리스트로 변환합니다.
     
     Args:
-        diff: GitPython diff 객체
+        file_diff: 스트리밍 diff 파서가 만든 파일별 변경 내용
     
     Returns:
         처리된 diff 내용 문자열 리스트
     """
-    diff_content = diff.diff.decode('utf-8', errors='ignore').splitlines()
-    result = [f"--- 파일: {diff.a_path} ---"]
+    result = [f"--- 파일: {file_diff.path} ---"]
+    result.extend(file_diff.lines)
     
-    # 최대 줄 수 제한 적용
-    result.extend(diff_content[:MAX_DIFF_LINES_PER_FILE])
-    
-    if len(diff_content) > MAX_DIFF_LINES_PER_FILE:
+    if file_diff.truncated:
         result.append(DIFF_TRUNCATION_MESSAGE)
     
     return result
 
 
-def get_git_analysis_text(repo_path: str, base_branch: str = 'origin/develop', head_branch: str = 'HEAD') -> str:
+def resolve_commit_pair(repo: git.Repo, base_branch: str, head_branch: str) -> Optional[Tuple[git.Commit, git.Commit]]:
+    """
+    브랜치명을 (공통 조상 커밋, 대상 커밋) 쌍으로 변환합니다.
+    
+    Args:
+        repo: Git 저장소 객체
+        base_branch: 기준 브랜치명
+        head_branch: 대상 브랜치명
+    
+    Returns:
+        (공통 조상 커밋, 대상 커밋) 또는 None (공통 조상이 없는 경우)
+    """
+    base_commit = get_merge_base_commits(repo, base_branch, head_branch)
+    if not base_commit:
+        return None
+    return base_commit, repo.commit(head_branch)
+
+
+def build_analysis_text(repo: git.Repo, base_commit: git.Commit, head_commit: git.Commit) -> str:
+    """
+    두 커밋 사이의 커밋 메시지와 코드 diff를 하나의 텍스트로 결합합니다.
+    
+    Args:
+        repo: Git 저장소 객체
+        base_commit: 기준(공통 조상) 커밋
+        head_commit: 대상 커밋
+    
+    Returns:
+        Git 분석 결과 텍스트
+    """
+    # 1. 커밋 메시지 수집
+    commit_messages = extract_commit_messages(repo, base_commit, head_commit)
+
+    # 2. 코드 변경점(diff) 수집
+    code_changes = extract_code_changes(repo, base_commit, head_commit)
+
+    # 3. 모든 정보를 하나의 텍스트로 결합
+    return "\n".join(commit_messages) + "\n\n" + "\n".join(code_changes)
+
+
+def get_analysis_options() -> Dict[str, Any]:
+    """분석 결과에 영향을 주는 옵션 (분석 결과 캐시 키에 포함)"""
+    return {
+        'version': ANALYSIS_FORMAT_VERSION,
+        'max_diff_lines_per_file': MAX_DIFF_LINES_PER_FILE,
+        'diff_budget': get_diff_budget_config(),
+        'path_filters': get_path_filter_config()
+    }
+
+
+def analyze_commit_pair(repo: git.Repo, base_commit: git.Commit, head_commit: git.Commit, use_cache: bool = True) -> str:
+    """
+    두 커밋 사이의 분석 결과를 반환합니다. (커밋 SHA 기준 캐시 사용)
+    
+    Args:
+        repo: Git 저장소 객체
+        base_commit: 기준(공통 조상) 커밋
+        head_commit: 대상 커밋
+        use_cache: 분석 결과 캐시 사용 여부
+    
+    Returns:
+        Git 분석 결과 텍스트
+    """
+    cache = get_git_analysis_cache() if use_cache else None
+    if cache is None:
+        return build_analysis_text(repo, base_commit, head_commit)
+
+    key = make_analysis_cache_key(repo.working_dir, base_commit.hexsha, head_commit.hexsha, get_analysis_options())
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"Git 분석 캐시 적중: {base_commit.hexsha[:8]}..{head_commit.hexsha[:8]}")
+        return cached
+
+    start_time = time.time()
+    analysis_text = build_analysis_text(repo, base_commit, head_commit)
+    cache.set(key, analysis_text, repo_path=repo.working_dir, head_sha=head_commit.hexsha,
+              analysis_time=time.time() - start_time)
+    return analysis_text
+
+
+def is_analysis_error(analysis_text: str) -> bool:
+    """get_git_analysis_text 결과가 오류 메시지인지 여부"""
+    return not analysis_text or analysis_text == COMMON_ANCESTOR_ERROR or analysis_text.startswith(GIT_ERROR_PREFIX)
+
+
+def get_git_analysis_text(repo_path: str, base_branch: str = 'origin/develop', head_branch: str = 'HEAD',
+                          use_cache: bool = True) -> str:
     """
     브랜치의 커밋 메시지, 변경 파일 목록, 전체 코드 diff를 종합하여
     하나의 상세한 텍스트로 반환합니다.
     
+    브랜치명을 먼저 커밋 SHA로 바꾼 뒤 분석 결과 캐시를 조회하므로,
+    브랜치가 바뀌지 않았다면 커밋 목록과 diff를 다시 계산하지 않습니다.
+    
     Args:
         repo_path: Git 저장소 경로
         base_branch: 기준 브랜치명 (기본값: 'origin/develop')
         head_branch: 대상 브랜치명 (기본값: 'HEAD')
+        use_cache: 분석 결과 캐시 사용 여부
     
     Returns:
         Git 분석 결과 텍스트
@@ -105,21 +680,12 @@ def get_git_analysis_text(repo_path: str, base_branch: str = 'origin/develop', h
     try:
         repo = git.Repo(repo_path)
         
-        # 1. 공통 조상 커밋 찾기
-        base_commit = get_merge_base_commits(repo, base_branch, head_branch)
-        if not base_commit:
+        # 공통 조상 커밋 찾기
+        commit_pair = resolve_commit_pair(repo, base_branch, head_branch)
+        if not commit_pair:
             return COMMON_ANCESTOR_ERROR
         
-        head_commit = repo.commit(head_branch)
-
-        # 2. 커밋 메시지 수집
-        commit_messages = extract_commit_messages(repo, base_commit, head_commit)
-
-        # 3. 코드 변경점(diff) 수집
-        code_changes = extract_code_changes(base_commit, head_commit)
-
-        # 4. 모든 정보를 하나의 텍스트로 결합
-        return "\n".join(commit_messages) + "\n\n" + "\n".join(code_changes)
+        return analyze_commit_pair(repo, *commit_pair, use_cache=use_cache)
 
     except Exception as e:
         return f"{GIT_ERROR_PREFIX}{e}"
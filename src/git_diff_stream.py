@@ -0,0 +1,187 @@
+"""
+스트리밍 git diff 파서
+`git diff --patch` 출력을 한 줄씩 읽어 파일별 변경 내용을 만듭니다.
+
+GitPython의 `Commit.diff(create_patch=True)`는 모든 파일의 패치를 메모리에 bytes로 만든 뒤 통째로 디코딩하지만,
+여기서는 파일별 줄 수 상한까지만 디코딩해 보관하고 나머지 줄은 세기만 하고 버립니다.
+따라서 메모리 사용량과 처리 시간이 diff 전체 크기가 아니라 출력 상한에 비례합니다.
+"""
+
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+import git
+
+# 상수 정의
+DIFF_HEADER_PREFIX = b"diff --git "
+HUNK_HEADER_PREFIX = b"@@"
+BINARY_FILES_PREFIX = b"Binary files "
+OLD_PATH_PREFIX = b"--- "
+NEW_PATH_PREFIX = b"+++ "
+RENAME_FROM_PREFIX = b"rename from "
+DEV_NULL = "/dev/null"
+# 외부 diff 도구/textconv 설정과 무관하게 일정한 패치 형식을 얻기 위한 옵션 (-M: 이름 변경 감지, GitPython과 동일)
+DIFF_OPTIONS = ('--no-color', '--no-ext-diff', '--no-textconv', '-M', '--patch')
+# 파일별 보관 줄 수 상한: 모든 파일에 같은 값(int), 경로별 값(callable), 제한 없음(None)
+LineLimit = Union[None, int, Callable[[str], Optional[int]]]
+C_ESCAPES = {'a': '\a', 'b': '\b', 't': '\t', 'n': '\n', 'v': '\v', 'f': '\f', 'r': '\r', '"': '"', '\\': '\\'}
+
+
+class FileDiff:
+    """파일 하나의 변경 내용 (상한까지의 줄과 전체 줄 수)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lines: List[str] = []
+        self.line_count = 0
+
+    @property
+    def truncated(self) -> bool:
+        """상한을 넘어 버린 줄이 있는지 여부"""
+        return self.line_count > len(self.lines)
+
+
+def unquote_path(raw: str) -> str:
+    """
+    git이 따옴표로 감싼 경로("a/\\355\\225\\234.py")를 원래 경로로 변환
+
+    Args:
+        raw: diff 헤더의 경로 (따옴표 없는 경로는 그대로 반환)
+
+    Returns:
+        경로 문자열
+    """
+    if not (len(raw) >= 2 and raw.startswith('"') and raw.endswith('"')):
+        return raw
+    body = raw[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch == '\\' and i + 1 < len(body):
+            nxt = body[i + 1]
+            octal = body[i + 1:i + 4]
+            if len(octal) == 3 and all(c in '01234567' for c in octal):
+                out.append(int(octal, 8))
+                i += 4
+                continue
+            out.extend(C_ESCAPES.get(nxt, nxt).encode('utf-8'))
+            i += 2
+            continue
+        out.extend(ch.encode('utf-8'))
+        i += 1
+    return out.decode('utf-8', errors='replace')
+
+
+def _strip_prefix(path: str) -> str:
+    """diff 헤더 경로의 a/ 또는 b/ 접두어 제거"""
+    return path[2:] if path[:2] in ('a/', 'b/') else path
+
+
+def _path_from_header(line: str) -> str:
+    """'diff --git a/P b/P' 줄에서 경로 추출 (---/+++ 줄이 없는 이진/모드 변경용)"""
+    rest = line[len(DIFF_HEADER_PREFIX):]
+    if rest.startswith('"'):
+        end = rest.find('" ', 1)
+        return _strip_prefix(unquote_path(rest[:end + 1] if end != -1 else rest))
+    # 공백이 들어간 경로도 처리할 수 있도록 같은 경로 쌍(a/P b/P)을 먼저 가정
+    half = (len(rest) - 1) // 2
+    if rest[half] == ' ' and rest[:half][2:] == rest[half + 1:][2:]:
+        return rest[2:half]
+    separator = rest.find(' b/')
+    return rest[2:separator] if separator != -1 else rest
+
+
+def _header_path(raw: bytes, prefix: bytes) -> str:
+    """헤더 줄(---, +++, rename from)의 경로 (공백이 있는 경로 뒤에 git이 붙이는 탭 제거)"""
+    return unquote_path(raw[len(prefix):].decode('utf-8', errors='replace').rstrip('\r\n').rstrip('\t'))
+
+
+def parse_patch_stream(lines, max_lines_per_file: LineLimit) -> Iterator[FileDiff]:
+    """
+    `git diff --patch` 출력(bytes 줄)을 파일별 FileDiff로 변환
+
+    파일 헤더(diff --git, index, ---/+++ 등)는 경로만 읽고 버리며, 첫 hunk(@@)부터의 줄을 내용으로 봅니다.
+    상한을 넘은 줄은 디코딩하지 않고 줄 수만 셉니다.
+
+    Args:
+        lines: bytes 줄의 반복자 (프로세스 stdout 등)
+        max_lines_per_file: 파일별로 보관할 최대 줄 수 (None이면 제한 없음, callable이면 경로별 상한)
+
+    Yields:
+        파일별 변경 내용
+    """
+    current: Optional[FileDiff] = None
+    in_header = False
+    old_path_is_null = False
+    limit: Optional[int] = None
+
+    for raw in lines:
+        if raw.startswith(DIFF_HEADER_PREFIX):
+            if current is not None:
+                yield current
+            header = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            current = FileDiff(_path_from_header(header))
+            in_header = True
+            old_path_is_null = False
+            continue
+        if current is None:
+            continue
+
+        if in_header:
+            if raw.startswith(HUNK_HEADER_PREFIX) or raw.startswith(BINARY_FILES_PREFIX):
+                in_header = False
+                # 경로가 헤더에서 확정된 뒤 파일별 상한 결정
+                limit = max_lines_per_file(current.path) if callable(max_lines_per_file) else max_lines_per_file
+            else:
+                # 헤더의 경로가 diff --git 줄보다 정확함 (이전 경로 기준, 새 파일은 새 경로)
+                if raw.startswith(OLD_PATH_PREFIX):
+                    path = _header_path(raw, OLD_PATH_PREFIX)
+                    old_path_is_null = path == DEV_NULL
+                    if not old_path_is_null:
+                        current.path = _strip_prefix(path)
+                elif raw.startswith(NEW_PATH_PREFIX) and old_path_is_null:
+                    current.path = _strip_prefix(_header_path(raw, NEW_PATH_PREFIX))
+                elif raw.startswith(RENAME_FROM_PREFIX):
+                    current.path = _header_path(raw, RENAME_FROM_PREFIX)
+                continue
+
+        current.line_count += 1
+        if limit is None or current.line_count <= limit:
+            current.lines.append(raw.decode('utf-8', errors='ignore').rstrip('\r\n'))
+
+    if current is not None:
+        yield current
+
+
+def stream_file_diffs(repo: git.Repo, base_sha: str, head_sha: str,
+                      max_lines_per_file: LineLimit = None, pathspecs: Sequence[str] = ()) -> Iterator[FileDiff]:
+    """
+    두 커밋 사이의 변경 내용을 파일별로 스트리밍
+
+    Args:
+        repo: Git 저장소 객체
+        base_sha: 기준 커밋 SHA
+        head_sha: 대상 커밋 SHA
+        max_lines_per_file: 파일별로 보관할 최대 줄 수 (None이면 제한 없음, callable이면 경로별 상한)
+        pathspecs: 대상 경로를 제한하는 git pathspec 목록 (제외 파일은 패치 자체를 만들지 않음)
+
+    Yields:
+        파일별 변경 내용 (git diff 출력 순서)
+
+    Raises:
+        git.GitCommandError: git diff 실행 실패
+    """
+    pathspec_args = ('--', *pathspecs) if pathspecs else ()
+    process = repo.git.diff(base_sha, head_sha, *DIFF_OPTIONS, *pathspec_args, as_process=True)
+    finished = False
+    try:
+        yield from parse_patch_stream(process.stdout, max_lines_per_file)
+        finished = True
+    finally:
+        if finished:
+            # 끝까지 읽었으면 종료 코드 확인 (실패 시 GitCommandError)
+            process.wait()
+        else:
+            # 호출자가 중간에 멈추면 남은 출력을 읽지 않고 프로세스 종료
+            process.proc.kill()
+            process.proc.wait()
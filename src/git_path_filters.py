@@ -0,0 +1,189 @@
+"""
+diff 경로 필터
+잠금 파일, 압축(minified) 번들, 이미지, 벤더/자동 생성 코드처럼 시나리오 작성에 쓸모없는 파일을
+git diff 호출의 pathspec으로 미리 제외해 패치 생성, 디코딩, 전송 비용을 줄입니다.
+제외된 파일은 분석 결과에 이름만 남깁니다.
+"""
+
+import re
+from typing import Dict, Any, Iterable, List, Sequence, Set
+
+import git
+
+from .config_loader import load_config
+
+# 상수 정의
+# 기본 제외 패턴 (git pathspec glob 문법: '**/'는 모든 디렉터리, '*'는 '/'를 넘지 않음)
+BUILTIN_EXCLUDE_GLOBS = (
+    # 잠금 파일
+    '**/package-lock.json', '**/yarn.lock', '**/pnpm-lock.yaml', '**/poetry.lock', '**/Pipfile.lock',
+    '**/Cargo.lock', '**/composer.lock', '**/Gemfile.lock', '**/go.sum',
+    # 압축 번들, 소스맵, 스냅샷
+    '**/*.min.js', '**/*.min.css', '**/*.map', '**/*.snap',
+    # 벤더/빌드 산출물
+    '**/node_modules/**', '**/vendor/**', '**/third_party/**', '**/dist/**', '**/build/**',
+    # 자동 생성 코드
+    '**/generated/**', '**/__generated__/**', '**/*_pb2.py', '**/*.pb.go', '**/*.g.dart', '**/*.designer.cs',
+    # 이미지, 폰트, 문서, 압축 파일 등 이진 파일
+    '**/*.png', '**/*.jpg', '**/*.jpeg', '**/*.gif', '**/*.ico', '**/*.bmp', '**/*.webp',
+    '**/*.woff', '**/*.woff2', '**/*.ttf', '**/*.eot', '**/*.pdf', '**/*.xlsx', '**/*.docx',
+    '**/*.zip', '**/*.gz', '**/*.jar', '**/*.war', '**/*.class', '**/*.dll', '**/*.exe', '**/*.so'
+)
+# .gitattributes에서 벤더/생성 파일로 표시하는 속성 (GitHub linguist 규칙)
+GENERATED_ATTRIBUTES = ('linguist-generated', 'linguist-vendored')
+# 파일 첫머리 주석에 있으면 자동 생성 파일로 보는 표식 (주석 기호를 뗀 본문 기준)
+GENERATED_MARKER_PATTERNS = (
+    re.compile(r'(?:^|\s)@generated\b'),
+    re.compile(r'^Code generated .* DO NOT EDIT\.$'),
+    re.compile(r'^Generated by .* DO NOT EDIT!?$'),
+    re.compile(r'^<auto-generated\b')
+)
+COMMENT_PREFIXES = ('//', '/*', '*', '#', '<!--', '--', ';')
+COMMENT_SUFFIX_PATTERN = re.compile(r'\s*(?:\*/|-->)$')
+# 파일 1번째 줄부터 시작하는 hunk 헤더 (새 파일 '@@ -0,0 +1,N @@' 또는 '@@ -1,N +1,M @@')
+FIRST_LINE_HUNK_PATTERN = re.compile(r'^@@ -[01](?:,\d+)? \+1(?:,\d+)? @@')
+GENERATED_SCAN_LINES = 10
+# 명령줄 길이 제한(Windows 약 32K자)을 넘지 않도록 한 번에 넘기는 경로 수
+PATHS_PER_COMMAND = 100
+MAX_LITERAL_EXCLUDES = 100
+
+EXCLUDED_FILES_HEADER = "### 제외된 파일 (이름만 표시):"
+MAX_EXCLUDED_LISTED = 50
+EXCLUDE_REASON_FILTER = "경로 필터"
+EXCLUDE_REASON_BINARY = "이진 파일"
+EXCLUDE_REASON_GENERATED = "생성/벤더 파일"
+EXCLUDE_REASON_BUDGET = "예산 초과"
+
+
+def get_path_filter_config() -> Dict[str, Any]:
+    """
+    diff 경로 필터 설정(config.json의 git.path_filters)을 기본값과 합쳐 반환합니다.
+
+    Returns:
+        enabled, include, exclude, builtin_excludes, skip_binary, skip_generated
+    """
+    config = load_config() or {}
+    filter_config = config.get('git', {}).get('path_filters', {})
+    return {
+        'enabled': filter_config.get('enabled', True),
+        'include': list(filter_config.get('include', [])),
+        'exclude': list(filter_config.get('exclude', [])),
+        'builtin_excludes': filter_config.get('builtin_excludes', True),
+        'skip_binary': filter_config.get('skip_binary', True),
+        'skip_generated': filter_config.get('skip_generated', True)
+    }
+
+
+def build_pathspecs(filter_config: Dict[str, Any]) -> List[str]:
+    """
+    포함/제외 glob 설정을 git pathspec 목록으로 변환합니다.
+
+    Args:
+        filter_config: get_path_filter_config() 결과
+
+    Returns:
+        git diff의 '--' 뒤에 붙일 pathspec 목록 (필터가 없으면 빈 목록)
+    """
+    pathspecs = [f":(top,glob){pattern}" for pattern in filter_config['include']]
+    excludes = list(filter_config['exclude'])
+    if filter_config['builtin_excludes']:
+        excludes.extend(BUILTIN_EXCLUDE_GLOBS)
+    pathspecs.extend(f":(top,exclude,glob){pattern}" for pattern in excludes)
+    return pathspecs
+
+
+def literal_excludes(paths: Iterable[str]) -> List[str]:
+    """개별 경로를 제외하는 pathspec 목록 (명령줄 길이를 고려해 MAX_LITERAL_EXCLUDES개까지)"""
+    return [f":(top,exclude,literal){path}" for path in list(paths)[:MAX_LITERAL_EXCLUDES]]
+
+
+def list_changed_paths(repo: git.Repo, base_sha: str, head_sha: str) -> List[str]:
+    """
+    두 커밋 사이에 바뀐 모든 파일 경로 (트리 비교만 하므로 패치를 만들지 않음)
+
+    이름 변경 감지를 하지 않으므로 이름이 바뀐 파일은 이전 경로와 새 경로가 모두 포함됩니다.
+
+    Args:
+        repo: Git 저장소 객체
+        base_sha: 기준 커밋 SHA
+        head_sha: 대상 커밋 SHA
+
+    Returns:
+        경로 목록
+    """
+    output = repo.git.diff(base_sha, head_sha, '--name-only', '-z', '--no-renames')
+    return [path for path in output.split('\0') if path]
+
+
+def detect_attribute_excluded(repo: git.Repo, paths: Sequence[str]) -> Set[str]:
+    """
+    .gitattributes에서 linguist-generated 또는 linguist-vendored로 표시된 경로를 찾습니다.
+
+    git check-attr는 작업 트리의 .gitattributes를 기준으로 합니다.
+
+    Args:
+        repo: Git 저장소 객체
+        paths: 검사할 경로 목록
+
+    Returns:
+        생성/벤더 파일로 표시된 경로 집합
+    """
+    marked: Set[str] = set()
+    for start in range(0, len(paths), PATHS_PER_COMMAND):
+        chunk = paths[start:start + PATHS_PER_COMMAND]
+        # -z 출력: "경로\0속성\0값\0" 반복
+        tokens = repo.git.check_attr('-z', *GENERATED_ATTRIBUTES, '--', *chunk).split('\0')
+        for index in range(0, len(tokens) - 2, 3):
+            path, value = tokens[index], tokens[index + 2]
+            if value in ('set', 'true'):
+                marked.add(path)
+    return marked
+
+
+def is_generated_content(lines: Sequence[str]) -> bool:
+    """
+    파일 첫머리 주석에 자동 생성 파일 표식('@generated', 'Code generated ... DO NOT EDIT.' 등)이 있는지 확인합니다.
+
+    첫 hunk가 파일 1번째 줄부터 시작할 때만 보고, 첫 코드 줄 전까지의 주석 줄만 검사합니다.
+
+    Args:
+        lines: 파일의 diff 줄 (hunk 헤더 포함)
+
+    Returns:
+        자동 생성 파일이면 True
+    """
+    if not lines or not FIRST_LINE_HUNK_PATTERN.match(lines[0]):
+        return False
+    for line in lines[1:GENERATED_SCAN_LINES]:
+        if line.startswith('-'):
+            continue
+        text = line[1:].strip()
+        if not text:
+            continue
+        prefix = next((prefix for prefix in COMMENT_PREFIXES if text.startswith(prefix)), None)
+        if prefix is None:
+            return False
+        comment = COMMENT_SUFFIX_PATTERN.sub('', text[len(prefix):].strip())
+        if any(pattern.search(comment) for pattern in GENERATED_MARKER_PATTERNS):
+            return True
+    return False
+
+
+def format_excluded_files(excluded: Dict[str, str]) -> List[str]:
+    """
+    제외된 파일 목록을 분석 결과용 문자열 리스트로 변환합니다.
+
+    Args:
+        excluded: 경로 -> 제외 사유
+
+    Returns:
+        문자열 리스트 (제외된 파일이 없으면 빈 리스트)
+    """
+    if not excluded:
+        return []
+    result = [EXCLUDED_FILES_HEADER]
+    for path, reason in list(excluded.items())[:MAX_EXCLUDED_LISTED]:
+        result.append(f"- {path} ({reason})")
+    if len(excluded) > MAX_EXCLUDED_LISTED:
+        result.append(f"- ... 외 {len(excluded) - MAX_EXCLUDED_LISTED}개")
+    return result
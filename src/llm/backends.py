@@ -0,0 +1,76 @@
+"""
+LLM 백엔드 선택
+config.json의 llm.backend 값에 따라 엔드포인트별 클라이언트를 만듭니다.
+
+모든 백엔드 클라이언트는 같은 인터페이스를 따릅니다. 요청과 응답은 Ollama /api/generate 형식입니다.
+- generate(payload, timeout) / agenerate(payload, timeout): 응답 dict (response, done_reason, eval 카운터)
+- astream(payload, timeout): status_code, request, aread(), aiter_lines()(NDJSON 줄)를 가진 응답을 제공하는 비동기 컨텍스트
+- aclose() / close(): 연결 정리
+
+지원 백엔드:
+- ollama: Ollama HTTP API (기본값)
+- openai: llama.cpp server, vLLM 등 OpenAI 호환 /v1/completions 서버
+- stub: 기록된 응답을 재생하는 프로세스 내 스텁 (모델 없이 부하 테스트/벤치마크)
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+from ..config_loader import load_config
+from .ollama_client import OllamaClient
+from .openai_client import OpenAICompatibleClient
+from .stub_client import StubClient
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+OLLAMA_BACKEND = "ollama"
+OPENAI_BACKEND = "openai"
+STUB_BACKEND = "stub"
+BACKENDS = (OLLAMA_BACKEND, OPENAI_BACKEND, STUB_BACKEND)
+
+
+def get_backend_config() -> Dict[str, Any]:
+    """
+    config.json의 llm 섹션에서 백엔드 이름과 백엔드별 옵션을 읽음
+
+    Returns:
+        {'backend': 이름, 'options': llm.<backend> 섹션 (없으면 빈 dict)}
+    """
+    config = load_config() or {}
+    llm_config = config.get('llm', {})
+    backend = llm_config.get('backend', OLLAMA_BACKEND)
+    return {'backend': backend, 'options': llm_config.get(backend, {})}
+
+
+def create_client(backend: str,
+                  url: str,
+                  client_options: Optional[Dict[str, Any]] = None,
+                  backend_options: Optional[Dict[str, Any]] = None,
+                  transport=None):
+    """
+    백엔드 이름에 맞는 엔드포인트 클라이언트 생성
+
+    Args:
+        backend: 백엔드 이름 (ollama, openai, stub)
+        url: 엔드포인트 주소 (stub은 지표 표시용 이름)
+        client_options: HTTP 연결 풀 옵션 (stub은 사용하지 않음)
+        backend_options: llm.<backend> 설정 (openai: api_key / stub: recordings, latency, tokens_per_second 등)
+        transport: 테스트용 httpx transport
+
+    Returns:
+        백엔드 클라이언트
+
+    Raises:
+        ValueError: 지원하지 않는 백엔드인 경우
+    """
+    client_options = client_options or {}
+    backend_options = backend_options or {}
+    if backend == OLLAMA_BACKEND:
+        return OllamaClient(base_url=url, transport=transport, **client_options)
+    if backend == OPENAI_BACKEND:
+        return OpenAICompatibleClient(base_url=url, api_key=backend_options.get('api_key'),
+                                      transport=transport, **client_options)
+    if backend == STUB_BACKEND:
+        return StubClient(base_url=url, **backend_options)
+    raise ValueError(f"지원하지 않는 LLM 백엔드입니다: {backend} (사용 가능: {', '.join(BACKENDS)})")
@@ -0,0 +1,394 @@
+"""
+LLM 호출 정책 (적응형 타임아웃, 재시도, 헤지)
+요청 유형(모델, 출력 모드, 출력 상한)별 최근 (프롬프트 크기, 응답 시간) 기록으로 예상 지연을 학습해
+요청마다 마감 시간을 정하고,
+일시적인 오류(연결 오류, 타임아웃, 5xx)는 지터가 있는 지수 백오프로 다른 엔드포인트에 재시도합니다.
+헤지를 켜면 p95 예상 지연을 넘긴 요청을 다른 엔드포인트에 한 번 더 보내고 먼저 끝난 응답을 사용합니다.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Deque, Set, Tuple
+
+import httpx
+
+from ..config_loader import load_config
+from .endpoint_pool import is_endpoint_failure
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_HISTORY_SIZE = 100
+DEFAULT_MIN_SAMPLES = 10
+DEFAULT_TIMEOUT_FACTOR = 2.0
+DEFAULT_MIN_TIMEOUT = 60.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_MAX = 15.0
+DEFAULT_HEDGE_MIN_DELAY = 5.0
+LATENCY_PERCENTILE = 0.95
+MIN_PREDICTED_SECONDS = 0.1
+
+# (마감 시간(초), 피해야 할 엔드포인트 주소 집합) -> Ollama 응답
+SendFunction = Callable[[float, Set[str]], Dict[str, Any]]
+AsyncSendFunction = Callable[[float, Set[str]], Awaitable[Dict[str, Any]]]
+
+
+def is_retryable(error: BaseException) -> bool:
+    """재시도할 가치가 있는 일시적 오류인지 판단 (래핑된 원인 예외도 확인)"""
+    while error is not None:
+        if is_endpoint_failure(error):
+            return True
+        error = error.__cause__
+    return False
+
+
+def latency_key(payload: Dict[str, Any]) -> str:
+    """
+    지연 기록 키 (모델, 출력 모드, think 여부, 출력 상한, 스트리밍 여부)
+
+    빠른 모드나 분할 생성의 짧은 호출 기록이 일반 생성의 마감 시간을 줄이지 않도록 요청 유형별로 따로 학습합니다.
+    스트리밍 요청은 첫 토큰까지의 시간을 기록하므로 일괄 응답과도 분리합니다.
+
+    Args:
+        payload: Ollama /api/generate 요청 본문
+
+    Returns:
+        '모델|모드|think=...|num_predict=...[|stream]' 형식의 키
+    """
+    format_value = payload.get('format')
+    mode = 'schema' if isinstance(format_value, dict) else (format_value or 'text')
+    num_predict = (payload.get('options') or {}).get('num_predict')
+    parts = [payload['model'], mode, f"think={payload.get('think')}", f"num_predict={num_predict}"]
+    if payload.get('stream'):
+        parts.append('stream')
+    return '|'.join(parts)
+
+
+def _is_timeout(error: BaseException) -> bool:
+    while error is not None:
+        if isinstance(error, httpx.TimeoutException):
+            return True
+        error = error.__cause__
+    return False
+
+
+class LatencyModel:
+    """요청 유형(latency_key)별 프롬프트 크기 대비 응답 시간 학습기 (최소제곱 직선 + p95 오차 비율)"""
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE, min_samples: int = DEFAULT_MIN_SAMPLES):
+        """
+        Args:
+            history_size: 기록 키별로 유지할 최근 기록 수
+            min_samples: 예측에 필요한 최소 기록 수 (미만이면 예측하지 않음)
+        """
+        self.history_size = history_size
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[Tuple[int, float]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, prompt_chars: int, seconds: float):
+        """성공한 호출의 (프롬프트 크기, 응답 시간) 기록"""
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.history_size))
+            samples.append((prompt_chars, seconds))
+
+    @staticmethod
+    def _fit(samples: List[Tuple[int, float]]) -> Tuple[float, float]:
+        count = len(samples)
+        mean_x = sum(x for x, _ in samples) / count
+        mean_y = sum(y for _, y in samples) / count
+        variance = sum((x - mean_x) ** 2 for x, _ in samples)
+        if variance == 0:
+            return mean_y, 0.0
+        slope = max(0.0, sum((x - mean_x) * (y - mean_y) for x, y in samples) / variance)
+        return mean_y - slope * mean_x, slope
+
+    @staticmethod
+    def _predict(fit: Tuple[float, float], prompt_chars: int) -> float:
+        intercept, slope = fit
+        return max(MIN_PREDICTED_SECONDS, intercept + slope * prompt_chars)
+
+    def estimate(self, key: str, prompt_chars: int) -> Optional[Tuple[float, float]]:
+        """
+        예상 응답 시간 계산
+
+        Args:
+            key: 기록 키 (latency_key() 결과 또는 모델명)
+            prompt_chars: 프롬프트 크기 (문자 수)
+
+        Returns:
+            (예상 시간, p95 예상 시간) 또는 기록이 부족하면 None
+        """
+        with self._lock:
+            samples = list(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+
+        fit = self._fit(samples)
+        ratios = sorted(y / self._predict(fit, x) for x, y in samples)
+        p95_ratio = max(1.0, ratios[math.ceil(LATENCY_PERCENTILE * len(ratios)) - 1])
+        expected = self._predict(fit, prompt_chars)
+        return expected, expected * p95_ratio
+
+    def get_stats(self) -> Dict[str, Any]:
+        """기록 키별 기록 수와 학습된 직선(초 = 절편 + 기울기 × 1000자) 반환"""
+        with self._lock:
+            recorded = {key: list(samples) for key, samples in self._samples.items()}
+        stats = {}
+        for key, samples in recorded.items():
+            intercept, slope = self._fit(samples)
+            stats[key] = {
+                'samples': len(samples),
+                'intercept_seconds': round(intercept, 2),
+                'seconds_per_kchar': round(slope * 1000, 3)
+            }
+        return stats
+
+
+class CallPolicy:
+    """Ollama 호출의 마감 시간, 재시도, 헤지 정책"""
+
+    def __init__(self,
+                 latency_model: Optional[LatencyModel] = None,
+                 adaptive_timeout: bool = True,
+                 timeout_factor: float = DEFAULT_TIMEOUT_FACTOR,
+                 min_timeout: float = DEFAULT_MIN_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 hedge: bool = False,
+                 hedge_min_delay: float = DEFAULT_HEDGE_MIN_DELAY):
+        """
+        호출 정책 초기화
+
+        Args:
+            latency_model: 지연 학습기 (None이면 새로 생성)
+            adaptive_timeout: 학습된 p95 지연으로 마감 시간을 정할지 여부
+            timeout_factor: p95 예상 시간에 곱할 여유 배수
+            min_timeout: 적응형 마감 시간의 하한 (초)
+            max_retries: 일시적 오류 재시도 횟수
+            backoff_base: 첫 재시도 대기 시간 상한 (초, 재시도마다 두 배)
+            backoff_max: 재시도 대기 시간 최대값 (초)
+            hedge: p95 예상 시간을 넘기면 다른 엔드포인트로 중복 요청을 보낼지 여부
+            hedge_min_delay: 헤지 요청을 보내기 전 최소 대기 시간 (초)
+        """
+        self.latency_model = latency_model or LatencyModel()
+        self.adaptive_timeout = adaptive_timeout
+        self.timeout_factor = timeout_factor
+        self.min_timeout = min_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self._stats = {
+            'calls': 0,
+            'retries': 0,
+            'timeouts': 0,
+            'failures': 0,
+            'hedged': 0,
+            'hedge_wins': 0
+        }
+
+    def timeout_for(self, key: str, prompt_chars: int, default_timeout: float) -> float:
+        """
+        요청별 마감 시간 계산
+
+        기록이 충분하면 p95 예상 시간 × timeout_factor를 [min_timeout, default_timeout] 범위로 사용하고,
+        부족하면 설정된 기본 타임아웃을 그대로 사용합니다.
+        """
+        if not self.adaptive_timeout:
+            return default_timeout
+        estimate = self.latency_model.estimate(key, prompt_chars)
+        if estimate is None:
+            return default_timeout
+        return min(default_timeout, max(self.min_timeout, estimate[1] * self.timeout_factor))
+
+    def hedge_delay(self, key: str, prompt_chars: int) -> Optional[float]:
+        """헤지 요청을 보내기까지 기다릴 시간 (p95 예상 시간). 헤지를 하지 않으면 None"""
+        if not self.hedge:
+            return None
+        estimate = self.latency_model.estimate(key, prompt_chars)
+        if estimate is None:
+            return None
+        return max(self.hedge_min_delay, estimate[1])
+
+    def backoff(self, attempt: int) -> float:
+        """지수 백오프 + full jitter 대기 시간"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """attempt번째(0부터) 시도의 오류를 재시도할지 판단"""
+        return attempt < self.max_retries and is_retryable(error)
+
+    def prepare_retry(self, error: BaseException, attempt: int, timeout: float,
+                      default_timeout: float) -> Tuple[float, float]:
+        """
+        재시도 준비: 다음 마감 시간과 대기 시간 계산
+
+        마감 시간 초과였다면 예측이 짧았던 것이므로 다음 시도의 마감 시간을 두 배로 늘립니다.
+
+        Returns:
+            (다음 마감 시간, 재시도 전 대기 시간)
+        """
+        if _is_timeout(error):
+            self._stats['timeouts'] += 1
+            timeout = min(default_timeout, timeout * 2)
+        delay = self.backoff(attempt)
+        self._stats['retries'] += 1
+        logger.warning(f"LLM 호출 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {error}")
+        return timeout, delay
+
+    def record(self, key: str, prompt_chars: int, seconds: float):
+        """성공한 호출의 응답 시간 기록"""
+        self._stats['calls'] += 1
+        self.latency_model.record(key, prompt_chars, seconds)
+
+    def record_failure(self):
+        """재시도 후에도 실패한 호출 집계"""
+        self._stats['calls'] += 1
+        self._stats['failures'] += 1
+
+    def call(self, key: str, prompt_chars: int, default_timeout: float, send: SendFunction) -> Dict[str, Any]:
+        """
+        동기 호출에 재시도 정책 적용
+
+        Args:
+            key: 지연 기록 키 (latency_key() 결과)
+            prompt_chars: 프롬프트 크기
+            default_timeout: 설정된 타임아웃 (적응형 마감 시간의 상한)
+            send: (마감 시간, 피할 엔드포인트 집합)을 받아 요청을 보내는 함수
+
+        Returns:
+            Ollama 응답
+
+        Raises:
+            재시도 후에도 실패하면 마지막 오류
+        """
+        timeout = self.timeout_for(key, prompt_chars, default_timeout)
+        tried: Set[str] = set()
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = send(timeout, tried)
+            except Exception as e:
+                if not self.should_retry(e, attempt):
+                    self.record_failure()
+                    raise
+                timeout, delay = self.prepare_retry(e, attempt, timeout, default_timeout)
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self.record(key, prompt_chars, time.monotonic() - started)
+            return response
+
+    async def _send_with_hedge(self, send: AsyncSendFunction, timeout: float, tried: Set[str],
+                               hedge_delay: Optional[float]) -> Dict[str, Any]:
+        primary = asyncio.ensure_future(send(timeout, tried))
+        if hedge_delay is None:
+            return await primary
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+
+            self._stats['hedged'] += 1
+            logger.info(f"LLM 응답이 p95 예상 시간({hedge_delay:.1f}초)을 넘어 다른 엔드포인트로 헤지 요청을 보냅니다.")
+            hedge = asyncio.ensure_future(send(timeout, tried))
+            pending = {primary, hedge}
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._stats['hedge_wins'] += 1
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def acall(self, key: str, prompt_chars: int, default_timeout: float, send: AsyncSendFunction,
+                    can_hedge: bool = False) -> Dict[str, Any]:
+        """
+        비동기 호출에 재시도/헤지 정책 적용
+
+        Args:
+            key: 지연 기록 키 (latency_key() 결과)
+            prompt_chars: 프롬프트 크기
+            default_timeout: 설정된 타임아웃 (적응형 마감 시간의 상한)
+            send: (마감 시간, 피할 엔드포인트 집합)을 받아 요청을 보내는 코루틴 함수
+            can_hedge: 헤지할 다른 엔드포인트가 있는지 여부
+
+        Returns:
+            Ollama 응답
+
+        Raises:
+            재시도 후에도 실패하면 마지막 오류
+        """
+        timeout = self.timeout_for(key, prompt_chars, default_timeout)
+        hedge_delay = self.hedge_delay(key, prompt_chars) if can_hedge else None
+        tried: Set[str] = set()
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = await self._send_with_hedge(send, timeout, tried, hedge_delay)
+            except Exception as e:
+                if not self.should_retry(e, attempt):
+                    self.record_failure()
+                    raise
+                timeout, delay = self.prepare_retry(e, attempt, timeout, default_timeout)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self.record(key, prompt_chars, time.monotonic() - started)
+            return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """정책 설정, 재시도/헤지 통계, 기록 키별 지연 학습 상태 반환"""
+        return {
+            'adaptive_timeout': self.adaptive_timeout,
+            'max_retries': self.max_retries,
+            'hedge': self.hedge,
+            **self._stats,
+            'models': self.latency_model.get_stats()
+        }
+
+
+# 전역 인스턴스 (지연 로딩)
+_call_policy: Optional[CallPolicy] = None
+
+
+def get_call_policy() -> CallPolicy:
+    """설정(config.json의 llm.policy)을 반영한 호출 정책 싱글톤 반환"""
+    global _call_policy
+    if _call_policy is None:
+        config = load_config() or {}
+        policy_config = config.get('llm', {}).get('policy', {})
+        _call_policy = CallPolicy(
+            latency_model=LatencyModel(
+                history_size=policy_config.get('history_size', DEFAULT_HISTORY_SIZE),
+                min_samples=policy_config.get('min_samples', DEFAULT_MIN_SAMPLES)
+            ),
+            adaptive_timeout=policy_config.get('adaptive_timeout', True),
+            timeout_factor=policy_config.get('timeout_factor', DEFAULT_TIMEOUT_FACTOR),
+            min_timeout=policy_config.get('min_timeout', DEFAULT_MIN_TIMEOUT),
+            max_retries=policy_config.get('max_retries', DEFAULT_MAX_RETRIES),
+            backoff_base=policy_config.get('backoff_base', DEFAULT_BACKOFF_BASE),
+            backoff_max=policy_config.get('backoff_max', DEFAULT_BACKOFF_MAX),
+            hedge=policy_config.get('hedge', False),
+            hedge_min_delay=policy_config.get('hedge_min_delay', DEFAULT_HEDGE_MIN_DELAY)
+        )
+    return _call_policy
@@ -0,0 +1,251 @@
+"""
+LLM 백엔드 서킷 브레이커
+Ollama 호출이 연속으로 실패하면 회로를 열어(open) 이후 요청을 타임아웃까지 기다리지 않고 즉시 실패시키고,
+백그라운드 점검(probe)이 성공하면 다시 닫습니다(closed).
+점검 없이 open_seconds가 지나면 반열림(half-open) 상태로 바뀌어 요청 하나를 시험 삼아 통과시킵니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from ..config_loader import load_config
+from .call_policy import is_retryable
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_PROBE_INTERVAL = 10.0
+
+# 백엔드 점검 함수: 정상이면 True
+ProbeFunction = Callable[[], Awaitable[bool]]
+
+
+class CircuitState(str, Enum):
+    """서킷 브레이커 상태"""
+    CLOSED = "closed"         # 정상: 모든 요청 통과
+    OPEN = "open"             # 차단: 요청 즉시 실패
+    HALF_OPEN = "half_open"   # 시험: 요청 하나만 통과시켜 복구 여부 확인
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 LLM 호출을 시도하지 않고 실패한 경우"""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"LLM 서버가 응답하지 않아 호출을 중단했습니다. 약 {retry_after:.0f}초 후 다시 시도해주세요.")
+
+
+class CircuitBreaker:
+    """closed / open / half-open 상태를 갖는 LLM 백엔드 서킷 브레이커"""
+
+    def __init__(self,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 open_seconds: float = DEFAULT_OPEN_SECONDS,
+                 probe_interval: float = DEFAULT_PROBE_INTERVAL,
+                 probe: Optional[ProbeFunction] = None,
+                 enabled: bool = True):
+        """
+        서킷 브레이커 초기화
+
+        Args:
+            failure_threshold: 회로를 여는 연속 실패 횟수
+            open_seconds: 점검 성공이 없을 때 반열림으로 전환하기까지의 시간 (초)
+            probe_interval: 회로가 열려 있는 동안 백엔드를 점검하는 주기 (초)
+            probe: 백엔드 점검 함수 (None이면 시간 경과에 따른 반열림 전환만 사용)
+            enabled: 사용 여부
+        """
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.probe_interval = probe_interval
+        self.probe = probe
+        self.enabled = enabled
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial_in_flight = False
+        self._probe_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'opened': 0,
+            'rejected': 0,
+            'probes': 0
+        }
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """다음 시험 요청이 허용될 때까지 남은 시간 (초)"""
+        if self.state == CircuitState.CLOSED or self.opened_at is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        remaining = self.opened_at + self.open_seconds - now
+        return max(0.0, min(remaining, self.probe_interval) if self.probe else remaining)
+
+    def _refresh(self, now: float):
+        """open_seconds가 지난 열린 회로를 반열림으로 전환 (락 보유 상태에서 호출)"""
+        if self.state == CircuitState.OPEN and now - self.opened_at >= self.open_seconds:
+            self.state = CircuitState.HALF_OPEN
+            logger.info("LLM 서킷 브레이커 반열림: 다음 요청으로 복구 여부를 확인합니다.")
+
+    def check(self):
+        """
+        호출 가능 여부 확인 (대기열에 들어가기 전 빠른 실패용, 시험 요청 자리를 차지하지 않음)
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 다른 시험 요청이 진행 중인 경우
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self.state == CircuitState.OPEN or (self.state == CircuitState.HALF_OPEN and self._trial_in_flight):
+                self._stats['rejected'] += 1
+                raise CircuitOpenError(self.retry_after(now))
+
+    def _acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            if self.state == CircuitState.CLOSED:
+                return
+            if self.state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self._stats['rejected'] += 1
+            raise CircuitOpenError(self.retry_after(now))
+
+    def record_success(self):
+        """백엔드가 응답한 호출 기록. 반열림 상태였다면 회로를 닫음"""
+        with self._lock:
+            self._trial_in_flight = False
+            self.consecutive_failures = 0
+            if self.state != CircuitState.CLOSED:
+                logger.info("LLM 서킷 브레이커 닫힘: 백엔드가 복구되었습니다.")
+            self.state = CircuitState.CLOSED
+            self.opened_at = None
+
+    def record_failure(self, error: BaseException):
+        """백엔드 장애로 실패한 호출 기록. 임계값에 도달하거나 시험 요청이 실패하면 회로를 엶"""
+        with self._lock:
+            self._trial_in_flight = False
+            self.consecutive_failures += 1
+            self.last_error = str(error) or error.__class__.__name__
+            if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        """회로 열기 (락 보유 상태에서 호출)"""
+        if self.state != CircuitState.OPEN:
+            self._stats['opened'] += 1
+            logger.warning(f"LLM 서킷 브레이커 열림: 연속 실패 {self.consecutive_failures}회 (사유: {self.last_error})")
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+        self._start_probe()
+
+    def _start_probe(self):
+        if self.probe is None or (self._probe_task is not None and not self._probe_task.done()):
+            return
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+        except RuntimeError:
+            # 이벤트 루프 밖(동기 호출)에서는 시간 경과에 따른 반열림 전환만 사용
+            self._probe_task = None
+
+    async def _probe_loop(self):
+        while self.state != CircuitState.CLOSED:
+            await asyncio.sleep(self.probe_interval)
+            if self.state == CircuitState.CLOSED:
+                return
+            self._stats['probes'] += 1
+            try:
+                healthy = await self.probe()
+            except Exception as e:
+                logger.debug(f"LLM 백엔드 점검 실패: {e}")
+                healthy = False
+            if healthy:
+                self.record_success()
+                return
+
+    @contextmanager
+    def guard(self):
+        """
+        LLM 호출을 감싸 결과를 상태에 반영하는 컨텍스트 매니저
+
+        연결 오류/타임아웃/5xx만 실패로 집계하고, 그 밖의 오류는 백엔드가 응답한 것으로 봅니다.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있어 호출하지 않은 경우
+        """
+        if not self.enabled:
+            yield
+            return
+        self._acquire()
+        try:
+            yield
+        except Exception as e:
+            if is_retryable(e):
+                self.record_failure(e)
+            else:
+                self.record_success()
+            raise
+        except BaseException:
+            # 취소 등은 판단 근거가 없으므로 시험 자리만 반납
+            with self._lock:
+                self._trial_in_flight = False
+            raise
+        else:
+            self.record_success()
+
+    async def stop(self):
+        """백그라운드 점검 작업 중지"""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._probe_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """현재 상태와 차단/점검 통계 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh(now)
+            return {
+                'enabled': self.enabled,
+                'state': self.state.value,
+                'consecutive_failures': self.consecutive_failures,
+                'retry_after': round(self.retry_after(now), 1),
+                'last_error': self.last_error,
+                **self._stats
+            }
+
+
+# 전역 인스턴스 (지연 로딩)
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """설정(config.json의 llm.circuit_breaker)을 반영한 서킷 브레이커 싱글톤 반환"""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        from .warmup import get_model_warmer
+
+        config = load_config() or {}
+        breaker_config = config.get('llm', {}).get('circuit_breaker', {})
+        _circuit_breaker = CircuitBreaker(
+            failure_threshold=breaker_config.get('failure_threshold', DEFAULT_FAILURE_THRESHOLD),
+            open_seconds=breaker_config.get('open_seconds', DEFAULT_OPEN_SECONDS),
+            probe_interval=breaker_config.get('probe_interval', DEFAULT_PROBE_INTERVAL),
+            # 예열과 같은 짧은 생성 요청으로 모델까지 실제로 응답하는지 확인
+            probe=lambda: get_model_warmer().warm_up(),
+            enabled=breaker_config.get('enabled', True)
+        )
+    return _circuit_breaker
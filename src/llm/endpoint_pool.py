@@ -0,0 +1,296 @@
+"""
+다중 Ollama 엔드포인트 풀
+진행 중 요청 수와 최근 지연 시간을 기준으로 요청을 분배하고,
+오류가 반복되는 엔드포인트는 수동(passive) 헬스 체크로 일시 제외한 뒤 자동으로 재투입합니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Set
+
+import httpx
+
+from ..config_loader import load_config
+from .backends import create_client, get_backend_config, OLLAMA_BACKEND
+from .ollama_client import (
+    OllamaClient,
+    DEFAULT_BASE_URL,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_CONNECT_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_EJECTION_SECONDS = 30.0
+MAX_EJECTION_SECONDS = 600.0
+LATENCY_EWMA_ALPHA = 0.3
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """엔드포인트 상태 이상으로 볼 수 있는 오류인지 판단 (연결/타임아웃 오류, 5xx 응답)"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return False
+
+
+class OllamaEndpoint:
+    """단일 Ollama 엔드포인트의 상태와 지표"""
+
+    def __init__(self, url: str, client: OllamaClient):
+        self.url = url
+        self.client = client
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.total_requests = 0
+        self.total_failures = 0
+        self.total_cancelled = 0
+        self.consecutive_failures = 0
+        self.ejection_count = 0
+        self.ejected_until = 0.0
+        self.last_error: Optional[str] = None
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def get_metrics(self, now: float) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'healthy': not self.is_ejected(now),
+            'in_flight': self.in_flight,
+            'latency_ewma': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            'total_requests': self.total_requests,
+            'total_failures': self.total_failures,
+            'total_cancelled': self.total_cancelled,
+            'consecutive_failures': self.consecutive_failures,
+            'ejection_count': self.ejection_count,
+            'ejected_for': round(max(0.0, self.ejected_until - now), 1),
+            'last_error': self.last_error
+        }
+
+
+# 요청을 보내기 직전에 선택된 엔드포인트로 호출되는 콜백
+AcquireCallback = Callable[[OllamaEndpoint], None]
+
+
+class EndpointPool:
+    """최소 부하/최저 지연 엔드포인트로 요청을 보내는 Ollama 클라이언트 풀"""
+
+    def __init__(self,
+                 urls: List[str],
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 ejection_seconds: float = DEFAULT_EJECTION_SECONDS,
+                 client_options: Optional[Dict[str, Any]] = None,
+                 transport=None,
+                 backend: str = OLLAMA_BACKEND,
+                 backend_options: Optional[Dict[str, Any]] = None):
+        """
+        엔드포인트 풀 초기화
+
+        Args:
+            urls: Ollama 서버 주소 목록
+            failure_threshold: 연속 실패가 이 횟수에 도달하면 제외
+            ejection_seconds: 첫 제외 시간 (반복 제외 시 두 배씩 증가)
+            client_options: 엔드포인트별 OllamaClient 연결 풀 옵션
+            transport: 테스트용 httpx transport
+            backend: LLM 백엔드 (ollama, openai, stub - src/llm/backends.py 참고)
+            backend_options: 백엔드별 옵션 (llm.<backend> 설정)
+        """
+        if not urls:
+            raise ValueError("최소 한 개 이상의 Ollama 엔드포인트가 필요합니다.")
+        client_options = client_options or {}
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self.backend = backend
+        self.endpoints = [
+            OllamaEndpoint(url.rstrip('/'), create_client(backend, url, client_options, backend_options, transport))
+            for url in urls
+        ]
+        self._lock = threading.Lock()
+
+    def _choose(self, now: float, avoid_urls: Optional[Set[str]] = None) -> OllamaEndpoint:
+        """엔드포인트 선택 로직 (락 보유 상태에서 호출)"""
+        candidates = [ep for ep in self.endpoints if not ep.is_ejected(now)]
+        if avoid_urls:
+            # 재시도/헤지 요청은 이미 시도한 엔드포인트를 피하되, 다른 후보가 없으면 그대로 사용
+            candidates = [ep for ep in candidates if ep.url not in avoid_urls] or candidates
+        if not candidates:
+            return min(self.endpoints, key=lambda ep: ep.ejected_until)
+        # 지연 기록이 없는 엔드포인트는 0으로 간주해 먼저 시험해봄
+        return min(candidates, key=lambda ep: (ep.in_flight, ep.latency_ewma or 0.0))
+
+    def select(self) -> OllamaEndpoint:
+        """
+        요청을 보낼 엔드포인트 선택
+
+        정상 엔드포인트 중 진행 중 요청이 가장 적고, 같다면 최근 지연이 가장 짧은 것을 고릅니다.
+        제외 기간이 끝난 엔드포인트는 자동으로 후보에 다시 포함되며,
+        모두 제외된 경우에는 가장 먼저 제외가 끝나는 엔드포인트를 사용합니다.
+        """
+        with self._lock:
+            return self._choose(time.monotonic())
+
+    def _acquire(self, avoid_urls: Optional[Set[str]] = None,
+                 on_acquire: Optional[AcquireCallback] = None) -> OllamaEndpoint:
+        """
+        엔드포인트를 선택하고 진행 중 요청 수를 원자적으로 증가
+
+        avoid_urls가 주어지면 그 밖의 엔드포인트를 우선 선택하고, 선택한 주소를 집합에 추가합니다.
+        on_acquire가 주어지면 요청을 보내기 전에 선택한 엔드포인트로 호출합니다.
+        """
+        with self._lock:
+            endpoint = self._choose(time.monotonic(), avoid_urls)
+            endpoint.in_flight += 1
+            endpoint.total_requests += 1
+            if avoid_urls is not None:
+                avoid_urls.add(endpoint.url)
+        if on_acquire is not None:
+            on_acquire(endpoint)
+        return endpoint
+
+    def _finish(self, endpoint: OllamaEndpoint, started: float, error: Optional[BaseException]):
+        """
+        요청 종료 처리. 엔드포인트 장애로 볼 수 없는 오류(4xx, 취소 등)는 상태에 반영하지 않습니다.
+        """
+        elapsed = time.monotonic() - started
+        with self._lock:
+            endpoint.in_flight -= 1
+            if isinstance(error, asyncio.CancelledError):
+                # 클라이언트 연결 종료 등으로 중단된 요청 (연결을 닫아 Ollama 쪽 생성도 멈춤)
+                endpoint.total_cancelled += 1
+            if error is not None:
+                if is_endpoint_failure(error):
+                    endpoint.total_failures += 1
+                    endpoint.consecutive_failures += 1
+                    endpoint.last_error = str(error) or error.__class__.__name__
+                    if endpoint.consecutive_failures >= self.failure_threshold:
+                        self._eject(endpoint)
+                return
+
+            if endpoint.ejection_count:
+                logger.info(f"Ollama 엔드포인트 정상 복귀: {endpoint.url}")
+            endpoint.consecutive_failures = 0
+            endpoint.ejection_count = 0
+            if endpoint.latency_ewma is None:
+                endpoint.latency_ewma = elapsed
+            else:
+                endpoint.latency_ewma = LATENCY_EWMA_ALPHA * elapsed + (1 - LATENCY_EWMA_ALPHA) * endpoint.latency_ewma
+
+    def _eject(self, endpoint: OllamaEndpoint):
+        """엔드포인트 일시 제외 (락 보유 상태에서 호출)"""
+        endpoint.ejection_count += 1
+        duration = min(self.ejection_seconds * (2 ** (endpoint.ejection_count - 1)), MAX_EJECTION_SECONDS)
+        endpoint.ejected_until = time.monotonic() + duration
+        endpoint.consecutive_failures = 0
+        logger.warning(f"Ollama 엔드포인트 제외: {endpoint.url} ({duration:.0f}초, 사유: {endpoint.last_error})")
+
+    @contextmanager
+    def _track(self, avoid_urls: Optional[Set[str]] = None, on_acquire: Optional[AcquireCallback] = None):
+        endpoint = self._acquire(avoid_urls, on_acquire)
+        started = time.monotonic()
+        try:
+            yield endpoint
+        except BaseException as e:
+            self._finish(endpoint, started, e)
+            raise
+        else:
+            self._finish(endpoint, started, None)
+
+    def generate(self, payload: Dict[str, Any], timeout: float,
+                 avoid_urls: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """/api/generate 동기 호출"""
+        with self._track(avoid_urls) as endpoint:
+            return endpoint.client.generate(payload, timeout)
+
+    async def agenerate(self, payload: Dict[str, Any], timeout: float,
+                        avoid_urls: Optional[Set[str]] = None,
+                        on_acquire: Optional[AcquireCallback] = None) -> Dict[str, Any]:
+        """/api/generate 비동기 호출"""
+        with self._track(avoid_urls, on_acquire) as endpoint:
+            return await endpoint.client.agenerate(payload, timeout)
+
+    @asynccontextmanager
+    async def astream(self, payload: Dict[str, Any], timeout: float,
+                      avoid_urls: Optional[Set[str]] = None,
+                      on_acquire: Optional[AcquireCallback] = None) -> AsyncIterator[httpx.Response]:
+        """/api/generate 스트리밍 호출. 5xx 응답도 엔드포인트 실패로 집계합니다."""
+        endpoint = self._acquire(avoid_urls, on_acquire)
+        started = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            async with endpoint.client.astream(payload, timeout) as response:
+                if response.status_code >= 500:
+                    error = httpx.HTTPStatusError(
+                        f"Ollama returned HTTP {response.status_code}",
+                        request=response.request,
+                        response=response
+                    )
+                yield response
+        except BaseException as e:
+            error = error or e
+            raise
+        finally:
+            self._finish(endpoint, started, error)
+
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        """엔드포인트별 지표 반환"""
+        now = time.monotonic()
+        with self._lock:
+            return [endpoint.get_metrics(now) for endpoint in self.endpoints]
+
+    async def aclose(self):
+        """모든 엔드포인트의 연결 풀 정리"""
+        for endpoint in self.endpoints:
+            await endpoint.client.aclose()
+
+
+# 전역 인스턴스 (지연 로딩)
+_endpoint_pool: Optional[EndpointPool] = None
+
+
+def get_endpoint_urls(llm_config: Dict[str, Any]) -> List[str]:
+    """llm.endpoints 목록을 우선 사용하고, 없으면 llm.base_url 단일 엔드포인트를 사용"""
+    urls = llm_config.get('endpoints') or [llm_config.get('base_url', DEFAULT_BASE_URL)]
+    return [url for url in urls if url]
+
+
+def get_endpoint_pool() -> EndpointPool:
+    """설정(config.json의 llm 섹션)을 반영한 엔드포인트 풀 싱글톤 반환"""
+    global _endpoint_pool
+    if _endpoint_pool is None:
+        config = load_config() or {}
+        llm_config = config.get('llm', {})
+        pool_config = llm_config.get('pool', {})
+        health_config = llm_config.get('health', {})
+        backend_config = get_backend_config()
+        _endpoint_pool = EndpointPool(
+            get_endpoint_urls(llm_config),
+            failure_threshold=health_config.get('failure_threshold', DEFAULT_FAILURE_THRESHOLD),
+            ejection_seconds=health_config.get('ejection_seconds', DEFAULT_EJECTION_SECONDS),
+            client_options={
+                'max_connections': pool_config.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+                'max_keepalive_connections': pool_config.get('max_keepalive_connections', DEFAULT_MAX_KEEPALIVE_CONNECTIONS),
+                'keepalive_expiry': pool_config.get('keepalive_expiry', DEFAULT_KEEPALIVE_EXPIRY),
+                'connect_timeout': pool_config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT)
+            },
+            backend=backend_config['backend'],
+            backend_options=backend_config['options']
+        )
+        logger.info(f"LLM 엔드포인트 풀 초기화 ({_endpoint_pool.backend}): {[ep.url for ep in _endpoint_pool.endpoints]}")
+    return _endpoint_pool
+
+
+async def close_endpoint_pool():
+    """애플리케이션 종료 시 연결 풀 정리"""
+    global _endpoint_pool
+    if _endpoint_pool is not None:
+        await _endpoint_pool.aclose()
+        _endpoint_pool = None
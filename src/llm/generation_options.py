@@ -0,0 +1,90 @@
+"""
+LLM 생성 옵션
+config.json의 llm.generation 설정과 요청별 값을 합쳐 Ollama options(num_predict, stop 등)를 만듭니다.
+"""
+
+import logging
+from typing import Dict, Any, Optional
+
+from ..config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+JSON_STOP_SEQUENCE = "</json>"
+DEFAULT_MIN_PREDICT = 1024
+DEFAULT_MAX_PREDICT = 6144
+DEFAULT_TOKENS_PER_KCHAR = 200
+DEFAULT_THINKING_TOKENS = 768
+
+
+def get_generation_config() -> Dict[str, Any]:
+    """config.json의 llm.generation 섹션 반환 (없으면 빈 dict)"""
+    config = load_config() or {}
+    return config.get('llm', {}).get('generation', {})
+
+
+def estimate_num_predict(git_analysis: str,
+                         fast_mode: bool = False,
+                         generation_config: Optional[Dict[str, Any]] = None) -> int:
+    """
+    변경 내역 크기에 비례하는 출력 토큰 상한 계산
+
+    Args:
+        git_analysis: Git 분석 결과 (프롬프트에 들어가는 변경 내역)
+        fast_mode: True면 <thinking> 구간 예산을 제외
+        generation_config: llm.generation 설정 (None이면 config.json에서 로드)
+
+    Returns:
+        num_predict 값
+    """
+    if generation_config is None:
+        generation_config = get_generation_config()
+    minimum = generation_config.get('num_predict_min', DEFAULT_MIN_PREDICT)
+    maximum = generation_config.get('num_predict_max', DEFAULT_MAX_PREDICT)
+    per_kchar = generation_config.get('tokens_per_kchar', DEFAULT_TOKENS_PER_KCHAR)
+
+    # 테스트 케이스 수는 변경 범위에 비례하므로 JSON 출력 예산도 diff 크기에 맞춰 늘림
+    json_budget = min(maximum, max(minimum, int(len(git_analysis or "") / 1000 * per_kchar)))
+    if fast_mode:
+        return json_budget
+    return json_budget + generation_config.get('thinking_tokens', DEFAULT_THINKING_TOKENS)
+
+
+def build_generation_options(git_analysis: str,
+                             fast_mode: Optional[bool] = None,
+                             num_predict: Optional[int] = None,
+                             structured_output: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    시나리오 생성 요청에 사용할 Ollama 생성 옵션 구성
+
+    Args:
+        git_analysis: Git 분석 결과
+        fast_mode: 생각 과정 없이 JSON만 생성하는 빠른 모드 (None이면 설정값)
+        num_predict: 요청에서 지정한 출력 토큰 상한 (None이면 diff 크기로 계산)
+        structured_output: JSON 스키마를 format으로 전달해 출력 형식을 강제 (None이면 설정값)
+
+    Returns:
+        {'options': Ollama options dict, 'think': bool 또는 None, 'fast_mode': bool, 'structured_output': bool}
+    """
+    generation_config = get_generation_config()
+    if fast_mode is None:
+        fast_mode = generation_config.get('fast_mode', False)
+    if structured_output is None:
+        structured_output = generation_config.get('structured_output', False)
+
+    options = dict(generation_config.get('options', {}))
+    # 구조화 출력은 <json> 태그 없이 순수 JSON만 생성하므로 stop 시퀀스를 쓰지 않음
+    if generation_config.get('stop_at_json_end', True) and not structured_output:
+        options['stop'] = list(dict.fromkeys(options.get('stop', []) + [JSON_STOP_SEQUENCE]))
+    options['num_predict'] = num_predict or estimate_num_predict(git_analysis, fast_mode, generation_config)
+
+    logger.info(f"LLM 생성 옵션: num_predict={options['num_predict']}, fast_mode={fast_mode}, "
+                f"structured_output={structured_output}")
+    return {
+        'options': options,
+        # 빠른 모드에서는 모델 자체의 추론(think) 단계도 끔
+        'think': False if fast_mode else None,
+        'fast_mode': fast_mode,
+        'structured_output': structured_output
+    }
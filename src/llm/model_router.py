@@ -0,0 +1,172 @@
+"""
+요청별 모델 선택 (routing)
+변경 내역 크기, LLM 대기열 길이, 목표 응답 시간(latency SLO)으로 요청마다 사용할 모델을 고릅니다.
+
+후보 모델은 작은(빠른) 모델부터 큰 모델 순서로 설정합니다.
+1. 변경 내역 토큰 수가 max_analysis_tokens 이내인 가장 작은 모델을 고릅니다. (작은 변경은 빠른 모델로)
+2. 대기열 예상 대기 시간 + 예상 생성 시간이 목표 응답 시간을 넘으면 더 작은 모델로 내려갑니다.
+   생성 시간은 모델별 최근 초당 토큰 수(p50, 처리량 지표)로 계산하고, 기록이 없으면 설정값을 사용합니다.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+
+from ..config_loader import load_config
+from .generation_options import estimate_num_predict, get_generation_config
+from .scheduler import get_llm_scheduler
+from .telemetry import get_llm_telemetry
+from .token_counter import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_MODEL = "qwen3:8b"
+DEFAULT_LATENCY_TARGET_SECONDS = 180.0
+# 처리량 지표를 신뢰하기 위한 최소 호출 기록 수
+MIN_TELEMETRY_CALLS = 3
+
+
+class ModelRouter:
+    """변경 내역 크기와 목표 응답 시간에 맞춰 요청별 모델을 고르는 라우터"""
+
+    def __init__(self,
+                 default_model: str = DEFAULT_MODEL,
+                 models: Optional[List[Dict[str, Any]]] = None,
+                 latency_target_seconds: float = DEFAULT_LATENCY_TARGET_SECONDS,
+                 enabled: bool = True):
+        """
+        Args:
+            default_model: 라우팅을 사용하지 않을 때의 모델 (config.json의 model_name)
+            models: 작은 모델부터 큰 모델 순서의 후보 목록.
+                    각 항목은 {'name', 'max_analysis_tokens'(없으면 제한 없음), 'tokens_per_second'(기록이 없을 때 사용)}
+            latency_target_seconds: 목표 응답 시간 (초)
+            enabled: 사용 여부
+        """
+        self.default_model = default_model
+        self.models = models or []
+        self.latency_target_seconds = latency_target_seconds
+        self.enabled = enabled and bool(self.models)
+
+    def _tokens_per_second(self, candidate: Dict[str, Any], telemetry: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        """후보 모델의 초당 생성/프롬프트 처리 토큰 수 (최근 기록 p50 > 설정값)"""
+        model_stats = telemetry.get('models', {}).get(candidate['name'], {})
+        if model_stats.get('calls', 0) >= MIN_TELEMETRY_CALLS:
+            generation = model_stats.get('tokens_per_second', {}).get('p50')
+            prompt = model_stats.get('prompt_tokens_per_second', {}).get('p50')
+        else:
+            generation, prompt = None, None
+        return {
+            'generation': generation or candidate.get('tokens_per_second'),
+            'prompt': prompt or candidate.get('prompt_tokens_per_second')
+        }
+
+    def estimate_seconds(self,
+                         candidate: Dict[str, Any],
+                         analysis_tokens: int,
+                         output_tokens: int,
+                         queue_seconds: float,
+                         telemetry: Dict[str, Any]) -> Optional[float]:
+        """
+        후보 모델의 예상 응답 시간
+
+        Returns:
+            대기열 대기 + 프롬프트 처리 + 출력 생성 예상 시간 (초). 초당 토큰 수를 모르면 None
+        """
+        rates = self._tokens_per_second(candidate, telemetry)
+        if not rates['generation']:
+            return None
+        seconds = queue_seconds + output_tokens / rates['generation']
+        if rates['prompt']:
+            seconds += analysis_tokens / rates['prompt']
+        return round(seconds, 1)
+
+    def route(self,
+              git_analysis: str,
+              fast_mode: Optional[bool] = None,
+              num_predict: Optional[int] = None,
+              default_model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        요청에 사용할 모델 선택
+
+        Args:
+            git_analysis: Git 분석 결과 (프롬프트에 들어가는 변경 내역)
+            fast_mode: 빠른 모드 여부 (예상 출력 토큰 수 계산용, None이면 설정값)
+            num_predict: 요청에서 지정한 출력 토큰 상한
+            default_model: 라우팅을 사용하지 않을 때의 모델 (None이면 생성 시 지정한 값)
+
+        Returns:
+            {'model', 'reason', 'analysis_tokens', 'estimated_seconds', 'latency_target_seconds', 'queue_seconds'}
+            reason은 default(라우팅 미사용), size(변경 내역 크기), latency(목표 응답 시간 초과로 작은 모델 선택),
+            fastest(어느 모델도 목표를 맞출 수 없어 가장 빠른 모델 선택) 중 하나
+        """
+        default_model = default_model or self.default_model
+        if not self.enabled:
+            return {'model': default_model, 'reason': 'default'}
+
+        if fast_mode is None:
+            fast_mode = get_generation_config().get('fast_mode', False)
+        analysis_tokens = get_token_counter().count(git_analysis, default_model)
+        output_tokens = num_predict or estimate_num_predict(git_analysis, fast_mode)
+        queue_seconds = get_llm_scheduler().estimate_admission_wait()
+        telemetry = get_llm_telemetry().get_stats()
+
+        # 1. 변경 내역 크기로 고른 모델 (후보 중 마지막 모델은 제한 없음)
+        size_index = len(self.models) - 1
+        for index, candidate in enumerate(self.models):
+            limit = candidate.get('max_analysis_tokens')
+            if limit is None or analysis_tokens <= limit:
+                size_index = index
+                break
+
+        # 2. 목표 응답 시간을 넘으면 더 작은 모델로
+        estimates = [self.estimate_seconds(candidate, analysis_tokens, output_tokens, queue_seconds, telemetry)
+                     for candidate in self.models[:size_index + 1]]
+        chosen, reason = size_index, 'size'
+        if estimates[size_index] is not None and estimates[size_index] > self.latency_target_seconds:
+            meeting = [i for i in range(size_index - 1, -1, -1)
+                       if estimates[i] is not None and estimates[i] <= self.latency_target_seconds]
+            if meeting:
+                chosen, reason = meeting[0], 'latency'
+            else:
+                known = [i for i in range(size_index + 1) if estimates[i] is not None]
+                chosen, reason = min(known, key=lambda i: estimates[i]), 'fastest'
+
+        decision = {
+            'model': self.models[chosen]['name'],
+            'reason': reason,
+            'analysis_tokens': analysis_tokens,
+            'estimated_seconds': estimates[chosen],
+            'latency_target_seconds': self.latency_target_seconds,
+            'queue_seconds': round(queue_seconds, 1)
+        }
+        logger.info(f"모델 선택: {decision['model']} ({reason}, 변경 내역 {analysis_tokens}토큰, "
+                    f"예상 {decision['estimated_seconds']}초 / 목표 {self.latency_target_seconds}초)")
+        return decision
+
+    def get_config(self) -> Dict[str, Any]:
+        """라우팅 설정 요약"""
+        return {
+            'enabled': self.enabled,
+            'default_model': self.default_model,
+            'latency_target_seconds': self.latency_target_seconds,
+            'models': self.models
+        }
+
+
+# 전역 인스턴스 (지연 로딩)
+_model_router: Optional[ModelRouter] = None
+
+
+def get_model_router() -> ModelRouter:
+    """설정(config.json의 model_name, llm.routing)을 반영한 모델 라우터 싱글톤 반환"""
+    global _model_router
+    if _model_router is None:
+        config = load_config() or {}
+        routing_config = config.get('llm', {}).get('routing', {})
+        _model_router = ModelRouter(
+            default_model=config.get('model_name', DEFAULT_MODEL),
+            models=routing_config.get('models', []),
+            latency_target_seconds=routing_config.get('latency_target_seconds', DEFAULT_LATENCY_TARGET_SECONDS),
+            enabled=routing_config.get('enabled', False)
+        )
+    return _model_router
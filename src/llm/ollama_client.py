@@ -0,0 +1,143 @@
+"""
+Ollama HTTP 클라이언트
+keep-alive 연결 풀을 공유하는 비동기 클라이언트와 기존 동기 호출부를 위한 동기 클라이언트를 제공합니다.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_BASE_URL = "http://localhost:11434"
+GENERATE_PATH = "/api/generate"
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 5
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+
+class OllamaClient:
+    """연결 풀 기반 Ollama API 클라이언트"""
+
+    def __init__(self,
+                 base_url: str = DEFAULT_BASE_URL,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+                 keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 transport=None):
+        """
+        Ollama 클라이언트 초기화
+
+        Args:
+            base_url: Ollama 서버 주소
+            max_connections: 최대 동시 연결 수
+            max_keepalive_connections: 유지할 최대 유휴(keep-alive) 연결 수
+            keepalive_expiry: 유휴 연결 유지 시간 (초)
+            connect_timeout: 연결 타임아웃 (초)
+            transport: 테스트용 httpx transport (MockTransport 등)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.connect_timeout = connect_timeout
+        self._transport = transport
+        # 연결 풀은 이벤트 루프에 묶이므로 루프마다 따로 유지
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_lock = threading.Lock()
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.base_url}{GENERATE_PATH}"
+
+    def _timeout(self, timeout: float) -> httpx.Timeout:
+        return httpx.Timeout(timeout, connect=min(self.connect_timeout, timeout))
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        현재 이벤트 루프에 바인딩된 공유 AsyncClient 반환
+
+        다른 스레드의 루프가 쓰는 클라이언트는 그대로 두고, 닫힌 루프의 클라이언트는 목록에서 뺍니다.
+        (닫힌 루프에서는 aclose()를 실행할 수 없으므로 남은 소켓은 가비지 컬렉션 시 닫힘)
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for closed_loop in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[closed_loop]
+                client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=httpx.Timeout(None, connect=self.connect_timeout),
+                    transport=self._transport
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def _get_sync_client(self) -> httpx.Client:
+        """스레드 간 공유되는 동기 Client 반환"""
+        with self._sync_lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    limits=self.limits,
+                    timeout=httpx.Timeout(None, connect=self.connect_timeout),
+                    transport=self._transport
+                )
+            return self._sync_client
+
+    async def agenerate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """/api/generate 비동기 호출 (stream=False)"""
+        client = self._get_async_client()
+        response = await client.post(self.generate_url, json=payload, timeout=self._timeout(timeout))
+        response.raise_for_status()
+        return response.json()
+
+    def generate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """/api/generate 동기 호출 (stream=False)"""
+        client = self._get_sync_client()
+        response = client.post(self.generate_url, json=payload, timeout=self._timeout(timeout))
+        response.raise_for_status()
+        return response.json()
+
+    @asynccontextmanager
+    async def astream(self, payload: Dict[str, Any], timeout: float) -> AsyncIterator[httpx.Response]:
+        """/api/generate 스트리밍 호출. 응답 객체를 컨텍스트로 제공합니다."""
+        client = self._get_async_client()
+        async with client.stream("POST", self.generate_url, json=payload, timeout=self._timeout(timeout)) as response:
+            yield response
+
+    async def aclose(self):
+        """모든 연결 풀 정리 (다른 루프에 묶인 비동기 클라이언트는 해당 루프에서 닫음)"""
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        for client_loop, client in clients:
+            if client_loop is loop:
+                await client.aclose()
+                continue
+            try:
+                client_loop.call_soon_threadsafe(lambda c=client: asyncio.ensure_future(c.aclose()))
+            except RuntimeError:
+                pass  # 이미 닫힌 루프
+        self.close()
+
+    def close(self):
+        """동기 연결 풀 정리"""
+        with self._sync_lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
@@ -0,0 +1,186 @@
+"""
+OpenAI 호환 로컬 서버 클라이언트 (llama.cpp server, vLLM 등)
+Ollama 형식의 요청 페이로드를 /v1/completions 요청으로 변환하고,
+응답(스트리밍 SSE 포함)을 다시 Ollama /api/generate 형식으로 바꿔 돌려줍니다.
+"""
+
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+
+import httpx
+
+from .ollama_client import OllamaClient
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+COMPLETIONS_PATH = "/v1/completions"
+SSE_DATA_PREFIX = "data:"
+SSE_DONE = "[DONE]"
+# Ollama options -> OpenAI 요청 필드 (top_k, seed는 llama.cpp/vLLM 확장 필드)
+OPTION_FIELDS = {
+    'num_predict': 'max_tokens',
+    'temperature': 'temperature',
+    'top_p': 'top_p',
+    'top_k': 'top_k',
+    'seed': 'seed',
+    'stop': 'stop'
+}
+
+
+def to_completion_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ollama /api/generate 페이로드를 OpenAI /v1/completions 요청으로 변환
+
+    think, keep_alive처럼 대응하는 필드가 없는 값은 버립니다.
+
+    Args:
+        payload: Ollama 요청 페이로드
+
+    Returns:
+        /v1/completions 요청 본문
+    """
+    body = {
+        'model': payload['model'],
+        'prompt': payload['prompt'],
+        'stream': bool(payload.get('stream'))
+    }
+    for option, field in OPTION_FIELDS.items():
+        value = payload.get('options', {}).get(option)
+        if value is not None:
+            body[field] = value
+
+    output_format = payload.get('format')
+    if output_format == "json":
+        body['response_format'] = {'type': 'json_object'}
+    elif isinstance(output_format, dict):
+        body['response_format'] = {
+            'type': 'json_schema',
+            'json_schema': {'name': 'output', 'schema': output_format}
+        }
+
+    if body['stream']:
+        # 마지막 청크에 토큰 사용량을 포함시켜 처리량 지표에 사용
+        body['stream_options'] = {'include_usage': True}
+    return body
+
+
+def _usage_counters(usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    usage = usage or {}
+    return {
+        'prompt_eval_count': usage.get('prompt_tokens'),
+        'eval_count': usage.get('completion_tokens')
+    }
+
+
+def from_completion_response(data: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """
+    /v1/completions 응답을 Ollama /api/generate 응답 형식으로 변환
+
+    Args:
+        data: OpenAI 호환 응답 본문
+        model: 요청한 모델명 (응답에 없을 때 사용)
+
+    Returns:
+        response, done, done_reason, prompt_eval_count, eval_count를 담은 dict
+    """
+    choice = (data.get('choices') or [{}])[0]
+    return {
+        'model': data.get('model', model),
+        'response': choice.get('text') or '',
+        'done': True,
+        'done_reason': choice.get('finish_reason') or 'stop',
+        **_usage_counters(data.get('usage'))
+    }
+
+
+class CompletionStream:
+    """SSE 스트림을 Ollama NDJSON 줄로 바꿔 읽는 응답 래퍼 (status_code/request/aread는 원본 그대로)"""
+
+    def __init__(self, response: httpx.Response, model: str):
+        self._response = response
+        self.model = model
+        self.status_code = response.status_code
+        self.request = response.request
+
+    async def aread(self) -> bytes:
+        return await self._response.aread()
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        finish_reason = None
+        usage = None
+        async for line in self._response.aiter_lines():
+            line = line.strip()
+            if not line.startswith(SSE_DATA_PREFIX):
+                continue
+            data = line[len(SSE_DATA_PREFIX):].strip()
+            if data == SSE_DONE:
+                break
+
+            chunk = json.loads(data)
+            if chunk.get('error'):
+                error = chunk['error']
+                yield json.dumps({'error': error.get('message', error) if isinstance(error, dict) else error})
+                return
+            usage = chunk.get('usage') or usage
+            for choice in chunk.get('choices') or []:
+                finish_reason = choice.get('finish_reason') or finish_reason
+                if choice.get('text'):
+                    yield json.dumps({'model': self.model, 'response': choice['text'], 'done': False},
+                                     ensure_ascii=False)
+
+        yield json.dumps({
+            'model': self.model,
+            'response': '',
+            'done': True,
+            'done_reason': finish_reason or 'stop',
+            **_usage_counters(usage)
+        })
+
+
+class OpenAICompatibleClient(OllamaClient):
+    """OpenAI 호환 /v1/completions 서버용 클라이언트 (연결 풀은 OllamaClient와 동일하게 관리)"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, **kwargs):
+        """
+        Args:
+            base_url: 서버 주소 (예: http://localhost:8080, /v1 제외)
+            api_key: Bearer 인증 키 (로컬 서버는 보통 불필요)
+            **kwargs: OllamaClient 연결 풀 옵션
+        """
+        super().__init__(base_url=base_url, **kwargs)
+        self.api_key = api_key
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.base_url}{COMPLETIONS_PATH}"
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+
+    async def agenerate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """/v1/completions 비동기 호출 (stream=False)"""
+        client = self._get_async_client()
+        response = await client.post(self.generate_url, json=to_completion_request(payload),
+                                     headers=self.headers, timeout=self._timeout(timeout))
+        response.raise_for_status()
+        return from_completion_response(response.json(), payload['model'])
+
+    def generate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """/v1/completions 동기 호출 (stream=False)"""
+        client = self._get_sync_client()
+        response = client.post(self.generate_url, json=to_completion_request(payload),
+                               headers=self.headers, timeout=self._timeout(timeout))
+        response.raise_for_status()
+        return from_completion_response(response.json(), payload['model'])
+
+    @asynccontextmanager
+    async def astream(self, payload: Dict[str, Any], timeout: float) -> AsyncIterator[CompletionStream]:
+        """/v1/completions 스트리밍 호출. SSE를 Ollama NDJSON 줄로 변환하는 응답을 제공합니다."""
+        client = self._get_async_client()
+        async with client.stream("POST", self.generate_url, json=to_completion_request(payload),
+                                 headers=self.headers, timeout=self._timeout(timeout)) as response:
+            yield CompletionStream(response, payload['model'])
@@ -0,0 +1,232 @@
+"""
+프롬프트 고정 머리말(prefix) 캐시
+템플릿 지시문 + 피드백 개선 블록처럼 요청마다 동일한 머리말을 엔드포인트별로 미리 평가(priming)해 두어,
+Ollama가 이후 요청에서 해당 구간의 KV 캐시를 재사용하고 가변 본문(Git 분석, RAG 컨텍스트)만 평가하도록 합니다.
+
+Ollama는 전달받은 context 토큰도 다시 문자열로 풀어 평가하므로, 실제로 재사용되는 상태는
+러너(llama.cpp)가 보관하는 KV prefix입니다. 따라서 키는 (템플릿 해시, 모델)이고 엔드포인트별로 priming 여부를 관리합니다.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set
+
+from ..config_loader import load_config
+from .endpoint_pool import get_endpoint_pool, OllamaEndpoint
+from .scheduler import get_llm_scheduler, Priority
+from .warmup import get_model_warmer, parse_keep_alive
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_MAX_ENTRIES = 8
+DEFAULT_TTL_SECONDS = 1800.0
+PRIME_TIMEOUT = 300
+# 값이 다르면 Ollama가 모델을 다시 로드하므로 priming 요청에도 그대로 전달해야 하는 옵션
+LOAD_OPTION_KEYS = ('num_ctx', 'num_batch', 'num_gpu', 'main_gpu', 'num_thread', 'use_mmap')
+
+
+def prefix_hash(prefix: str) -> str:
+    """머리말 텍스트 해시 (템플릿 버전 식별자)"""
+    return hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:16]
+
+
+class _PrefixEntry:
+    """(템플릿 해시, 모델)별 priming 상태와 사용 통계"""
+
+    def __init__(self, template_hash: str, model: str, prefix: str):
+        self.template_hash = template_hash
+        self.model = model
+        self.prefix_chars = len(prefix)
+        # url -> {'primed_at', 'prefix_tokens', 'context_tokens', 'prime_seconds'}
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.priming: Set[str] = set()
+        self.uses = 0
+        self.prompt_eval_tokens = 0
+        self.prompt_eval_seconds = 0.0
+
+
+class PromptPrefixCache:
+    """엔드포인트별 프롬프트 머리말 priming 관리자"""
+
+    def __init__(self,
+                 enabled: bool = True,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 keep_alive: Any = None):
+        """
+        머리말 캐시 초기화
+
+        Args:
+            enabled: 사용 여부
+            max_entries: 유지할 (템플릿, 모델) 항목 수
+            ttl_seconds: priming 유효 시간 (모델이 내려가면 KV 캐시도 사라짐)
+            keep_alive: priming 요청에 전달할 keep_alive 값
+        """
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.keep_alive = keep_alive
+        self._entries: "OrderedDict[tuple, _PrefixEntry]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _entry(self, prefix: str, model: str) -> _PrefixEntry:
+        key = (prefix_hash(prefix), model)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _PrefixEntry(key[0], model, prefix)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return entry
+
+    def _is_fresh(self, entry: _PrefixEntry, url: str, now: float) -> bool:
+        state = entry.endpoints.get(url)
+        return state is not None and now - state['primed_at'] < self.ttl_seconds
+
+    async def _prime(self, entry: _PrefixEntry, endpoint: OllamaEndpoint, prefix: str, options: Dict[str, Any]):
+        """
+        단일 엔드포인트에서 머리말을 평가해 KV 캐시에 올림
+
+        대화형 생성보다 앞서지 않도록 스케줄러의 배치 우선순위 슬롯을 받아 실행하고,
+        슬롯을 받은 시점에 엔드포인트가 다른 요청을 처리 중이면 건너뜁니다. (다음 요청 때 다시 예약)
+        기다리는 동안 실제 요청을 처리해 이미 머리말이 올라간 엔드포인트도 건너뜁니다.
+        """
+        payload = {
+            "model": entry.model,
+            "prompt": prefix,
+            "stream": False,
+            "options": {**options, "num_predict": 1}
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        try:
+            async with get_llm_scheduler().slot(Priority.BATCH):
+                if endpoint.in_flight:
+                    logger.debug(f"프롬프트 머리말 priming 건너뜀 (진행 중 요청 있음: {endpoint.url})")
+                    return
+                if self._is_fresh(entry, endpoint.url, time.time()):
+                    return
+                started = time.monotonic()
+                response = await endpoint.client.agenerate(payload, PRIME_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"프롬프트 머리말 priming 실패 ({endpoint.url}, {entry.template_hash}): {e}")
+            return
+        finally:
+            entry.priming.discard(endpoint.url)
+
+        entry.endpoints[endpoint.url] = {
+            'primed_at': time.time(),
+            'prefix_tokens': response.get('prompt_eval_count', 0),
+            'context_tokens': len(response.get('context') or []),
+            'prime_seconds': round(time.monotonic() - started, 2)
+        }
+        logger.info(f"프롬프트 머리말 priming 완료 ({endpoint.url}, 템플릿 {entry.template_hash}, "
+                    f"{entry.endpoints[endpoint.url]['prefix_tokens']} 토큰)")
+
+    def schedule_priming(self, prefix: str, model: str, options: Optional[Dict[str, Any]] = None,
+                         exclude_url: Optional[str] = None) -> int:
+        """
+        아직 priming되지 않은(또는 만료된) 정상 엔드포인트에 백그라운드 priming을 예약
+
+        현재 요청은 기다리지 않습니다. 요청을 처리하는 엔드포인트는 어차피 머리말을 평가하므로
+        exclude_url로 제외하고, 나머지 엔드포인트들이 다음 요청부터 재사용할 수 있게 합니다.
+
+        Args:
+            prefix: 고정 머리말
+            model: 모델명
+            options: 생성 옵션 (모델 로드에 영향을 주는 값만 전달)
+            exclude_url: 현재 요청을 처리하는 엔드포인트 주소
+
+        Returns:
+            예약된 priming 작업 수
+        """
+        if not self.enabled or not prefix:
+            return 0
+
+        entry = self._entry(prefix, model)
+        load_options = {k: v for k, v in (options or {}).items() if k in LOAD_OPTION_KEYS}
+        now_wall, now_mono = time.time(), time.monotonic()
+        scheduled = 0
+        for endpoint in get_endpoint_pool().endpoints:
+            if endpoint.url == exclude_url or endpoint.is_ejected(now_mono) or endpoint.url in entry.priming:
+                continue
+            if self._is_fresh(entry, endpoint.url, now_wall):
+                continue
+            entry.priming.add(endpoint.url)
+            task = asyncio.create_task(self._prime(entry, endpoint, prefix, load_options))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            scheduled += 1
+        return scheduled
+
+    def record_usage(self, prefix: str, model: str, stats: Dict[str, Any], endpoint_url: Optional[str] = None):
+        """
+        머리말을 사용한 생성 요청의 프롬프트 평가 통계 기록
+
+        요청을 처리한 엔드포인트는 머리말을 평가했으므로 priming된 것으로 표시합니다.
+
+        Args:
+            prefix: 고정 머리말
+            model: 모델명
+            stats: Ollama 완료 응답의 통계 필드 (prompt_eval_count, prompt_eval_duration)
+            endpoint_url: 요청을 처리한 엔드포인트 주소
+        """
+        if not self.enabled or not prefix:
+            return
+        entry = self._entry(prefix, model)
+        if endpoint_url:
+            state = entry.endpoints.setdefault(endpoint_url, {
+                'prefix_tokens': 0,
+                'context_tokens': 0,
+                'prime_seconds': 0.0
+            })
+            state['primed_at'] = time.time()
+        entry.uses += 1
+        entry.prompt_eval_tokens += stats.get('prompt_eval_count', 0) or 0
+        # prompt_eval_duration은 나노초 단위
+        entry.prompt_eval_seconds += (stats.get('prompt_eval_duration', 0) or 0) / 1e9
+
+    def get_stats(self) -> Dict[str, Any]:
+        """템플릿/모델별 priming 상태와 평균 프롬프트 평가량 반환"""
+        now = time.time()
+        entries = []
+        for entry in reversed(self._entries.values()):
+            entries.append({
+                'template_hash': entry.template_hash,
+                'model': entry.model,
+                'prefix_chars': entry.prefix_chars,
+                'primed_endpoints': [url for url in entry.endpoints if self._is_fresh(entry, url, now)],
+                'prefix_tokens': max((s['prefix_tokens'] for s in entry.endpoints.values()), default=0),
+                'uses': entry.uses,
+                'avg_prompt_eval_tokens': round(entry.prompt_eval_tokens / entry.uses, 1) if entry.uses else 0.0,
+                'avg_prompt_eval_seconds': round(entry.prompt_eval_seconds / entry.uses, 2) if entry.uses else 0.0
+            })
+        return {'enabled': self.enabled, 'entries': entries}
+
+
+# 전역 인스턴스 (지연 로딩)
+_prefix_cache: Optional[PromptPrefixCache] = None
+
+
+def get_prefix_cache() -> PromptPrefixCache:
+    """설정(config.json의 llm.prefix_cache)을 반영한 머리말 캐시 싱글톤 반환"""
+    global _prefix_cache
+    if _prefix_cache is None:
+        config = load_config() or {}
+        prefix_config = config.get('llm', {}).get('prefix_cache', {})
+        keep_alive = get_model_warmer().keep_alive
+        # 모델이 keep_alive 이후 내려가면 KV 캐시도 사라지므로 같은 기간을 기본 유효 시간으로 사용
+        ttl_seconds = prefix_config.get('ttl_seconds') or parse_keep_alive(keep_alive) or DEFAULT_TTL_SECONDS
+        _prefix_cache = PromptPrefixCache(
+            enabled=prefix_config.get('enabled', True),
+            max_entries=prefix_config.get('max_entries', DEFAULT_MAX_ENTRIES),
+            ttl_seconds=ttl_seconds,
+            keep_alive=keep_alive
+        )
+    return _prefix_cache
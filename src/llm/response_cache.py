@@ -0,0 +1,110 @@
+"""
+LLM 응답 캐시
+(model, prompt, format, options, think) 해시를 키로 하는 2단계(메모리 LRU + SQLite) 응답 캐시를 제공합니다.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Any, Optional
+
+from ..config_loader import load_config
+from ..tiered_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_DB_PATH = "llm_cache.db"
+DEFAULT_MEMORY_ENTRIES = 64
+DEFAULT_MAX_DISK_MB = 256
+DEFAULT_TTL_HOURS = 24 * 7
+KEY_FIELDS = ("model", "prompt", "format", "options", "think")
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Ollama 요청 페이로드에서 캐시 키를 생성합니다.
+
+    Args:
+        payload: Ollama /api/generate 요청 페이로드
+
+    Returns:
+        model, prompt, format, options, think 기반 sha256 해시
+    """
+    material = {field: payload.get(field) for field in KEY_FIELDS}
+    encoded = json.dumps(material, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMResponseCache(TieredCache):
+    """메모리 LRU + 디스크(SQLite) 2단계 LLM 응답 캐시"""
+
+    TABLE = "llm_responses"
+    VALUE_COLUMN = "response"
+    TIME_COLUMN = "generation_time"
+    SCHEMA = (
+        '''
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL,
+            size INTEGER NOT NULL,
+            generation_time REAL DEFAULT 0,
+            response TEXT NOT NULL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_llm_responses_access ON llm_responses(last_access)'
+    )
+    LABEL = "LLM"
+
+    def __init__(self,
+                 db_path: Optional[str] = DEFAULT_DB_PATH,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_MB * 1024 * 1024,
+                 ttl_seconds: float = DEFAULT_TTL_HOURS * 3600):
+        """
+        응답 캐시 초기화
+
+        Args:
+            db_path: 디스크 캐시 SQLite 파일 경로 (None이면 메모리 캐시만 사용)
+            memory_entries: 메모리 LRU 최대 항목 수
+            max_disk_bytes: 디스크 캐시 최대 크기 (응답 바이트 합계)
+            ttl_seconds: 항목 유효 시간 (초)
+        """
+        super().__init__(db_path, memory_entries, max_disk_bytes, ttl_seconds)
+
+    def set(self, key: str, response: str, model: str = "", generation_time: float = 0.0):
+        """
+        응답을 캐시에 저장
+
+        Args:
+            key: make_cache_key()로 생성한 키
+            response: 저장할 응답 텍스트
+            model: 모델명 (통계용)
+            generation_time: 응답 생성에 걸린 시간 (적중 시 절약 시간으로 집계)
+        """
+        self._store(key, response, generation_time, model=model)
+
+
+# 전역 인스턴스 (지연 로딩)
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_loaded = False
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """설정(config.json의 llm.cache)을 반영한 응답 캐시 싱글톤 반환. 비활성화 시 None."""
+    global _llm_cache, _llm_cache_loaded
+    if not _llm_cache_loaded:
+        config = load_config() or {}
+        cache_config = config.get('llm', {}).get('cache', {})
+        if cache_config.get('enabled', True):
+            ttl_hours = cache_config.get('ttl_hours', DEFAULT_TTL_HOURS)
+            _llm_cache = LLMResponseCache(
+                db_path=cache_config.get('db_path', DEFAULT_DB_PATH),
+                memory_entries=cache_config.get('memory_entries', DEFAULT_MEMORY_ENTRIES),
+                max_disk_bytes=int(cache_config.get('max_disk_mb', DEFAULT_MAX_DISK_MB) * 1024 * 1024),
+                ttl_seconds=ttl_hours * 3600 if ttl_hours else None
+            )
+        _llm_cache_loaded = True
+    return _llm_cache
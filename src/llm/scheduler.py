@@ -0,0 +1,215 @@
+"""
+LLM 호출 스케줄러
+동시에 Ollama로 보내는 생성 요청 수를 엔드포인트당 상한으로 제한하고,
+나머지는 우선순위 대기열(웹 대화형 > CLI 배치)에 넣어 순서대로 실행합니다.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from ..config_loader import load_config
+from .endpoint_pool import get_endpoint_pool
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_MAX_CONCURRENT_PER_ENDPOINT = 1
+DEFAULT_INITIAL_SERVICE_SECONDS = 60.0
+QUEUE_POLL_SECONDS = 1.0
+SERVICE_EWMA_ALPHA = 0.3
+
+
+class Priority(IntEnum):
+    """LLM 호출 우선순위 (값이 작을수록 먼저 실행)"""
+    INTERACTIVE = 0   # 웹 UI (v1 WebSocket)
+    BATCH = 1         # CLI (v2, generate-from-text)
+
+
+# 대기 중 위치/예상 대기 시간 알림 콜백: (대기 순번, 예상 대기 초)
+QueueCallback = Callable[[int, float], Awaitable[None]]
+
+
+class _Waiter:
+    """대기열 항목"""
+
+    __slots__ = ('priority', 'seq', 'future', 'enqueued_at')
+
+    def __init__(self, priority: Priority, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class LLMScheduler:
+    """우선순위 기반 LLM 호출 승인(admission) 대기열"""
+
+    def __init__(self, max_concurrent: int, initial_service_seconds: float = DEFAULT_INITIAL_SERVICE_SECONDS):
+        """
+        스케줄러 초기화
+
+        Args:
+            max_concurrent: 동시에 실행할 수 있는 LLM 호출 수
+            initial_service_seconds: 처리 이력이 없을 때 사용할 호출당 예상 소요 시간
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent는 1 이상이어야 합니다.")
+        self.max_concurrent = max_concurrent
+        self.avg_service_seconds = initial_service_seconds
+        self.active = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._stats = {
+            'admitted': 0,
+            'queued': 0,
+            'cancelled': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0
+        }
+
+    def _position(self, waiter: _Waiter) -> int:
+        """대기열에서 앞선 항목 수 + 1 (1부터 시작)"""
+        return 1 + sum(1 for other in self._queue if other < waiter)
+
+    def estimate_wait(self, position: int) -> float:
+        """대기 순번 기준 예상 대기 시간 (초)"""
+        return math.ceil(position / self.max_concurrent) * self.avg_service_seconds
+
+    def estimate_admission_wait(self) -> float:
+        """지금 새 요청이 들어오면 실행 슬롯을 받기까지 기다릴 예상 시간 (초)"""
+        if self.active < self.max_concurrent and not self._queue:
+            return 0.0
+        return self.estimate_wait(len(self._queue) + 1)
+
+    def _grant_next(self):
+        """빈 슬롯만큼 대기열 앞쪽 항목을 승인"""
+        while self._queue and self.active < self.max_concurrent:
+            waiter = heapq.heappop(self._queue)
+            self.active += 1
+            waiter.future.set_result(None)
+
+    def _record_wait(self, waited: float):
+        self._stats['admitted'] += 1
+        self._stats['total_wait_seconds'] += waited
+        self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], waited)
+
+    async def acquire(self, priority: Priority = Priority.BATCH, on_wait: Optional[QueueCallback] = None):
+        """
+        실행 슬롯 획득. 슬롯이 없으면 대기열에서 순서를 기다립니다.
+
+        Args:
+            priority: 호출 우선순위
+            on_wait: 대기 중 순번이 바뀔 때마다 호출되는 콜백
+        """
+        if self.active < self.max_concurrent and not self._queue:
+            self.active += 1
+            self._record_wait(0.0)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, next(self._seq), loop.create_future())
+        heapq.heappush(self._queue, waiter)
+        self._stats['queued'] += 1
+        self._grant_next()
+        if waiter.future.done():
+            self._record_wait(0.0)
+            return
+        logger.info(f"LLM 호출 대기열 진입 (우선순위: {priority.name}, 순번: {self._position(waiter)})")
+
+        last_position = None
+        try:
+            while not waiter.future.done():
+                position = self._position(waiter)
+                if on_wait is not None and position != last_position:
+                    last_position = position
+                    await on_wait(position, self.estimate_wait(position))
+                if waiter.future.done():
+                    break
+                await asyncio.wait({waiter.future}, timeout=QUEUE_POLL_SECONDS)
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                self._stats['cancelled'] += 1
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 승인 직후 취소된 경우 슬롯을 다음 대기자에게 넘김
+                self.release()
+            else:
+                waiter.future.cancel()
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            raise
+
+        self._record_wait(time.monotonic() - waiter.enqueued_at)
+
+    def release(self, service_seconds: Optional[float] = None):
+        """
+        실행 슬롯 반환
+
+        Args:
+            service_seconds: 이번 호출의 소요 시간 (예상 대기 시간 보정용)
+        """
+        self.active = max(0, self.active - 1)
+        if service_seconds is not None:
+            self.avg_service_seconds = (SERVICE_EWMA_ALPHA * service_seconds
+                                        + (1 - SERVICE_EWMA_ALPHA) * self.avg_service_seconds)
+        self._grant_next()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.BATCH, on_wait: Optional[QueueCallback] = None):
+        """acquire()/release()를 묶은 컨텍스트 매니저. 실행 중 취소되면 슬롯을 즉시 다음 대기자에게 넘깁니다."""
+        await self.acquire(priority, on_wait)
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self._stats['cancelled'] += 1
+            raise
+        finally:
+            self.release(time.monotonic() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """동시 실행/대기열 현황 반환"""
+        waiting = self._queue
+        admitted = self._stats['admitted']
+        return {
+            'max_concurrent': self.max_concurrent,
+            'active': self.active,
+            'waiting': len(waiting),
+            'waiting_by_priority': {p.name.lower(): sum(1 for w in waiting if w.priority == p) for p in Priority},
+            'avg_service_seconds': round(self.avg_service_seconds, 1),
+            'admitted': admitted,
+            'queued': self._stats['queued'],
+            'cancelled': self._stats['cancelled'],
+            'avg_wait_seconds': round(self._stats['total_wait_seconds'] / admitted, 2) if admitted else 0.0,
+            'max_wait_seconds': round(self._stats['max_wait_seconds'], 2)
+        }
+
+
+# 전역 인스턴스 (지연 로딩)
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """설정(config.json의 llm.scheduler)을 반영한 스케줄러 싱글톤 반환. 상한은 엔드포인트 수에 비례합니다."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        config = load_config() or {}
+        scheduler_config = config.get('llm', {}).get('scheduler', {})
+        per_endpoint = scheduler_config.get('max_concurrent_per_endpoint', DEFAULT_MAX_CONCURRENT_PER_ENDPOINT)
+        endpoint_count = len(get_endpoint_pool().endpoints)
+        _llm_scheduler = LLMScheduler(
+            max_concurrent=per_endpoint * endpoint_count,
+            initial_service_seconds=scheduler_config.get('initial_service_seconds', DEFAULT_INITIAL_SERVICE_SECONDS)
+        )
+        logger.info(f"LLM 스케줄러 초기화: 동시 실행 상한 {_llm_scheduler.max_concurrent} "
+                    f"(엔드포인트 {endpoint_count}개 x {per_endpoint})")
+    return _llm_scheduler
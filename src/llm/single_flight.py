@@ -0,0 +1,135 @@
+"""
+동일 LLM 요청 합치기 (single-flight)
+같은 (모델, 프롬프트, format, options) 요청이 이미 진행 중이면 새로 호출하지 않고
+진행 중인 작업의 결과를 함께 기다립니다. (더블 클릭, 같은 저장소/커밋에 대한 동시 요청)
+
+먼저 들어온 요청(leader)의 작업은 별도 태스크로 실행되므로, leader가 연결을 끊어도
+기다리는 요청이 남아 있으면 생성은 계속됩니다. 모든 대기자가 취소되면 작업도 취소됩니다.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Tuple
+
+from ..config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+# 진행 중인 작업이 보내는 이벤트를 받는 콜백: (이벤트 이름, *인자)
+FlightListener = Callable[..., Awaitable[None]]
+
+
+class _Flight:
+    """진행 중인 단일 작업과 그 결과를 기다리는 요청들"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        self.listeners: List[FlightListener] = []
+
+    async def publish(self, event: str, *args):
+        """모든 대기자에게 이벤트(진행률, 대기 순번 등) 전달. 실패한 리스너는 제외"""
+        for listener in list(self.listeners):
+            try:
+                await listener(event, *args)
+            except Exception as e:
+                logger.warning(f"합쳐진 LLM 요청의 이벤트 전달 실패 ({event}): {e}")
+                if listener in self.listeners:
+                    self.listeners.remove(listener)
+
+
+class SingleFlight:
+    """키별로 동시에 하나의 작업만 실행하고 결과를 공유하는 관리자"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: 사용 여부 (False면 모든 요청을 각각 실행)
+        """
+        self.enabled = enabled
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {
+            'leaders': 0,
+            'coalesced': 0,
+            'cancelled': 0
+        }
+
+    async def do(self,
+                 key: str,
+                 fn: Callable[[FlightListener], Awaitable[Any]],
+                 listener: Optional[FlightListener] = None) -> Tuple[Any, bool]:
+        """
+        key에 해당하는 작업을 실행하거나, 이미 진행 중이면 그 결과를 기다림
+
+        Args:
+            key: 요청 지문 (동일 요청 판별용)
+            fn: 실제 작업. 이벤트를 모든 대기자에게 보내는 publish 함수를 인자로 받음
+            listener: 작업 이벤트를 받을 콜백 (진행률 표시 등)
+
+        Returns:
+            (결과, 다른 요청의 작업에 합쳐졌는지 여부)
+
+        Raises:
+            작업에서 발생한 예외를 모든 대기자에게 그대로 전달
+        """
+        if not self.enabled:
+            async def publish(event: str, *args):
+                if listener is not None:
+                    await listener(event, *args)
+            return await fn(publish), False
+
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self._stats['coalesced'] += 1
+            logger.info(f"동일한 LLM 요청이 진행 중이어서 결과를 공유합니다. (대기자 {flight.waiters + 1}명)")
+        else:
+            flight = _Flight(key)
+            flight.task = asyncio.create_task(fn(flight.publish))
+            flight.task.add_done_callback(lambda _: self._forget(flight))
+            self._flights[key] = flight
+            self._stats['leaders'] += 1
+
+        flight.waiters += 1
+        if listener is not None:
+            flight.listeners.append(listener)
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # 마지막 대기자가 떠나면 더 이상 결과가 필요 없으므로 작업도 중단
+                self._stats['cancelled'] += 1
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+            if listener in flight.listeners:
+                flight.listeners.remove(listener)
+
+    def _forget(self, flight: _Flight):
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """진행 중인 작업 수와 합쳐진 요청 통계 반환"""
+        return {
+            'enabled': self.enabled,
+            'in_flight': len(self._flights),
+            'waiting': sum(flight.waiters for flight in self._flights.values()),
+            **self._stats
+        }
+
+
+# 전역 인스턴스 (지연 로딩)
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """설정(config.json의 llm.single_flight)을 반영한 요청 합치기 싱글톤 반환"""
+    global _single_flight
+    if _single_flight is None:
+        config = load_config() or {}
+        flight_config = config.get('llm', {}).get('single_flight', {})
+        _single_flight = SingleFlight(enabled=flight_config.get('enabled', True))
+    return _single_flight
@@ -0,0 +1,217 @@
+"""
+결정적(deterministic) 프로세스 내 LLM 스텁 클라이언트
+모델 없이(CPU 전용 환경 포함) 전체 파이프라인을 부하 테스트/벤치마크할 수 있도록
+기록된 응답을 설정한 지연 시간과 초당 토큰 수로 재생합니다.
+
+기록 소스:
+- LLM 응답 캐시 DB(llm_cache.db): 실제 실행에서 저장된 응답을 캐시 키로 그대로 재생
+- JSONL/JSON 파일: {"response": "...", "key": "(선택) 캐시 키"} 항목 목록
+같은 요청은 항상 같은 응답을 받습니다. (캐시 키 일치 > 프롬프트 해시로 고른 기록 > 기본 응답)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import asynccontextmanager, closing
+from pathlib import Path
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+
+from .response_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+STUB_BASE_URL = "stub://local"
+DEFAULT_CHARS_PER_TOKEN = 4
+NANOSECONDS = 1_000_000_000
+DEFAULT_STUB_RESPONSE = """<thinking>스텁 응답입니다.</thinking>
+<json>
+{
+  "Scenario Description": "스텁 LLM이 생성한 테스트 시나리오입니다.",
+  "Test Scenario Name": "스텁 테스트 시나리오",
+  "Test Cases": [
+    {
+      "ID": "TEST_001",
+      "절차": "1. 변경된 기능을 실행한다.",
+      "사전조건": "테스트 환경이 준비되어 있다.",
+      "데이터": "기본 테스트 데이터",
+      "예상결과": "기능이 정상적으로 동작한다.",
+      "종류": "Unit"
+    }
+  ]
+}
+</json>"""
+
+
+def load_recordings(path: str) -> Tuple[Dict[str, str], List[str]]:
+    """
+    기록된 응답 로드
+
+    Args:
+        path: 응답 캐시 SQLite DB 또는 JSONL/JSON 파일 경로
+
+    Returns:
+        (캐시 키별 응답, 전체 응답 목록)
+    """
+    by_key: Dict[str, str] = {}
+    responses: List[str] = []
+    file_path = Path(path)
+
+    if file_path.suffix in ('.db', '.sqlite', '.sqlite3'):
+        with closing(sqlite3.connect(str(file_path))) as conn:
+            rows = conn.execute("SELECT cache_key, response FROM llm_responses ORDER BY cache_key").fetchall()
+        entries = [{'key': key, 'response': response} for key, response in rows]
+    else:
+        text = file_path.read_text(encoding='utf-8')
+        if file_path.suffix == '.json':
+            entries = json.loads(text)
+        else:
+            entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    for entry in entries:
+        if entry.get('key'):
+            by_key[entry['key']] = entry['response']
+        responses.append(entry['response'])
+    logger.info(f"스텁 LLM 기록 {len(responses)}개 로드: {path}")
+    return by_key, responses
+
+
+class StubStream:
+    """스텁 스트리밍 응답 (httpx.Response처럼 status_code/aread/aiter_lines 제공)"""
+
+    status_code = 200
+    request = None
+
+    def __init__(self, client: 'StubClient', payload: Dict[str, Any]):
+        self._client = client
+        self._payload = payload
+
+    async def aread(self) -> bytes:
+        return b""
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        tokens, done_reason = self._client.render(self._payload)
+        await asyncio.sleep(self._client.latency)
+        for token in tokens:
+            if self._client.tokens_per_second:
+                await asyncio.sleep(1 / self._client.tokens_per_second)
+            yield json.dumps({'model': self._payload['model'], 'response': token, 'done': False}, ensure_ascii=False)
+        yield json.dumps({
+            'model': self._payload['model'],
+            'response': '',
+            'done': True,
+            **self._client.counters(self._payload, tokens, done_reason)
+        })
+
+
+class StubClient:
+    """기록된 응답을 정해진 속도로 재생하는 Ollama 호환 클라이언트 (네트워크 사용 없음)"""
+
+    def __init__(self,
+                 base_url: str = STUB_BASE_URL,
+                 recordings: Optional[str] = None,
+                 responses: Optional[List[str]] = None,
+                 latency: float = 0.0,
+                 tokens_per_second: float = 0.0,
+                 load_seconds: float = 0.0,
+                 chars_per_token: int = DEFAULT_CHARS_PER_TOKEN):
+        """
+        Args:
+            base_url: 지표에 표시할 엔드포인트 이름
+            recordings: 기록 파일 경로 (응답 캐시 DB 또는 JSONL/JSON)
+            responses: 직접 지정하는 응답 목록 (recordings보다 우선)
+            latency: 첫 토큰까지의 지연 시간 (초)
+            tokens_per_second: 초당 생성 토큰 수 (0이면 지연 없이 즉시)
+            load_seconds: 응답에 보고할 모델 로드 시간 (초)
+            chars_per_token: 응답을 토큰으로 나눌 때 사용하는 글자 수
+        """
+        self.base_url = base_url
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.load_seconds = load_seconds
+        self.chars_per_token = max(1, chars_per_token)
+        self._by_key: Dict[str, str] = {}
+        self._responses: List[str] = list(responses or [])
+        if recordings and not self._responses:
+            self._by_key, self._responses = load_recordings(recordings)
+
+    def pick_response(self, payload: Dict[str, Any]) -> str:
+        """요청에 대응하는 응답 선택 (같은 요청에는 항상 같은 응답)"""
+        recorded = self._by_key.get(make_cache_key(payload))
+        if recorded is not None:
+            return recorded
+        if not self._responses:
+            return DEFAULT_STUB_RESPONSE
+        digest = hashlib.sha256(payload.get('prompt', '').encode('utf-8')).hexdigest()
+        return self._responses[int(digest, 16) % len(self._responses)]
+
+    def render(self, payload: Dict[str, Any]) -> Tuple[List[str], str]:
+        """
+        응답을 토큰 단위로 나누고 stop 시퀀스와 num_predict를 Ollama와 같은 방식으로 적용
+
+        Returns:
+            (토큰 목록, done_reason)
+        """
+        text = self.pick_response(payload)
+        options = payload.get('options', {})
+        done_reason = 'stop'
+
+        stops = [text.find(stop) for stop in options.get('stop') or [] if stop and stop in text]
+        if stops:
+            # Ollama처럼 stop 시퀀스 자체는 출력에서 제외
+            text = text[:min(stops)]
+
+        step = self.chars_per_token
+        tokens = [text[i:i + step] for i in range(0, len(text), step)]
+        limit = options.get('num_predict')
+        if limit is not None and limit >= 0 and len(tokens) > limit:
+            tokens = tokens[:limit]
+            done_reason = 'length'
+        return tokens, done_reason
+
+    def generation_seconds(self, token_count: int) -> float:
+        return token_count / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def counters(self, payload: Dict[str, Any], tokens: List[str], done_reason: str) -> Dict[str, Any]:
+        """Ollama 응답과 같은 eval 카운터 (처리량 지표용)"""
+        return {
+            'done_reason': done_reason,
+            'prompt_eval_count': len(payload.get('prompt', '')) // self.chars_per_token,
+            'eval_count': len(tokens),
+            'eval_duration': int(self.generation_seconds(len(tokens)) * NANOSECONDS),
+            'load_duration': int(self.load_seconds * NANOSECONDS)
+        }
+
+    def _response(self, payload: Dict[str, Any], tokens: List[str], done_reason: str) -> Dict[str, Any]:
+        return {
+            'model': payload['model'],
+            'response': ''.join(tokens),
+            'done': True,
+            **self.counters(payload, tokens, done_reason)
+        }
+
+    async def agenerate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """응답 전체를 지연 시간 + 생성 시간 뒤에 반환"""
+        tokens, done_reason = self.render(payload)
+        await asyncio.sleep(self.latency + self.generation_seconds(len(tokens)))
+        return self._response(payload, tokens, done_reason)
+
+    def generate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """agenerate의 동기 버전"""
+        tokens, done_reason = self.render(payload)
+        time.sleep(self.latency + self.generation_seconds(len(tokens)))
+        return self._response(payload, tokens, done_reason)
+
+    @asynccontextmanager
+    async def astream(self, payload: Dict[str, Any], timeout: float) -> AsyncIterator[StubStream]:
+        """토큰을 설정한 속도로 NDJSON 줄로 내보내는 스트리밍 응답"""
+        yield StubStream(self, payload)
+
+    async def aclose(self):
+        pass
+
+    def close(self):
+        pass
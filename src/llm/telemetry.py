@@ -0,0 +1,197 @@
+"""
+LLM 처리량 지표 (telemetry)
+Ollama 응답의 eval 카운터(prompt_eval_count, eval_count, eval_duration, load_duration)로
+호출별 기록(초당 토큰 수, 프롬프트 토큰 수, 모델 로드 시간, 대기열 대기 시간)을 만들고,
+모델별 최근 기록의 백분위수(p50/p90/p99)를 집계합니다.
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Deque
+
+from ..config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_HISTORY_SIZE = 200
+NANOSECONDS = 1e9
+PERCENTILES = (50, 90, 99)
+# 백분위수를 집계하는 호출 기록 항목
+TRACKED_FIELDS = (
+    'tokens_per_second',
+    'prompt_tokens_per_second',
+    'prompt_tokens',
+    'output_tokens',
+    'load_seconds',
+    'queue_seconds',
+    'total_seconds'
+)
+
+
+def _seconds(response_data: Dict[str, Any], key: str) -> Optional[float]:
+    """나노초 단위 Ollama duration 값을 초로 변환 (없으면 None)"""
+    value = response_data.get(key)
+    return value / NANOSECONDS if value else None
+
+
+def _round(value: Optional[float], digits: int = 3) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+def build_call_stats(model: str,
+                     response_data: Optional[Dict[str, Any]],
+                     queue_seconds: float = 0.0,
+                     total_seconds: float = 0.0,
+                     output_chunks: Optional[int] = None,
+                     cache_hit: bool = False) -> Dict[str, Any]:
+    """
+    Ollama 응답으로 호출 1건의 지표 기록 생성
+
+    Args:
+        model: 모델 이름
+        response_data: /api/generate 응답 (스트리밍은 done 줄). 카운터가 없으면 빈 dict/None
+        queue_seconds: 스케줄러 대기열에서 기다린 시간 (초)
+        total_seconds: 요청 전송부터 응답 완료까지의 시간 (초)
+        output_chunks: 스트리밍으로 받은 조각 수 (조기 종료로 eval_count가 없을 때 출력 토큰 수로 사용)
+        cache_hit: 응답 캐시에서 제공되었는지 여부
+
+    Returns:
+        호출 지표 dict
+    """
+    response_data = response_data or {}
+    output_tokens = response_data.get('eval_count') or output_chunks
+    eval_seconds = _seconds(response_data, 'eval_duration')
+    prompt_tokens = response_data.get('prompt_eval_count')
+    prompt_eval_seconds = _seconds(response_data, 'prompt_eval_duration')
+
+    tokens_per_second = None
+    if output_tokens and eval_seconds:
+        tokens_per_second = output_tokens / eval_seconds
+    elif output_tokens and total_seconds and not cache_hit:
+        # 스트림을 </json>에서 끊으면 done 줄이 없으므로 실측 시간으로 추정
+        tokens_per_second = output_tokens / total_seconds
+
+    return {
+        'model': model,
+        'cache_hit': cache_hit,
+        'prompt_tokens': prompt_tokens,
+        'output_tokens': output_tokens,
+        'tokens_per_second': _round(tokens_per_second, 1),
+        'prompt_tokens_per_second': _round(prompt_tokens / prompt_eval_seconds, 1)
+        if prompt_tokens and prompt_eval_seconds else None,
+        'load_seconds': _round(_seconds(response_data, 'load_duration')),
+        'queue_seconds': _round(queue_seconds),
+        'total_seconds': _round(total_seconds)
+    }
+
+
+def merge_call_stats(records: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    여러 호출(분할 생성 배치 등)의 지표를 하나로 합침
+
+    토큰 수와 시간은 합산하고, 초당 토큰 수는 전체 출력 토큰 / 전체 생성 시간으로 다시 계산합니다.
+
+    Args:
+        records: build_call_stats 결과 목록
+
+    Returns:
+        합친 지표 dict (records가 비어 있으면 None)
+    """
+    if not records:
+        return None
+
+    def total(field: str) -> Optional[float]:
+        values = [record[field] for record in records if record.get(field) is not None]
+        return sum(values) if values else None
+
+    output_tokens = total('output_tokens')
+    generating_seconds = sum(
+        record['output_tokens'] / record['tokens_per_second']
+        for record in records if record.get('output_tokens') and record.get('tokens_per_second')
+    )
+    return {
+        'model': records[0].get('model'),
+        'calls': len(records),
+        'cache_hit': all(record.get('cache_hit') for record in records),
+        'prompt_tokens': total('prompt_tokens'),
+        'output_tokens': output_tokens,
+        'tokens_per_second': _round(output_tokens / generating_seconds, 1)
+        if output_tokens and generating_seconds else None,
+        'prompt_tokens_per_second': None,
+        'load_seconds': _round(total('load_seconds')),
+        'queue_seconds': _round(total('queue_seconds')),
+        'total_seconds': _round(total('total_seconds'))
+    }
+
+
+def _percentile(sorted_values: List[float], percentile: int) -> float:
+    """정렬된 값의 nearest-rank 백분위수"""
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LLMTelemetry:
+    """모델별 최근 호출 지표를 모아 백분위수를 제공하는 집계기"""
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE, enabled: bool = True):
+        """
+        Args:
+            history_size: 모델별로 유지할 최근 호출 기록 수
+            enabled: 사용 여부
+        """
+        self.history_size = history_size
+        self.enabled = enabled
+        self._records: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._cache_hits = 0
+        self._lock = threading.Lock()
+
+    def record(self, stats: Dict[str, Any]):
+        """호출 1건 기록. 캐시 적중은 처리량을 왜곡하므로 횟수만 셉니다."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if stats.get('cache_hit'):
+                self._cache_hits += 1
+                return
+            model = stats.get('model') or 'unknown'
+            if model not in self._records:
+                self._records[model] = deque(maxlen=self.history_size)
+            self._records[model].append(stats)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """모델별 호출 수와 주요 지표의 p50/p90/p99 반환"""
+        with self._lock:
+            models = {}
+            for model, records in self._records.items():
+                summary: Dict[str, Any] = {'calls': len(records)}
+                for field in TRACKED_FIELDS:
+                    values = sorted(record[field] for record in records if record.get(field) is not None)
+                    if values:
+                        summary[field] = {f"p{p}": round(_percentile(values, p), 3) for p in PERCENTILES}
+                models[model] = summary
+            return {
+                'enabled': self.enabled,
+                'history_size': self.history_size,
+                'cache_hits': self._cache_hits,
+                'models': models
+            }
+
+
+# 전역 인스턴스 (지연 로딩)
+_llm_telemetry: Optional[LLMTelemetry] = None
+
+
+def get_llm_telemetry() -> LLMTelemetry:
+    """설정(config.json의 llm.telemetry)을 반영한 처리량 지표 집계기 싱글톤 반환"""
+    global _llm_telemetry
+    if _llm_telemetry is None:
+        config = load_config() or {}
+        telemetry_config = config.get('llm', {}).get('telemetry', {})
+        _llm_telemetry = LLMTelemetry(
+            history_size=telemetry_config.get('history_size', DEFAULT_HISTORY_SIZE),
+            enabled=telemetry_config.get('enabled', True)
+        )
+    return _llm_telemetry
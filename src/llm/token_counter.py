@@ -0,0 +1,210 @@
+"""
+프롬프트 토큰 수 계산
+대상 모델의 토크나이저(tokenizer.json)로 정확한 토큰 수를 세고,
+토크나이저를 쓸 수 없으면 문자 종류별 가중치로 빠르게 근사합니다.
+같은 텍스트(고정 머리말 등)는 다시 세지 않도록 결과를 LRU 캐시에 보관합니다.
+
+문자 수 기준(약 4자 = 1토큰)은 한국어에서 크게 빗나갑니다.
+한글 음절은 대부분 음절당 1토큰 안팎이고, 영문 코드는 4자 이상이 1토큰이 되기도 합니다.
+"""
+
+import logging
+import math
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from ..config_loader import load_config
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_CACHE_SIZE = 512
+ESTIMATE = "estimate"
+# 근사 계산용 문자 묶음: 영문 단어, 숫자, 공백, 한글 음절, 그 외 문자 1개
+_SEGMENT_PATTERN = re.compile(r"[A-Za-z]+|\d+|\s+|[가-힣]|.", re.DOTALL)
+
+
+def _segment_cost(segment: str) -> int:
+    """근사 계산에서 문자 묶음 하나가 차지하는 토큰 수"""
+    first = segment[0]
+    if first.isascii() and first.isalpha():
+        return math.ceil(len(segment) / 4)
+    if first.isdigit():
+        return math.ceil(len(segment) / 3)
+    if first.isspace():
+        # 단어 앞 공백 1개는 보통 다음 토큰에 합쳐짐 (코드 들여쓰기는 4칸 정도가 1토큰)
+        return 0 if segment == " " else math.ceil(len(segment) / 4)
+    return 1
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수 근사
+
+    영문 단어는 4자, 숫자는 3자당 1토큰, 한글 음절과 기호는 글자당 1토큰으로 셉니다.
+    BPE 토크나이저(Qwen, Llama 계열)의 실제 값보다 약간 크게 나오도록 잡아
+    컨텍스트를 넘치게 하기보다는 조금 덜 채우는 쪽을 택합니다.
+
+    Args:
+        text: 토큰 수를 셀 텍스트
+
+    Returns:
+        근사 토큰 수
+    """
+    return sum(_segment_cost(match.group()) for match in _SEGMENT_PATTERN.finditer(text or ""))
+
+
+def _truncate_estimate(text: str, max_tokens: int) -> str:
+    """근사 토큰 수가 max_tokens를 넘지 않는 가장 긴 앞부분"""
+    used = 0
+    for match in _SEGMENT_PATTERN.finditer(text):
+        used += _segment_cost(match.group())
+        if used > max_tokens:
+            return text[:match.start()]
+    return text
+
+
+class TokenCounter:
+    """모델별 토크나이저 기반 토큰 수 계산기 (토크나이저가 없으면 근사값 사용)"""
+
+    def __init__(self,
+                 tokenizers: Optional[Dict[str, str]] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            tokenizers: 모델명 또는 모델 계열(예: qwen3) -> tokenizer.json 경로, 이를 담은 폴더, 또는 HuggingFace 저장소 ID
+            cache_size: 토큰 수 캐시 최대 항목 수
+        """
+        self.tokenizers = tokenizers or {}
+        self.cache_size = cache_size
+        # 토크나이저 이름 -> 로드된 토크나이저 (로드 실패 시 None)
+        self._loaded: Dict[str, Any] = {}
+        self._cache: "OrderedDict[Tuple[str, int, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def _tokenizer_name(self, model: Optional[str]) -> Optional[str]:
+        """모델명(qwen3:8b)이나 계열(qwen3)에 설정된 토크나이저 이름"""
+        if not model:
+            return None
+        return self.tokenizers.get(model) or self.tokenizers.get(model.split(':')[0])
+
+    def _load(self, name: str):
+        """토크나이저 로드 (실패하면 한 번만 경고하고 근사 계산으로 전환)"""
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            tokenizer = None
+            try:
+                # sentence-transformers 의존성으로 설치되는 tokenizers 패키지 사용
+                from tokenizers import Tokenizer
+
+                path = Path(name)
+                if path.is_dir():
+                    path = path / "tokenizer.json"
+                if path.is_file():
+                    tokenizer = Tokenizer.from_file(str(path))
+                else:
+                    tokenizer = Tokenizer.from_pretrained(name)
+                logger.info(f"토크나이저 로드 완료: {name}")
+            except Exception as e:
+                logger.warning(f"토크나이저 로드 실패, 근사 토큰 수를 사용합니다: {name} ({e})")
+            self._loaded[name] = tokenizer
+            return tokenizer
+
+    def _get_tokenizer(self, model: Optional[str]):
+        name = self._tokenizer_name(model)
+        if name is None:
+            return None
+        if name in self._loaded:
+            return self._loaded[name]
+        return self._load(name)
+
+    def is_exact(self, model: Optional[str]) -> bool:
+        """해당 모델의 토큰 수를 실제 토크나이저로 세는지 여부"""
+        return self._get_tokenizer(model) is not None
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        """
+        텍스트의 토큰 수
+
+        Args:
+            text: 토큰 수를 셀 텍스트
+            model: 대상 모델명 (토크나이저 선택용)
+
+        Returns:
+            토큰 수 (토크나이저가 없으면 근사값)
+        """
+        if not text:
+            return 0
+        tokenizer = self._get_tokenizer(model)
+        key = (self._tokenizer_name(model) if tokenizer else ESTIMATE, len(text), hash(text))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._cache[key]
+            self._stats['misses'] += 1
+
+        if tokenizer is not None:
+            count = len(tokenizer.encode(text, add_special_tokens=False).ids)
+        else:
+            count = estimate_tokens(text)
+
+        with self._lock:
+            self._cache[key] = count
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def truncate(self, text: str, max_tokens: int, model: Optional[str] = None) -> str:
+        """
+        토큰 수가 max_tokens를 넘지 않도록 텍스트 뒷부분을 자름
+
+        Args:
+            text: 자를 텍스트
+            max_tokens: 최대 토큰 수
+            model: 대상 모델명
+
+        Returns:
+            max_tokens 이내의 앞부분 (이미 이내면 원문)
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text, model) <= max_tokens:
+            return text
+        tokenizer = self._get_tokenizer(model)
+        if tokenizer is None:
+            return _truncate_estimate(text, max_tokens)
+        encoding = tokenizer.encode(text, add_special_tokens=False)
+        return text[:encoding.offsets[max_tokens - 1][1]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 적중 통계와 토크나이저 로드 상태"""
+        with self._lock:
+            return {
+                'cache_entries': len(self._cache),
+                'cache_hits': self._stats['hits'],
+                'cache_misses': self._stats['misses'],
+                'tokenizers': {name: tokenizer is not None for name, tokenizer in self._loaded.items()}
+            }
+
+
+# 전역 인스턴스 (지연 로딩)
+_token_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """설정(config.json의 llm.tokenizer)을 반영한 토큰 수 계산기 싱글톤 반환"""
+    global _token_counter
+    if _token_counter is None:
+        config = load_config() or {}
+        tokenizer_config = config.get('llm', {}).get('tokenizer', {})
+        _token_counter = TokenCounter(
+            tokenizers=tokenizer_config.get('models', {}),
+            cache_size=tokenizer_config.get('cache_size', DEFAULT_CACHE_SIZE)
+        )
+    return _token_counter
@@ -0,0 +1,222 @@
+"""
+Ollama 모델 예열(warm-up) 및 상주 유지
+백엔드 시작 시 설정된 모델(모델 라우팅 사용 시 모든 후보 모델)을 모든 엔드포인트에 미리 로드하고,
+keep_alive 만료 전에 주기적으로 모델을 다시 호출해 메모리에서 내려가지 않도록 합니다.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, List, Optional, Union
+
+from ..config_loader import load_config
+from .endpoint_pool import get_endpoint_pool, OllamaEndpoint
+from .model_router import get_model_router
+from .scheduler import get_llm_scheduler, Priority
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_KEEP_ALIVE = "30m"
+DEFAULT_WARMUP_TIMEOUT = 300
+REFRESH_RATIO = 0.8
+MIN_REFRESH_SECONDS = 30.0
+WARMUP_PROMPT = "ping"
+DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+
+
+def parse_keep_alive(keep_alive: Union[str, int, float, None]) -> Optional[float]:
+    """
+    Ollama keep_alive 값을 초 단위로 변환
+
+    Args:
+        keep_alive: 초(숫자) 또는 "30m", "1h30m" 형식의 기간 문자열
+
+    Returns:
+        유지 시간(초). 음수(무기한 유지) 또는 해석 불가 시 None
+    """
+    if keep_alive is None:
+        return None
+    if isinstance(keep_alive, (int, float)):
+        return float(keep_alive) if keep_alive >= 0 else None
+
+    text = str(keep_alive).strip()
+    try:
+        seconds = float(text)
+        return seconds if seconds >= 0 else None
+    except ValueError:
+        pass
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', text)
+    if not parts or ''.join(n + u for n, u in parts) != text:
+        return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+class ModelWarmer:
+    """엔드포인트별 모델 예열 및 keep_alive 갱신 관리자"""
+
+    def __init__(self,
+                 model: str,
+                 keep_alive: Union[str, int, float, None] = DEFAULT_KEEP_ALIVE,
+                 enabled: bool = True,
+                 refresh_seconds: Optional[float] = None,
+                 timeout: float = DEFAULT_WARMUP_TIMEOUT,
+                 extra_models: Optional[List[str]] = None):
+        """
+        예열 관리자 초기화
+
+        Args:
+            model: 예열할 기본 모델명
+            keep_alive: Ollama에 전달할 keep_alive 값 (None이면 Ollama 기본값 사용)
+            enabled: 예열/상주 유지 사용 여부
+            refresh_seconds: 재호출 주기 (None이면 keep_alive의 80%)
+            timeout: 예열 요청 타임아웃 (모델 로드 시간 포함)
+            extra_models: 함께 예열/상주 유지할 모델 목록 (모델 라우팅 후보)
+        """
+        self.model = model
+        self.models = list(dict.fromkeys([model, *(extra_models or [])]))
+        self.keep_alive = keep_alive
+        self.enabled = enabled
+        self.timeout = timeout
+        if refresh_seconds is None:
+            keep_alive_seconds = parse_keep_alive(keep_alive)
+            if keep_alive_seconds is not None:
+                refresh_seconds = max(MIN_REFRESH_SECONDS, keep_alive_seconds * REFRESH_RATIO)
+        self.refresh_seconds = refresh_seconds
+        # (엔드포인트 주소, 모델) -> 상태
+        self._status: Dict[tuple, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _payload(self, model: str) -> Dict[str, Any]:
+        payload = {
+            "model": model,
+            "prompt": WARMUP_PROMPT,
+            "stream": False,
+            "options": {"num_predict": 1}
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    async def _touch(self, endpoint: OllamaEndpoint, model: str) -> bool:
+        """
+        단일 엔드포인트에 짧은 요청을 보내 모델을 로드/유지
+
+        생성 요청의 엔드포인트당 동시 실행 상한을 지키도록 스케줄러의 배치 우선순위 슬롯을 받아 실행하며,
+        그 사이 엔드포인트에 진행 중인 요청이 생기면 모델이 이미 사용 중이므로 요청을 보내지 않습니다.
+        """
+        status = self._status.setdefault((endpoint.url, model), {'state': 'pending'})
+        try:
+            async with get_llm_scheduler().slot(Priority.BATCH):
+                if endpoint.in_flight:
+                    if status.get('state') == 'ready':
+                        status['last_touched'] = time.time()
+                    return status.get('state') == 'ready'
+                if status.get('state') != 'ready':
+                    status['state'] = 'warming'
+                started = time.monotonic()
+                response = await endpoint.client.agenerate(self._payload(model), self.timeout)
+        except Exception as e:
+            status.update(state='failed', error=str(e) or e.__class__.__name__)
+            logger.warning(f"모델 예열 실패 ({endpoint.url}, {model}): {status['error']}")
+            return False
+
+        elapsed = time.monotonic() - started
+        if status.get('state') != 'ready':
+            # load_duration은 나노초 단위
+            load_seconds = response.get('load_duration', 0) / 1e9
+            status['load_seconds'] = round(load_seconds or elapsed, 2)
+            logger.info(f"모델 예열 완료 ({endpoint.url}, {model}): {status['load_seconds']}초")
+        status.update(state='ready', error=None, last_touched=time.time())
+        return True
+
+    async def warm_up(self) -> bool:
+        """모든 엔드포인트에 모든 모델을 예열. 한 곳이라도 성공하면 True."""
+        endpoints = get_endpoint_pool().endpoints
+        results = await asyncio.gather(*(self._touch(endpoint, model)
+                                         for endpoint in endpoints for model in self.models))
+        return any(results)
+
+    async def _run(self):
+        await self.warm_up()
+        if not self.refresh_seconds:
+            return
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.warm_up()
+
+    def start(self):
+        """백그라운드에서 예열 후 keep_alive 갱신 루프 시작 (서버 시작을 차단하지 않음)"""
+        if not self.enabled or self._task is not None:
+            return
+        logger.info(f"모델 예열 시작: {', '.join(self.models)} (keep_alive: {self.keep_alive}, 갱신 주기: {self.refresh_seconds}초)")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 작업 중단"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """예열 상태 반환 (/api/health 노출용)"""
+        if not self.enabled:
+            return {'model': self.model, 'state': 'disabled'}
+
+        now = time.time()
+        endpoints: List[Dict[str, Any]] = []
+        for endpoint in get_endpoint_pool().endpoints:
+            for model in self.models:
+                status = dict(self._status.get((endpoint.url, model), {'state': 'pending'}))
+                last_touched = status.pop('last_touched', None)
+                status['last_touched_ago'] = round(now - last_touched, 1) if last_touched else None
+                endpoints.append({'url': endpoint.url, 'model': model, **status})
+
+        states = {endpoint['state'] for endpoint in endpoints}
+        if 'ready' in states:
+            state = 'ready'
+        elif 'warming' in states:
+            state = 'warming'
+        elif states == {'failed'}:
+            state = 'failed'
+        else:
+            state = 'pending'
+        return {
+            'model': self.model,
+            'models': self.models,
+            'state': state,
+            'keep_alive': self.keep_alive,
+            'refresh_seconds': self.refresh_seconds,
+            'endpoints': endpoints
+        }
+
+
+# 전역 인스턴스 (지연 로딩)
+_model_warmer: Optional[ModelWarmer] = None
+
+
+def get_model_warmer() -> ModelWarmer:
+    """설정(config.json의 model_name, llm.warmup, llm.routing)을 반영한 예열 관리자 싱글톤 반환"""
+    global _model_warmer
+    if _model_warmer is None:
+        config = load_config() or {}
+        warmup_config = config.get('llm', {}).get('warmup', {})
+        # 라우터가 고를 수 있는 후보 모델은 모두 상주시켜 첫 요청에서 모델 로드를 기다리지 않도록 함
+        router = get_model_router()
+        routing_models = [candidate['name'] for candidate in router.models] if router.enabled else []
+        _model_warmer = ModelWarmer(
+            model=config.get('model_name', 'qwen3:8b'),
+            keep_alive=warmup_config.get('keep_alive', DEFAULT_KEEP_ALIVE),
+            enabled=warmup_config.get('enabled', True),
+            refresh_seconds=warmup_config.get('refresh_seconds'),
+            timeout=warmup_config.get('timeout', DEFAULT_WARMUP_TIMEOUT),
+            extra_models=routing_models
+        )
+    return _model_warmer
@@ -1,6 +1,20 @@
-import requests
+import asyncio
+import copy
+import json
+import time
+import httpx
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Awaitable, Union, Set, List
+
+from .llm.endpoint_pool import get_endpoint_pool, AcquireCallback
+from .llm.response_cache import get_llm_cache, make_cache_key
+from .llm.scheduler import get_llm_scheduler, Priority, QueueCallback
+from .llm.warmup import get_model_warmer
+from .llm.prefix_cache import get_prefix_cache
+from .llm.single_flight import get_single_flight
+from .llm.call_policy import get_call_policy, latency_key
+from .llm.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from .llm.telemetry import get_llm_telemetry, build_call_stats
 
 # Get a logger for this module
 logger = logging.getLogger(__name__)
@@ -8,60 +22,632 @@ logger = logging.getLogger(__name__)
 # Constants
 DEFAULT_MODEL = "qwen3:8b"
 DEFAULT_TIMEOUT = 600
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
 JSON_FORMAT = "json"
+JSON_BLOCK_START = "<json>"
+JSON_BLOCK_END = "</json>"
+
+# Receives the per-call telemetry record (see src/llm/telemetry.py)
+StatsCallback = Callable[[Dict[str, Any]], None]
 
 class OllamaAPIError(Exception):
     """Custom exception for Ollama API errors."""
     pass
 
-def _create_payload(prompt: str, model: str, format_type: str) -> Dict[str, Any]:
-    """Creates the payload for the Ollama API request."""
+def _create_payload(prompt: str, model: str, format_type: Union[str, Dict[str, Any]], stream: bool = False,
+                    options: Optional[Dict[str, Any]] = None, think: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Creates the payload for the Ollama API request.
+
+    ``format_type`` is either "json" or a JSON schema dict for structured output.
+    """
     payload = {
         "model": model,
         "prompt": prompt,
-        "stream": False
+        "stream": stream
     }
-    if format_type == JSON_FORMAT:
-        payload['format'] = JSON_FORMAT
+    if format_type == JSON_FORMAT or isinstance(format_type, dict):
+        payload['format'] = format_type
+    if options:
+        payload['options'] = options
+    if think is not None:
+        payload['think'] = think
+    keep_alive = get_model_warmer().keep_alive
+    if keep_alive is not None:
+        payload['keep_alive'] = keep_alive
     return payload
 
 def _send_request(payload: Dict[str, Any], timeout: int) -> Dict[str, Any]:
-    """Sends a request to the Ollama API and returns the response."""
+    """
+    Sends a request to the Ollama API over the shared connection pool (sync shim).
+
+    ``timeout`` is the upper bound; the call policy may use a shorter deadline
+    learned from recent latencies and retries transient failures.
+    """
+    pool = get_endpoint_pool()
+    try:
+        return get_call_policy().call(
+            latency_key(payload), len(payload['prompt']), timeout,
+            lambda deadline, tried: pool.generate(payload, deadline, avoid_urls=tried)
+        )
+    except httpx.HTTPError as e:
+        logger.exception("Ollama API request failed")
+        raise OllamaAPIError(f"Error calling Ollama API: {e}") from e
+
+async def _send_request_async(payload: Dict[str, Any], timeout: int,
+                              on_acquire: Optional[AcquireCallback] = None) -> Dict[str, Any]:
+    """
+    Sends a request to the Ollama API without blocking the event loop.
+
+    Retries go to a different endpoint when one is available; with hedging
+    enabled a slow request is duplicated to a second endpoint. ``on_acquire``
+    is called with each endpoint right before a request is sent to it.
+    """
+    pool = get_endpoint_pool()
     try:
-        response = requests.post(OLLAMA_API_URL, json=payload, timeout=timeout)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return await get_call_policy().acall(
+            latency_key(payload), len(payload['prompt']), timeout,
+            lambda deadline, tried: pool.agenerate(payload, deadline, avoid_urls=tried, on_acquire=on_acquire),
+            can_hedge=len(pool.endpoints) > 1
+        )
+    except httpx.HTTPError as e:
         logger.exception("Ollama API request failed")
-        raise OllamaAPIError(f"Error calling Ollama API: {e}")
+        raise OllamaAPIError(f"Error calling Ollama API: {e}") from e
+
+def _stopped_at_json_end(text: str, payload: Dict[str, Any], done_reason: Optional[str]) -> bool:
+    """
+    True when generation ended on the ``</json>`` stop sequence. Ollama strips
+    matched stop sequences from the output, so the tag has to be re-appended.
+    """
+    stops = payload.get('options', {}).get('stop') or []
+    if done_reason != 'stop' or JSON_BLOCK_END not in stops:
+        return False
+    start = text.rfind(JSON_BLOCK_START)
+    return start != -1 and JSON_BLOCK_END not in text[start:]
+
+def _extract_response_text(response_data: Dict[str, Any], model: str,
+                           payload: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Returns the stripped response text, or None when it is empty."""
+    response_text = response_data.get('response', '').strip()
+    if not response_text:
+        logger.warning("Ollama API returned an empty response.")
+        return None
+    if payload and _stopped_at_json_end(response_text, payload, response_data.get('done_reason')):
+        response_text += JSON_BLOCK_END
+
+    logger.info(f"Successfully received response from Ollama model '{model}'.")
+    return response_text
+
+def _static_prefix(prompt: str, prompt_prefix: Optional[str]) -> Optional[str]:
+    """Returns prompt_prefix only when the prompt really starts with it."""
+    if prompt_prefix and prompt.startswith(prompt_prefix):
+        return prompt_prefix
+    return None
+
+def _report_stats(stats: Dict[str, Any], on_stats: Optional[StatsCallback]):
+    """Adds the record to the rolling telemetry and hands it to the caller."""
+    get_llm_telemetry().record(stats)
+    if on_stats is not None:
+        on_stats(stats)
+
+def _lookup_cache(payload: Dict[str, Any], use_cache: bool):
+    """Returns (cache, key, cached_text) for the payload; cache is None when disabled."""
+    cache = get_llm_cache() if use_cache else None
+    if cache is None:
+        return None, None, None
+    key = make_cache_key(payload)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"LLM response cache hit for model '{payload['model']}'.")
+    return cache, key, cached
 
 def call_ollama_llm(
     prompt: str, 
     model: str = DEFAULT_MODEL, 
-    format: str = "", 
-    timeout: int = DEFAULT_TIMEOUT
+    format: Union[str, Dict[str, Any]] = "", 
+    timeout: int = DEFAULT_TIMEOUT,
+    use_cache: bool = True,
+    options: Optional[Dict[str, Any]] = None,
+    think: Optional[bool] = None,
+    on_stats: Optional[StatsCallback] = None
 ) -> Optional[str]:
     """
     Calls the Ollama API with a given prompt.
+
+    Identical (model, prompt, format, options) requests are served from the
+    response cache unless ``use_cache`` is False. ``options`` is passed to
+    Ollama as-is (num_predict, stop, ...); ``think=False`` disables the
+    model's own reasoning phase. ``on_stats`` receives the call's telemetry
+    record (tokens/sec, prompt tokens, load and queue time).
     """
     logger.info(f"Calling Ollama model '{model}'...")
     
     try:
-        payload = _create_payload(prompt, model, format)
-        response_data = _send_request(payload, timeout)
-        
-        response_text = response_data.get('response', '').strip()
-        if not response_text:
-            logger.warning("Ollama API returned an empty response.")
-            return None
-            
-        logger.info(f"Successfully received response from Ollama model '{model}'.")
+        payload = _create_payload(prompt, model, format, options=options, think=think)
+        cache, key, cached = _lookup_cache(payload, use_cache)
+        if cached is not None:
+            _report_stats(build_call_stats(model, None, cache_hit=True), on_stats)
+            return cached
+
+        breaker = get_circuit_breaker()
+        breaker.check()
+        started = time.monotonic()
+        with breaker.guard():
+            response_data = _send_request(payload, timeout)
+        _report_stats(build_call_stats(model, response_data, total_seconds=time.monotonic() - started), on_stats)
+        response_text = _extract_response_text(response_data, model, payload)
+        if cache is not None and response_text:
+            cache.set(key, response_text, model=model, generation_time=time.monotonic() - started)
         return response_text
     
+    except CircuitOpenError as e:
+        logger.warning(f"Ollama call skipped: {e}")
+        return None
     except OllamaAPIError as e:
         logger.error(f"Ollama API Error: {e}")
         return None
     except Exception as e:
         logger.exception("An unexpected error occurred in call_ollama_llm")
         return None
+
+async def acall_ollama_llm(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    format: Union[str, Dict[str, Any]] = "",
+    timeout: int = DEFAULT_TIMEOUT,
+    use_cache: bool = True,
+    priority: Priority = Priority.BATCH,
+    on_queue: Optional[QueueCallback] = None,
+    options: Optional[Dict[str, Any]] = None,
+    think: Optional[bool] = None,
+    prompt_prefix: Optional[str] = None,
+    on_stats: Optional[StatsCallback] = None
+) -> Optional[str]:
+    """
+    Async variant of call_ollama_llm for use inside FastAPI handlers.
+
+    Cache misses go through the global LLM scheduler; ``on_queue`` is awaited
+    with (queue position, estimated wait seconds) while the call is queued.
+    ``prompt_prefix`` marks the static head of ``prompt`` so other endpoints
+    can be primed with it (see src/llm/prefix_cache.py). An identical request
+    that is already in flight is joined instead of being sent again; joined
+    callers get the same telemetry record through ``on_stats``.
+
+    Raises:
+        CircuitOpenError: the circuit breaker is open and no call was made
+    """
+    logger.info(f"Calling Ollama model '{model}' (async)...")
+
+    try:
+        payload = _create_payload(prompt, model, format, options=options, think=think)
+        cache, key, cached = _lookup_cache(payload, use_cache)
+        if cached is not None:
+            _report_stats(build_call_stats(model, None, cache_hit=True), on_stats)
+            return cached
+
+        prefix = _static_prefix(prompt, prompt_prefix)
+        breaker = get_circuit_breaker()
+        # Fail fast instead of queueing behind a backend that is known to be down
+        breaker.check()
+
+        async def generate(publish):
+            prefix_cache = get_prefix_cache()
+            served: List[str] = []
+
+            def on_acquire(endpoint):
+                # The serving endpoint evaluates the prefix itself; prime the others
+                served.append(endpoint.url)
+                prefix_cache.schedule_priming(prefix, model, options, exclude_url=endpoint.url)
+
+            queued_at = time.monotonic()
+            async with get_llm_scheduler().slot(priority, on_wait=lambda *args: publish('queue', *args)):
+                started = time.monotonic()
+                with breaker.guard():
+                    response_data = await _send_request_async(payload, timeout, on_acquire=on_acquire)
+            elapsed = time.monotonic() - started
+            stats = build_call_stats(model, response_data, queue_seconds=started - queued_at, total_seconds=elapsed)
+            get_llm_telemetry().record(stats)
+            prefix_cache.record_usage(prefix, model, response_data, served[-1] if served else None)
+            response_text = _extract_response_text(response_data, model, payload)
+            if cache is not None and response_text:
+                cache.set(key, response_text, model=model, generation_time=elapsed)
+            return response_text, stats
+
+        async def listener(event, *args):
+            if event == 'queue' and on_queue is not None:
+                await on_queue(*args)
+
+        (response_text, stats), _ = await get_single_flight().do(
+            f"call:{make_cache_key(payload)}", generate, listener
+        )
+        if on_stats is not None:
+            on_stats(stats)
+        return response_text
+
+    except CircuitOpenError:
+        raise
+    except OllamaAPIError as e:
+        logger.error(f"Ollama API Error: {e}")
+        return None
+    except Exception as e:
+        logger.exception("An unexpected error occurred in acall_ollama_llm")
+        return None
+
+
+class JsonBlockExtractor:
+    """
+    Incrementally detects the <json>...</json> block in streamed LLM output.
+
+    Only the tail of the buffer that could still contain a partial tag is
+    re-scanned on each feed, so detection stays linear in the output size.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._scan_from = 0
+        self.start_index: Optional[int] = None
+        self.end_index: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    @property
+    def has_started(self) -> bool:
+        return self.start_index is not None
+
+    @property
+    def is_complete(self) -> bool:
+        return self.end_index is not None
+
+    @property
+    def json_text(self) -> Optional[str]:
+        """Returns the (stripped) block content once the closing tag has arrived."""
+        if not self.is_complete:
+            return None
+        return self._buffer[self.start_index:self.end_index].strip()
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Appends a chunk and returns True when this chunk closed the JSON block.
+        """
+        if self.is_complete or not chunk:
+            self._buffer += chunk or ""
+            return False
+
+        self._buffer += chunk
+
+        if self.start_index is None:
+            found = self._buffer.find(JSON_BLOCK_START, self._scan_from)
+            if found == -1:
+                self._scan_from = max(0, len(self._buffer) - len(JSON_BLOCK_START) + 1)
+                return False
+            self.start_index = found + len(JSON_BLOCK_START)
+            self._scan_from = self.start_index
+
+        found = self._buffer.find(JSON_BLOCK_END, self._scan_from)
+        if found == -1:
+            self._scan_from = max(self.start_index, len(self._buffer) - len(JSON_BLOCK_END) + 1)
+            return False
+
+        self.end_index = found
+        return True
+
+
+class LLMStreamChunk:
+    """A single incremental piece of streamed output."""
+
+    def __init__(self, text: str, token_count: int, elapsed: float,
+                 json_started: bool, json_complete: bool, done: bool):
+        self.text = text
+        self.token_count = token_count
+        self.elapsed = elapsed
+        self.json_started = json_started
+        self.json_complete = json_complete
+        self.done = done
+
+
+class LLMStreamResult:
+    """Final state of a streamed generation."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.extractor = JsonBlockExtractor()
+        self.token_count = 0
+        self.done = False
+        self.done_reason: Optional[str] = None
+        self.stopped_early = False
+        self.from_cache = False
+        self.coalesced = False
+        self.queue_wait = 0.0
+        self.elapsed = 0.0
+        self.first_token_seconds: Optional[float] = None
+        self.stats: Dict[str, Any] = {}
+
+    @property
+    def text(self) -> str:
+        return self.extractor.text
+
+    @property
+    def json_text(self) -> Optional[str]:
+        return self.extractor.json_text
+
+    @property
+    def telemetry(self) -> Dict[str, Any]:
+        """Throughput record built from Ollama's eval counters in the final stream line."""
+        return build_call_stats(self.model, self.stats, queue_seconds=self.queue_wait, total_seconds=self.elapsed,
+                                output_chunks=self.token_count, cache_hit=self.from_cache)
+
+    def parse_json(self) -> Dict[str, Any]:
+        """
+        Parses the extracted <json> block.
+
+        Raises:
+            OllamaAPIError: no complete <json> block was produced
+            json.JSONDecodeError: the block is not valid JSON
+        """
+        if self.json_text is None:
+            raise OllamaAPIError("No complete <json> block in LLM output.")
+        return json.loads(self.json_text)
+
+
+class OllamaStream:
+    """
+    Async iterator over a streamed Ollama generation.
+
+    Iterating yields LLMStreamChunk objects as NDJSON lines arrive; once
+    iteration finishes, ``result`` holds the full text and the extracted
+    JSON block. With ``stop_at_json_end`` the HTTP stream is closed as soon
+    as ``</json>`` arrives, which also stops generation on the Ollama side.
+    A response-cache hit is replayed as a single final chunk; only streams
+    that produced a complete <json> block are stored, or, in structured-output
+    mode (schema ``format``, no tags), streams that finished normally. Cache misses wait for
+    a slot in the global LLM scheduler before the request is sent, and the
+    timeout only starts counting once the slot is granted. The call policy's
+    learned deadline only bounds the time to the first token; once output
+    is flowing, the configured timeout applies. Transient failures
+    before any output arrives are retried on another endpoint. When
+    ``prompt_prefix`` is given, endpoints that have not evaluated that static
+    prefix yet are primed in the background. While the circuit breaker is
+    open, iteration raises CircuitOpenError before anything is queued.
+    """
+
+    def __init__(self, prompt: str, model: str, format: Union[str, Dict[str, Any]], timeout: float,
+                 stop_at_json_end: bool, use_cache: bool = True,
+                 priority: Priority = Priority.BATCH, on_queue: Optional[QueueCallback] = None,
+                 options: Optional[Dict[str, Any]] = None, think: Optional[bool] = None,
+                 prompt_prefix: Optional[str] = None):
+        self.payload = _create_payload(prompt, model, format, stream=True, options=options, think=think)
+        self.prompt_prefix = _static_prefix(prompt, prompt_prefix)
+        self.timeout = timeout
+        self.stop_at_json_end = stop_at_json_end
+        self.use_cache = use_cache
+        self.priority = priority
+        self.on_queue = on_queue
+        self.result = LLMStreamResult(model)
+        self._served_url: Optional[str] = None
+
+    def __aiter__(self) -> AsyncIterator[LLMStreamChunk]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[LLMStreamChunk]:
+        result = self.result
+        started = time.monotonic()
+        cache, key, cached = _lookup_cache(self.payload, self.use_cache)
+        if cached is not None:
+            result.extractor.feed(cached)
+            result.from_cache = True
+            result.done = True
+            result.done_reason = "cache"
+            get_llm_telemetry().record(result.telemetry)
+            yield LLMStreamChunk(
+                text=cached,
+                token_count=result.token_count,
+                elapsed=time.monotonic() - started,
+                json_started=result.extractor.has_started,
+                json_complete=result.extractor.is_complete,
+                done=True
+            )
+            return
+
+        breaker = get_circuit_breaker()
+        breaker.check()
+        async with get_llm_scheduler().slot(self.priority, on_wait=self.on_queue):
+            result.queue_wait = time.monotonic() - started
+            prefix_cache = get_prefix_cache()
+
+            # 출력이 전달되기 전에 발생한 일시적 오류만 다른 엔드포인트로 재시도
+            policy = get_call_policy()
+            profile = latency_key(self.payload)
+            prompt_chars = len(self.payload['prompt'])
+            timeout = policy.timeout_for(profile, prompt_chars, self.timeout)
+            tried: Set[str] = set()
+            attempt = 0
+            with breaker.guard():
+                while True:
+                    try:
+                        async for chunk in self._generate(cache, key, timeout, tried):
+                            yield chunk
+                        break
+                    except OllamaAPIError as e:
+                        if result.token_count or not policy.should_retry(e, attempt):
+                            policy.record_failure()
+                            raise
+                        timeout, delay = policy.prepare_retry(e, attempt, timeout, self.timeout)
+                        attempt += 1
+                        await asyncio.sleep(delay)
+            # 학습된 마감 시간은 첫 토큰까지만 적용하므로 첫 토큰 시간을 기록
+            policy.record(profile, prompt_chars, result.first_token_seconds or result.elapsed)
+            get_llm_telemetry().record(result.telemetry)
+            prefix_cache.record_usage(self.prompt_prefix, result.model, result.stats, self._served_url)
+
+    def _on_acquire(self, endpoint):
+        # The serving endpoint evaluates the prefix itself; prime the others
+        self._served_url = endpoint.url
+        get_prefix_cache().schedule_priming(self.prompt_prefix, self.result.model, self.payload.get('options'),
+                                            exclude_url=endpoint.url)
+
+    def _is_cacheable(self) -> bool:
+        """
+        A tagged stream is complete once its <json> block closed. Schema-format
+        output carries no tags, so it counts once Ollama reports a normal finish
+        (not cut off by num_predict).
+        """
+        result = self.result
+        if result.extractor.is_complete:
+            return True
+        structured = isinstance(self.payload.get('format'), dict)
+        return structured and result.done and result.done_reason != 'length' and bool(result.text.strip())
+
+    async def _generate(self, cache, key, timeout: float, tried: Set[str]) -> AsyncIterator[LLMStreamChunk]:
+        result = self.result
+        started = time.monotonic()
+        # The learned deadline bounds time-to-first-token; a stream that is producing output runs to the configured timeout
+        deadline = started + timeout
+        logger.info(f"Streaming from Ollama model '{result.model}'...")
+
+        try:
+            async with get_endpoint_pool().astream(self.payload, timeout, avoid_urls=tried,
+                                                   on_acquire=self._on_acquire) as response:
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode('utf-8', errors='ignore')
+                    error = httpx.HTTPStatusError(body, request=response.request, response=response)
+                    raise OllamaAPIError(f"Ollama API returned HTTP {response.status_code}: {body}") from error
+
+                async for line in response.aiter_lines():
+                    if time.monotonic() > deadline:
+                        # Chain a timeout cause so retry policy and breaker treat it like a read timeout
+                        limit = deadline - started
+                        error = httpx.ReadTimeout(f"stream exceeded deadline of {limit:.0f}s")
+                        raise OllamaAPIError(f"Ollama stream exceeded timeout of {limit:.0f}s") from error
+                    if not line.strip():
+                        continue
+
+                    data = json.loads(line)
+                    if data.get('error'):
+                        raise OllamaAPIError(f"Ollama API error: {data['error']}")
+
+                    piece = data.get('response', '')
+                    closed = result.extractor.feed(piece)
+                    if result.first_token_seconds is None and (piece or data.get('thinking')):
+                        result.first_token_seconds = time.monotonic() - started
+                        deadline = started + max(timeout, self.timeout)
+                    if piece:
+                        result.token_count += 1
+
+                    if data.get('done'):
+                        result.done = True
+                        result.done_reason = data.get('done_reason')
+                        result.stats = {k: v for k, v in data.items() if k not in ('response', 'context')}
+                        if _stopped_at_json_end(result.text, self.payload, result.done_reason):
+                            result.extractor.feed(JSON_BLOCK_END)
+                            piece += JSON_BLOCK_END
+
+                    result.elapsed = time.monotonic() - started
+                    yield LLMStreamChunk(
+                        text=piece,
+                        token_count=result.token_count,
+                        elapsed=result.elapsed,
+                        json_started=result.extractor.has_started,
+                        json_complete=result.extractor.is_complete,
+                        done=result.done
+                    )
+
+                    if result.done:
+                        break
+                    if closed and self.stop_at_json_end:
+                        result.stopped_early = True
+                        logger.info("JSON block closed; ending Ollama stream early.")
+                        break
+        except httpx.HTTPError as e:
+            logger.exception("Ollama streaming request failed")
+            raise OllamaAPIError(f"Error calling Ollama API: {e}") from e
+        except json.JSONDecodeError as e:
+            raise OllamaAPIError(f"Malformed line in Ollama stream: {e}")
+
+        result.elapsed = time.monotonic() - started
+        if cache is not None and self._is_cacheable():
+            cache.set(key, result.text, model=result.model, generation_time=result.elapsed)
+        logger.info(
+            f"Ollama stream finished: {result.token_count} chunks in {result.elapsed:.1f}s "
+            f"(json_complete={result.extractor.is_complete}, stopped_early={result.stopped_early})"
+        )
+
+
+def stream_ollama_llm(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    format: Union[str, Dict[str, Any]] = "",
+    timeout: int = DEFAULT_TIMEOUT,
+    stop_at_json_end: bool = True,
+    use_cache: bool = True,
+    priority: Priority = Priority.BATCH,
+    on_queue: Optional[QueueCallback] = None,
+    options: Optional[Dict[str, Any]] = None,
+    think: Optional[bool] = None,
+    prompt_prefix: Optional[str] = None
+) -> OllamaStream:
+    """
+    Streams a generation from Ollama.
+
+    Usage::
+
+        stream = stream_ollama_llm(prompt, model=model_name)
+        async for chunk in stream:
+            ...  # chunk.text, chunk.token_count, chunk.json_complete
+        result_json = stream.result.parse_json()
+    """
+    return OllamaStream(prompt, model, format, timeout, stop_at_json_end, use_cache=use_cache,
+                        priority=priority, on_queue=on_queue, options=options, think=think,
+                        prompt_prefix=prompt_prefix)
+
+
+async def collect_ollama_stream(
+    prompt: str,
+    model: str = DEFAULT_MODEL,
+    format: Union[str, Dict[str, Any]] = "",
+    timeout: int = DEFAULT_TIMEOUT,
+    on_progress: Optional[Callable[[LLMStreamChunk], Awaitable[None]]] = None,
+    progress_interval: float = 1.0,
+    stop_at_json_end: bool = True,
+    use_cache: bool = True,
+    priority: Priority = Priority.BATCH,
+    on_queue: Optional[QueueCallback] = None,
+    options: Optional[Dict[str, Any]] = None,
+    think: Optional[bool] = None,
+    prompt_prefix: Optional[str] = None
+) -> LLMStreamResult:
+    """
+    Consumes a stream to completion, invoking ``on_progress`` at most once per
+    ``progress_interval`` seconds (and once more when the JSON block closes).
+    ``on_queue`` reports the queue position while waiting for a scheduler slot.
+
+    When an identical stream is already in flight, this caller attaches to it:
+    it receives the same progress events and a copy of the final result with
+    ``coalesced`` set, and no second generation is started.
+    """
+    stream = stream_ollama_llm(prompt, model=model, format=format, timeout=timeout,
+                               stop_at_json_end=stop_at_json_end, use_cache=use_cache,
+                               priority=priority, options=options, think=think,
+                               prompt_prefix=prompt_prefix)
+
+    async def consume(publish):
+        stream.on_queue = lambda *args: publish('queue', *args)
+        last_report = 0.0
+        async for chunk in stream:
+            if chunk.json_complete or chunk.done or chunk.elapsed - last_report >= progress_interval:
+                last_report = chunk.elapsed
+                await publish('progress', chunk)
+        return stream.result
+
+    async def listener(event, *args):
+        if event == 'progress' and on_progress is not None:
+            await on_progress(*args)
+        elif event == 'queue' and on_queue is not None:
+            await on_queue(*args)
+
+    key = f"stream:{stop_at_json_end}:{make_cache_key(stream.payload)}"
+    result, shared = await get_single_flight().do(key, consume, listener)
+    if shared:
+        result = copy.copy(result)
+        result.coalesced = True
+    return result
@@ -5,9 +5,13 @@
 
 from typing import Dict, List, Tuple, Optional
 from src.feedback_manager import FeedbackManager
+from src.llm.token_counter import get_token_counter
 import re
 import json
 
+# 피드백 예시를 포함한 프롬프트의 최대 토큰 수
+MAX_ENHANCED_PROMPT_TOKENS = 8000
+
 class PromptEnhancer:
     def __init__(self, feedback_manager: FeedbackManager):
         """프롬프트 개선기 초기화"""
@@ -199,8 +203,8 @@ class PromptEnhancer:
         
         return good_scenarios, bad_scenarios
     
-    def enhance_prompt(self, base_prompt: str) -> str:
-        """기본 프롬프트에 피드백 기반 개선사항 추가"""
+    def enhance_prompt(self, base_prompt: str, model: Optional[str] = None) -> str:
+        """기본 프롬프트에 피드백 기반 개선사항 추가 (model은 토큰 수 계산에 사용할 토크나이저 선택용)"""
         stats = self.feedback_manager.get_feedback_stats()
         
         # 피드백이 충분하지 않으면 기본 프롬프트 반환
@@ -251,9 +255,10 @@ class PromptEnhancer:
         enhanced_prompt += "\n🎯 중요: 위의 실제 사용자 피드백과 예시를 면밀히 분석하여, 사용자가 만족할 만한 고품질 테스트 시나리오를 생성해주세요.\n"
         enhanced_prompt += "사용자의 구체적인 의견과 표현 방식을 참고하여 더 나은 결과를 만들어주세요.\n"
         
-        # 프롬프트 크기 제한 (약 8000 토큰 제한)
-        if len(enhanced_prompt) > 32000:  # 대략적인 토큰 제한
-            print(f"⚠️ 프롬프트가 너무 길어서 일부 내용을 제거합니다. (길이: {len(enhanced_prompt)})")
+        # 프롬프트 크기 제한 (대상 모델 토크나이저 기준)
+        prompt_tokens = get_token_counter().count(enhanced_prompt, model)
+        if prompt_tokens > MAX_ENHANCED_PROMPT_TOKENS:
+            print(f"⚠️ 프롬프트가 너무 길어서 일부 내용을 제거합니다. (토큰 수: {prompt_tokens})")
             # 기본 프롬프트 + 개선 지침만 유지
             enhanced_prompt = base_prompt + f"\n\n{enhancement_instructions}\n"
             enhanced_prompt += "\n🎯 중요: 위의 개선 지침을 참고하여 고품질 테스트 시나리오를 생성해주세요.\n"
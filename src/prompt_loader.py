@@ -5,6 +5,7 @@ from .vector_db.rag_manager import RAGManager
 from .vector_db.document_indexer import DocumentIndexer
 from .feedback_manager import FeedbackManager
 from .prompt_enhancer import PromptEnhancer
+from .llm.token_counter import get_token_counter
 
 # 전역 인스턴스들 (지연 로딩을 위해 None으로 시작)
 _rag_manager = None
@@ -70,24 +71,60 @@ def load_prompt(path="prompts/final_prompt.txt"):
         print(f"오류: 프롬프트 파일('{path}')을 찾을 수 없습니다.")
         return None
 
-def create_final_prompt(
+PROMPT_TEMPLATE_PATH = "prompts/final_prompt.txt"
+FAST_PROMPT_TEMPLATE_PATH = "prompts/final_prompt_fast.txt"
+STRUCTURED_PROMPT_TEMPLATE_PATH = "prompts/final_prompt_structured.txt"
+PERFORMANCE_PROMPT_TOKEN_LIMIT = 8000   # 성능 모드 프롬프트 최대 토큰 수
+
+def _template_head(template: str) -> str:
+    """
+    템플릿에서 {git_analysis} 섹션 제목 앞까지의 고정 지시문을 반환합니다.
+    (RAG 참조 정보는 섹션 제목 위치에 삽입되므로 머리말에 포함되지 않음)
+    """
+    placeholder = template.find('{git_analysis}')
+    if placeholder == -1:
+        return ""
+    heading = template.rfind('###', 0, placeholder)
+    head = template[:heading if heading != -1 else placeholder]
+    return head.replace('{{', '{').replace('}}', '}')
+
+def build_prompt_parts(
         git_analysis: str,
         use_rag: bool = True,
         use_feedback_enhancement: bool = True,
-        performance_mode: bool = False
-) -> str:
+        performance_mode: bool = False,
+        fast_mode: bool = False,
+        structured_output: bool = False,
+        model: str = None
+):
     """
-    프롬프트 템플릿을 로드하고, RAG·피드백을 반영해 최종 프롬프트를 생성한다.
+    최종 프롬프트를 (고정 머리말, 가변 본문) 두 부분으로 생성한다.
+
+    머리말은 템플릿 지시문과 피드백 개선 블록으로 구성되어 같은 템플릿 버전에서는 항상 동일하므로,
+    LLM 서버가 이 구간의 프롬프트 평가 결과(KV 캐시)를 재사용할 수 있다.
+    본문은 RAG 참조 정보와 Git 분석 결과, 출력 형식 안내를 포함한다.
 
     Args:
         git_analysis                : Git 변경 분석 결과
         use_rag                     : RAG 사용 여부
         use_feedback_enhancement    : 피드백 기반 개선 적용 여부
         performance_mode            : True 시 프롬프트 길이를 제한해 속도 우선
+        fast_mode                   : True 시 <thinking> 없이 JSON만 요청하는 템플릿 사용
+        structured_output           : True 시 태그 없이 순수 JSON만 요청하는 템플릿 사용 (스키마 format과 함께 사용)
+        model                       : 대상 모델명 (토큰 수 계산에 사용할 토크나이저 선택)
+
+    Returns:
+        (prefix, suffix) 튜플. 템플릿을 읽지 못하면 (None, None)
     """
-    template = load_prompt()
+    if structured_output:
+        template_path = STRUCTURED_PROMPT_TEMPLATE_PATH
+    elif fast_mode:
+        template_path = FAST_PROMPT_TEMPLATE_PATH
+    else:
+        template_path = PROMPT_TEMPLATE_PATH
+    template = load_prompt(template_path)
     if not template:
-        return None
+        return None, None
 
     final_prompt = None
 
@@ -107,11 +144,21 @@ def create_final_prompt(
     if final_prompt is None:
         final_prompt = template.format(git_analysis=git_analysis)
 
-    # 피드백 기반 프롬프트 개선 적용
+    # 고정 머리말과 가변 본문 분리 (머리말이 일치하지 않으면 전체를 본문으로 취급)
+    head = _template_head(template)
+    if head and final_prompt.startswith(head):
+        prefix, suffix = head, final_prompt[len(head):]
+    else:
+        prefix, suffix = "", final_prompt
+
+    # 피드백 기반 프롬프트 개선 적용 (개선 블록은 머리말 뒤에 붙여 고정 구간에 포함)
     if use_feedback_enhancement:
         try:
             prompt_enhancer = get_prompt_enhancer()
-            enhanced_prompt = prompt_enhancer.enhance_prompt(final_prompt)
+            if prefix:
+                prefix = prompt_enhancer.enhance_prompt(prefix, model=model)
+            else:
+                suffix = prompt_enhancer.enhance_prompt(suffix, model=model)
 
             # 개선 요약 출력 (디버깅용)
             enhancement_summary = prompt_enhancer.get_enhancement_summary()
@@ -120,19 +167,56 @@ def create_final_prompt(
                 print(f"평균 점수: {enhancement_summary['average_score']:.1f}/5.0")
                 if enhancement_summary['improvement_areas']:
                     print(f"개선 영역: {', '.join(enhancement_summary['improvement_areas'])}")
-
-            return enhanced_prompt
         except Exception as e:
             print(f"피드백 기반 프롬프트 개선 중 오류 발생: {e}")
             print("기본 프롬프트를 사용합니다.")
 
     # --- NEW : 성능 모드 프롬프트 길이 제한 ----------------
-    if performance_mode and len(final_prompt) > 32000:   # ≒ 8k 토큰
-        print(f"[PERF] Prompt length {len(final_prompt)} > 32 000 → trimming.")
-        final_prompt = final_prompt[:32000]
+    if performance_mode:
+        token_counter = get_token_counter()
+        prefix_tokens = token_counter.count(prefix, model)
+        total_tokens = prefix_tokens + token_counter.count(suffix, model)
+        if total_tokens > PERFORMANCE_PROMPT_TOKEN_LIMIT:
+            print(f"[PERF] Prompt tokens {total_tokens} > {PERFORMANCE_PROMPT_TOKEN_LIMIT} → trimming.")
+            # 머리말은 캐시 재사용을 위해 유지하고 본문 끝을 자름
+            suffix = token_counter.truncate(suffix, PERFORMANCE_PROMPT_TOKEN_LIMIT - prefix_tokens, model)
     # ------------------------------------------------------
 
-    return final_prompt
+    return prefix, suffix
+
+def create_final_prompt(
+        git_analysis: str,
+        use_rag: bool = True,
+        use_feedback_enhancement: bool = True,
+        performance_mode: bool = False,
+        fast_mode: bool = False,
+        structured_output: bool = False,
+        model: str = None
+) -> str:
+    """
+    프롬프트 템플릿을 로드하고, RAG·피드백을 반영해 최종 프롬프트를 생성한다.
+
+    Args:
+        git_analysis                : Git 변경 분석 결과
+        use_rag                     : RAG 사용 여부
+        use_feedback_enhancement    : 피드백 기반 개선 적용 여부
+        performance_mode            : True 시 프롬프트 길이를 제한해 속도 우선
+        fast_mode                   : True 시 <thinking> 없이 JSON만 요청하는 템플릿 사용
+        structured_output           : True 시 태그 없이 순수 JSON만 요청하는 템플릿 사용
+        model                       : 대상 모델명 (토큰 수 계산에 사용할 토크나이저 선택)
+    """
+    prefix, suffix = build_prompt_parts(
+        git_analysis,
+        use_rag=use_rag,
+        use_feedback_enhancement=use_feedback_enhancement,
+        performance_mode=performance_mode,
+        fast_mode=fast_mode,
+        structured_output=structured_output,
+        model=model
+    )
+    if prefix is None:
+        return None
+    return prefix + suffix
 
 def add_git_analysis_to_rag(git_analysis, repo_path):
     """
@@ -0,0 +1,371 @@
+"""
+LLM 응답 파싱 모듈
+<json> 태그 블록 또는 구조화 출력(순수 JSON)에서 시나리오 JSON을 한 번에 추출하고,
+형식이 조금 어긋난 경우 관대한 복구(repair)를 시도해 재생성 없이 결과를 살립니다.
+전체를 복구할 수 없으면 완결된 테스트 케이스만이라도 살리고, 무엇을 고쳤는지 보고합니다.
+"""
+
+import json
+import logging
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+JSON_BLOCK_START = "<json>"
+JSON_BLOCK_END = "</json>"
+CODE_FENCE_PATTERN = re.compile(r'```(?:json)?\s*(.*?)(?:```|$)', re.DOTALL)
+TEST_CASES_ARRAY_PATTERN = re.compile(r'"Test Cases"\s*:\s*\[')
+SCENARIO_TEXT_FIELDS = ("Scenario Description", "Test Scenario Name")
+VALID_ESCAPES = '"\\/bfnrtu'
+# 문자열을 닫는 따옴표 뒤에 올 수 있는 문자 (그 밖의 문자가 오면 문자열 안의 따옴표로 봄)
+STRING_END_FOLLOWERS = (',', ':', '}', ']', '\n', '\r', '')
+
+
+def extract_json_candidate(text: str) -> Optional[str]:
+    """
+    응답 텍스트에서 JSON으로 보이는 구간 추출
+
+    우선순위: <json> 블록(닫는 태그가 없으면 끝까지) → 코드 펜스 → 첫 '{'부터 마지막 '}'까지
+    (첫 '{'의 괄호가 닫히지 않은 잘린 출력이면 끝까지 남겨 복구 단계에서 잘림으로 처리)
+
+    Args:
+        text: LLM 응답 원문
+
+    Returns:
+        JSON 후보 문자열 또는 None
+    """
+    if not text:
+        return None
+
+    start = text.find(JSON_BLOCK_START)
+    if start != -1:
+        end = text.find(JSON_BLOCK_END, start)
+        body = text[start + len(JSON_BLOCK_START):end if end != -1 else len(text)]
+        return body.strip()
+
+    fence = CODE_FENCE_PATTERN.search(text)
+    if fence and '{' in fence.group(1):
+        text = fence.group(1)
+
+    brace = text.find('{')
+    if brace == -1:
+        return None
+    last = text.rfind('}')
+    if last < brace or _find_closing(text, brace) == -1:
+        return text[brace:].strip()
+    return text[brace:last + 1].strip()
+
+
+def _next_significant(text: str, i: int) -> str:
+    """i 위치부터 공백(줄바꿈 제외)을 건너뛴 다음 문자 (끝이면 빈 문자열)"""
+    while i < len(text) and text[i] in ' \t':
+        i += 1
+    return text[i] if i < len(text) else ''
+
+
+def _repair(text: str) -> Tuple[str, List[str], int]:
+    """
+    repair_json() 본체
+
+    Returns:
+        (복구된 JSON 문자열, 적용한 복구 종류 목록, 원문에 있던 부분의 길이)
+        마지막 값은 잘린 출력을 닫기 위해 덧붙인 괄호가 시작되는 위치로, 완결된 테스트 케이스 판별에 사용
+    """
+    out = []
+    stack = []
+    repairs = []
+    in_string = False
+    escaped = False
+    value_ended = False
+
+    def note(kind: str):
+        if kind not in repairs:
+            repairs.append(kind)
+
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+                if ch not in VALID_ESCAPES:
+                    # 윈도우 경로 등 JSON에 없는 이스케이프는 역슬래시를 그대로 살림
+                    out.append('\\')
+                    note('invalid_escapes')
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                if _next_significant(text, i + 1) in STRING_END_FOLLOWERS:
+                    in_string = False
+                    value_ended = True
+                else:
+                    # 문자열 안의 이스케이프되지 않은 따옴표 (예: "버튼 "저장" 클릭")
+                    ch = '\\"'
+                    note('unescaped_quotes')
+            elif ch in '\n\t\r':
+                ch = {'\n': '\\n', '\t': '\\t', '\r': ''}[ch]
+                note('unescaped_control_chars')
+            out.append(ch)
+            i += 1
+            continue
+
+        if ch == '/' and text.startswith('//', i):
+            newline = text.find('\n', i)
+            i = len(text) if newline == -1 else newline
+            note('comments')
+            continue
+        if ch == '/' and text.startswith('/*', i):
+            close = text.find('*/', i + 2)
+            i = len(text) if close == -1 else close + 2
+            note('comments')
+            continue
+
+        if value_ended and ch in '"{[':
+            # 값과 값 사이에 빠진 쉼표
+            out.append(',')
+            note('missing_commas')
+        if not ch.isspace():
+            value_ended = False
+
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if stack and stack[-1] == ch:
+                stack.pop()
+                value_ended = True
+                # 닫는 괄호 앞의 후행 쉼표 제거
+                while out and out[-1].isspace():
+                    out.pop()
+                if out and out[-1] == ',':
+                    out.pop()
+                    note('trailing_commas')
+            else:
+                # 짝이 맞지 않는 닫는 괄호는 버림
+                note('unbalanced_brackets')
+                i += 1
+                continue
+        out.append(ch)
+        i += 1
+
+    repaired = ''.join(out)
+    if in_string:
+        if escaped:
+            repaired = repaired[:-1]
+        repaired += '"'
+        note('truncated')
+    complete_length = len(repaired)
+    if stack:
+        # 잘린 출력: 마지막 완결된 값 뒤에서 끊고 열린 괄호를 닫음
+        repaired = re.sub(r'[,:]\s*$', '', repaired.rstrip())
+        if stack[-1] == '}':
+            # 값 없이 남은 키 제거
+            repaired = re.sub(r'([{,])\s*"[^"]*"\s*$', r'\1', repaired)
+            repaired = re.sub(r',\s*$', '', repaired)
+        complete_length = min(complete_length, len(repaired))
+        repaired += ''.join(reversed(stack))
+        note('truncated')
+    return repaired, repairs, complete_length
+
+
+def repair_json(text: str) -> str:
+    """
+    흔한 LLM JSON 형식 오류 복구
+
+    - // 및 /* */ 주석 제거
+    - 문자열 안의 날것 줄바꿈/탭 이스케이프, 잘못된 이스케이프(\\U 등)와 따옴표 이스케이프
+    - 닫히지 않은 문자열과 괄호 닫기 (출력이 잘린 경우)
+    - 닫는 괄호 앞의 후행 쉼표 제거, 값 사이에 빠진 쉼표 추가
+
+    Args:
+        text: JSON 후보 문자열
+
+    Returns:
+        복구된 JSON 문자열
+    """
+    return _repair(text)[0]
+
+
+def _find_closing(text: str, start: int) -> int:
+    """start 위치의 '{'와 짝이 맞는 '}' 위치 (없으면 -1)"""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def salvage_test_cases(repaired: str, complete_length: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    복구된 JSON의 "Test Cases" 배열에서 완결된 테스트 케이스만 하나씩 살림
+
+    전체 문서가 파싱되지 않아도 항목 단위로 파싱하므로, 한 항목이 깨져도 나머지는 살아남습니다.
+
+    Args:
+        repaired: repair_json()으로 복구한 JSON 문자열
+        complete_length: 원문에 있던 부분의 길이. 이 위치를 넘어서 닫힌 항목은 잘린 항목으로 보고 버림
+
+    Returns:
+        (완결된 테스트 케이스 목록, 버린 항목 수)
+    """
+    if complete_length is None:
+        complete_length = len(repaired)
+    match = TEST_CASES_ARRAY_PATTERN.search(repaired)
+    if not match:
+        return [], 0
+
+    test_cases = []
+    dropped = 0
+    i = match.end()
+    while i < len(repaired):
+        ch = repaired[i]
+        if ch == ']':
+            break
+        if ch != '{':
+            i += 1
+            continue
+        end = _find_closing(repaired, i)
+        if end == -1 or end >= complete_length:
+            dropped += 1
+            break
+        try:
+            test_case = json.loads(repaired[i:end + 1])
+        except json.JSONDecodeError:
+            test_case = None
+        if isinstance(test_case, dict):
+            test_cases.append(test_case)
+        else:
+            dropped += 1
+        i = end + 1
+    return test_cases, dropped
+
+
+def _salvage_scenario(repaired: str, complete_length: int) -> Tuple[Dict[str, Any], int]:
+    """전체 파싱에 실패한 응답에서 시나리오 제목/개요와 완결된 테스트 케이스를 모아 새 객체로 구성"""
+    result = {}
+    for field in SCENARIO_TEXT_FIELDS:
+        match = re.search(r'"%s"\s*:\s*("(?:[^"\\]|\\.)*")' % re.escape(field), repaired)
+        if match:
+            try:
+                result[field] = json.loads(match.group(1))
+            except json.JSONDecodeError:
+                pass
+    test_cases, dropped = salvage_test_cases(repaired, complete_length)
+    result['Test Cases'] = test_cases
+    return result, dropped
+
+
+def parse_scenario_json_with_report(text: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    LLM 응답에서 시나리오 JSON 객체를 파싱하고, 복구가 필요했다면 무엇을 고쳤는지 함께 반환
+
+    1. 그대로 파싱 (정상 응답은 추가 비용 없음)
+    2. 실패하면 repair_json()으로 복구 후 파싱. 출력이 잘렸다면 잘린 마지막 테스트 케이스는 버림
+    3. 그래도 실패하면 "Test Cases"에서 완결된 테스트 케이스만 항목 단위로 살림
+
+    Args:
+        text: LLM 응답 원문 (<json> 블록 또는 순수 JSON)
+
+    Returns:
+        (파싱된 JSON 객체, 복구 보고서 또는 None(복구 없음))
+        복구 보고서는 {'repairs': 적용한 복구 종류 목록, 'test_cases': 살린 테스트 케이스 수,
+        'dropped_test_cases': 잘렸거나 깨져서 버린 테스트 케이스 수}
+
+    Raises:
+        json.JSONDecodeError: JSON을 찾지 못했거나 살릴 수 있는 테스트 케이스가 없는 경우
+    """
+    candidate = extract_json_candidate(text)
+    if candidate is None:
+        raise json.JSONDecodeError("LLM 응답에서 JSON 객체를 찾을 수 없습니다.", text or "", 0)
+
+    try:
+        result = json.loads(candidate)
+    except json.JSONDecodeError as original_error:
+        repaired, repairs, complete_length = _repair(candidate)
+        dropped = 0
+        try:
+            result = json.loads(repaired)
+            if 'truncated' in repairs and isinstance(result, dict) and isinstance(result.get('Test Cases'), list):
+                test_cases, dropped = salvage_test_cases(repaired, complete_length)
+                if dropped:
+                    result['Test Cases'] = test_cases
+        except json.JSONDecodeError:
+            result, dropped = _salvage_scenario(repaired, complete_length)
+            if not result['Test Cases']:
+                raise original_error
+            repairs.append('salvaged_test_cases')
+
+        if isinstance(result, dict):
+            report = {
+                'repairs': repairs,
+                'test_cases': len(result.get('Test Cases') or []),
+                'dropped_test_cases': dropped
+            }
+            logger.warning(f"LLM 응답 JSON을 복구하여 파싱했습니다. (원래 오류: {original_error}, 복구: {', '.join(repairs)}, "
+                           f"테스트 케이스 {report['test_cases']}개 복구 / {dropped}개 버림)")
+            return result, report
+
+    if not isinstance(result, dict):
+        raise json.JSONDecodeError("LLM 응답 JSON이 객체 형식이 아닙니다.", candidate, 0)
+    return result, None
+
+
+def parse_scenario_json(text: str) -> Dict[str, Any]:
+    """
+    LLM 응답에서 시나리오 JSON 객체를 파싱
+
+    먼저 그대로 파싱하고, 실패하면 복구/부분 복구를 시도합니다. (parse_scenario_json_with_report 참고)
+
+    Args:
+        text: LLM 응답 원문 (<json> 블록 또는 순수 JSON)
+
+    Returns:
+        파싱된 JSON 객체(dict)
+
+    Raises:
+        json.JSONDecodeError: JSON을 찾지 못했거나 복구 후에도 파싱할 수 없는 경우
+    """
+    return parse_scenario_json_with_report(text)[0]
+
+
+def merge_repair_reports(reports: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    분할 생성 배치별 복구 보고서 합치기
+
+    Args:
+        reports: 배치별 복구 보고서 (복구 없는 배치는 None)
+
+    Returns:
+        합친 보고서 (복구한 배치가 없으면 None)
+    """
+    reports = [report for report in reports if report]
+    if not reports:
+        return None
+    repairs = []
+    for report in reports:
+        repairs.extend(kind for kind in report['repairs'] if kind not in repairs)
+    return {
+        'repairs': repairs,
+        'test_cases': sum(report['test_cases'] for report in reports),
+        'dropped_test_cases': sum(report['dropped_test_cases'] for report in reports),
+        'repaired_batches': len(reports)
+    }
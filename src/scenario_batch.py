@@ -0,0 +1,268 @@
+"""
+일괄(batch) 시나리오 생성 모듈
+여러 (저장소, 기준 브랜치, 대상 브랜치) 항목의 시나리오를 한 작업으로 생성합니다.
+
+- 저장소 핸들 공유: 같은 저장소는 한 번만 열고, Git 작업은 저장소별로 순서대로 실행
+  (GitPython 핸들은 스레드 안전하지 않으므로 diff 병렬 추출 작업자는 핸들을 각자 엶)
+- 중복 작업 제거: 브랜치명을 (공통 조상 SHA, 대상 SHA)로 바꿔 같은 커밋 쌍은 Git 분석/RAG 저장/LLM 호출을 한 번만 수행
+- 동시 실행 제한: 항목별 생성은 max_concurrent개까지만 동시에 진행 (LLM 호출은 스케줄러의 BATCH 우선순위 대기열 사용)
+"""
+
+import asyncio
+import logging
+import os
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple, Union
+
+import git
+
+from .config_loader import load_config
+from .git_analyzer import resolve_commit_pair, analyze_commit_pair, COMMON_ANCESTOR_ERROR, GIT_ERROR_PREFIX
+from .llm.generation_options import build_generation_options
+from .llm.model_router import get_model_router
+from .llm.scheduler import Priority
+from .llm_handler import acall_ollama_llm, CircuitOpenError
+from .prompt_loader import build_prompt_parts, add_git_analysis_to_rag, get_rag_manager
+from .response_parser import parse_scenario_json
+from .scenario_mapreduce import should_use_map_reduce, generate_scenario_map_reduce
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+DEFAULT_MAX_CONCURRENT_ITEMS = 4
+DEFAULT_BASE_BRANCH = "origin/develop"
+DEFAULT_HEAD_BRANCH = "HEAD"
+
+# 항목 상태
+ITEM_PENDING = "pending"
+ITEM_ANALYZING = "analyzing_git"
+ITEM_GENERATING = "calling_llm"
+ITEM_COMPLETED = "completed"
+ITEM_FAILED = "failed"
+
+# 항목 상태 변경 콜백: (항목 번호, 상태, 세부 정보)
+ItemCallback = Callable[[int, str, Dict[str, Any]], Awaitable[None]]
+
+
+def get_batch_config() -> Dict[str, Any]:
+    """config.json의 batch 섹션 반환 (없으면 빈 dict)"""
+    config = load_config() or {}
+    return config.get('batch', {})
+
+
+async def generate_scenario_from_analysis(git_analysis: str,
+                                          model: str,
+                                          timeout: float,
+                                          performance_mode: bool = True,
+                                          fast_mode: Optional[bool] = None,
+                                          num_predict: Optional[int] = None,
+                                          structured_output: Optional[bool] = None,
+                                          map_reduce: Optional[bool] = None,
+                                          output_format: Union[str, Dict[str, Any]] = "",
+                                          use_cache: bool = True,
+                                          priority: Priority = Priority.BATCH) -> Dict[str, Any]:
+    """
+    Git 분석 결과 하나로 시나리오 JSON 생성 (큰 변경은 분할 생성)
+
+    Args:
+        git_analysis: Git 분석 결과
+        model: 모델명
+        timeout: LLM 호출 타임아웃 (초)
+        performance_mode: 프롬프트 길이 제한 적용 여부
+        fast_mode: 빠른 모드 (None이면 설정값)
+        num_predict: 출력 토큰 상한 (None이면 변경 크기로 계산)
+        structured_output: 구조화 출력 사용 여부 (None이면 설정값)
+        map_reduce: 분할 생성 사용 여부 (None이면 설정값)
+        output_format: 구조화 출력 시 Ollama format에 전달할 JSON 스키마
+        use_cache: LLM 응답 캐시 사용 여부
+        priority: LLM 스케줄러 우선순위
+
+    Returns:
+        시나리오 JSON
+
+    Raises:
+        ValueError: 프롬프트 생성 실패 또는 빈 응답
+        CircuitOpenError: LLM 서킷 브레이커가 열려 있는 경우
+    """
+    if should_use_map_reduce(git_analysis, map_reduce):
+        result_json, _ = await generate_scenario_map_reduce(
+            git_analysis, model, timeout,
+            performance_mode=performance_mode, fast_mode=fast_mode, num_predict=num_predict,
+            structured_output=structured_output, output_format=output_format,
+            use_cache=use_cache, priority=priority
+        )
+        return result_json
+
+    generation = build_generation_options(git_analysis, fast_mode, num_predict, structured_output)
+    # RAG 검색과 피드백 조회가 이벤트 루프를 막지 않도록 작업자 스레드에서 실행
+    prompt_prefix, prompt_body = await asyncio.to_thread(
+        build_prompt_parts,
+        git_analysis,
+        use_rag=True,
+        use_feedback_enhancement=True,
+        performance_mode=performance_mode,
+        fast_mode=generation['fast_mode'],
+        structured_output=generation['structured_output'],
+        model=model
+    )
+    if prompt_prefix is None:
+        raise ValueError("프롬프트 생성에 실패했습니다.")
+
+    raw_response = await acall_ollama_llm(
+        prompt_prefix + prompt_body, model=model,
+        format=output_format if generation['structured_output'] else "",
+        timeout=timeout, use_cache=use_cache, priority=priority,
+        options=generation['options'], think=generation['think'], prompt_prefix=prompt_prefix
+    )
+    if not raw_response:
+        raise ValueError("LLM으로부터 응답을 받지 못했습니다.")
+    return parse_scenario_json(raw_response)
+
+
+class _RepoHandles:
+    """저장소 경로별로 한 번만 연 git.Repo 핸들과 저장소별 잠금"""
+
+    def __init__(self):
+        self._repos: Dict[str, Tuple[git.Repo, asyncio.Lock]] = {}
+
+    def get(self, repo_path: str) -> Tuple[git.Repo, asyncio.Lock]:
+        key = os.path.realpath(repo_path)
+        if key not in self._repos:
+            self._repos[key] = (git.Repo(key), asyncio.Lock())
+        return self._repos[key]
+
+    def close(self):
+        for repo, _ in self._repos.values():
+            repo.close()
+        self._repos.clear()
+
+
+async def run_scenario_batch(items: List[Dict[str, Any]],
+                             model: str,
+                             timeout: float,
+                             max_concurrent: Optional[int] = None,
+                             on_item_update: Optional[ItemCallback] = None,
+                             **generation_kwargs) -> List[Dict[str, Any]]:
+    """
+    여러 브랜치의 시나리오를 일괄 생성
+
+    Args:
+        items: {'repo_path', 'base_branch', 'head_branch', 'name'(선택)} 목록
+        model: 기본 모델명 (모델 라우팅을 사용하면 항목별로 바뀔 수 있음)
+        timeout: 항목별 LLM 호출 타임아웃 (초)
+        max_concurrent: 동시에 생성할 항목 수 (None이면 설정값 batch.max_concurrent_items)
+        on_item_update: 항목 상태가 바뀔 때마다 (항목 번호, 상태, 세부 정보)로 호출되는 콜백
+        **generation_kwargs: generate_scenario_from_analysis에 전달할 생성 옵션
+
+    Returns:
+        입력 순서대로의 항목별 결과. 각 항목은 index, name, repo_path, base_branch, head_branch,
+        base_sha, head_sha, status(completed/failed), result_json, error, llm_model, shared_with(같은 커밋 쌍을 공유한 첫 항목 번호)
+
+    Raises:
+        CircuitOpenError: LLM 서킷 브레이커가 열려 있는 경우 (남은 항목도 모두 실패하므로 작업 전체를 중단)
+    """
+    if max_concurrent is None:
+        max_concurrent = get_batch_config().get('max_concurrent_items', DEFAULT_MAX_CONCURRENT_ITEMS)
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    rag_lock = asyncio.Lock()
+    handles = _RepoHandles()
+
+    results = [{
+        'index': index,
+        'name': item.get('name'),
+        'repo_path': item['repo_path'],
+        'base_branch': item.get('base_branch') or DEFAULT_BASE_BRANCH,
+        'head_branch': item.get('head_branch') or DEFAULT_HEAD_BRANCH,
+        'base_sha': None,
+        'head_sha': None,
+        'status': ITEM_PENDING,
+        'result_json': None,
+        'error': None,
+        'llm_model': None,
+        'shared_with': None
+    } for index, item in enumerate(items)]
+
+    async def update(indices: List[int], status: str, **details):
+        for index in indices:
+            results[index]['status'] = status
+            if on_item_update is not None:
+                await on_item_update(index, status, details)
+
+    async def fail(indices: List[int], error: str):
+        for index in indices:
+            results[index]['error'] = error
+        await update(indices, ITEM_FAILED, error=error)
+
+    # 1. 브랜치명을 커밋 쌍으로 변환 (저장소별 순차 실행, 저장소 간 병렬)
+    commit_pairs: Dict[int, Tuple[git.Commit, git.Commit]] = {}
+
+    async def resolve(result: Dict[str, Any]):
+        try:
+            repo, lock = handles.get(result['repo_path'])
+            async with lock:
+                pair = await asyncio.to_thread(resolve_commit_pair, repo, result['base_branch'], result['head_branch'])
+        except Exception as e:
+            await fail([result['index']], f"{GIT_ERROR_PREFIX}{e}")
+            return
+        if pair is None:
+            await fail([result['index']], COMMON_ANCESTOR_ERROR)
+            return
+        commit_pairs[result['index']] = pair
+        result['base_sha'], result['head_sha'] = pair[0].hexsha, pair[1].hexsha
+
+    # 2. 같은 커밋 쌍끼리 묶어 한 번만 생성
+    async def generate(indices: List[int]):
+        first = results[indices[0]]
+        base_commit, head_commit = commit_pairs[indices[0]]
+        async with semaphore:
+            try:
+                await update(indices, ITEM_ANALYZING)
+                repo, lock = handles.get(first['repo_path'])
+                async with lock:
+                    git_analysis = await asyncio.to_thread(analyze_commit_pair, repo, base_commit, head_commit)
+                async with rag_lock:
+                    await asyncio.to_thread(add_git_analysis_to_rag, git_analysis, first['repo_path'])
+
+                route = get_model_router().route(git_analysis, generation_kwargs.get('fast_mode'),
+                                                 generation_kwargs.get('num_predict'), default_model=model)
+                await update(indices, ITEM_GENERATING, llm_model=route['model'])
+                result_json = await generate_scenario_from_analysis(git_analysis, route['model'], timeout,
+                                                                    **generation_kwargs)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                logger.warning(f"일괄 생성 항목 {indices[0] + 1} 실패: {e}")
+                await fail(indices, str(e))
+                return
+
+            for index in indices:
+                results[index].update(result_json=result_json, llm_model=route['model'],
+                                      shared_with=indices[0] if index != indices[0] else None)
+            await update(indices, ITEM_COMPLETED, test_cases=len(result_json.get('Test Cases', [])))
+
+    try:
+        # 임베딩 모델 등 RAG 리소스를 한 번 미리 로드해 항목들이 동시에 로드하지 않도록 함
+        try:
+            await asyncio.to_thread(get_rag_manager, False)
+        except Exception as e:
+            # 단일 생성과 같이 RAG 없이 기본 프롬프트로 계속 진행
+            logger.warning(f"RAG 리소스 로드 실패, 기본 프롬프트를 사용합니다: {e}")
+        await asyncio.gather(*(resolve(result) for result in results))
+
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        for index in sorted(commit_pairs):
+            key = (os.path.realpath(results[index]['repo_path']), results[index]['base_sha'], results[index]['head_sha'])
+            groups.setdefault(key, []).append(index)
+        logger.info(f"일괄 생성: {len(items)}개 항목, 고유 커밋 쌍 {len(groups)}개, 동시 실행 {max_concurrent}개")
+
+        tasks = [asyncio.ensure_future(generate(indices)) for indices in groups.values()]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # 서킷 브레이커가 열리거나 작업이 취소되면 남은 항목 생성도 중단
+            for task in tasks:
+                task.cancel()
+            raise
+    finally:
+        handles.close()
+
+    return results
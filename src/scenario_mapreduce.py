@@ -0,0 +1,332 @@
+"""
+분할 생성(map-reduce) 모듈
+큰 변경 내역을 모듈(디렉터리) 단위 배치로 나눠 LLM을 병렬 호출하고,
+배치별 테스트 케이스를 하나의 시나리오로 합칩니다. (ID 재부여, 유사 중복 제거)
+
+성능 모드의 프롬프트 길이 제한(8,000토큰)으로 뒤쪽 파일의 변경이 잘려 나가는 문제를 피하고,
+여러 Ollama 엔드포인트에 호출을 나눠 전체 소요 시간을 줄입니다.
+"""
+
+import asyncio
+import logging
+import math
+import re
+from difflib import SequenceMatcher
+from typing import List, Tuple, Dict, Any, Optional, Callable, Awaitable, Union
+
+from .config_loader import load_config
+from .git_analyzer import CODE_CHANGES_HEADER
+from .llm.generation_options import build_generation_options
+from .llm.scheduler import Priority
+from .llm.telemetry import merge_call_stats
+from .llm.token_counter import get_token_counter
+from .llm_handler import acall_ollama_llm, CircuitOpenError
+from .prompt_loader import build_prompt_parts
+from .response_parser import parse_scenario_json_with_report, merge_repair_reports
+
+logger = logging.getLogger(__name__)
+
+# 상수 정의
+FILE_SECTION_PREFIX = "--- 파일: "
+DEFAULT_BATCH_CHARS = 12000
+DEFAULT_MAX_BATCHES = 8
+DEFAULT_DUPLICATE_THRESHOLD = 0.9
+DEFAULT_ID_PREFIX = "TEST_"
+DUPLICATE_FIELDS = ("절차", "예상결과")
+ID_PATTERN = re.compile(r'^(.*?)(\d+)$')
+
+# 배치 완료 알림 콜백: (완료된 배치 수, 전체 배치 수)
+BatchCallback = Callable[[int, int], Awaitable[None]]
+
+
+def get_map_reduce_config() -> Dict[str, Any]:
+    """config.json의 llm.map_reduce 섹션 반환 (없으면 빈 dict)"""
+    config = load_config() or {}
+    return config.get('llm', {}).get('map_reduce', {})
+
+
+def split_git_analysis(git_analysis: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Git 분석 결과를 공통 머리(커밋 메시지)와 파일별 diff 구간으로 분리
+
+    Args:
+        git_analysis: get_git_analysis_text() 결과
+
+    Returns:
+        (공통 머리, [(파일 경로, 파일 구간 텍스트), ...])
+    """
+    header_lines: List[str] = []
+    sections: List[Tuple[str, List[str]]] = []
+    for line in git_analysis.splitlines():
+        if line.startswith(FILE_SECTION_PREFIX):
+            path = line[len(FILE_SECTION_PREFIX):].rstrip(' -')
+            sections.append((path, [line]))
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            header_lines.append(line)
+    return "\n".join(header_lines).rstrip(), [(path, "\n".join(lines)) for path, lines in sections]
+
+
+def module_of(path: str) -> str:
+    """파일 경로의 모듈(소속 디렉터리) 이름. 루트 파일은 '.'"""
+    return path.rsplit('/', 1)[0] if '/' in path else '.'
+
+
+def build_batches(git_analysis: str,
+                  batch_chars: int = DEFAULT_BATCH_CHARS,
+                  max_batches: int = DEFAULT_MAX_BATCHES) -> List[str]:
+    """
+    변경 내역을 모듈 단위로 묶어 배치별 분석 텍스트 생성
+
+    같은 모듈의 파일은 가능한 한 같은 배치에 넣고, 배치 크기가 batch_chars를 넘으면 새 배치를 시작합니다.
+    배치 수가 max_batches를 넘지 않도록 필요하면 배치 크기를 늘리거나 이웃 배치를 합칩니다.
+
+    Args:
+        git_analysis: Git 분석 결과
+        batch_chars: 배치당 목표 diff 크기 (문자 수)
+        max_batches: 최대 배치 수 (= 최대 병렬 LLM 호출 수)
+
+    Returns:
+        배치별 분석 텍스트 리스트 (각각 커밋 메시지 머리 포함). 파일 구간이 없으면 원문 하나
+    """
+    header, sections = split_git_analysis(git_analysis)
+    if not sections:
+        return [git_analysis]
+
+    total = sum(len(text) for _, text in sections)
+    limit = max(batch_chars, math.ceil(total / max(1, max_batches)))
+
+    modules: Dict[str, List[str]] = {}
+    for path, text in sections:
+        modules.setdefault(module_of(path), []).append(text)
+
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_size = 0
+    for module_sections in modules.values():
+        module_size = sum(len(text) for text in module_sections)
+        # 모듈이 현재 배치에 들어가지 않으면 새 배치에서 시작
+        if current and current_size + module_size > limit:
+            batches.append(current)
+            current, current_size = [], 0
+        for text in module_sections:
+            if current and current_size + len(text) > limit:
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(text)
+            current_size += len(text)
+    if current:
+        batches.append(current)
+
+    # 모듈 경계 때문에 상한을 넘으면 합친 크기가 가장 작은 이웃 배치끼리 병합
+    while len(batches) > max(1, max_batches):
+        sizes = [sum(len(text) for text in batch) for batch in batches]
+        index = min(range(len(batches) - 1), key=lambda i: sizes[i] + sizes[i + 1])
+        batches[index:index + 2] = [batches[index] + batches[index + 1]]
+
+    if header and CODE_CHANGES_HEADER not in header:
+        header = f"{header}\n\n{CODE_CHANGES_HEADER}"
+    return [f"{header}\n" + "\n".join(batch) if header else "\n".join(batch) for batch in batches]
+
+
+def should_use_map_reduce(git_analysis: str, requested: Optional[bool] = None) -> bool:
+    """
+    분할 생성 사용 여부 판단
+
+    Args:
+        git_analysis: Git 분석 결과
+        requested: 요청에서 지정한 값 (None이면 설정값 llm.map_reduce.enabled)
+
+    Returns:
+        사용 설정이 켜져 있고 변경 내역이 두 개 이상의 배치로 나뉘면 True
+    """
+    map_reduce_config = get_map_reduce_config()
+    enabled = requested if requested is not None else map_reduce_config.get('enabled', False)
+    if not enabled or not git_analysis:
+        return False
+    batches = build_batches(
+        git_analysis,
+        batch_chars=map_reduce_config.get('batch_chars', DEFAULT_BATCH_CHARS),
+        max_batches=map_reduce_config.get('max_batches', DEFAULT_MAX_BATCHES)
+    )
+    return len(batches) > 1
+
+
+def _normalize(test_case: Dict[str, Any]) -> str:
+    return " ".join(" ".join(str(test_case.get(field, "")) for field in DUPLICATE_FIELDS).lower().split())
+
+
+def merge_scenarios(partials: List[Dict[str, Any]],
+                    duplicate_threshold: float = DEFAULT_DUPLICATE_THRESHOLD) -> Dict[str, Any]:
+    """
+    배치별 시나리오를 하나로 병합
+
+    - 테스트 케이스는 배치 순서대로 이어 붙이고, 절차/예상결과가 거의 같은 케이스는 하나만 남김
+    - ID는 첫 케이스의 접두어를 유지하며 001부터 다시 매김
+
+    Args:
+        partials: 배치별 시나리오 JSON 리스트
+        duplicate_threshold: 유사 중복으로 판단할 문자열 유사도 (0~1)
+
+    Returns:
+        병합된 시나리오 JSON
+    """
+    descriptions: List[str] = []
+    scenario_name = ""
+    merged_cases: List[Dict[str, Any]] = []
+    seen: List[str] = []
+
+    for partial in partials:
+        description = (partial.get("Scenario Description") or "").strip()
+        if description and description not in descriptions:
+            descriptions.append(description)
+        scenario_name = scenario_name or (partial.get("Test Scenario Name") or "").strip()
+
+        for test_case in partial.get("Test Cases") or []:
+            if not isinstance(test_case, dict):
+                continue
+            normalized = _normalize(test_case)
+            if normalized and any(SequenceMatcher(None, normalized, other).ratio() >= duplicate_threshold
+                                  for other in seen):
+                continue
+            seen.append(normalized)
+            merged_cases.append(dict(test_case))
+
+    first_id = str(merged_cases[0].get("ID", "")) if merged_cases else ""
+    match = ID_PATTERN.match(first_id)
+    id_prefix = match.group(1) if match else DEFAULT_ID_PREFIX
+    for index, test_case in enumerate(merged_cases, start=1):
+        test_case["ID"] = f"{id_prefix}{index:03d}"
+
+    return {
+        "Scenario Description": "\n".join(descriptions),
+        "Test Scenario Name": scenario_name,
+        "Test Cases": merged_cases
+    }
+
+
+async def generate_scenario_map_reduce(
+        git_analysis: str,
+        model: str,
+        timeout: int,
+        performance_mode: bool = True,
+        fast_mode: Optional[bool] = None,
+        num_predict: Optional[int] = None,
+        structured_output: Optional[bool] = None,
+        output_format: Union[str, Dict[str, Any]] = "",
+        use_cache: bool = True,
+        priority: Priority = Priority.BATCH,
+        on_batch_done: Optional[BatchCallback] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    배치별 LLM 호출을 병렬로 실행하고 결과를 하나의 시나리오로 병합
+
+    각 호출은 LLM 스케줄러를 거치므로 엔드포인트 수 × 엔드포인트당 동시 실행 수만큼 동시에 처리됩니다.
+    일부 배치가 실패해도 성공한 배치가 있으면 그 결과로 시나리오를 만듭니다.
+
+    Args:
+        git_analysis: Git 분석 결과
+        model: 모델명
+        timeout: 배치별 LLM 호출 타임아웃 (초)
+        performance_mode: 배치 프롬프트에도 성능 모드 길이 제한 적용
+        fast_mode: 빠른 모드 (None이면 설정값)
+        num_predict: 배치별 출력 토큰 상한 (None이면 배치 크기로 계산)
+        structured_output: 구조화 출력 사용 여부 (None이면 설정값)
+        output_format: 구조화 출력 시 Ollama format에 전달할 JSON 스키마
+        use_cache: LLM 응답 캐시 사용 여부
+        priority: LLM 스케줄러 우선순위
+        on_batch_done: 배치가 끝날 때마다 (완료 수, 전체 수)로 호출되는 콜백
+
+    Returns:
+        (병합된 시나리오 JSON, {'batches', 'failed_batches', 'prompt_size', 'prompt_tokens', 'prompt_tokens_exact', 'llm_telemetry', 'json_repair'})
+
+    Raises:
+        ValueError: 모든 배치가 실패한 경우
+        CircuitOpenError: LLM 서킷 브레이커가 열려 있는 경우
+    """
+    map_reduce_config = get_map_reduce_config()
+    batches = build_batches(
+        git_analysis,
+        batch_chars=map_reduce_config.get('batch_chars', DEFAULT_BATCH_CHARS),
+        max_batches=map_reduce_config.get('max_batches', DEFAULT_MAX_BATCHES)
+    )
+    logger.info(f"분할 생성: 변경 내역 {len(git_analysis)}자를 {len(batches)}개 배치로 나눠 병렬 호출합니다.")
+
+    prompt_size = 0
+    prompt_tokens = 0
+    token_counter = get_token_counter()
+    completed = 0
+    call_stats: List[Dict[str, Any]] = []
+    repair_reports: List[Optional[Dict[str, Any]]] = []
+
+    def prepare_prompt(batch_text: str, generation: Dict[str, Any]) -> Tuple[Optional[str], str, int]:
+        """RAG 검색, 피드백 조회, 토큰 계산을 포함한 배치 프롬프트 생성 (작업자 스레드에서 실행)"""
+        prompt_prefix, prompt_body = build_prompt_parts(
+            batch_text,
+            use_rag=True,
+            use_feedback_enhancement=True,
+            performance_mode=performance_mode,
+            fast_mode=generation['fast_mode'],
+            structured_output=generation['structured_output'],
+            model=model
+        )
+        if prompt_prefix is None:
+            return None, prompt_body, 0
+        tokens = token_counter.count(prompt_prefix, model) + token_counter.count(prompt_body, model)
+        return prompt_prefix, prompt_body, tokens
+
+    async def run_batch(index: int, batch_text: str) -> Optional[Dict[str, Any]]:
+        nonlocal prompt_size, prompt_tokens, completed
+        generation = build_generation_options(batch_text, fast_mode, num_predict, structured_output)
+        try:
+            # 배치 프롬프트 생성이 이벤트 루프를 막지 않도록 작업자 스레드에서 병렬로 실행
+            prompt_prefix, prompt_body, batch_tokens = await asyncio.to_thread(prepare_prompt, batch_text, generation)
+            if prompt_prefix is None:
+                raise ValueError("프롬프트 생성에 실패했습니다.")
+            prompt_size += len(prompt_prefix) + len(prompt_body)
+            prompt_tokens += batch_tokens
+            raw_response = await acall_ollama_llm(
+                prompt_prefix + prompt_body, model=model,
+                format=output_format if generation['structured_output'] else "",
+                timeout=timeout, use_cache=use_cache, priority=priority,
+                options=generation['options'], think=generation['think'], prompt_prefix=prompt_prefix,
+                on_stats=call_stats.append
+            )
+            if not raw_response:
+                raise ValueError("LLM으로부터 응답을 받지 못했습니다.")
+            result_json, repair_report = parse_scenario_json_with_report(raw_response)
+            repair_reports.append(repair_report)
+            return result_json
+        except CircuitOpenError:
+            # 백엔드 장애는 배치 하나의 실패가 아니므로 전체 생성을 중단
+            raise
+        except Exception as e:
+            logger.warning(f"분할 생성 배치 {index + 1}/{len(batches)} 실패: {e}")
+            return None
+        finally:
+            completed += 1
+            if on_batch_done is not None:
+                await on_batch_done(completed, len(batches))
+
+    results = await asyncio.gather(*(run_batch(i, text) for i, text in enumerate(batches)))
+    partials = [result for result in results if result is not None]
+    if not partials:
+        raise ValueError("모든 분할 생성 배치가 실패했습니다.")
+
+    merged = merge_scenarios(
+        partials,
+        duplicate_threshold=map_reduce_config.get('duplicate_threshold', DEFAULT_DUPLICATE_THRESHOLD)
+    )
+    logger.info(f"분할 생성 완료: {len(partials)}/{len(batches)}개 배치, 테스트 케이스 {len(merged['Test Cases'])}개")
+    return merged, {
+        'batches': len(batches),
+        'failed_batches': len(batches) - len(partials),
+        'prompt_size': prompt_size,
+        'prompt_tokens': prompt_tokens,
+        'prompt_tokens_exact': token_counter.is_exact(model),
+        # 배치별 호출 지표를 합친 값 (토큰 수/시간 합산)
+        'llm_telemetry': merge_call_stats(call_stats),
+        # 배치별 JSON 복구 보고서를 합친 값 (복구한 배치가 없으면 None)
+        'json_repair': merge_repair_reports(repair_reports)
+    }
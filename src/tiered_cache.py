@@ -0,0 +1,220 @@
+"""
+2단계(메모리 LRU + SQLite) 캐시 공통 구현
+LLM 응답 캐시와 Git 분석 결과 캐시가 함께 사용하는 조회/저장/정리/통계 로직을 제공합니다.
+
+하위 클래스는 테이블 이름, 값/소요 시간 컬럼, 테이블 생성 SQL, 로그용 이름만 정합니다.
+디스크 연결은 작업마다 열고 반드시 닫습니다. (sqlite3 연결의 with 문은 커밋/롤백만 하고 닫지 않음)
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from typing import Dict, Any, Iterator, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCache:
+    """메모리 LRU + 디스크(SQLite) 2단계 캐시 (하위 클래스에서 테이블 구성을 지정)"""
+
+    # 하위 클래스에서 지정
+    TABLE = ""
+    VALUE_COLUMN = ""
+    TIME_COLUMN = ""
+    SCHEMA: Sequence[str] = ()
+    LABEL = ""
+
+    def __init__(self,
+                 db_path: Optional[str],
+                 memory_entries: int,
+                 max_disk_bytes: int,
+                 ttl_seconds: Optional[float] = None):
+        """
+        캐시 초기화
+
+        Args:
+            db_path: 디스크 캐시 SQLite 파일 경로 (None이면 메모리 캐시만 사용)
+            memory_entries: 메모리 LRU 최대 항목 수
+            max_disk_bytes: 디스크 캐시 최대 크기 (값 바이트 합계)
+            ttl_seconds: 항목 유효 시간 (초, None이면 만료 없음)
+        """
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (created_at, value, saved_seconds)
+        self._memory: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_ready = False
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expired': 0,
+            'saved_seconds': 0.0
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._db_ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        if not self._db_ready:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            self._db_ready = True
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """트랜잭션(커밋/롤백)을 적용하고 끝나면 닫는 디스크 연결"""
+        with closing(self._connect()) as conn, conn:
+            yield conn
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, entry: Tuple[float, str, float]):
+        """메모리 LRU에 항목 추가 (락 보유 상태에서 호출)"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 값 조회 (메모리 → 디스크 순서, 디스크 적중은 메모리에도 올림)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 값 또는 None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_expired(entry[0], now):
+                    del self._memory[key]
+                    self._stats['expired'] += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    self._stats['saved_seconds'] += entry[2]
+                    return entry[1]
+
+            if self.db_path:
+                try:
+                    with self._connection() as conn:
+                        row = conn.execute(
+                            f'SELECT created_at, {self.VALUE_COLUMN}, {self.TIME_COLUMN} FROM {self.TABLE} '
+                            'WHERE cache_key = ?', (key,)
+                        ).fetchone()
+                        if row is not None:
+                            if self._is_expired(row[0], now):
+                                conn.execute(f'DELETE FROM {self.TABLE} WHERE cache_key = ?', (key,))
+                                self._stats['expired'] += 1
+                            else:
+                                conn.execute(f'UPDATE {self.TABLE} SET last_access = ? WHERE cache_key = ?', (now, key))
+                                self._remember(key, (row[0], row[1], row[2] or 0.0))
+                                self._stats['disk_hits'] += 1
+                                self._stats['saved_seconds'] += row[2] or 0.0
+                                return row[1]
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.LABEL} 디스크 캐시 조회 실패: {e}")
+
+            self._stats['misses'] += 1
+            return None
+
+    def _store(self, key: str, value: str, saved_seconds: float, **columns: Any):
+        """
+        값을 메모리와 디스크에 저장
+
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            saved_seconds: 값을 만드는 데 걸린 시간 (적중 시 절약 시간으로 집계)
+            **columns: 테이블의 관리용 추가 컬럼 값
+        """
+        if not value:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, (now, value, saved_seconds))
+            self._stats['stores'] += 1
+
+            if self.db_path:
+                names = ['cache_key', *columns, 'created_at', 'last_access', 'size', self.TIME_COLUMN,
+                         self.VALUE_COLUMN]
+                values = [key, *columns.values(), now, now, len(value.encode('utf-8')), saved_seconds, value]
+                try:
+                    with self._connection() as conn:
+                        conn.execute(
+                            f'INSERT OR REPLACE INTO {self.TABLE} ({", ".join(names)}) '
+                            f'VALUES ({", ".join("?" * len(names))})', values
+                        )
+                        self._evict_disk(conn, now)
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.LABEL} 디스크 캐시 저장 실패: {e}")
+
+    def _evict_disk(self, conn: sqlite3.Connection, now: float):
+        """만료 항목 삭제 후 크기 제한을 넘으면 오래 사용되지 않은 항목부터 제거"""
+        if self.ttl_seconds is not None:
+            conn.execute(f'DELETE FROM {self.TABLE} WHERE created_at < ?', (now - self.ttl_seconds,))
+
+        total = conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.TABLE}').fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        rows = conn.execute(f'SELECT cache_key, size FROM {self.TABLE} ORDER BY last_access ASC').fetchall()
+        evicted = []
+        for cache_key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            evicted.append((cache_key,))
+            total -= size
+        conn.executemany(f'DELETE FROM {self.TABLE} WHERE cache_key = ?', evicted)
+        self._stats['evictions'] += len(evicted)
+        logger.info(f"{self.LABEL} 디스크 캐시 정리: {len(evicted)}개 항목 제거")
+
+    def clear(self) -> int:
+        """모든 캐시 항목 삭제. 삭제된 디스크 항목 수를 반환합니다."""
+        removed = 0
+        with self._lock:
+            self._memory.clear()
+            if self.db_path and os.path.exists(self.db_path):
+                try:
+                    with self._connection() as conn:
+                        removed = conn.execute(f'DELETE FROM {self.TABLE}').rowcount
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.LABEL} 디스크 캐시 삭제 실패: {e}")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 카운터와 저장 현황 반환"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            disk_entries, disk_bytes = 0, 0
+            if self.db_path and os.path.exists(self.db_path):
+                try:
+                    with self._connection() as conn:
+                        disk_entries, disk_bytes = conn.execute(
+                            f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}'
+                        ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"{self.LABEL} 디스크 캐시 통계 조회 실패: {e}")
+
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['disk_entries'] = disk_entries
+        stats['disk_bytes'] = disk_bytes
+        stats['saved_seconds'] = round(stats['saved_seconds'], 2)
+        return stats
@@ -176,6 +176,8 @@ def mock_dependencies():
         
         # Prompt Enhancer Mock
         mock_prompt_enhancer_instance = MagicMock()
+        # 피드백이 충분하지 않을 때처럼 기본 프롬프트를 그대로 반환
+        mock_prompt_enhancer_instance.enhance_prompt.side_effect = lambda prompt, model=None: prompt
         mock_get_prompt_enhancer.return_value = mock_prompt_enhancer_instance
         
         yield {
@@ -0,0 +1,154 @@
+"""
+LLM 상태/지표 API 테스트
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.llm.response_cache import LLMResponseCache
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.scheduler import LLMScheduler
+from src.llm.warmup import ModelWarmer
+from src.llm.single_flight import SingleFlight
+from src.llm.call_policy import CallPolicy
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.telemetry import LLMTelemetry
+from src.llm.model_router import ModelRouter
+
+def test_get_llm_cache_stats(client):
+    """LLM 캐시 통계 조회 테스트"""
+    cache = LLMResponseCache(db_path=None)
+    cache.set("key", "value", generation_time=30.0)
+    cache.get("key")
+    cache.get("missing")
+    
+    with patch('backend.routers.llm.get_llm_cache', return_value=cache):
+        response = client.get("/api/llm/cache/stats")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+    assert data["saved_seconds"] == 30.0
+
+def test_get_llm_cache_stats_disabled(client):
+    """LLM 캐시 비활성화 시 통계 조회 테스트"""
+    response = client.get("/api/llm/cache/stats")
+    
+    assert response.status_code == 200
+    assert response.json() == {"enabled": False}
+
+def test_clear_llm_cache(client):
+    """LLM 캐시 삭제 테스트"""
+    cache = LLMResponseCache(db_path=None)
+    cache.set("key", "value")
+    
+    with patch('backend.routers.llm.get_llm_cache', return_value=cache):
+        response = client.delete("/api/llm/cache")
+    
+    assert response.status_code == 200
+    assert response.json()["enabled"] is True
+    assert cache.get("key") is None
+
+def test_get_llm_endpoints(client):
+    """Ollama 엔드포인트 상태 조회 테스트"""
+    pool = EndpointPool(["http://gpu-1:11434", "http://gpu-2:11434"])
+    
+    with patch('backend.routers.llm.get_endpoint_pool', return_value=pool):
+        response = client.get("/api/llm/endpoints")
+    
+    assert response.status_code == 200
+    endpoints = response.json()["endpoints"]
+    assert [ep["url"] for ep in endpoints] == ["http://gpu-1:11434", "http://gpu-2:11434"]
+    assert all(ep["healthy"] for ep in endpoints)
+
+def test_get_llm_queue(client):
+    """LLM 호출 대기열 현황 조회 테스트"""
+    scheduler = LLMScheduler(max_concurrent=2)
+    
+    with patch('backend.routers.llm.get_llm_scheduler', return_value=scheduler):
+        response = client.get("/api/llm/queue")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["max_concurrent"] == 2
+    assert data["active"] == 0
+    assert data["waiting_by_priority"] == {"interactive": 0, "batch": 0}
+
+def test_get_llm_coalescing(client):
+    """동일 LLM 요청 합치기 현황 조회 테스트"""
+    with patch('backend.routers.llm.get_single_flight', return_value=SingleFlight()):
+        response = client.get("/api/llm/coalescing")
+    
+    assert response.status_code == 200
+    assert response.json() == {
+        "enabled": True, "in_flight": 0, "waiting": 0, "leaders": 0, "coalesced": 0, "cancelled": 0
+    }
+
+def test_get_llm_call_policy(client):
+    """LLM 호출 정책 통계 조회 테스트"""
+    policy = CallPolicy(hedge=True)
+    policy.record("qwen3:8b", 1000, 12.0)
+    
+    with patch('backend.routers.llm.get_call_policy', return_value=policy):
+        response = client.get("/api/llm/policy")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["hedge"] is True
+    assert data["calls"] == 1
+    assert data["models"]["qwen3:8b"]["samples"] == 1
+
+def test_get_llm_circuit_breaker(client):
+    """LLM 서킷 브레이커 상태 조회 테스트"""
+    breaker = CircuitBreaker(failure_threshold=1, open_seconds=60)
+    breaker.record_failure(ConnectionError("connection refused"))
+    
+    with patch('backend.routers.llm.get_circuit_breaker', return_value=breaker):
+        response = client.get("/api/llm/circuit")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["state"] == "open"
+    assert data["opened"] == 1
+    assert data["last_error"] == "connection refused"
+    assert 0 < data["retry_after"] <= 60
+
+def test_get_llm_telemetry(client):
+    """LLM 처리량 지표 백분위수 조회 테스트"""
+    telemetry = LLMTelemetry()
+    telemetry.record({"model": "qwen3:8b", "tokens_per_second": 42.0, "load_seconds": 1.2})
+    
+    with patch('backend.routers.llm.get_llm_telemetry', return_value=telemetry):
+        response = client.get("/api/llm/telemetry")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["models"]["qwen3:8b"]["calls"] == 1
+    assert data["models"]["qwen3:8b"]["tokens_per_second"]["p90"] == 42.0
+
+def test_get_llm_routing(client):
+    """모델 라우팅 설정 조회 테스트"""
+    router = ModelRouter(default_model="qwen3:8b", models=[{"name": "qwen3:1.7b", "max_analysis_tokens": 4000},
+                                                          {"name": "qwen3:8b"}])
+    
+    with patch('backend.routers.llm.get_model_router', return_value=router):
+        response = client.get("/api/llm/routing")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["enabled"] is True
+    assert [model["name"] for model in data["models"]] == ["qwen3:1.7b", "qwen3:8b"]
+
+def test_health_includes_llm_warmup(client):
+    """헬스 체크에 모델 예열 상태가 포함되는지 테스트"""
+    warmer = ModelWarmer("qwen3:8b", enabled=False)
+    
+    with patch('src.llm.warmup.get_model_warmer', return_value=warmer):
+        response = client.get("/api/health")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["llm"] == {"model": "qwen3:8b", "state": "disabled"}
@@ -249,6 +249,45 @@ def test_generate_scenario_from_text_llm_error(client, mock_dependencies):
     assert response.status_code == 500
     assert "LLM API 오류" in response.json()["detail"]
 
+def test_generate_scenario_from_text_circuit_open(client, mock_dependencies):
+    """분석 텍스트 기반 시나리오 생성 - LLM 서킷 브레이커가 열린 경우 503 테스트"""
+    from src.llm.circuit_breaker import CircuitOpenError
+    
+    request_data = {
+        "analysis_text": "Git 저장소 분석 결과"
+    }
+    
+    with patch('backend.routers.scenario.load_config', return_value=mock_dependencies['load_config'].return_value), \
+         patch('backend.routers.scenario.acall_ollama_llm', side_effect=CircuitOpenError(12.3)):
+        response = client.post("/api/scenario/v1/generate-from-text", json=request_data)
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "13"
+
+@pytest.mark.asyncio
+async def test_websocket_disconnect_cancels_generation():
+    """WebSocket 연결이 끊기면 진행 중인 생성 작업이 취소되는지 테스트"""
+    import asyncio
+    from fastapi import WebSocketDisconnect
+    from unittest.mock import AsyncMock
+    from backend.routers.scenario import _run_until_disconnect
+    
+    websocket = MagicMock()
+    websocket.receive = AsyncMock(return_value={"type": "websocket.disconnect", "code": 1001})
+    cancelled = asyncio.Event()
+    
+    async def generation():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    with pytest.raises(WebSocketDisconnect):
+        await _run_until_disconnect(websocket, generation())
+    
+    assert cancelled.is_set()
+
 def test_generate_scenario_from_text_json_parse_error(client, mock_dependencies):
     """분석 텍스트 기반 시나리오 생성 - JSON 파싱 오류 테스트"""
     
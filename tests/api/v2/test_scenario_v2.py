@@ -109,6 +109,38 @@ class TestV2ScenarioAPI:
         )
         assert response.status_code == 422
     
+    def test_batch_endpoint_invalid_repo_path(self, client):
+        """일괄 생성 요청의 잘못된 저장소 경로 테스트"""
+        batch_request = {
+            "client_id": "test_batch_invalid",
+            "items": [{"repo_path": "/nonexistent/path", "head_branch": "feature/a"}]
+        }
+
+        response = client.post("/api/v2/scenario/batch", json=batch_request)
+
+        assert response.status_code == 400
+        assert "/nonexistent/path" in response.json()["detail"]
+
+    def test_batch_endpoint_success(self, client, temp_dir):
+        """일괄 생성 요청 접수 테스트"""
+        batch_request = {
+            "client_id": "test_batch_client",
+            "items": [
+                {"repo_path": temp_dir, "head_branch": "feature/a"},
+                {"repo_path": temp_dir, "head_branch": "feature/b"}
+            ],
+            "output_format": "zip"
+        }
+
+        with patch('backend.routers.v2.scenario_v2._handle_v2_batch', new_callable=AsyncMock) as mock_handle:
+            response = client.post("/api/v2/scenario/batch", json=batch_request)
+
+        assert response.status_code == 200
+        assert "2개 항목" in response.json()["message"]
+        request = mock_handle.call_args.args[1]
+        assert len(request.items) == 2
+        assert request.output_format.value == "zip"
+
     def test_status_endpoint(self, client):
         """상태 조회 엔드포인트 테스트"""
         client_id = "test_status_client"
@@ -243,6 +275,31 @@ class TestV2BackgroundGeneration:
             error_calls = [call for call in mock_send.call_args_list if 'ERROR' in str(call)]
             assert len(error_calls) > 0
 
+    @pytest.mark.asyncio
+    async def test_websocket_disconnect_cancels_generation(self):
+        """CLI의 WebSocket 연결이 끊기면 진행 중인 생성 작업이 취소되는지 테스트"""
+        from fastapi import WebSocket
+        from unittest.mock import Mock, AsyncMock
+        from backend.routers.v2.scenario_v2 import active_generations
+        from backend.routers.v2.progress_websocket import v2_connection_manager
+        
+        client_id = "test_cancel_client"
+        websocket = Mock(spec=WebSocket)
+        websocket.accept = AsyncMock()
+        websocket.send_text = AsyncMock()
+        websocket.close = AsyncMock()
+        
+        task = asyncio.create_task(asyncio.sleep(60))
+        active_generations[client_id] = task
+        try:
+            await v2_connection_manager.connect(client_id, websocket)
+            await v2_connection_manager.disconnect(client_id, websocket)
+            
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            active_generations.pop(client_id, None)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
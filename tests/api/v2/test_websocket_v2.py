@@ -225,6 +225,29 @@ class TestV2ConnectionManager:
         
         # 모든 연결이 정리되었는지 확인
         assert len(manager.connections) == 0
+
+    @pytest.mark.asyncio
+    async def test_disconnect_notifies_listeners(self, manager, mock_websocket):
+        """연결 해제 시 콜백이 호출되고, 교체된 이전 연결의 해제는 무시되는지 테스트"""
+        client_id = "test_client_listener"
+        disconnected = []
+        manager.add_disconnect_listener(disconnected.append)
+        
+        old_websocket = Mock(spec=WebSocket)
+        old_websocket.accept = AsyncMock()
+        old_websocket.close = AsyncMock()
+        old_websocket.send_text = AsyncMock()
+        await manager.connect(client_id, old_websocket)
+        await manager.connect(client_id, mock_websocket)
+        
+        # 이전 연결 핸들러의 정리는 새 연결에 영향을 주지 않음
+        await manager.disconnect(client_id, old_websocket)
+        assert manager.is_connected(client_id) is True
+        assert disconnected == []
+        
+        await manager.disconnect(client_id, mock_websocket)
+        assert manager.is_connected(client_id) is False
+        assert disconnected == [client_id]
     
     def test_get_connected_clients(self, manager):
         """연결된 클라이언트 목록 조회 테스트"""
@@ -7,6 +7,51 @@ import tempfile
 import json
 
 
+@pytest.fixture(autouse=True)
+def disable_llm_response_cache():
+    """테스트 간 응답이 공유되지 않도록 전역 LLM 응답 캐시 비활성화"""
+    from unittest.mock import patch
+    with patch('src.llm.response_cache._llm_cache', None), \
+         patch('src.llm.response_cache._llm_cache_loaded', True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disable_git_analysis_cache():
+    """테스트 저장소의 분석 결과가 디스크 캐시에 남거나 다른 테스트와 공유되지 않도록 비활성화"""
+    from unittest.mock import patch
+    with patch('src.git_analysis_cache._git_analysis_cache', None), \
+         patch('src.git_analysis_cache._git_analysis_cache_loaded', True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def disable_prompt_prefix_priming():
+    """테스트 중 실제 Ollama 엔드포인트로 머리말 priming 요청이 나가지 않도록 비활성화"""
+    from unittest.mock import patch
+    from src.llm.prefix_cache import PromptPrefixCache
+    with patch('src.llm.prefix_cache._prefix_cache', PromptPrefixCache(enabled=False)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolate_llm_call_policy():
+    """테스트마다 지연 학습 기록을 초기화하고, 실패 테스트가 재시도 대기로 느려지지 않도록 재시도 비활성화"""
+    from unittest.mock import patch
+    from src.llm.call_policy import CallPolicy
+    with patch('src.llm.call_policy._call_policy', CallPolicy(max_retries=0)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def isolate_llm_circuit_breaker():
+    """실패를 검증하는 테스트가 누적되어 다른 테스트에서 회로가 열리지 않도록 테스트마다 새 서킷 브레이커 사용"""
+    from unittest.mock import patch
+    from src.llm.circuit_breaker import CircuitBreaker
+    with patch('src.llm.circuit_breaker._circuit_breaker', CircuitBreaker()):
+        yield
+
+
 @pytest.fixture
 def temp_dir():
     """임시 디렉토리 픽스처"""
@@ -0,0 +1,147 @@
+"""
+테스트용 가짜 Ollama 서버
+/api/generate(스트리밍/비스트리밍)와 /api/tags를 흉내 내며, 지연 시간과 실패 응답을 설정할 수 있습니다.
+
+단독 실행:
+    python -m tests.fake_ollama_server --port 11435 --latency 0.5
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class FakeOllamaServer:
+    """스레드에서 동작하는 가짜 Ollama 서버"""
+
+    def __init__(self,
+                 response_text: str = "<json>{\"Scenario Description\": \"fake\", \"Test Cases\": []}</json>",
+                 latency: float = 0.0,
+                 fail_status: Optional[int] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        Args:
+            response_text: /api/generate 응답 텍스트
+            latency: 응답 전 대기 시간 (초)
+            fail_status: 설정 시 /api/generate가 해당 HTTP 상태로 실패
+            host: 바인딩 주소
+            port: 바인딩 포트 (0이면 임의 포트)
+        """
+        self.response_text = response_text
+        self.latency = latency
+        self.fail_status = fail_status
+        self.request_count = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, body):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self._send_json(200, {"models": [{"name": "qwen3:8b"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != '/api/generate':
+                    self._send_json(404, {"error": "not found"})
+                    return
+
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                with server._lock:
+                    server.request_count += 1
+                    server.requests.append(payload)
+
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.fail_status:
+                    self._send_json(server.fail_status, {"error": "fake failure"})
+                    return
+
+                if not payload.get('stream'):
+                    self._send_json(200, {
+                        "model": payload.get('model'),
+                        "response": server.response_text,
+                        "done": True,
+                        "done_reason": "stop",
+                        "prompt_eval_count": len(payload.get('prompt', '')) // 4,
+                        "prompt_eval_duration": 1_000_000 * (len(payload.get('prompt', '')) // 4),
+                        "eval_count": len(server.response_text),
+                        "eval_duration": 10_000_000 * len(server.response_text),
+                        "load_duration": 500_000_000,
+                        "context": list(range(len(payload.get('prompt', '')) // 4))
+                    })
+                    return
+
+                # NDJSON 스트리밍: 10자 단위로 나눠 전송
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.end_headers()
+                text = server.response_text
+                for i in range(0, len(text), 10):
+                    line = json.dumps({"response": text[i:i + 10], "done": False}, ensure_ascii=False)
+                    self.wfile.write(line.encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                final = {"response": "", "done": True, "done_reason": "stop",
+                         "eval_count": len(text), "eval_duration": 10_000_000 * len(text)}
+                self.wfile.write(json.dumps(final).encode('utf-8') + b'\n')
+
+        return Handler
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 Ollama 서버")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeOllamaServer(latency=args.latency, fail_status=args.fail_status, port=args.port)
+    print(f"Fake Ollama server listening on {fake.url}")
+    try:
+        fake._httpd.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
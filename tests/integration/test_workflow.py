@@ -1,6 +1,7 @@
 """
 전체 워크플로우 통합 테스트
 """
+import io
 import pytest
 import tempfile
 import os
@@ -21,8 +22,10 @@ class TestWorkflowIntegration:
         config = load_config(config_file)
         assert config is not None
         
-        # 2. Git 분석 (Mock 사용)
-        with patch('src.git_analyzer.git.Repo') as mock_repo_class:
+        # 2. Git 분석 (Mock 사용, 경로 필터/diff 예산 배분 없이 파일당 고정 줄 수)
+        with patch('src.git_analyzer.git.Repo') as mock_repo_class, \
+             patch('src.git_analyzer.get_diff_budget_config', return_value={'enabled': False}), \
+             patch('src.git_analyzer.get_path_filter_config', return_value={'enabled': False}):
             # Mock 설정
             mock_repo = Mock()
             mock_repo_class.return_value = mock_repo
@@ -35,7 +38,7 @@ class TestWorkflowIntegration:
             mock_repo.merge_base.return_value = [mock_base_commit]
             mock_repo.commit.return_value = mock_head_commit
             mock_repo.iter_commits.return_value = []
-            mock_base_commit.diff.return_value = []
+            mock_repo.git.diff.return_value = Mock(stdout=io.BytesIO(b""))
             
             # Git 분석 실행
             analysis_result = get_git_analysis_text(config["repo_path"])
@@ -43,12 +46,11 @@ class TestWorkflowIntegration:
             assert "### 커밋 메시지 목록:" in analysis_result
             assert "### 주요 코드 변경 내용 (diff):" in analysis_result
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_to_excel_workflow(self, mock_post, temp_dir, mock_excel_template):
+    @patch('src.llm_handler.get_endpoint_pool')
+    def test_llm_to_excel_workflow(self, mock_get_pool, temp_dir, mock_excel_template):
         """LLM 호출부터 Excel 생성까지의 워크플로우 테스트"""
         # 1. LLM 호출 Mock 설정
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mock_get_pool.return_value.generate.return_value = {
             'response': json.dumps({
                 "Scenario Description": "통합 테스트 시나리오",
                 "Test Scenario Name": "워크플로우 테스트",
@@ -64,8 +66,6 @@ class TestWorkflowIntegration:
                 ]
             })
         }
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
         
         # 2. LLM 호출
         llm_result = call_ollama_llm("test prompt", format="json")
@@ -120,9 +120,8 @@ class TestWorkflowIntegration:
             git_analysis = get_git_analysis_text(config["repo_path"])
             
             # 3. LLM 호출 Mock
-            with patch('src.llm_handler.requests.post') as mock_post:
-                mock_response = Mock()
-                mock_response.json.return_value = {
+            with patch('src.llm_handler.get_endpoint_pool') as mock_get_pool:
+                mock_get_pool.return_value.generate.return_value = {
                     'response': json.dumps({
                         "Scenario Description": "통합 테스트용 시나리오",
                         "Test Scenario Name": "전체 파이프라인 테스트",
@@ -138,8 +137,6 @@ class TestWorkflowIntegration:
                         ]
                     })
                 }
-                mock_response.raise_for_status.return_value = None
-                mock_post.return_value = mock_response
                 
                 llm_result = call_ollama_llm(f"분석 결과: {git_analysis}", format="json")
                 result_json = json.loads(llm_result)
@@ -178,9 +175,9 @@ class TestWorkflowIntegration:
         assert "Git 분석 중 오류 발생:" in git_analysis
         
         # LLM 호출 실패 테스트
-        with patch('src.llm_handler.requests.post') as mock_post:
-            from requests.exceptions import RequestException
-            mock_post.side_effect = RequestException("Network error")
+        with patch('src.llm_handler.get_endpoint_pool') as mock_get_pool:
+            import httpx
+            mock_get_pool.return_value.generate.side_effect = httpx.ConnectError("Network error")
             
             llm_result = call_ollama_llm("test prompt")
             assert llm_result is None
@@ -0,0 +1,108 @@
+"""
+git_analysis_cache.py 모듈 및 get_git_analysis_text 캐시 연동 테스트
+"""
+import os
+import pytest
+from unittest.mock import patch
+
+from src.git_analysis_cache import GitAnalysisCache, make_analysis_cache_key
+from src.git_analyzer import get_git_analysis_text, get_analysis_options
+
+
+class TestGitAnalysisCache:
+    """2단계 분석 결과 캐시 테스트"""
+
+    def test_key_depends_on_shas_and_options(self, temp_dir):
+        key = make_analysis_cache_key(temp_dir, "base", "head", {"max_diff_lines_per_file": 20})
+
+        assert key == make_analysis_cache_key(os.path.join(temp_dir, "."), "base", "head", {"max_diff_lines_per_file": 20})
+        assert key != make_analysis_cache_key(temp_dir, "base", "other", {"max_diff_lines_per_file": 20})
+        assert key != make_analysis_cache_key(temp_dir, "base", "head", {"max_diff_lines_per_file": 40})
+
+    def test_disk_cache_survives_restart(self, temp_dir):
+        db_path = os.path.join(temp_dir, "cache", "git_analysis_cache.db")
+        GitAnalysisCache(db_path=db_path).set("key", "분석 결과", analysis_time=2.5)
+
+        cache = GitAnalysisCache(db_path=db_path)
+        assert cache.get("key") == "분석 결과"
+        assert cache.get("key") == "분석 결과"
+
+        stats = cache.get_stats()
+        assert stats['disk_hits'] == 1
+        assert stats['memory_hits'] == 1
+        assert stats['saved_seconds'] == 5.0
+
+    def test_disk_size_eviction_is_lru(self, temp_dir):
+        cache = GitAnalysisCache(db_path=os.path.join(temp_dir, "git_analysis_cache.db"),
+                                 memory_entries=1, max_disk_bytes=12)
+        cache.set("old", "123456")
+        cache.set("recent", "abcdef")
+        # 최근에 사용한 항목은 남고 가장 오래 사용되지 않은 항목부터 제거
+        with patch('src.tiered_cache.time.time', return_value=9999999999.0):
+            assert cache.get("old") == "123456"
+        cache.set("new", "ghijkl")
+
+        stats = cache.get_stats()
+        assert stats['disk_entries'] == 2
+        assert stats['evictions'] == 1
+        assert cache.get("recent") is None
+        assert cache.get("old") == "123456"
+
+
+class TestCachedGitAnalysis:
+    """get_git_analysis_text 캐시 연동 테스트"""
+
+    @pytest.fixture
+    def cache(self):
+        cache = GitAnalysisCache(db_path=None)
+        with patch('src.git_analyzer.get_git_analysis_cache', return_value=cache):
+            yield cache
+
+    @pytest.fixture
+    def feature_repo(self, mock_git_repo, temp_dir):
+        base_branch = mock_git_repo.active_branch.name
+        mock_git_repo.create_head("feature").checkout()
+        self._commit(mock_git_repo, temp_dir, "feature.py", "def feature():\n    return 1\n")
+        return mock_git_repo, base_branch
+
+    @staticmethod
+    def _commit(repo, temp_dir, name, content):
+        path = os.path.join(temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        repo.index.add([path])
+        repo.index.commit(f"Update {name}")
+
+    def test_unchanged_branch_served_from_cache(self, cache, feature_repo, temp_dir):
+        """브랜치가 바뀌지 않았으면 diff를 다시 계산하지 않는지 테스트"""
+        _, base_branch = feature_repo
+
+        first = get_git_analysis_text(temp_dir, base_branch, "feature")
+        with patch('src.git_analyzer.build_analysis_text') as build:
+            second = get_git_analysis_text(temp_dir, base_branch, "feature")
+
+        build.assert_not_called()
+        assert second == first
+        assert "Update feature.py" in first
+        assert cache.get_stats()['hits'] == 1
+
+    def test_new_commit_invalidates_by_sha(self, cache, feature_repo, temp_dir):
+        """브랜치에 새 커밋이 생기면 새로 분석하는지 테스트"""
+        repo, base_branch = feature_repo
+        get_git_analysis_text(temp_dir, base_branch, "feature")
+
+        self._commit(repo, temp_dir, "second.py", "value = 2\n")
+        result = get_git_analysis_text(temp_dir, base_branch, "feature")
+
+        assert "Update second.py" in result
+        assert cache.get_stats()['misses'] == 2
+
+    def test_opt_out_and_errors_not_cached(self, cache, feature_repo, temp_dir):
+        """캐시를 끄거나 분석에 실패한 경우 저장하지 않는지 테스트"""
+        _, base_branch = feature_repo
+
+        get_git_analysis_text(temp_dir, base_branch, "feature", use_cache=False)
+        get_git_analysis_text(temp_dir, base_branch, "missing")
+
+        assert cache.get_stats()['stores'] == 0
+        assert get_analysis_options()['max_diff_lines_per_file'] == 20
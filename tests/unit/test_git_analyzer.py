@@ -1,15 +1,39 @@
 """
 git_analyzer.py 모듈 테스트
 """
+import io
+import os
 import pytest
 import git
 from unittest.mock import Mock, patch, MagicMock
-from src.git_analyzer import get_git_analysis_text
+from src.git_analyzer import (
+    get_git_analysis_text, allocate_diff_budget, collect_change_stats, score_file, select_hunks,
+    DIFF_TRUNCATION_MESSAGE
+)
+from src.git_diff_stream import stream_file_diffs
+
+
+def _git_diff_process(*files):
+    """`git diff --patch` 출력을 내보내는 프로세스 Mock (files: (경로, hunk 본문) 목록)"""
+    output = "".join(
+        f"diff --git a/{path} b/{path}\nindex 1111111..2222222 100644\n--- a/{path}\n+++ b/{path}\n{body}\n"
+        for path, body in files
+    )
+    process = Mock()
+    process.stdout = io.BytesIO(output.encode('utf-8'))
+    return process
 
 
 class TestGitAnalyzer:
     """Git 분석기 테스트"""
     
+    @pytest.fixture(autouse=True)
+    def fixed_line_limit(self):
+        """Mock 저장소는 numstat/log 출력이 없으므로 경로 필터 없이 파일당 고정 줄 수 방식으로 검증"""
+        with patch('src.git_analyzer.get_diff_budget_config', return_value={'enabled': False}), \
+             patch('src.git_analyzer.get_path_filter_config', return_value={'enabled': False}):
+            yield
+    
     @patch('src.git_analyzer.git.Repo')
     def test_successful_git_analysis(self, mock_repo_class):
         """성공적인 Git 분석 테스트"""
@@ -34,12 +58,10 @@ class TestGitAnalyzer:
         
         mock_repo.iter_commits.return_value = [mock_commit2, mock_commit1]
         
-        # diff Mock
-        mock_diff = Mock()
-        mock_diff.a_path = "src/test.py"
-        mock_diff.diff = b"+def new_function():\n+    return True"
-        
-        mock_base_commit.diff.return_value = [mock_diff]
+        # git diff 출력 Mock
+        mock_repo.git.diff.return_value = _git_diff_process(
+            ("src/test.py", "@@ -0,0 +1,2 @@\n+def new_function():\n+    return True")
+        )
         
         result = get_git_analysis_text("/test/repo")
         
@@ -87,22 +109,19 @@ class TestGitAnalyzer:
         mock_repo.commit.return_value = mock_head_commit
         mock_repo.iter_commits.return_value = []
         
-        # 긴 diff 생성 (20줄 넘게)
-        long_diff_lines = [f"+line {i}" for i in range(25)]
+        # 긴 diff 생성 (hunk 헤더 포함 20줄 넘게)
+        long_diff_lines = ["@@ -0,0 +1,25 @@"] + [f"+line {i}" for i in range(25)]
         long_diff_content = "\n".join(long_diff_lines)
         
-        mock_diff = Mock()
-        mock_diff.a_path = "src/long_file.py"
-        mock_diff.diff = long_diff_content.encode('utf-8')
-        
-        mock_base_commit.diff.return_value = [mock_diff]
+        mock_repo.git.diff.return_value = _git_diff_process(("src/long_file.py", long_diff_content))
         
         result = get_git_analysis_text("/test/repo")
         
         assert "src/long_file.py" in result
         assert "... (내용 생략) ..." in result
-        assert "+line 19" in result  # 20줄까지는 포함
-        assert "+line 24" not in result  # 21줄부터는 제외
+        assert "+line 18" in result  # 20줄까지는 포함
+        assert "+line 19" not in result  # 21줄부터는 제외
+        assert "+line 24" not in result
     
     @patch('src.git_analyzer.git.Repo')
     def test_unicode_handling_in_diff(self, mock_repo_class):
@@ -121,13 +140,9 @@ class TestGitAnalyzer:
         mock_repo.iter_commits.return_value = []
         
         # 한글이 포함된 diff
-        korean_diff = "+한글 주석 추가\n+def 함수():"
-        
-        mock_diff = Mock()
-        mock_diff.a_path = "src/korean.py"
-        mock_diff.diff = korean_diff.encode('utf-8')
+        korean_diff = "@@ -0,0 +1,2 @@\n+한글 주석 추가\n+def 함수():"
         
-        mock_base_commit.diff.return_value = [mock_diff]
+        mock_repo.git.diff.return_value = _git_diff_process(("src/korean.py", korean_diff))
         
         result = get_git_analysis_text("/test/repo")
         
@@ -156,7 +171,7 @@ class TestGitAnalyzer:
         
         # iter_commits는 최신부터 반환하므로 역순
         mock_repo.iter_commits.return_value = [mock_commit3, mock_commit2, mock_commit1]
-        mock_base_commit.diff.return_value = []
+        mock_repo.git.diff.return_value = _git_diff_process()
         
         result = get_git_analysis_text("/test/repo")
         
@@ -166,4 +181,158 @@ class TestGitAnalyzer:
         second_pos = commit_section.find("두 번째 커밋")
         third_pos = commit_section.find("세 번째 커밋")
         
-        assert first_pos < second_pos < third_pos
\ No newline at end of file
+        assert first_pos < second_pos < third_pos
+
+
+class TestDiffBudget:
+    """관련도 기반 diff 예산 배분 테스트"""
+    
+    def test_allocation_respects_total_minimum_and_caps(self):
+        costs = {"service.py": 500, "config.json": 8, "yarn.lock": 900}
+        scores = {"service.py": 6.0, "config.json": 1.0, "yarn.lock": 0.5}
+        
+        budgets = allocate_diff_budget(costs, scores, total=100, min_per_file=4)
+        
+        assert sum(budgets.values()) == 100
+        # 작은 파일은 전체 diff 비용까지만 받고 남는 몫은 다른 파일로
+        assert budgets["config.json"] == 8
+        assert budgets["service.py"] > budgets["yarn.lock"] >= 4
+        assert allocate_diff_budget(costs, scores, total=100, min_per_file=4, max_per_file=30)["service.py"] == 30
+    
+    def test_tight_budget_fills_small_files_first(self):
+        costs = {"service.py": 500, "helper.py": 200, "renamed.py": 3}
+        scores = {"service.py": 6.0, "helper.py": 3.0, "renamed.py": 1.0}
+        
+        budgets = allocate_diff_budget(costs, scores, total=8, min_per_file=4)
+        
+        # 파일 수 × 최소량이 전체 예산을 넘으면 최소량 안에 들어가는 작은 파일을 먼저 채움
+        assert budgets == {"service.py": 4, "helper.py": 1, "renamed.py": 3}
+    
+    def test_score_uses_size_type_and_history(self):
+        change = {'added': 40, 'deleted': 10, 'binary': False, 'commits': 1}
+        
+        assert score_file("src/service.py", change) > score_file("tests/test_service.py", change)
+        assert score_file("tests/test_service.py", change) > score_file("config/app.yaml", change)
+        assert score_file("config/app.yaml", change) > score_file("frontend/package-lock.json", change)
+        assert score_file("src/service.py", dict(change, commits=4)) > score_file("src/service.py", change)
+        assert score_file("logo.png", {'added': 0, 'deleted': 0, 'binary': True, 'commits': 1}) == 0.0
+    
+    def test_select_hunks_prefers_most_changed(self):
+        lines = ["@@ -1 +1 @@", "-a", "+b",
+                 "@@ -10,2 +10,6 @@", " ctx", "+c1", "+c2", "+c3", "+c4",
+                 "@@ -30 +34 @@", "+d"]
+        
+        selected = select_hunks(lines, budget=8, line_cost=lambda line: 1)
+        
+        # 변경이 가장 많은 둘째 hunk 전체 + 남은 예산으로 첫 hunk 앞부분, 원래 순서 유지
+        assert selected == ["@@ -1 +1 @@", "-a", DIFF_TRUNCATION_MESSAGE,
+                            "@@ -10,2 +10,6 @@", " ctx", "+c1", "+c2", "+c3", "+c4", DIFF_TRUNCATION_MESSAGE]
+    
+    def test_real_repo_budget(self, mock_git_repo, temp_dir):
+        """실제 저장소에서 큰 소스 변경이 문서 변경보다 먼저, 더 많이 담기는지 테스트"""
+        base_branch = mock_git_repo.active_branch.name
+        mock_git_repo.create_head("feature").checkout()
+        
+        def commit(name, content):
+            path = os.path.join(temp_dir, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            mock_git_repo.index.add([path])
+            mock_git_repo.index.commit(f"Update {name}")
+        
+        commit("CHANGELOG.md", "".join(f"- entry {i}\n" for i in range(300)))
+        commit("service.py", "".join(f"def handler_{i}():\n    return {i}\n" for i in range(100)))
+        commit("service.py", "".join(f"def handler_{i}():\n    return {i * 2}\n" for i in range(100)))
+        
+        stats = collect_change_stats(mock_git_repo, mock_git_repo.commit(base_branch).hexsha,
+                                     mock_git_repo.head.commit.hexsha)
+        assert stats["service.py"] == {'added': 200, 'deleted': 0, 'binary': False, 'commits': 2,
+                                       'new_path': "service.py"}
+        
+        config = {'git': {'diff_budget': {'max_lines': 60, 'min_lines_per_file': 4}}}
+        with patch('src.git_analyzer.load_config', return_value=config):
+            result = get_git_analysis_text(temp_dir, base_branch, "feature")
+        
+        diff_section = result.split("### 주요 코드 변경 내용 (diff):")[1]
+        assert diff_section.index("--- 파일: service.py ---") < diff_section.index("--- 파일: CHANGELOG.md ---")
+        content_lines = [line for line in diff_section.splitlines()
+                         if line and not line.startswith("--- 파일:") and line != DIFF_TRUNCATION_MESSAGE]
+        assert len(content_lines) <= 60
+        assert diff_section.count("- entry") < diff_section.count("def handler_")
+    
+    def test_zero_budget_files_listed_by_name_only(self, mock_git_repo, temp_dir):
+        """예산을 받지 못한 파일은 빈 구역 대신 제외 목록에 이름만 남는지 테스트"""
+        base_branch = mock_git_repo.active_branch.name
+        mock_git_repo.create_head("feature").checkout()
+        files = {
+            "service.py": "".join(f"def handler_{i}():\n    return {i}\n" for i in range(50)),
+            "helper.py": "".join(f"VALUE_{i} = {i}\n" for i in range(30)),
+            "notes.md": "note\n"
+        }
+        for name, content in files.items():
+            with open(os.path.join(temp_dir, name), 'w') as f:
+                f.write(content)
+        mock_git_repo.index.add([os.path.join(temp_dir, name) for name in files])
+        mock_git_repo.index.commit("Add files")
+        
+        config = {'git': {'diff_budget': {'max_lines': 16, 'min_lines_per_file': 8}}}
+        with patch('src.git_analyzer.load_config', return_value=config):
+            result = get_git_analysis_text(temp_dir, base_branch, "feature", use_cache=False)
+        
+        # notes.md(비용 8)가 먼저 전체를 받고, service.py가 최소량, helper.py는 0줄
+        assert "+note" in result
+        assert "--- 파일: service.py ---" in result
+        assert "--- 파일: helper.py ---" not in result
+        assert "- helper.py (예산 초과)" in result
+
+
+class TestParallelDiffExtraction:
+    """작업자 풀 기반 파일별 diff 추출 테스트"""
+    
+    @pytest.fixture
+    def monorepo_branch(self, mock_git_repo, temp_dir):
+        """파일 60개 변경 + 이름 변경 + 자동 생성 파일이 있는 브랜치"""
+        for i in range(3):
+            os.makedirs(os.path.join(temp_dir, f"module_{i}"), exist_ok=True)
+        with open(os.path.join(temp_dir, "module_0", "legacy.py"), 'w') as f:
+            f.write("".join(f"line_{i} = {i}\n" for i in range(30)))
+        mock_git_repo.index.add([os.path.join(temp_dir, "module_0", "legacy.py")])
+        mock_git_repo.index.commit("Add legacy module")
+        base_branch = mock_git_repo.active_branch.name
+        
+        mock_git_repo.create_head("feature").checkout()
+        mock_git_repo.index.move([os.path.join(temp_dir, "module_0", "legacy.py"),
+                                  os.path.join(temp_dir, "module_2", "renamed.py")])
+        paths = []
+        for i in range(60):
+            path = os.path.join(temp_dir, f"module_{i % 3}", f"service_{i}.py")
+            with open(path, 'w') as f:
+                f.write("".join(f"def handler_{i}_{j}():\n    return {j}\n" for j in range(i % 7 + 1)))
+            paths.append(path)
+        generated = os.path.join(temp_dir, "module_1", "client.py")
+        with open(generated, 'w') as f:
+            f.write("# @generated by codegen\nCLIENT = 1\n")
+        mock_git_repo.index.add(paths + [generated])
+        mock_git_repo.index.commit("Add services")
+        return base_branch
+    
+    @pytest.mark.parametrize("budget_enabled", [True, False])
+    def test_parallel_output_matches_sequential(self, monorepo_branch, temp_dir, budget_enabled):
+        config = {'git': {'diff_budget': {'enabled': budget_enabled, 'max_lines': 200}}}
+        results = {}
+        for workers in (1, 4):
+            with patch('src.git_analyzer.load_config', return_value=config), \
+                 patch('src.git_analyzer.get_diff_worker_count', return_value=workers), \
+                 patch('src.git_analyzer.stream_file_diffs', wraps=stream_file_diffs) as stream:
+                results[workers] = get_git_analysis_text(temp_dir, monorepo_branch, "feature", use_cache=False)
+            assert stream.call_count == (1 if workers == 1 else 8)
+            # 병렬 조각은 공유 핸들 대신 각자 연 저장소 핸들을 사용
+            assert len({id(call.args[0]) for call in stream.call_args_list}) == stream.call_count
+        
+        assert results[4] == results[1]
+        assert "--- 파일: module_0/legacy.py ---" in results[4]
+        assert "--- 파일: module_2/renamed.py ---" not in results[4]
+        assert "-line_0 = 0" not in results[4]  # 삭제가 아니라 이름 변경으로 감지
+        assert "- module_1/client.py (생성/벤더 파일)" in results[4]
+        # 예산을 받지 못한 파일은 구역 대신 제외 목록에 이름만 남음
+        assert results[4].count("--- 파일: module_") + results[4].count("(예산 초과)") == 61
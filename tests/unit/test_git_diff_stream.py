@@ -0,0 +1,92 @@
+"""
+git_diff_stream.py 모듈 테스트
+"""
+import os
+
+import git
+import pytest
+
+from src.git_diff_stream import parse_patch_stream, stream_file_diffs, unquote_path
+
+
+PATCH = b"""diff --git a/src/app.py b/src/app.py
+index 1111111..2222222 100644
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,3 @@
+ import os
+--- removed comment
++++ added comment
+diff --git a/docs/new file.md b/docs/new file.md
+new file mode 100644
+index 0000000..3333333
+--- /dev/null
++++ b/docs/new file.md\t
+@@ -0,0 +1 @@
++hello
+diff --git a/logo.png b/logo.png
+index 4444444..5555555 100644
+Binary files a/logo.png and b/logo.png differ
+"""
+
+
+class TestParsePatchStream:
+    """git diff 출력 파싱 테스트"""
+
+    def test_files_paths_and_content(self):
+        files = list(parse_patch_stream(PATCH.splitlines(keepends=True), None))
+
+        assert [f.path for f in files] == ["src/app.py", "docs/new file.md", "logo.png"]
+        # hunk 안의 '--- '/'+++ ' 줄은 헤더가 아니라 내용
+        assert files[0].lines == ["@@ -1,3 +1,3 @@", " import os", "--- removed comment", "+++ added comment"]
+        assert files[2].lines == ["Binary files a/logo.png and b/logo.png differ"]
+
+    def test_line_budget_keeps_count_only(self):
+        patch = b"diff --git a/big.txt b/big.txt\n--- a/big.txt\n+++ b/big.txt\n@@ -1 +1,1000 @@\n" + \
+                b"".join(b"+line %d\n" % i for i in range(1000))
+
+        (big,) = parse_patch_stream(iter(patch.splitlines(keepends=True)), 3)
+
+        assert big.lines == ["@@ -1 +1,1000 @@", "+line 0", "+line 1"]
+        assert big.line_count == 1001
+        assert big.truncated
+
+    def test_unquote_path(self):
+        assert unquote_path('"a/\\355\\225\\234\\352\\270\\200.py"') == "a/한글.py"
+        assert unquote_path('"a/tab\\there"') == "a/tab\there"
+        assert unquote_path("a/plain.py") == "a/plain.py"
+
+
+class TestStreamFileDiffs:
+    """실제 저장소 diff 스트리밍 테스트"""
+
+    @pytest.fixture
+    def changed_repo(self, mock_git_repo, temp_dir):
+        base_sha = mock_git_repo.head.commit.hexsha
+        with open(os.path.join(temp_dir, "test.py"), 'w') as f:
+            f.write("\n".join(f"print({i})" for i in range(100)))
+        with open(os.path.join(temp_dir, "한글.py"), 'w') as f:
+            f.write("# 새 파일\n")
+        mock_git_repo.index.add([os.path.join(temp_dir, "test.py"), os.path.join(temp_dir, "한글.py")])
+        head_sha = mock_git_repo.index.commit("change").hexsha
+        return mock_git_repo, base_sha, head_sha
+
+    def test_streams_each_file_with_budget(self, changed_repo):
+        repo, base_sha, head_sha = changed_repo
+
+        files = list(stream_file_diffs(repo, base_sha, head_sha, max_lines_per_file=5))
+
+        assert [f.path for f in files] == ["test.py", "한글.py"]
+        assert len(files[0].lines) == 5
+        assert files[0].line_count > 100
+        assert files[1].lines == ["@@ -0,0 +1 @@", "+# 새 파일"]
+
+    def test_early_stop_and_errors(self, changed_repo):
+        repo, base_sha, head_sha = changed_repo
+
+        stream = stream_file_diffs(repo, base_sha, head_sha)
+        assert next(stream).path == "test.py"
+        stream.close()
+
+        with pytest.raises(git.GitCommandError):
+            list(stream_file_diffs(repo, base_sha, "0" * 40))
@@ -0,0 +1,128 @@
+"""
+git_path_filters.py 모듈 및 diff 경로 필터 연동 테스트
+"""
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.git_analyzer import get_git_analysis_text
+from src.git_diff_stream import stream_file_diffs
+from src.git_path_filters import (
+    build_pathspecs, format_excluded_files, get_path_filter_config, is_generated_content,
+    BUILTIN_EXCLUDE_GLOBS, EXCLUDED_FILES_HEADER
+)
+
+
+class TestPathspecs:
+    """설정 -> pathspec 변환 테스트"""
+
+    def test_include_exclude_and_builtin(self):
+        config = dict(get_path_filter_config(), include=["src/**"], exclude=["docs/**"])
+
+        pathspecs = build_pathspecs(config)
+
+        assert pathspecs[:2] == [":(top,glob)src/**", ":(top,exclude,glob)docs/**"]
+        assert ":(top,exclude,glob)**/package-lock.json" in pathspecs
+        assert len(build_pathspecs(dict(config, builtin_excludes=False))) == 2
+        assert len(pathspecs) == 2 + len(BUILTIN_EXCLUDE_GLOBS)
+
+    def test_excluded_listing_is_capped(self):
+        excluded = {f"assets/{i}.png": "이진 파일" for i in range(55)}
+
+        lines = format_excluded_files(excluded)
+
+        assert lines[0] == EXCLUDED_FILES_HEADER
+        assert lines[1] == "- assets/0.png (이진 파일)"
+        assert lines[-1] == "- ... 외 5개"
+        assert format_excluded_files({}) == []
+
+
+class TestGeneratedContent:
+    """파일 첫머리 주석의 자동 생성 표식 판별 테스트"""
+
+    def test_detects_anchored_markers_in_leading_comments(self):
+        assert is_generated_content(["@@ -0,0 +1,2 @@", "+// Code generated by protoc. DO NOT EDIT.", "+package api"])
+        assert is_generated_content(["@@ -1,3 +1,3 @@", "-# @generated by codegen v1", "+# @generated by codegen v2",
+                                     " CLIENT = 1"])
+        assert is_generated_content(["@@ -0,0 +1,3 @@", "+#!/usr/bin/env python", "+", "+# @generated"])
+        assert is_generated_content(["@@ -0,0 +1 @@", "+/* Code generated by mockgen. DO NOT EDIT. */"])
+
+    def test_ignores_loose_markers(self):
+        # 일반 주석의 'Do not edit' 문구나 코드 속 단어는 표식이 아님
+        assert not is_generated_content([" # Do not edit these values without approval from ops", " TIMEOUT = 30"])
+        assert not is_generated_content(["@@ -0,0 +1,2 @@", "+# Do not edit these values without approval from ops",
+                                         "+TIMEOUT = 30"])
+        assert not is_generated_content(["+    return autogenerated_id()"])
+        assert not is_generated_content(["@@ -0,0 +1,2 @@", "+import os", "+# @generated"])
+        # 파일 중간부터 시작하는 hunk는 보지 않음
+        assert not is_generated_content(["@@ -20,2 +20,3 @@", " # @generated", "+VALUE = 1"])
+
+
+class TestFilteredAnalysis:
+    """실제 저장소에서 제외 파일이 패치 없이 이름만 남는지 테스트"""
+
+    @pytest.fixture
+    def filtered_repo(self, mock_git_repo, temp_dir):
+        base_branch = mock_git_repo.active_branch.name
+        mock_git_repo.create_head("feature").checkout()
+        files = {
+            "src/app.py": b"def handler():\n    return 'ok'\n",
+            "yarn.lock": b"".join(b"pkg-%d@1.0.0\n" % i for i in range(50)),
+            "web/dist/app.min.js": b"var minified=1;\n",
+            "assets/logo.bin": b"\x89PNG\x00\x01\x02\x00",
+            "models/schema.py": b"class Schema:\n    pass\n",
+            "api/client.go": b"// Code generated by protoc. DO NOT EDIT.\npackage api\n",
+            "docs/guide.md": b"# guide\n",
+            ".gitattributes": b"models/** linguist-generated\n"
+        }
+        paths = []
+        for name, content in files.items():
+            path = os.path.join(temp_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+            paths.append(path)
+        mock_git_repo.index.add(paths)
+        mock_git_repo.index.commit("Add files")
+        return base_branch
+
+    def test_excluded_files_listed_by_name_only(self, filtered_repo, temp_dir):
+        config = {'git': {'path_filters': {'exclude': ["docs/**"]}}}
+        with patch('src.git_path_filters.load_config', return_value=config), \
+             patch('src.git_analyzer.stream_file_diffs', wraps=stream_file_diffs) as stream:
+            result = get_git_analysis_text(temp_dir, filtered_repo, "feature", use_cache=False)
+
+        diff_section, excluded_section = result.split(EXCLUDED_FILES_HEADER)
+        assert "--- 파일: src/app.py ---" in diff_section
+        assert "return 'ok'" in diff_section
+        for name in ("yarn.lock", "web/dist/app.min.js", "docs/guide.md", "assets/logo.bin",
+                     "models/schema.py", "api/client.go"):
+            assert f"--- 파일: {name} ---" not in diff_section
+        assert "- yarn.lock (경로 필터)" in excluded_section
+        assert "- docs/guide.md (경로 필터)" in excluded_section
+        assert "- assets/logo.bin (이진 파일)" in excluded_section
+        assert "- models/schema.py (생성/벤더 파일)" in excluded_section
+        assert "- api/client.go (생성/벤더 파일)" in excluded_section
+        assert "pkg-" not in result
+
+        # 이진/생성 파일은 개별 경로 pathspec으로 패치 호출에서 제외
+        pathspecs = stream.call_args.args[4]
+        assert ":(top,exclude,glob)docs/**" in pathspecs
+        assert ":(top,exclude,literal)assets/logo.bin" in pathspecs
+        assert ":(top,exclude,literal)models/schema.py" in pathspecs
+
+    def test_include_globs_and_disabled_filters(self, filtered_repo, temp_dir):
+        config = {'git': {'path_filters': {'include': ["src/**", "docs/**"], 'builtin_excludes': False}}}
+        with patch('src.git_path_filters.load_config', return_value=config):
+            result = get_git_analysis_text(temp_dir, filtered_repo, "feature", use_cache=False)
+
+        assert "--- 파일: src/app.py ---" in result
+        assert "--- 파일: docs/guide.md ---" in result
+        assert "- yarn.lock (경로 필터)" in result
+
+        with patch('src.git_path_filters.load_config', return_value={'git': {'path_filters': {'enabled': False}}}):
+            result = get_git_analysis_text(temp_dir, filtered_repo, "feature", use_cache=False)
+
+        assert "--- 파일: yarn.lock ---" in result
+        assert EXCLUDED_FILES_HEADER not in result
@@ -0,0 +1,238 @@
+"""
+LLM 백엔드(Ollama 클라이언트, OpenAI 호환 서버, 스텁) 테스트
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from src.llm.backends import create_client, OLLAMA_BACKEND, OPENAI_BACKEND, STUB_BACKEND
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.ollama_client import OllamaClient
+from src.llm.openai_client import OpenAICompatibleClient, to_completion_request, from_completion_response
+from src.llm.response_cache import LLMResponseCache, make_cache_key
+from src.llm.stub_client import StubClient, DEFAULT_STUB_RESPONSE, load_recordings
+
+
+def _payload(prompt="test prompt", **options):
+    return {"model": "qwen3:8b", "prompt": prompt, "stream": False, "options": options}
+
+
+class TestCreateClient:
+    """백엔드별 클라이언트 생성 테스트"""
+
+    def test_creates_client_per_backend(self):
+        assert type(create_client(OLLAMA_BACKEND, "http://gpu-1:11434")) is OllamaClient
+        openai_client = create_client(OPENAI_BACKEND, "http://gpu-1:8080", backend_options={"api_key": "secret"})
+        assert isinstance(openai_client, OpenAICompatibleClient)
+        assert openai_client.generate_url == "http://gpu-1:8080/v1/completions"
+        assert openai_client.headers == {"Authorization": "Bearer secret"}
+        stub = create_client(STUB_BACKEND, "stub://local", backend_options={"latency": 0.2})
+        assert isinstance(stub, StubClient)
+        assert stub.latency == 0.2
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_client("unknown", "http://gpu-1:11434")
+
+
+class TestOllamaClient:
+    """이벤트 루프별 비동기 클라이언트 관리 테스트"""
+
+    @staticmethod
+    def _client():
+        return OllamaClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+
+    def test_closed_loop_client_is_dropped(self):
+        client = self._client()
+
+        async def get_client():
+            return client._get_async_client()
+
+        first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+        first = first_loop.run_until_complete(get_client())
+        first_loop.close()
+        second = second_loop.run_until_complete(get_client())
+        second_loop.close()
+
+        assert second is not first
+        assert list(client._async_clients.values()) == [second]
+
+    def test_aclose_closes_client_of_other_loop(self):
+        client = self._client()
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+
+        async def get_client():
+            return client._get_async_client()
+
+        async def close_all():
+            current = client._get_async_client()
+            assert current is not other  # 다른 루프의 클라이언트를 교체하지 않음
+            await client.aclose()
+            return current
+
+        try:
+            other = asyncio.run_coroutine_threadsafe(get_client(), other_loop).result(timeout=5)
+            current = asyncio.run(close_all())
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other_loop).result(timeout=5)
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join(timeout=5)
+            other_loop.close()
+
+        assert current.is_closed and other.is_closed
+        assert len(client._async_clients) == 0
+
+
+class TestOpenAICompatibleClient:
+    """OpenAI 호환 /v1/completions 변환 테스트"""
+
+    def test_request_mapping(self):
+        payload = _payload(num_predict=512, temperature=0.2, top_k=20, stop=["</json>"], num_ctx=8192)
+        payload["format"] = "json"
+        payload["think"] = False
+
+        body = to_completion_request(payload)
+
+        assert body == {
+            "model": "qwen3:8b",
+            "prompt": "test prompt",
+            "stream": False,
+            "max_tokens": 512,
+            "temperature": 0.2,
+            "top_k": 20,
+            "stop": ["</json>"],
+            "response_format": {"type": "json_object"}
+        }
+
+    def test_schema_format_and_stream_usage(self):
+        payload = _payload()
+        payload["stream"] = True
+        payload["format"] = {"type": "object"}
+
+        body = to_completion_request(payload)
+
+        assert body["response_format"]["json_schema"]["schema"] == {"type": "object"}
+        assert body["stream_options"] == {"include_usage": True}
+
+    def test_response_mapping(self):
+        data = {
+            "choices": [{"text": "hello", "finish_reason": "length"}],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 3}
+        }
+
+        result = from_completion_response(data, "qwen3:8b")
+
+        assert result["response"] == "hello"
+        assert result["done_reason"] == "length"
+        assert result["prompt_eval_count"] == 12
+        assert result["eval_count"] == 3
+
+    def test_pool_generate(self):
+        seen = []
+
+        def handler(request):
+            seen.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(200, json={"choices": [{"text": "ok", "finish_reason": "stop"}]})
+
+        pool = EndpointPool(["http://llama.test"], backend=OPENAI_BACKEND, transport=httpx.MockTransport(handler))
+        result = pool.generate(_payload(num_predict=16), timeout=10)
+
+        assert result["response"] == "ok"
+        assert seen[0][0] == "/v1/completions"
+        assert seen[0][1]["max_tokens"] == 16
+
+    @pytest.mark.asyncio
+    async def test_sse_stream_converted_to_ndjson(self):
+        from src.llm_handler import collect_ollama_stream
+
+        chunks = [
+            {"choices": [{"text": "<json>", "finish_reason": None}]},
+            {"choices": [{"text": '{"a": 1}', "finish_reason": None}]},
+            {"choices": [{"text": "</json>", "finish_reason": "stop"}]},
+            {"choices": [], "usage": {"prompt_tokens": 5, "completion_tokens": 3}}
+        ]
+        body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body.encode("utf-8")))
+        pool = EndpointPool(["http://llama.test"], backend=OPENAI_BACKEND, transport=transport)
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool):
+            result = await collect_ollama_stream("test prompt", model="qwen3:8b",
+                                                 stop_at_json_end=False, use_cache=False)
+
+        assert result.text == '<json>{"a": 1}</json>'
+        assert result.parse_json() == {"a": 1}
+        assert result.done_reason == "stop"
+
+
+class TestStubClient:
+    """결정적 스텁 클라이언트 테스트"""
+
+    def test_deterministic_response(self):
+        stub = StubClient(responses=["first", "second", "third"])
+
+        results = {stub.generate(_payload(f"prompt {i}"), timeout=10)["response"] for i in range(10)}
+
+        assert results <= {"first", "second", "third"}
+        for i in range(10):
+            payload = _payload(f"prompt {i}")
+            assert stub.generate(payload, timeout=10) == stub.generate(payload, timeout=10)
+
+    def test_default_response_is_valid_scenario(self):
+        result = StubClient().generate(_payload(), timeout=10)
+
+        assert result["response"] == DEFAULT_STUB_RESPONSE
+        assert result["done_reason"] == "stop"
+
+    def test_stop_and_num_predict(self):
+        stub = StubClient(responses=["<json>{}</json> trailing"], chars_per_token=2, tokens_per_second=1000)
+
+        stopped = stub.generate(_payload(stop=["</json>"]), timeout=10)
+        truncated = stub.generate(_payload(num_predict=3), timeout=10)
+
+        assert stopped["response"] == "<json>{}"
+        assert stopped["done_reason"] == "stop"
+        assert truncated["response"] == "<json>"
+        assert truncated["done_reason"] == "length"
+        assert truncated["eval_count"] == 3
+        assert truncated["eval_duration"] == 3_000_000
+
+    def test_recordings_from_jsonl(self, tmp_path):
+        path = tmp_path / "recordings.jsonl"
+        path.write_text(json.dumps({"response": "recorded"}) + "\n\n", encoding="utf-8")
+
+        result = StubClient(recordings=str(path)).generate(_payload(), timeout=10)
+
+        assert result["response"] == "recorded"
+
+    def test_recordings_from_response_cache(self, tmp_path):
+        db_path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(db_path=db_path)
+        matched = _payload("matched prompt")
+        cache.set(make_cache_key(matched), "cached answer", model="qwen3:8b")
+        cache.set("other-key", "other answer", model="qwen3:8b")
+
+        by_key, responses = load_recordings(db_path)
+        stub = StubClient(recordings=db_path)
+
+        assert by_key[make_cache_key(matched)] == "cached answer"
+        assert len(responses) == 2
+        assert stub.generate(matched, timeout=10)["response"] == "cached answer"
+
+    @pytest.mark.asyncio
+    async def test_stream_through_pool(self):
+        from src.llm_handler import collect_ollama_stream
+
+        pool = EndpointPool(["stub://local"], backend=STUB_BACKEND)
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool):
+            result = await collect_ollama_stream("test prompt", model="qwen3:8b", use_cache=False)
+
+        assert result.parse_json()["Test Scenario Name"] == "스텁 테스트 시나리오"
+        assert result.token_count > 1
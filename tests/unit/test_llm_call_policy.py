@@ -0,0 +1,171 @@
+"""
+call_policy.py 모듈 테스트
+"""
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+
+from src.llm.call_policy import CallPolicy, LatencyModel, is_retryable, latency_key
+from src.llm.endpoint_pool import EndpointPool
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+def _trained_model(samples=20):
+    """프롬프트 1000자당 1초 + 2초 기본 지연으로 학습된 모델"""
+    model = LatencyModel(min_samples=5)
+    for i in range(samples):
+        chars = 1000 * (i + 1)
+        model.record("qwen3:8b", chars, 2 + chars / 1000)
+    return model
+
+
+def _server_error():
+    request = httpx.Request("POST", "http://gpu-1:11434/api/generate")
+    return httpx.HTTPStatusError("boom", request=request, response=httpx.Response(503, request=request))
+
+
+class TestLatencyModel:
+    """지연 학습 테스트"""
+
+    def test_needs_min_samples(self):
+        """기록이 부족하면 예측하지 않는지 테스트"""
+        model = LatencyModel(min_samples=3)
+        model.record("qwen3:8b", 1000, 3.0)
+
+        assert model.estimate("qwen3:8b", 1000) is None
+
+    def test_estimate_scales_with_prompt_size(self):
+        """프롬프트 크기에 비례한 예상 시간 테스트"""
+        expected, p95 = _trained_model().estimate("qwen3:8b", 30000)
+
+        assert expected == pytest.approx(32.0)
+        assert p95 >= expected
+
+
+class TestCallPolicy:
+    """호출 정책 테스트"""
+
+    def test_timeout_for(self):
+        """학습 전에는 기본 타임아웃, 학습 후에는 p95 기반 마감 시간을 쓰는지 테스트"""
+        assert CallPolicy().timeout_for("qwen3:8b", 5000, 600) == 600
+
+        policy = CallPolicy(latency_model=_trained_model(), timeout_factor=2.0, min_timeout=10)
+        assert policy.timeout_for("qwen3:8b", 8000, 600) == pytest.approx(20.0)
+        assert policy.timeout_for("qwen3:8b", 1000, 600) == 10
+        assert policy.timeout_for("qwen3:8b", 1000000, 600) == 600
+
+    def test_latency_key_separates_request_kinds(self):
+        """출력 모드/상한/think/스트리밍이 다른 요청은 지연 기록을 공유하지 않는지 테스트"""
+        base = {"model": "qwen3:8b", "prompt": "p", "format": "", "stream": False}
+        fast = dict(base, think=False, options={"num_predict": 1024})
+        keys = {
+            latency_key(base),
+            latency_key(fast),
+            latency_key(dict(base, think=True, options={"num_predict": 8192})),
+            latency_key(dict(base, format={"type": "object"})),
+            latency_key(dict(base, stream=True))
+        }
+
+        assert len(keys) == 5
+        assert latency_key(fast) == "qwen3:8b|text|think=False|num_predict=1024"
+
+        policy = CallPolicy(min_timeout=10)
+        policy.latency_model.min_samples = 1
+        policy.record(latency_key(fast), 1000, 1.0)
+        assert policy.timeout_for(latency_key(fast), 1000, 600) == 10
+        assert policy.timeout_for(latency_key(base), 1000, 600) == 600
+
+    def test_is_retryable(self):
+        """일시적 오류 판별 테스트 (래핑된 원인 포함)"""
+        request = httpx.Request("POST", "http://gpu-1:11434/api/generate")
+        client_error = httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400, request=request))
+        wrapped = RuntimeError("wrapped")
+        wrapped.__cause__ = httpx.ConnectError("refused")
+
+        assert is_retryable(_server_error())
+        assert is_retryable(wrapped)
+        assert not is_retryable(client_error)
+        assert not is_retryable(ValueError("x"))
+
+    def test_retries_transient_errors(self):
+        """일시적 오류를 재시도하고 성공 시 지연을 기록하는지 테스트"""
+        policy = CallPolicy(max_retries=2, backoff_base=0)
+        attempts = []
+
+        def send(timeout, tried):
+            attempts.append(set(tried))
+            tried.add(f"http://gpu-{len(attempts)}:11434")
+            if len(attempts) < 3:
+                raise httpx.ConnectError("refused")
+            return {"response": "ok"}
+
+        assert policy.call("qwen3:8b", 100, 600, send) == {"response": "ok"}
+        assert attempts[-1] == {"http://gpu-1:11434", "http://gpu-2:11434"}
+        stats = policy.get_stats()
+        assert stats['retries'] == 2
+        assert stats['models']['qwen3:8b']['samples'] == 1
+
+    def test_gives_up_after_max_retries(self):
+        """재시도 횟수를 넘기면 마지막 오류를 그대로 올리는지 테스트"""
+        policy = CallPolicy(max_retries=1, backoff_base=0)
+
+        def send(timeout, tried):
+            raise _server_error()
+
+        with pytest.raises(httpx.HTTPStatusError):
+            policy.call("qwen3:8b", 100, 600, send)
+        assert policy.get_stats()['failures'] == 1
+
+    def test_timeout_doubles_deadline(self):
+        """마감 시간 초과 후 재시도는 두 배의 마감 시간을 쓰는지 테스트"""
+        policy = CallPolicy(latency_model=_trained_model(), min_timeout=10, backoff_base=0)
+        timeouts = []
+
+        def send(timeout, tried):
+            timeouts.append(timeout)
+            if len(timeouts) == 1:
+                raise httpx.ReadTimeout("slow")
+            return {}
+
+        policy.call("qwen3:8b", 1000, 600, send)
+
+        assert timeouts == [10, 20]
+        assert policy.get_stats()['timeouts'] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_when_primary_is_slow(self):
+        """p95 예상 시간을 넘기면 헤지 요청을 보내고 먼저 끝난 응답을 쓰는지 테스트"""
+        policy = CallPolicy(latency_model=_trained_model(), hedge=True, hedge_min_delay=0)
+        policy.hedge_delay = lambda model, chars: 0.05
+        calls = []
+
+        async def send(timeout, tried):
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+                return {"response": "primary"}
+            return {"response": "hedge"}
+
+        response = await policy.acall("qwen3:8b", 1000, 600, send, can_hedge=True)
+
+        assert response == {"response": "hedge"}
+        assert policy.get_stats()['hedged'] == 1
+        assert policy.get_stats()['hedge_wins'] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_call_retries_on_other_endpoint():
+    """5xx를 반환하는 엔드포인트 대신 다른 엔드포인트로 재시도해 응답을 받는지 테스트"""
+    from src.llm_handler import acall_ollama_llm
+
+    with FakeOllamaServer(fail_status=503) as failing, FakeOllamaServer() as healthy:
+        pool = EndpointPool([failing.url, healthy.url])
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+                patch('src.llm_handler.get_call_policy', return_value=CallPolicy(max_retries=1, backoff_base=0)):
+            result = await acall_ollama_llm("test prompt", use_cache=False)
+        await pool.aclose()
+
+    assert result is not None
+    assert failing.request_count == 1
+    assert healthy.request_count == 1
@@ -0,0 +1,149 @@
+"""
+circuit_breaker.py 모듈 테스트
+"""
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+
+from src.llm.circuit_breaker import CircuitBreaker, CircuitState, CircuitOpenError
+from src.llm.endpoint_pool import EndpointPool
+from src.llm_handler import acall_ollama_llm, call_ollama_llm, collect_ollama_stream
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+def _connect_error():
+    return httpx.ConnectError("connection refused")
+
+
+def _fail(breaker, error=None):
+    with pytest.raises(Exception):
+        with breaker.guard():
+            raise error or _connect_error()
+
+
+class TestCircuitBreaker:
+    """상태 전환 테스트"""
+
+    def test_opens_after_consecutive_failures(self):
+        """연속 실패가 임계값에 도달하면 회로가 열리고 즉시 실패하는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=2, open_seconds=60)
+        _fail(breaker)
+        assert breaker.state == CircuitState.CLOSED
+
+        _fail(breaker)
+        assert breaker.state == CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.check()
+        assert 0 < exc_info.value.retry_after <= 60
+        assert breaker.get_stats()['rejected'] == 1
+
+    def test_non_backend_errors_do_not_count(self):
+        """백엔드가 응답한 오류(4xx, 파싱 오류 등)는 실패로 집계하지 않는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1)
+        _fail(breaker, ValueError("bad json"))
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.consecutive_failures == 0
+
+    def test_success_resets_failures(self):
+        """성공하면 연속 실패 횟수가 초기화되는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=2)
+        _fail(breaker)
+        with breaker.guard():
+            pass
+        _fail(breaker)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_allows_single_trial(self):
+        """open_seconds 경과 후 시험 요청 하나만 허용하고 결과에 따라 닫히거나 다시 열리는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=0)
+        _fail(breaker)
+        assert breaker.get_stats()['state'] == CircuitState.HALF_OPEN.value
+
+        with breaker.guard():
+            # 시험 요청이 진행 중이면 다른 요청은 차단
+            with pytest.raises(CircuitOpenError):
+                breaker.check()
+        assert breaker.state == CircuitState.CLOSED
+
+        _fail(breaker)
+        assert breaker.get_stats()['opened'] == 2
+
+    def test_disabled(self):
+        """비활성화 시 실패가 누적되어도 요청을 막지 않는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1, enabled=False)
+        _fail(breaker)
+
+        breaker.check()
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_probe_closes_circuit(self):
+        """백그라운드 점검이 성공하면 회로가 닫히는지 테스트"""
+        probes = []
+
+        async def probe():
+            probes.append(1)
+            return len(probes) >= 2
+
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=60, probe_interval=0.01, probe=probe)
+        _fail(breaker)
+        assert breaker.state == CircuitState.OPEN
+
+        for _ in range(100):
+            if breaker.state == CircuitState.CLOSED:
+                break
+            await asyncio.sleep(0.01)
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_stats()['probes'] == 2
+        await breaker.stop()
+
+
+class TestHandlerIntegration:
+    """LLM 호출 경로 연동 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_acall_fails_fast_when_open(self):
+        """회로가 열린 뒤에는 서버에 요청하지 않고 CircuitOpenError를 내는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=60)
+        with FakeOllamaServer('{"ok": true}', fail_status=503) as server:
+            pool = EndpointPool([server.url])
+            with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+                 patch('src.llm_handler.get_circuit_breaker', return_value=breaker):
+                assert await acall_ollama_llm("prompt", model="qwen3:8b", use_cache=False) is None
+                with pytest.raises(CircuitOpenError):
+                    await acall_ollama_llm("prompt", model="qwen3:8b", use_cache=False)
+            await pool.aclose()
+
+        assert server.request_count == 1
+
+    def test_sync_call_returns_none_when_open(self):
+        """동기 호출은 회로가 열려 있으면 요청 없이 None을 반환하는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=60)
+        _fail(breaker)
+        with FakeOllamaServer('{"ok": true}') as server:
+            pool = EndpointPool([server.url])
+            with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+                 patch('src.llm_handler.get_circuit_breaker', return_value=breaker):
+                assert call_ollama_llm("prompt", model="qwen3:8b", use_cache=False) is None
+
+        assert server.request_count == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_records_success(self):
+        """스트리밍 호출이 성공하면 반열림 회로가 닫히는지 테스트"""
+        breaker = CircuitBreaker(failure_threshold=1, open_seconds=0)
+        _fail(breaker)
+        with FakeOllamaServer('<json>{"ok": true}</json>') as server:
+            pool = EndpointPool([server.url])
+            with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+                 patch('src.llm_handler.get_circuit_breaker', return_value=breaker):
+                result = await collect_ollama_stream("prompt", model="qwen3:8b", use_cache=False)
+            await pool.aclose()
+
+        assert result.json_text == '{"ok": true}'
+        assert breaker.state == CircuitState.CLOSED
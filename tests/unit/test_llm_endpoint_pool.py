@@ -0,0 +1,149 @@
+"""
+endpoint_pool.py 모듈 테스트 (가짜 Ollama 서버 사용)
+"""
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+
+from src.llm.endpoint_pool import EndpointPool, get_endpoint_urls
+from tests.fake_ollama_server import FakeOllamaServer
+
+PAYLOAD = {"model": "qwen3:8b", "prompt": "hello", "stream": False}
+
+
+@pytest.fixture
+def servers():
+    """가짜 Ollama 서버 두 대"""
+    first, second = FakeOllamaServer().start(), FakeOllamaServer().start()
+    yield first, second
+    first.stop()
+    second.stop()
+
+
+class TestEndpointPool:
+    """엔드포인트 풀 라우팅/헬스 체크 테스트"""
+
+    def test_routes_to_lowest_latency(self, servers):
+        """지연 시간이 짧은 엔드포인트로 요청이 몰리는지 테스트"""
+        fast, slow = servers
+        slow.latency = 0.2
+        pool = EndpointPool([slow.url, fast.url])
+
+        for _ in range(6):
+            assert pool.generate(PAYLOAD, timeout=10)["done"] is True
+
+        # 두 엔드포인트 모두 한 번씩 시험한 뒤에는 빠른 쪽만 사용
+        assert slow.request_count == 1
+        assert fast.request_count == 5
+
+    def test_prefers_fewest_in_flight(self, servers):
+        """진행 중 요청이 적은 엔드포인트가 선택되는지 테스트"""
+        first, second = servers
+        pool = EndpointPool([first.url, second.url])
+        pool.endpoints[0].in_flight = 2
+
+        assert pool.select().url == second.url
+
+    def test_ejects_after_consecutive_failures(self, servers):
+        """연속 실패 시 엔드포인트가 제외되고 정상 엔드포인트로 우회하는지 테스트"""
+        healthy, broken = servers
+        broken.fail_status = 500
+        pool = EndpointPool([broken.url, healthy.url], failure_threshold=2)
+        pool.endpoints[1].in_flight = 1  # 처음에는 고장난 엔드포인트가 선택되도록 유도
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                pool.generate(PAYLOAD, timeout=10)
+        pool.endpoints[1].in_flight = 0
+
+        for _ in range(3):
+            pool.generate(PAYLOAD, timeout=10)
+
+        assert broken.request_count == 2
+        assert healthy.request_count == 3
+        metrics = {m['url']: m for m in pool.get_metrics()}
+        assert metrics[broken.url]['healthy'] is False
+        assert metrics[broken.url]['total_failures'] == 2
+        assert metrics[broken.url]['ejection_count'] == 1
+
+    def test_client_errors_do_not_eject(self, servers):
+        """4xx 응답은 엔드포인트 장애로 집계하지 않는지 테스트"""
+        server, _ = servers
+        server.fail_status = 404
+        pool = EndpointPool([server.url], failure_threshold=1)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            pool.generate(PAYLOAD, timeout=10)
+
+        assert pool.get_metrics()[0]['healthy'] is True
+
+    def test_readmits_after_ejection_window(self, servers):
+        """제외 시간이 지나면 엔드포인트가 자동 재투입되는지 테스트"""
+        server, _ = servers
+        server.fail_status = 503
+        pool = EndpointPool([server.url], failure_threshold=1, ejection_seconds=30)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            pool.generate(PAYLOAD, timeout=10)
+        assert pool.get_metrics()[0]['healthy'] is False
+
+        server.fail_status = None
+        with patch('src.llm.endpoint_pool.time.monotonic', return_value=pool.endpoints[0].ejected_until + 1):
+            assert pool.get_metrics()[0]['healthy'] is True
+            pool.generate(PAYLOAD, timeout=10)
+
+        assert pool.endpoints[0].ejection_count == 0
+        assert pool.endpoints[0].consecutive_failures == 0
+
+    def test_connection_error_counts_as_failure(self):
+        """연결 실패가 엔드포인트 실패로 집계되는지 테스트"""
+        pool = EndpointPool(["http://127.0.0.1:1"], failure_threshold=1)
+
+        with pytest.raises(httpx.TransportError):
+            pool.generate(PAYLOAD, timeout=5)
+
+        assert pool.get_metrics()[0]['healthy'] is False
+
+    @pytest.mark.asyncio
+    async def test_async_stream_through_pool(self, servers):
+        """비동기 스트리밍이 풀을 통해 동작하고 지연 시간이 기록되는지 테스트"""
+        server, _ = servers
+        pool = EndpointPool([server.url])
+
+        async with pool.astream({**PAYLOAD, "stream": True}, timeout=10) as response:
+            lines = [line async for line in response.aiter_lines() if line]
+        await pool.aclose()
+
+        assert lines
+        assert pool.endpoints[0].in_flight == 0
+        assert pool.endpoints[0].latency_ewma is not None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_frees_endpoint(self, servers):
+        """진행 중인 요청이 취소되면 진행 중 수가 줄고 취소로만 집계되는지 테스트"""
+        server, _ = servers
+        server.latency = 2.0
+        pool = EndpointPool([server.url], failure_threshold=1)
+
+        task = asyncio.create_task(pool.agenerate(PAYLOAD, timeout=10))
+        for _ in range(100):
+            if pool.endpoints[0].in_flight:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await pool.aclose()
+
+        metrics = pool.get_metrics()[0]
+        assert metrics['in_flight'] == 0
+        assert metrics['total_cancelled'] == 1
+        assert metrics['total_failures'] == 0
+        assert metrics['healthy'] is True
+
+    def test_endpoint_urls_from_config(self):
+        """설정에서 엔드포인트 목록을 읽는지 테스트"""
+        assert get_endpoint_urls({"endpoints": ["http://a:11434", "http://b:11434"]}) == ["http://a:11434", "http://b:11434"]
+        assert get_endpoint_urls({"base_url": "http://a:11434"}) == ["http://a:11434"]
+        assert get_endpoint_urls({}) == ["http://localhost:11434"]
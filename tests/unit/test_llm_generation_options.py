@@ -0,0 +1,53 @@
+"""
+generation_options.py 모듈 테스트
+"""
+from unittest.mock import patch
+
+from src.llm.generation_options import build_generation_options, estimate_num_predict
+
+
+class TestGenerationOptions:
+    """LLM 생성 옵션 구성 테스트"""
+
+    def test_num_predict_scales_with_diff_size(self):
+        """diff 크기에 비례해 num_predict가 커지고 상/하한이 적용되는지 테스트"""
+        config = {"num_predict_min": 1000, "num_predict_max": 4000, "tokens_per_kchar": 100, "thinking_tokens": 500}
+
+        assert estimate_num_predict("x" * 1000, generation_config=config) == 1500
+        assert estimate_num_predict("x" * 30000, generation_config=config) == 3500
+        assert estimate_num_predict("x" * 100000, generation_config=config) == 4500
+        assert estimate_num_predict("x" * 30000, fast_mode=True, generation_config=config) == 3000
+
+    def test_default_options(self):
+        """기본 설정에서 </json> stop과 num_predict가 설정되는지 테스트"""
+        generation = build_generation_options("diff --git a/x b/x")
+
+        assert generation['options']['stop'] == ["</json>"]
+        assert generation['options']['num_predict'] > 0
+        assert generation['think'] is None
+        assert generation['fast_mode'] is False
+
+    def test_fast_mode_disables_thinking(self):
+        """빠른 모드에서 think=False와 더 작은 출력 예산이 적용되는지 테스트"""
+        normal = build_generation_options("x" * 5000)
+        fast = build_generation_options("x" * 5000, fast_mode=True)
+
+        assert fast['think'] is False
+        assert fast['options']['num_predict'] < normal['options']['num_predict']
+
+    def test_config_and_request_overrides(self):
+        """설정 옵션과 요청별 num_predict가 반영되는지 테스트"""
+        config = {"llm": {"generation": {"fast_mode": True, "options": {"temperature": 0.2, "stop": ["<END>"]}}}}
+
+        with patch('src.llm.generation_options.load_config', return_value=config):
+            generation = build_generation_options("diff", num_predict=256)
+
+        assert generation['fast_mode'] is True
+        assert generation['options'] == {"temperature": 0.2, "stop": ["<END>", "</json>"], "num_predict": 256}
+
+    def test_structured_output_skips_json_stop(self):
+        """구조화 출력 모드에서는 </json> stop 시퀀스를 넣지 않는지 테스트"""
+        generation = build_generation_options("diff", structured_output=True)
+
+        assert generation['structured_output'] is True
+        assert 'stop' not in generation['options']
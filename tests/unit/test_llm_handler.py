@@ -1,71 +1,97 @@
 """
 llm_handler.py 모듈 테스트
 """
+import asyncio
+import json
 import pytest
-import requests
+import httpx
 from unittest.mock import Mock, patch
-from src.llm_handler import call_ollama_llm
+from src.llm_handler import call_ollama_llm, acall_ollama_llm
+from src.llm.endpoint_pool import EndpointPool
+
+
+def _client_with_transport(transport):
+    """MockTransport를 사용하는 단일 엔드포인트 풀 생성"""
+    return EndpointPool(["http://ollama.test"], transport=transport)
+
+
+@pytest.fixture
+def ollama_requests():
+    """Ollama로 전송된 요청 기록"""
+    return []
+
+
+@pytest.fixture
+def mock_ollama(ollama_requests):
+    """응답/예외를 지정할 수 있는 Ollama 클라이언트 Mock"""
+    state = {"response": None, "status": 200, "error": None}
+
+    def handler(request):
+        ollama_requests.append(request)
+        if state["error"]:
+            raise state["error"]
+        return httpx.Response(state["status"], json=state["response"], request=request)
+
+    with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(httpx.MockTransport(handler))):
+        yield state
 
 
 class TestLLMHandler:
     """LLM 핸들러 테스트"""
     
-    @patch('src.llm_handler.requests.post')
-    def test_successful_llm_call(self, mock_post, mock_ollama_response):
+    def test_successful_llm_call(self, mock_ollama, ollama_requests, mock_ollama_response):
         """성공적인 LLM 호출 테스트"""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_ollama["response"] = mock_ollama_response
         
         result = call_ollama_llm("test prompt", "qwen3:8b")
         
         assert result is not None
         assert "Test Cases" in result
-        mock_post.assert_called_once()
+        assert len(ollama_requests) == 1
         
         # 호출 인자 검증
-        call_args = mock_post.call_args
-        assert call_args[1]['json']['model'] == "qwen3:8b"
-        assert call_args[1]['json']['prompt'] == "test prompt"
-        assert call_args[1]['json']['stream'] == False
+        payload = json.loads(ollama_requests[0].content)
+        assert str(ollama_requests[0].url) == "http://ollama.test/api/generate"
+        assert payload['model'] == "qwen3:8b"
+        assert payload['prompt'] == "test prompt"
+        assert payload['stream'] == False
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_with_json_format(self, mock_post, mock_ollama_response):
+    def test_llm_call_with_json_format(self, mock_ollama, ollama_requests, mock_ollama_response):
         """JSON 형식 LLM 호출 테스트"""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_ollama["response"] = mock_ollama_response
         
         result = call_ollama_llm("test prompt", "qwen3:8b", format="json")
         
         assert result is not None
         
         # JSON 형식 옵션이 포함되었는지 확인
-        call_args = mock_post.call_args
-        assert call_args[1]['json']['format'] == 'json'
+        payload = json.loads(ollama_requests[0].content)
+        assert payload['format'] == 'json'
+    
+    def test_llm_call_with_schema_format(self, mock_ollama, ollama_requests, mock_ollama_response):
+        """JSON 스키마를 format으로 전달하는 구조화 출력 호출 테스트"""
+        mock_ollama["response"] = mock_ollama_response
+        schema = {"type": "object", "properties": {"Test Cases": {"type": "array"}}}
+        
+        call_ollama_llm("test prompt", "qwen3:8b", format=schema)
+        
+        payload = json.loads(ollama_requests[0].content)
+        assert payload['format'] == schema
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_with_custom_timeout(self, mock_post, mock_ollama_response):
+    def test_llm_call_with_custom_timeout(self, mock_ollama, ollama_requests, mock_ollama_response):
         """커스텀 타임아웃 LLM 호출 테스트"""
-        mock_response = Mock()
-        mock_response.json.return_value = mock_ollama_response
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_ollama["response"] = mock_ollama_response
         
         result = call_ollama_llm("test prompt", timeout=300)
         
         assert result is not None
         
         # 타임아웃 설정 확인
-        call_args = mock_post.call_args
-        assert call_args[1]['timeout'] == 300
+        assert ollama_requests[0].extensions['timeout']['read'] == 300
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_network_error(self, mock_post, capsys):
+    def test_llm_call_network_error(self, mock_ollama, capsys):
         """네트워크 오류 테스트"""
-        mock_post.side_effect = requests.exceptions.RequestException("Network error")
+        mock_ollama["error"] = httpx.ConnectError("Network error")
         
         result = call_ollama_llm("test prompt")
         
@@ -73,10 +99,9 @@ class TestLLMHandler:
         captured = capsys.readouterr()
         assert "Ollama API 호출 중 오류 발생" in captured.out
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_timeout_error(self, mock_post, capsys):
+    def test_llm_call_timeout_error(self, mock_ollama, capsys):
         """타임아웃 오류 테스트"""
-        mock_post.side_effect = requests.exceptions.Timeout("Timeout error")
+        mock_ollama["error"] = httpx.ReadTimeout("Timeout error")
         
         result = call_ollama_llm("test prompt", timeout=1)
         
@@ -84,12 +109,10 @@ class TestLLMHandler:
         captured = capsys.readouterr()
         assert "Ollama API 호출 중 오류 발생" in captured.out
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_http_error(self, mock_post, capsys):
+    def test_llm_call_http_error(self, mock_ollama, capsys):
         """HTTP 오류 테스트"""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Not Found")
-        mock_post.return_value = mock_response
+        mock_ollama["status"] = 404
+        mock_ollama["response"] = {"error": "Not Found"}
         
         result = call_ollama_llm("test prompt")
         
@@ -97,26 +120,226 @@ class TestLLMHandler:
         captured = capsys.readouterr()
         assert "Ollama API 호출 중 오류 발생" in captured.out
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_empty_response(self, mock_post):
+    def test_llm_call_empty_response(self, mock_ollama):
         """빈 응답 테스트"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": ""}
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_ollama["response"] = {"response": ""}
         
         result = call_ollama_llm("test prompt")
         
         assert result == ""
     
-    @patch('src.llm_handler.requests.post')
-    def test_llm_call_missing_response_field(self, mock_post):
+    def test_llm_call_missing_response_field(self, mock_ollama):
         """응답 필드 누락 테스트"""
-        mock_response = Mock()
-        mock_response.json.return_value = {"other_field": "value"}
-        mock_response.raise_for_status.return_value = None
-        mock_post.return_value = mock_response
+        mock_ollama["response"] = {"other_field": "value"}
         
         result = call_ollama_llm("test prompt")
         
-        assert result == ""
\ No newline at end of file
+        assert result == ""
+
+
+class TestAsyncLLMHandler:
+    """비동기 LLM 호출 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_async_call_uses_pooled_client(self, mock_ollama, ollama_requests, mock_ollama_response):
+        """비동기 호출이 공유 클라이언트를 재사용하는지 테스트"""
+        mock_ollama["response"] = mock_ollama_response
+
+        first = await acall_ollama_llm("test prompt")
+        second = await acall_ollama_llm("test prompt")
+
+        assert "Test Cases" in first
+        assert first == second
+        assert len(ollama_requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_call_error_returns_none(self, mock_ollama):
+        """비동기 호출 실패 시 None 반환 테스트"""
+        mock_ollama["error"] = httpx.ConnectError("Network error")
+
+        assert await acall_ollama_llm("test prompt") is None
+
+    def test_pool_limits_from_config(self):
+        """설정에서 연결 풀 제한을 읽는지 테스트"""
+        import src.llm.endpoint_pool as endpoint_pool
+
+        config = {"llm": {"base_url": "http://gpu-1:11434/", "pool": {"max_connections": 3, "max_keepalive_connections": 2}}}
+        with patch.object(endpoint_pool, '_endpoint_pool', None), \
+             patch('src.llm.endpoint_pool.load_config', return_value=config):
+            pool = endpoint_pool.get_endpoint_pool()
+
+        client = pool.endpoints[0].client
+        assert client.generate_url == "http://gpu-1:11434/api/generate"
+        assert client.limits.max_connections == 3
+        assert client.limits.max_keepalive_connections == 2
+
+
+def _ndjson_transport(pieces, done_reason="stop"):
+    """스트리밍 NDJSON 응답을 돌려주는 httpx MockTransport 생성"""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        lines = [json.dumps({"response": p, "done": False}, ensure_ascii=False) for p in pieces]
+        lines.append(json.dumps({"response": "", "done": True, "done_reason": done_reason, "eval_count": len(pieces)}))
+        return httpx.Response(200, content=("\n".join(lines) + "\n").encode('utf-8'))
+
+    return httpx.MockTransport(handler), requests_seen
+
+
+class TestJsonBlockExtractor:
+    """스트리밍 <json> 블록 검출 테스트"""
+
+    def test_detects_tags_split_across_chunks(self):
+        from src.llm_handler import JsonBlockExtractor
+
+        extractor = JsonBlockExtractor()
+        closed = [extractor.feed(p) for p in ["<think", "ing>...</thinking><js", "on>{\"a\": ", "1}</js", "on> trailing"]]
+
+        assert closed == [False, False, False, False, True]
+        assert extractor.has_started
+        assert extractor.is_complete
+        assert extractor.json_text == '{"a": 1}'
+
+    def test_incomplete_block(self):
+        from src.llm_handler import JsonBlockExtractor
+
+        extractor = JsonBlockExtractor()
+        extractor.feed("<json>{\"a\": ")
+
+        assert extractor.has_started
+        assert not extractor.is_complete
+        assert extractor.json_text is None
+
+
+class TestOllamaStreaming:
+    """스트리밍 생성 모드 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_after_json_block(self):
+        from src.llm_handler import stream_ollama_llm
+
+        pieces = ["<thinking>분석</thinking>", "<json>", '{"Test Cases": []}', "</json>", "불필요한 후행 출력"]
+        transport, seen = _ndjson_transport(pieces)
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(transport)):
+            stream = stream_ollama_llm("test prompt", model="qwen3:8b")
+            chunks = [chunk async for chunk in stream]
+
+        assert seen[0]['stream'] is True
+        assert chunks[-1].json_complete
+        assert stream.result.stopped_early
+        assert "불필요한 후행 출력" not in stream.result.text
+        assert stream.result.parse_json() == {"Test Cases": []}
+
+    @pytest.mark.asyncio
+    async def test_collect_reports_progress(self):
+        from src.llm_handler import collect_ollama_stream
+
+        transport, _ = _ndjson_transport(["<json>", "{}", "</json>"])
+        reports = []
+
+        async def on_progress(chunk):
+            reports.append(chunk.token_count)
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(transport)):
+            result = await collect_ollama_stream("test prompt", on_progress=on_progress, progress_interval=0)
+
+        assert reports == [1, 2, 3]
+        assert result.json_text == "{}"
+
+    @pytest.mark.asyncio
+    async def test_stream_error_line_raises(self):
+        from src.llm_handler import stream_ollama_llm, OllamaAPIError
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b'{"error": "model not found"}\n'))
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(transport)):
+            with pytest.raises(OllamaAPIError):
+                async for _ in stream_ollama_llm("test prompt"):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_stream_restores_stripped_stop_sequence(self):
+        """stop 시퀀스로 잘린 </json> 태그가 복원되는지 테스트"""
+        from src.llm_handler import collect_ollama_stream
+
+        transport, seen = _ndjson_transport(["<json>", '{"Test Cases": []}'])
+        options = {"stop": ["</json>"], "num_predict": 1024}
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(transport)):
+            result = await collect_ollama_stream("test prompt", options=options, think=False)
+
+        assert seen[0]['options'] == options
+        assert seen[0]['think'] is False
+        assert result.parse_json() == {"Test Cases": []}
+
+    @pytest.mark.asyncio
+    async def test_stream_deadline_is_classified_as_timeout(self):
+        """스트림 마감 시간 초과가 타임아웃으로 분류되어 재시도/서킷 브레이커에 반영되는지 테스트"""
+        from src.llm_handler import stream_ollama_llm, OllamaAPIError
+        from src.llm.call_policy import CallPolicy, is_retryable, _is_timeout
+        from src.llm.circuit_breaker import CircuitBreaker
+
+        async def slow_lines():
+            await asyncio.sleep(0.05)
+            yield b'{"response": "<json>", "done": false}\n'
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=slow_lines()))
+        policy = CallPolicy(max_retries=1, backoff_base=0)
+        breaker = CircuitBreaker()
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(transport)), \
+                patch('src.llm_handler.get_call_policy', return_value=policy), \
+                patch('src.llm_handler.get_circuit_breaker', return_value=breaker):
+            with pytest.raises(OllamaAPIError) as exc_info:
+                async for _ in stream_ollama_llm("test prompt", timeout=0.01):
+                    pass
+
+        assert _is_timeout(exc_info.value)
+        assert is_retryable(exc_info.value)
+        assert policy.get_stats()['timeouts'] == 1
+        assert breaker.consecutive_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_learned_deadline_only_bounds_first_token(self):
+        """출력이 나오기 시작한 스트림은 학습된 마감 시간이 아니라 설정된 타임아웃까지 이어지는지 테스트"""
+        from src.llm_handler import collect_ollama_stream
+        from src.llm.call_policy import CallPolicy
+
+        async def steady_lines():
+            for piece in ["<json>", "{}", "</json>"]:
+                await asyncio.sleep(0.02)
+                yield (json.dumps({"response": piece, "done": False}) + "\n").encode('utf-8')
+
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=steady_lines()))
+        policy = CallPolicy(max_retries=0)
+        policy.timeout_for = lambda key, chars, default: 0.03
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=_client_with_transport(transport)), \
+                patch('src.llm_handler.get_call_policy', return_value=policy):
+            result = await collect_ollama_stream("test prompt", timeout=5)
+
+        assert result.json_text == "{}"
+        assert 0 < result.first_token_seconds < result.elapsed
+        # 스트리밍 기록은 첫 토큰 시간으로, 일괄 응답과 다른 키에 쌓임
+        assert [key.endswith("|stream") for key in policy.get_stats()['models']] == [True]
+
+
+class TestGenerationOptionsPayload:
+    """생성 옵션 전달 테스트"""
+
+    def test_options_sent_and_stop_restored(self, mock_ollama, ollama_requests):
+        mock_ollama["response"] = {"response": "<json>{}", "done": True, "done_reason": "stop"}
+
+        result = call_ollama_llm("test prompt", options={"stop": ["</json>"], "num_predict": 512})
+
+        payload = json.loads(ollama_requests[0].content)
+        assert payload['options'] == {"stop": ["</json>"], "num_predict": 512}
+        assert 'think' not in payload
+        assert result == "<json>{}</json>"
+
+    def test_length_cut_not_treated_as_stop(self, mock_ollama):
+        mock_ollama["response"] = {"response": "<json>{\"a\": ", "done": True, "done_reason": "length"}
+
+        assert call_ollama_llm("test prompt", options={"stop": ["</json>"]}) == "<json>{\"a\":"
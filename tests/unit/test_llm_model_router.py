@@ -0,0 +1,105 @@
+"""
+model_router.py 모듈 테스트
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.llm.model_router import ModelRouter
+from src.llm.telemetry import LLMTelemetry
+
+MODELS = [
+    {"name": "qwen3:1.7b", "max_analysis_tokens": 1000, "tokens_per_second": 100},
+    {"name": "qwen3:8b", "tokens_per_second": 20}
+]
+
+
+@pytest.fixture
+def route_env():
+    """대기열 대기 시간과 처리량 지표를 지정할 수 있는 라우팅 환경"""
+    scheduler = MagicMock()
+    scheduler.estimate_admission_wait.return_value = 0.0
+    telemetry = LLMTelemetry()
+    with patch('src.llm.model_router.get_llm_scheduler', return_value=scheduler), \
+         patch('src.llm.model_router.get_llm_telemetry', return_value=telemetry):
+        yield scheduler, telemetry
+
+
+class TestModelRouter:
+    """요청별 모델 선택 테스트"""
+
+    def test_disabled_uses_default_model(self):
+        """라우팅을 사용하지 않으면 설정된 기본 모델을 그대로 쓰는지 테스트"""
+        router = ModelRouter(default_model="qwen3:8b", models=MODELS, enabled=False)
+
+        assert router.route("diff") == {"model": "qwen3:8b", "reason": "default"}
+        assert router.route("diff", default_model="qwen3:14b")["model"] == "qwen3:14b"
+        assert not ModelRouter(models=[]).enabled
+
+    def test_small_change_goes_to_fast_model(self, route_env):
+        """작은 변경은 빠른 모델, 큰 변경은 큰 모델로 보내는지 테스트"""
+        router = ModelRouter(models=MODELS, latency_target_seconds=1000)
+
+        small = router.route("def run(): pass", num_predict=1000)
+        large = router.route("변경 " * 2000, num_predict=1000)
+
+        assert small["model"] == "qwen3:1.7b"
+        assert small["reason"] == "size"
+        assert small["estimated_seconds"] == 10.0
+        assert large["model"] == "qwen3:8b"
+        assert large["reason"] == "size"
+        assert large["analysis_tokens"] > 1000
+
+    def test_latency_target_falls_back_to_smaller_model(self, route_env):
+        """큰 모델의 예상 시간이 목표를 넘으면 목표를 지키는 작은 모델로 내려가는지 테스트"""
+        scheduler, _ = route_env
+        router = ModelRouter(models=MODELS, latency_target_seconds=60)
+
+        # 큰 모델: 1000 / 20 = 50초 (목표 이내)
+        assert router.route("변경 " * 2000, num_predict=1000)["model"] == "qwen3:8b"
+
+        # 대기열이 길어지면 큰 모델은 목표를 넘으므로 작은 모델 선택 (20 + 10 = 30초)
+        scheduler.estimate_admission_wait.return_value = 20.0
+        decision = router.route("변경 " * 2000, num_predict=1000)
+
+        assert decision["model"] == "qwen3:1.7b"
+        assert decision["reason"] == "latency"
+        assert decision["queue_seconds"] == 20.0
+        assert decision["estimated_seconds"] == 30.0
+
+    def test_no_model_meets_target_picks_fastest(self, route_env):
+        """어느 모델도 목표를 맞출 수 없으면 가장 빠른 모델을 고르는지 테스트"""
+        scheduler, _ = route_env
+        scheduler.estimate_admission_wait.return_value = 120.0
+        router = ModelRouter(models=MODELS, latency_target_seconds=60)
+
+        decision = router.route("변경 " * 2000, num_predict=1000)
+
+        assert decision["model"] == "qwen3:1.7b"
+        assert decision["reason"] == "fastest"
+
+    def test_measured_throughput_overrides_config(self, route_env):
+        """최근 처리량 기록이 충분하면 설정값 대신 실측 초당 토큰 수를 쓰는지 테스트"""
+        _, telemetry = route_env
+        for _ in range(3):
+            telemetry.record({"model": "qwen3:8b", "tokens_per_second": 10.0, "prompt_tokens_per_second": 1000.0})
+        router = ModelRouter(models=MODELS, latency_target_seconds=60)
+
+        # 실측 10 tok/s → 1000 / 10 = 100초 + 프롬프트 처리 시간 → 목표 초과로 작은 모델 선택
+        decision = router.route("변경 " * 2000, num_predict=1000)
+
+        assert decision["model"] == "qwen3:1.7b"
+        assert decision["reason"] == "latency"
+        # 2000 토큰 / 1000 tok/s = 2초의 프롬프트 처리 시간이 더해짐
+        estimate = router.estimate_seconds(MODELS[1], 2000, 1000, 0.0, telemetry.get_stats())
+        assert estimate == 102.0
+
+    def test_unknown_throughput_keeps_size_choice(self, route_env):
+        """초당 토큰 수를 알 수 없으면 크기 기준 선택을 유지하는지 테스트"""
+        router = ModelRouter(models=[{"name": "small", "max_analysis_tokens": 10}, {"name": "large"}],
+                             latency_target_seconds=1)
+
+        decision = router.route("변경 " * 100, num_predict=1000)
+
+        assert decision["model"] == "large"
+        assert decision["reason"] == "size"
+        assert decision["estimated_seconds"] is None
@@ -0,0 +1,188 @@
+"""
+prefix_cache.py 모듈 및 프롬프트 머리말 분리 테스트
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.prefix_cache import PromptPrefixCache, prefix_hash
+from src.llm.scheduler import LLMScheduler, Priority
+from src.prompt_loader import build_prompt_parts, create_final_prompt
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+class TestPromptParts:
+    """프롬프트 고정 머리말/가변 본문 분리 테스트"""
+
+    def test_prefix_is_stable_across_diffs(self):
+        prefix_a, body_a = build_prompt_parts("diff A", use_rag=False, use_feedback_enhancement=False)
+        prefix_b, body_b = build_prompt_parts("diff B", use_rag=False, use_feedback_enhancement=False)
+
+        assert prefix_a == prefix_b
+        assert "Final Output Format" in prefix_a
+        assert "diff A" in body_a and "diff A" not in prefix_a
+        assert create_final_prompt("diff A", use_rag=False, use_feedback_enhancement=False) == prefix_a + body_a
+
+    def test_feedback_block_is_part_of_prefix(self):
+        enhancer = Mock()
+        enhancer.enhance_prompt.side_effect = lambda prompt, model=None: prompt + "[FEEDBACK]\n"
+        enhancer.get_enhancement_summary.return_value = {'feedback_count': 0}
+
+        with patch('src.prompt_loader.get_prompt_enhancer', return_value=enhancer):
+            prefix, body = build_prompt_parts("diff", use_rag=False)
+
+        assert prefix.endswith("[FEEDBACK]\n")
+        assert body.startswith("### Git Change History to Analyze:")
+
+    def test_performance_mode_trims_body_only(self):
+        prefix, body = build_prompt_parts("x" * 40000, use_rag=False, use_feedback_enhancement=False,
+                                          performance_mode=True)
+
+        from src.llm.token_counter import estimate_tokens
+        from src.prompt_loader import PERFORMANCE_PROMPT_TOKEN_LIMIT
+
+        assert len(body) < 40000
+        assert estimate_tokens(prefix) + estimate_tokens(body) <= PERFORMANCE_PROMPT_TOKEN_LIMIT
+        assert prefix == build_prompt_parts("y", use_rag=False, use_feedback_enhancement=False)[0]
+
+
+@pytest.fixture
+def fake_servers():
+    first, second = FakeOllamaServer().start(), FakeOllamaServer().start()
+    yield first, second
+    first.stop()
+    second.stop()
+
+
+class TestPromptPrefixCache:
+    """엔드포인트별 머리말 priming 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_primes_each_endpoint_once(self, fake_servers):
+        pool = EndpointPool([server.url for server in fake_servers])
+        cache = PromptPrefixCache(keep_alive="30m")
+        prefix = "static instructions " * 20
+
+        with patch('src.llm.prefix_cache.get_endpoint_pool', return_value=pool):
+            assert cache.schedule_priming(prefix, "qwen3:8b", {"num_ctx": 8192, "temperature": 0.1}) == 2
+            assert cache.schedule_priming(prefix, "qwen3:8b") == 0   # priming 진행 중
+            await asyncio.gather(*cache._tasks)
+            assert cache.schedule_priming(prefix, "qwen3:8b") == 0   # 이미 priming 완료
+        await pool.aclose()
+
+        for server in fake_servers:
+            assert server.request_count == 1
+            request = server.requests[0]
+            assert request['prompt'] == prefix
+            assert request['options'] == {"num_ctx": 8192, "num_predict": 1}
+            assert request['keep_alive'] == "30m"
+
+        entry = cache.get_stats()['entries'][0]
+        assert entry['template_hash'] == prefix_hash(prefix)
+        assert sorted(entry['primed_endpoints']) == sorted(pool_ep.url for pool_ep in pool.endpoints)
+        assert entry['prefix_tokens'] == len(prefix) // 4
+
+    @pytest.mark.asyncio
+    async def test_new_template_version_gets_new_entry(self, fake_servers):
+        pool = EndpointPool([fake_servers[0].url])
+        cache = PromptPrefixCache()
+
+        with patch('src.llm.prefix_cache.get_endpoint_pool', return_value=pool):
+            cache.schedule_priming("template v1", "qwen3:8b")
+            cache.schedule_priming("template v2", "qwen3:8b")
+            await asyncio.gather(*cache._tasks)
+        await pool.aclose()
+
+        assert len(cache.get_stats()['entries']) == 2
+        assert fake_servers[0].request_count == 2
+
+    @pytest.mark.asyncio
+    async def test_priming_waits_for_slot_and_skips_busy_endpoint(self, fake_servers):
+        """priming이 스케줄러 슬롯을 기다리고, 요청을 처리 중인 엔드포인트는 건너뛰는지 테스트"""
+        pool = EndpointPool([server.url for server in fake_servers])
+        scheduler = LLMScheduler(max_concurrent=1)
+        cache = PromptPrefixCache()
+
+        with patch('src.llm.prefix_cache.get_endpoint_pool', return_value=pool), \
+             patch('src.llm.prefix_cache.get_llm_scheduler', return_value=scheduler):
+            await scheduler.acquire(Priority.INTERACTIVE)  # 대화형 생성이 슬롯 점유 중
+            pool.endpoints[0].in_flight = 1
+            assert cache.schedule_priming("prefix", "qwen3:8b") == 2
+            await asyncio.sleep(0.05)
+            assert fake_servers[0].request_count == fake_servers[1].request_count == 0
+
+            scheduler.release()
+            await asyncio.gather(*cache._tasks)
+        pool.endpoints[0].in_flight = 0
+        await pool.aclose()
+
+        assert fake_servers[0].request_count == 0
+        assert fake_servers[1].request_count == 1
+        assert cache.get_stats()['entries'][0]['primed_endpoints'] == [pool.endpoints[1].url]
+        assert scheduler.active == 0
+
+    def test_disabled_cache_is_noop(self):
+        cache = PromptPrefixCache(enabled=False)
+
+        assert cache.schedule_priming("prefix", "qwen3:8b") == 0
+        cache.record_usage("prefix", "qwen3:8b", {"prompt_eval_count": 10})
+        assert cache.get_stats() == {'enabled': False, 'entries': []}
+
+    def test_record_usage_averages_prompt_eval(self):
+        cache = PromptPrefixCache()
+        cache.record_usage("prefix", "qwen3:8b", {"prompt_eval_count": 100, "prompt_eval_duration": 2e9})
+        cache.record_usage("prefix", "qwen3:8b", {"prompt_eval_count": 50, "prompt_eval_duration": 1e9})
+
+        entry = cache.get_stats()['entries'][0]
+        assert entry['uses'] == 2
+        assert entry['avg_prompt_eval_tokens'] == 75
+        assert entry['avg_prompt_eval_seconds'] == 1.5
+
+    @pytest.mark.asyncio
+    async def test_stream_with_prefix_primes_other_endpoints(self, fake_servers):
+        """요청을 처리한 엔드포인트는 priming하지 않고 priming 완료로 표시하는지 테스트"""
+        from src.llm_handler import collect_ollama_stream
+
+        pool = EndpointPool([server.url for server in fake_servers])
+        cache = PromptPrefixCache()
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+             patch('src.llm.prefix_cache.get_endpoint_pool', return_value=pool), \
+             patch('src.llm_handler.get_prefix_cache', return_value=cache):
+            result = await collect_ollama_stream("PREFIX|body", prompt_prefix="PREFIX|")
+            await asyncio.gather(*cache._tasks)
+        await pool.aclose()
+
+        assert result.json_text is not None
+        prompts = sorted([r['prompt'] for r in server.requests] for server in fake_servers)
+        assert prompts == [["PREFIX|"], ["PREFIX|body"]]
+        entry = cache.get_stats()['entries'][0]
+        assert entry['uses'] == 1
+        assert sorted(entry['primed_endpoints']) == sorted(server.url for server in fake_servers)
+
+    @pytest.mark.asyncio
+    async def test_async_call_marks_serving_endpoint_primed(self, fake_servers):
+        from src.llm_handler import acall_ollama_llm
+
+        pool = EndpointPool([fake_servers[0].url])
+        cache = PromptPrefixCache()
+
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+             patch('src.llm.prefix_cache.get_endpoint_pool', return_value=pool), \
+             patch('src.llm_handler.get_prefix_cache', return_value=cache):
+            await acall_ollama_llm("PREFIX|body", prompt_prefix="PREFIX|", use_cache=False)
+            assert cache._tasks == set()
+        await pool.aclose()
+
+        assert [r['prompt'] for r in fake_servers[0].requests] == ["PREFIX|body"]
+        assert cache.get_stats()['entries'][0]['primed_endpoints'] == [fake_servers[0].url]
+
+    def test_record_usage_marks_endpoint_primed(self):
+        cache = PromptPrefixCache()
+        cache.record_usage("prefix", "qwen3:8b", {"prompt_eval_count": 100}, "http://a:11434")
+
+        entry = cache.get_stats()['entries'][0]
+        assert entry['primed_endpoints'] == ["http://a:11434"]
+        with patch('src.llm.prefix_cache.get_endpoint_pool', return_value=EndpointPool(["http://a:11434"])):
+            assert cache.schedule_priming("prefix", "qwen3:8b") == 0
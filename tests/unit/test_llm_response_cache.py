@@ -0,0 +1,190 @@
+"""
+llm/response_cache.py 모듈 테스트
+"""
+import os
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+
+from src.llm.response_cache import LLMResponseCache, make_cache_key
+from src.llm.endpoint_pool import EndpointPool
+from src.llm_handler import call_ollama_llm, collect_ollama_stream
+
+
+def _payload(prompt="test prompt", model="qwen3:8b", **extra):
+    payload = {"model": model, "prompt": prompt, "stream": False}
+    payload.update(extra)
+    return payload
+
+
+class TestCacheKey:
+    """캐시 키 생성 테스트"""
+
+    def test_key_ignores_stream_flag(self):
+        assert make_cache_key(_payload()) == make_cache_key(dict(_payload(), stream=True))
+
+    def test_key_depends_on_model_prompt_format_options(self):
+        base = make_cache_key(_payload())
+        assert base != make_cache_key(_payload(model="qwen3:1.7b"))
+        assert base != make_cache_key(_payload(prompt="other prompt"))
+        assert base != make_cache_key(_payload(format="json"))
+        assert base != make_cache_key(_payload(options={"num_predict": 100}))
+
+
+class TestLLMResponseCache:
+    """메모리/디스크 캐시 테스트"""
+
+    def test_memory_lru_eviction(self):
+        cache = LLMResponseCache(db_path=None, memory_entries=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+        assert cache.get("c") == "C"
+
+    def test_disk_tier_survives_new_instance(self, temp_dir):
+        db_path = os.path.join(temp_dir, "cache", "llm_cache.db")
+        LLMResponseCache(db_path=db_path).set("key", "한글 응답", model="qwen3:8b", generation_time=42.0)
+
+        cache = LLMResponseCache(db_path=db_path)
+        assert cache.get("key") == "한글 응답"
+
+        stats = cache.get_stats()
+        assert stats['disk_hits'] == 1
+        assert stats['saved_seconds'] == 42.0
+
+    def test_ttl_expiry(self, temp_dir):
+        cache = LLMResponseCache(db_path=os.path.join(temp_dir, "llm_cache.db"), ttl_seconds=60)
+        cache.set("key", "value")
+
+        with patch('src.tiered_cache.time.time', return_value=time.time() + 120):
+            assert cache.get("key") is None
+
+        assert cache.get_stats()['expired'] >= 1
+
+    def test_disk_size_eviction(self, temp_dir):
+        cache = LLMResponseCache(db_path=os.path.join(temp_dir, "llm_cache.db"), memory_entries=1, max_disk_bytes=10)
+        cache.set("old", "123456")
+        cache.set("new", "abcdef")
+
+        stats = cache.get_stats()
+        assert stats['disk_entries'] == 1
+        assert stats['evictions'] == 1
+        assert cache.get("old") is None
+        assert cache.get("new") == "abcdef"
+
+    def test_disk_connections_are_closed(self, temp_dir):
+        """디스크 캐시 조회/저장마다 연 SQLite 연결을 닫는지 테스트"""
+        import sqlite3
+
+        opened = []
+        connect = sqlite3.connect
+
+        def tracking_connect(*args, **kwargs):
+            opened.append(connect(*args, **kwargs))
+            return opened[-1]
+
+        cache = LLMResponseCache(db_path=os.path.join(temp_dir, "llm_cache.db"), memory_entries=0)
+        with patch('src.tiered_cache.sqlite3.connect', side_effect=tracking_connect):
+            cache.set("key", "value")
+            assert cache.get("key") == "value"
+            cache.get_stats()
+            cache.clear()
+
+        assert len(opened) == 4
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute('SELECT 1')
+
+    def test_hit_miss_counters(self):
+        cache = LLMResponseCache(db_path=None)
+        cache.get("missing")
+        cache.set("key", "value")
+        cache.get("key")
+
+        stats = cache.get_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+        assert stats['hit_rate'] == 0.5
+
+
+class TestCachedLLMCalls:
+    """llm_handler 캐시 연동 테스트"""
+
+    @pytest.fixture
+    def counting_client(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if b'"stream": true' in request.content or b'"stream":true' in request.content:
+                return httpx.Response(200, content=b'{"response": "<json>{}</json>", "done": true}\n')
+            return httpx.Response(200, json={"response": "cached answer"})
+
+        pool = EndpointPool(["http://ollama.test"], transport=httpx.MockTransport(handler))
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool):
+            yield calls
+
+    def test_second_call_served_from_cache(self, counting_client):
+        cache = LLMResponseCache(db_path=None)
+        with patch('src.llm_handler.get_llm_cache', return_value=cache):
+            assert call_ollama_llm("same prompt") == "cached answer"
+            assert call_ollama_llm("same prompt") == "cached answer"
+
+        assert len(counting_client) == 1
+        assert cache.get_stats()['hits'] == 1
+
+    def test_opt_out_bypasses_cache(self, counting_client):
+        cache = LLMResponseCache(db_path=None)
+        with patch('src.llm_handler.get_llm_cache', return_value=cache):
+            call_ollama_llm("same prompt")
+            call_ollama_llm("same prompt", use_cache=False)
+
+        assert len(counting_client) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_cached_response(self, counting_client):
+        cache = LLMResponseCache(db_path=None)
+        with patch('src.llm_handler.get_llm_cache', return_value=cache):
+            first = await collect_ollama_stream("stream prompt")
+            second = await collect_ollama_stream("stream prompt")
+
+        assert len(counting_client) == 1
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.parse_json() == {}
+
+    @pytest.mark.asyncio
+    async def test_structured_stream_is_cached(self):
+        """스키마 format 모드(<json> 태그 없음)는 정상 종료된 스트림을 저장하고, 잘린 스트림은 저장하지 않는지 테스트"""
+        schema = {"type": "object", "properties": {"Test Cases": {"type": "array"}}}
+        done_reasons = ["stop", "length"]
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, content=(
+                b'{"response": "{\\"Test Cases\\": ", "done": false}\n'
+                b'{"response": "[]}", "done": true, "done_reason": "' + done_reasons[len(calls) - 1].encode() + b'"}\n'
+            ))
+
+        pool = EndpointPool(["http://ollama.test"], transport=httpx.MockTransport(handler))
+        cache = LLMResponseCache(db_path=None)
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+             patch('src.llm_handler.get_llm_cache', return_value=cache):
+            first = await collect_ollama_stream("structured prompt", format=schema)
+            second = await collect_ollama_stream("structured prompt", format=schema)
+            truncated = await collect_ollama_stream("truncated prompt", format=schema)
+
+        assert first.text == '{"Test Cases": []}'
+        assert second.from_cache and second.text == first.text
+        assert not truncated.from_cache
+        stats = cache.get_stats()
+        assert stats['stores'] == 1
+        assert stats['hits'] == 1
+        assert len(calls) == 2
+
@@ -0,0 +1,128 @@
+"""
+scheduler.py 모듈 테스트
+"""
+import asyncio
+import pytest
+
+from src.llm.scheduler import LLMScheduler, Priority
+
+
+async def _occupy(scheduler, release_event, order, name, priority, on_wait=None):
+    async with scheduler.slot(priority, on_wait=on_wait):
+        order.append(name)
+        await release_event.wait()
+
+
+class TestLLMScheduler:
+    """LLM 호출 스케줄러 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        """동시 실행 수가 상한을 넘지 않는지 테스트"""
+        scheduler = LLMScheduler(max_concurrent=2)
+        running, peak = 0, 0
+
+        async def job():
+            nonlocal running, peak
+            async with scheduler.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(job() for _ in range(6)))
+
+        assert peak == 2
+        assert scheduler.active == 0
+        assert scheduler.estimate_admission_wait() == 0
+        assert scheduler.get_stats()['admitted'] == 6
+
+    @pytest.mark.asyncio
+    async def test_interactive_runs_before_batch(self):
+        """대화형 요청이 먼저 대기한 배치 요청보다 먼저 실행되는지 테스트"""
+        scheduler = LLMScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        order = []
+
+        holder = asyncio.create_task(_occupy(scheduler, release, order, "holder", Priority.BATCH))
+        await asyncio.sleep(0)
+        batch = asyncio.create_task(_occupy(scheduler, release, order, "batch", Priority.BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_occupy(scheduler, release, order, "interactive", Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, batch, interactive)
+
+        assert order == ["holder", "interactive", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_reports_queue_position_and_eta(self):
+        """대기 순번과 예상 대기 시간이 콜백으로 전달되는지 테스트"""
+        scheduler = LLMScheduler(max_concurrent=1, initial_service_seconds=30)
+        release = asyncio.Event()
+        order, reports = [], []
+
+        async def on_wait(position, estimated_wait):
+            reports.append((position, estimated_wait))
+
+        holder = asyncio.create_task(_occupy(scheduler, release, order, "holder", Priority.BATCH))
+        await asyncio.sleep(0)
+        first = asyncio.create_task(_occupy(scheduler, release, order, "first", Priority.BATCH))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(_occupy(scheduler, release, order, "second", Priority.BATCH, on_wait))
+        await asyncio.sleep(0)
+
+        assert reports == [(2, 60)]
+        assert scheduler.get_stats()['waiting'] == 2
+        # 새 요청은 대기 중인 2건 뒤 3번째 순번
+        assert scheduler.estimate_admission_wait() == 90
+
+        release.set()
+        await asyncio.gather(holder, first, second)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """대기 중 취소된 요청이 대기열에서 제거되는지 테스트"""
+        scheduler = LLMScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        order = []
+
+        holder = asyncio.create_task(_occupy(scheduler, release, order, "holder", Priority.BATCH))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_occupy(scheduler, release, order, "cancelled", Priority.BATCH))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.get_stats()['waiting'] == 0
+
+        release.set()
+        await holder
+        async with scheduler.slot():
+            assert scheduler.active == 1
+        assert order == ["holder"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_holder_frees_slot(self):
+        """실행 중 취소된 요청의 슬롯이 바로 다음 대기자에게 넘어가는지 테스트"""
+        scheduler = LLMScheduler(max_concurrent=1)
+        release = asyncio.Event()
+        order = []
+
+        holder = asyncio.create_task(_occupy(scheduler, asyncio.Event(), order, "holder", Priority.BATCH))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_occupy(scheduler, release, order, "waiter", Priority.BATCH))
+        await asyncio.sleep(0)
+
+        holder.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await holder
+        await asyncio.sleep(0)
+
+        assert order == ["holder", "waiter"]
+        assert scheduler.get_stats()['cancelled'] == 1
+        release.set()
+        await waiter
+        assert scheduler.active == 0
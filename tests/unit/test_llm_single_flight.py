@@ -0,0 +1,147 @@
+"""
+single_flight.py 모듈 테스트
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.single_flight import SingleFlight
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+class TestSingleFlight:
+    """동일 요청 합치기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_share_one_execution(self):
+        """같은 키의 동시 호출이 한 번만 실행되고 결과를 공유하는지 테스트"""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work(publish):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(3)))
+
+        assert calls == 1
+        assert sorted(shared for _, shared in results) == [False, True, True]
+        assert all(value == "result" for value, _ in results)
+        stats = flight.get_stats()
+        assert stats['leaders'] == 1
+        assert stats['coalesced'] == 2
+        assert stats['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_events_reach_all_waiters(self):
+        """진행 이벤트가 합쳐진 모든 요청에 전달되는지 테스트"""
+        flight = SingleFlight()
+        received = {"a": [], "b": []}
+        started = asyncio.Event()
+
+        async def work(publish):
+            started.set()
+            await asyncio.sleep(0.02)
+            await publish('progress', 1)
+            return None
+
+        def listener_for(name):
+            async def listener(event, *args):
+                received[name].append((event, *args))
+            return listener
+
+        first = asyncio.create_task(flight.do("key", work, listener_for("a")))
+        await started.wait()
+        second = asyncio.create_task(flight.do("key", work, listener_for("b")))
+        await asyncio.gather(first, second)
+
+        assert received == {"a": [('progress', 1)], "b": [('progress', 1)]}
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_to_all(self):
+        """작업 실패가 모든 대기자에게 전달되는지 테스트"""
+        flight = SingleFlight()
+
+        async def work(publish):
+            await asyncio.sleep(0.02)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_leader_cancel_keeps_work_for_followers(self):
+        """먼저 요청한 쪽이 취소돼도 남은 대기자를 위해 작업이 계속되는지 테스트"""
+        flight = SingleFlight()
+
+        async def work(publish):
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ("done", True)
+        assert flight.get_stats()['cancelled'] == 0
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancel_stops_work(self):
+        """마지막 대기자가 취소되면 작업도 취소되는지 테스트"""
+        flight = SingleFlight()
+        finished = False
+
+        async def work(publish):
+            nonlocal finished
+            await asyncio.sleep(0.05)
+            finished = True
+
+        caller = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.1)
+
+        assert finished is False
+        assert flight.get_stats()['cancelled'] == 1
+        assert flight.get_stats()['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_runs_every_call(self):
+        """비활성화 시 호출마다 실행되는지 테스트"""
+        flight = SingleFlight(enabled=False)
+        calls = 0
+
+        async def work(publish):
+            nonlocal calls
+            calls += 1
+            return calls
+
+        await asyncio.gather(flight.do("key", work), flight.do("key", work))
+
+        assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_streams_send_one_request():
+    """동일한 스트리밍 생성 요청이 동시에 들어오면 Ollama 호출이 한 번만 일어나는지 테스트"""
+    from src.llm_handler import collect_ollama_stream
+
+    with FakeOllamaServer(latency=0.2) as server:
+        pool = EndpointPool([server.url])
+        with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+                patch('src.llm_handler.get_single_flight', return_value=SingleFlight()):
+            first, second = await asyncio.gather(
+                collect_ollama_stream("same prompt", use_cache=False),
+                collect_ollama_stream("same prompt", use_cache=False)
+            )
+        await pool.aclose()
+
+    assert server.request_count == 1
+    assert first.json_text == second.json_text
+    assert sorted([first.coalesced, second.coalesced]) == [False, True]
@@ -0,0 +1,106 @@
+"""
+telemetry.py 모듈 테스트
+"""
+import pytest
+from unittest.mock import patch
+
+from src.llm.telemetry import LLMTelemetry, build_call_stats, merge_call_stats
+from src.llm.endpoint_pool import EndpointPool
+from src.llm_handler import acall_ollama_llm
+from tests.fake_ollama_server import FakeOllamaServer
+
+RESPONSE_DATA = {
+    "response": "{}",
+    "done": True,
+    "prompt_eval_count": 2000,
+    "prompt_eval_duration": 1_000_000_000,
+    "eval_count": 500,
+    "eval_duration": 10_000_000_000,
+    "load_duration": 2_500_000_000
+}
+
+
+class TestCallStats:
+    """호출 지표 생성/합산 테스트"""
+
+    def test_build_from_eval_counters(self):
+        """Ollama eval 카운터로 초당 토큰 수와 로드 시간을 계산하는지 테스트"""
+        stats = build_call_stats("qwen3:8b", RESPONSE_DATA, queue_seconds=1.5, total_seconds=14.0)
+
+        assert stats['prompt_tokens'] == 2000
+        assert stats['output_tokens'] == 500
+        assert stats['tokens_per_second'] == 50.0
+        assert stats['prompt_tokens_per_second'] == 2000.0
+        assert stats['load_seconds'] == 2.5
+        assert stats['queue_seconds'] == 1.5
+        assert stats['total_seconds'] == 14.0
+
+    def test_falls_back_to_stream_chunks(self):
+        """조기 종료된 스트림은 받은 조각 수와 실측 시간으로 추정하는지 테스트"""
+        stats = build_call_stats("qwen3:8b", {}, total_seconds=4.0, output_chunks=100)
+
+        assert stats['output_tokens'] == 100
+        assert stats['tokens_per_second'] == 25.0
+        assert stats['load_seconds'] is None
+
+    def test_merge(self):
+        """배치 지표를 합칠 때 토큰/시간은 합산하고 처리량은 다시 계산하는지 테스트"""
+        first = build_call_stats("qwen3:8b", RESPONSE_DATA, total_seconds=14.0)
+        second = build_call_stats("qwen3:8b", {**RESPONSE_DATA, "eval_count": 1000}, total_seconds=20.0)
+
+        merged = merge_call_stats([first, second])
+
+        assert merged['calls'] == 2
+        assert merged['output_tokens'] == 1500
+        assert merged['tokens_per_second'] == 75.0
+        assert merged['total_seconds'] == 34.0
+        assert merge_call_stats([]) is None
+
+
+class TestLLMTelemetry:
+    """백분위수 집계 테스트"""
+
+    def test_percentiles_per_model(self):
+        """모델별로 최근 기록의 p50/p90/p99를 계산하는지 테스트"""
+        telemetry = LLMTelemetry(history_size=100)
+        for rate in range(1, 101):
+            telemetry.record({'model': 'qwen3:8b', 'tokens_per_second': float(rate), 'queue_seconds': 0.0})
+
+        stats = telemetry.get_stats()['models']['qwen3:8b']
+
+        assert stats['calls'] == 100
+        assert stats['tokens_per_second'] == {'p50': 50.0, 'p90': 90.0, 'p99': 99.0}
+        assert stats['queue_seconds']['p99'] == 0.0
+        assert 'load_seconds' not in stats
+
+    def test_history_is_bounded_and_cache_hits_counted(self):
+        """기록 수 상한과 캐시 적중 별도 집계 테스트"""
+        telemetry = LLMTelemetry(history_size=3)
+        for rate in (10.0, 20.0, 30.0, 40.0):
+            telemetry.record({'model': 'qwen3:8b', 'tokens_per_second': rate})
+        telemetry.record(build_call_stats('qwen3:8b', None, cache_hit=True))
+
+        stats = telemetry.get_stats()
+
+        assert stats['cache_hits'] == 1
+        assert stats['models']['qwen3:8b']['calls'] == 3
+        assert stats['models']['qwen3:8b']['tokens_per_second']['p50'] == 30.0
+
+    @pytest.mark.asyncio
+    async def test_acall_reports_stats(self):
+        """비동기 호출이 지표를 콜백과 집계기에 전달하는지 테스트"""
+        telemetry = LLMTelemetry()
+        reports = []
+        with FakeOllamaServer('{"ok": true}') as server:
+            pool = EndpointPool([server.url])
+            with patch('src.llm_handler.get_endpoint_pool', return_value=pool), \
+                 patch('src.llm_handler.get_llm_telemetry', return_value=telemetry):
+                await acall_ollama_llm("x" * 400, model="qwen3:8b", use_cache=False, on_stats=reports.append)
+            await pool.aclose()
+
+        assert len(reports) == 1
+        assert reports[0]['prompt_tokens'] == 100
+        assert reports[0]['tokens_per_second'] == 100.0
+        assert reports[0]['load_seconds'] == 0.5
+        assert reports[0]['queue_seconds'] >= 0
+        assert telemetry.get_stats()['models']['qwen3:8b']['calls'] == 1
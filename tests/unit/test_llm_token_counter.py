@@ -0,0 +1,113 @@
+"""
+프롬프트 토큰 수 계산기 테스트
+"""
+
+import pytest
+from unittest.mock import patch
+
+from src.llm.token_counter import TokenCounter, estimate_tokens
+
+
+@pytest.fixture
+def tokenizer_path(tmp_path):
+    """공백 단위로 나누는 작은 WordLevel 토크나이저 (tokenizer.json)"""
+    from tokenizers import Tokenizer
+    from tokenizers.models import WordLevel
+    from tokenizers.pre_tokenizers import Whitespace
+
+    words = ["[UNK]", "def", "run", "(", ")", ":", "테스트", "시나리오"]
+    tokenizer = Tokenizer(WordLevel({word: i for i, word in enumerate(words)}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    path = tmp_path / "tokenizer.json"
+    tokenizer.save(str(path))
+    return path
+
+
+class TestEstimateTokens:
+    """토크나이저 없는 근사 계산 테스트"""
+
+    def test_korean_counts_per_syllable(self):
+        # 문자 수 / 4 기준이면 1토큰으로 잡히던 한국어가 음절 수만큼 계산됨
+        assert estimate_tokens("테스트") == 3
+        assert estimate_tokens("테스트 시나리오") == 7
+
+    def test_english_and_code(self):
+        assert estimate_tokens("scenario") == 2
+        assert estimate_tokens("x = 12345") == 4
+        assert estimate_tokens("        return") == 4
+        assert estimate_tokens("") == 0
+
+
+class TestTokenCounter:
+    """토크나이저 기반 토큰 수 계산 테스트"""
+
+    def test_uses_model_family_tokenizer(self, tokenizer_path):
+        counter = TokenCounter(tokenizers={"qwen3": str(tokenizer_path)})
+
+        assert counter.count("def run ( ) :", "qwen3:8b") == 5
+        assert counter.is_exact("qwen3:8b")
+        assert not counter.is_exact("llama3:8b")
+        assert counter.count("def run ( ) :", "llama3:8b") == estimate_tokens("def run ( ) :")
+
+    def test_tokenizer_directory(self, tokenizer_path):
+        counter = TokenCounter(tokenizers={"qwen3:8b": str(tokenizer_path.parent)})
+
+        assert counter.count("테스트 시나리오", "qwen3:8b") == 2
+
+    def test_load_failure_falls_back_to_estimate(self, tmp_path):
+        counter = TokenCounter(tokenizers={"qwen3": str(tmp_path / "missing.json")})
+
+        with patch("tokenizers.Tokenizer.from_pretrained", side_effect=OSError("offline")) as from_pretrained:
+            assert counter.count("테스트", "qwen3:8b") == 3
+            assert not counter.is_exact("qwen3:8b")
+
+        from_pretrained.assert_called_once()
+        assert counter.get_stats()["tokenizers"] == {str(tmp_path / "missing.json"): False}
+
+    def test_counts_are_cached(self):
+        counter = TokenCounter(cache_size=1)
+        with patch("src.llm.token_counter.estimate_tokens", return_value=7) as estimate:
+            assert counter.count("고정 머리말") == 7
+            assert counter.count("고정 머리말") == 7
+            assert estimate.call_count == 1
+
+            counter.count("다른 본문")
+            counter.count("고정 머리말")
+            assert estimate.call_count == 3
+
+        stats = counter.get_stats()
+        assert stats["cache_hits"] == 1
+        assert stats["cache_entries"] == 1
+
+    def test_truncate_with_tokenizer(self, tokenizer_path):
+        counter = TokenCounter(tokenizers={"qwen3": str(tokenizer_path)})
+
+        assert counter.truncate("def run ( ) :", 2, "qwen3:8b") == "def run"
+        assert counter.truncate("def run", 5, "qwen3:8b") == "def run"
+
+    def test_truncate_with_estimate(self):
+        counter = TokenCounter()
+        text = "테스트 시나리오 " * 100
+
+        truncated = counter.truncate(text, 50)
+
+        assert text.startswith(truncated)
+        assert 48 <= counter.count(truncated) <= 50
+        assert counter.truncate(text, 0) == ""
+
+
+class TestPromptTokenLimit:
+    """프롬프트 빌더의 토큰 기준 길이 제한 테스트"""
+
+    def test_performance_mode_limit_counts_korean_as_tokens(self):
+        from src.prompt_loader import build_prompt_parts, PERFORMANCE_PROMPT_TOKEN_LIMIT
+
+        # 32,000자 미만이라 문자 수 기준으로는 잘리지 않던 한국어 변경 내역
+        korean_diff = "변경된 함수의 동작을 확인한다 " * 1500
+
+        prefix, body = build_prompt_parts(korean_diff, use_rag=False, use_feedback_enhancement=False,
+                                          performance_mode=True)
+
+        assert len(korean_diff) < 32000
+        assert len(body) < len(korean_diff)
+        assert estimate_tokens(prefix) + estimate_tokens(body) <= PERFORMANCE_PROMPT_TOKEN_LIMIT
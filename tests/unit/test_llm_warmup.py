@@ -0,0 +1,149 @@
+"""
+warmup.py 모듈 테스트 (가짜 Ollama 서버 사용)
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.scheduler import LLMScheduler, Priority
+from src.llm.warmup import ModelWarmer, parse_keep_alive
+from tests.fake_ollama_server import FakeOllamaServer
+
+
+@pytest.fixture
+def fake_server():
+    with FakeOllamaServer() as server:
+        yield server
+
+
+def test_parse_keep_alive():
+    """keep_alive 기간 문자열 해석 테스트"""
+    assert parse_keep_alive("30m") == 1800
+    assert parse_keep_alive("1h30m") == 5400
+    assert parse_keep_alive(300) == 300
+    assert parse_keep_alive("120") == 120
+    assert parse_keep_alive(-1) is None
+    assert parse_keep_alive("forever") is None
+
+
+def test_refresh_interval_follows_keep_alive():
+    """갱신 주기가 keep_alive 만료 전으로 설정되는지 테스트"""
+    assert ModelWarmer("qwen3:8b", keep_alive="10m").refresh_seconds == 480
+    assert ModelWarmer("qwen3:8b", keep_alive=-1).refresh_seconds is None
+    assert ModelWarmer("qwen3:8b", keep_alive="10m", refresh_seconds=60).refresh_seconds == 60
+
+
+class TestModelWarmer:
+    """모델 예열 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_sends_keep_alive(self, fake_server):
+        """예열 요청이 모델/keep_alive와 함께 전송되고 상태가 ready가 되는지 테스트"""
+        pool = EndpointPool([fake_server.url])
+        warmer = ModelWarmer("qwen3:8b", keep_alive="15m")
+
+        with patch('src.llm.warmup.get_endpoint_pool', return_value=pool):
+            assert await warmer.warm_up() is True
+            status = warmer.get_status()
+        await pool.aclose()
+
+        request = fake_server.requests[0]
+        assert request['model'] == "qwen3:8b"
+        assert request['keep_alive'] == "15m"
+        assert request['options'] == {"num_predict": 1}
+        assert status['state'] == 'ready'
+        assert status['endpoints'][0]['last_touched_ago'] is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_warm_up_reported(self, fake_server):
+        """예열 실패 시 상태가 failed로 보고되는지 테스트"""
+        fake_server.fail_status = 500
+        pool = EndpointPool([fake_server.url])
+        warmer = ModelWarmer("qwen3:8b")
+
+        with patch('src.llm.warmup.get_endpoint_pool', return_value=pool):
+            assert await warmer.warm_up() is False
+            status = warmer.get_status()
+        await pool.aclose()
+
+        assert status['state'] == 'failed'
+        assert status['endpoints'][0]['error']
+
+    @pytest.mark.asyncio
+    async def test_keeper_retouches_model(self, fake_server):
+        """백그라운드 작업이 주기적으로 모델을 다시 호출하는지 테스트"""
+        pool = EndpointPool([fake_server.url])
+        warmer = ModelWarmer("qwen3:8b", refresh_seconds=0.05)
+
+        with patch('src.llm.warmup.get_endpoint_pool', return_value=pool):
+            warmer.start()
+            await asyncio.sleep(0.3)
+            await warmer.stop()
+        await pool.aclose()
+
+        assert fake_server.request_count >= 2
+
+    @pytest.mark.asyncio
+    async def test_touch_uses_scheduler_slot(self, fake_server):
+        """상주 유지 요청이 스케줄러 슬롯을 기다리고, 요청 처리 중인 엔드포인트에는 보내지 않는지 테스트"""
+        pool = EndpointPool([fake_server.url])
+        scheduler = LLMScheduler(max_concurrent=1)
+        warmer = ModelWarmer("qwen3:8b")
+
+        with patch('src.llm.warmup.get_endpoint_pool', return_value=pool), \
+             patch('src.llm.warmup.get_llm_scheduler', return_value=scheduler):
+            await scheduler.acquire(Priority.INTERACTIVE)
+            warm_up = asyncio.create_task(warmer.warm_up())
+            await asyncio.sleep(0.05)
+            assert fake_server.request_count == 0
+            scheduler.release()
+            assert await warm_up is True
+
+            pool.endpoints[0].in_flight = 1
+            assert await warmer.warm_up() is True
+            pool.endpoints[0].in_flight = 0
+            status = warmer.get_status()
+        await pool.aclose()
+
+        assert fake_server.request_count == 1
+        assert status['state'] == 'ready'
+
+    @pytest.mark.asyncio
+    async def test_warm_up_covers_every_model(self, fake_server):
+        """라우팅 후보 모델도 모두 예열되고 상태에 모델별로 보고되는지 테스트"""
+        pool = EndpointPool([fake_server.url])
+        warmer = ModelWarmer("qwen3:8b", extra_models=["qwen3:1.7b", "qwen3:8b"])
+
+        with patch('src.llm.warmup.get_endpoint_pool', return_value=pool):
+            assert await warmer.warm_up() is True
+            status = warmer.get_status()
+        await pool.aclose()
+
+        assert sorted(r['model'] for r in fake_server.requests) == ["qwen3:1.7b", "qwen3:8b"]
+        assert status['models'] == ["qwen3:8b", "qwen3:1.7b"]
+        assert [(e['model'], e['state']) for e in status['endpoints']] == [("qwen3:8b", 'ready'), ("qwen3:1.7b", 'ready')]
+
+    def test_singleton_includes_routing_candidates(self):
+        """라우팅이 켜져 있으면 후보 모델을 상주 대상에 포함하는지 테스트"""
+        from src.llm.model_router import ModelRouter
+
+        router = ModelRouter("qwen3:8b", models=[{"name": "qwen3:1.7b"}, {"name": "qwen3:14b"}])
+        with patch('src.llm.warmup._model_warmer', None), \
+             patch('src.llm.warmup.load_config', return_value={'model_name': 'qwen3:8b'}), \
+             patch('src.llm.warmup.get_model_router', return_value=router):
+            from src.llm.warmup import get_model_warmer
+            assert get_model_warmer().models == ["qwen3:8b", "qwen3:1.7b", "qwen3:14b"]
+
+        router.enabled = False
+        with patch('src.llm.warmup._model_warmer', None), \
+             patch('src.llm.warmup.load_config', return_value={'model_name': 'qwen3:8b'}), \
+             patch('src.llm.warmup.get_model_router', return_value=router):
+            assert get_model_warmer().models == ["qwen3:8b"]
+
+    def test_disabled_status(self):
+        """비활성화 시 상태 보고 테스트"""
+        warmer = ModelWarmer("qwen3:8b", enabled=False)
+        warmer.start()
+
+        assert warmer.get_status() == {'model': 'qwen3:8b', 'state': 'disabled'}
@@ -0,0 +1,156 @@
+"""
+response_parser.py 모듈 테스트
+"""
+import json
+import pytest
+
+from backend.models.scenario import get_scenario_output_schema
+from src.response_parser import (
+    extract_json_candidate, parse_scenario_json, parse_scenario_json_with_report, merge_repair_reports
+)
+
+
+class TestExtractJsonCandidate:
+    """JSON 후보 구간 추출 테스트"""
+
+    def test_json_block(self):
+        """<thinking> 뒤의 <json> 블록만 추출되는지 테스트"""
+        text = '<thinking>- {not json}</thinking>\n<json>{"a": 1}</json>'
+        assert extract_json_candidate(text) == '{"a": 1}'
+
+    def test_code_fence(self):
+        """코드 펜스로 감싼 JSON 추출 테스트"""
+        assert extract_json_candidate('결과:\n```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_plain_json(self):
+        """구조화 출력(순수 JSON) 추출 테스트"""
+        assert extract_json_candidate('  {"a": {"b": 2}}\n') == '{"a": {"b": 2}}'
+
+    def test_no_json(self):
+        """JSON이 없으면 None 반환 테스트"""
+        assert extract_json_candidate("응답 없음") is None
+        assert extract_json_candidate("") is None
+
+
+class TestParseScenarioJson:
+    """시나리오 JSON 파싱 및 복구 테스트"""
+
+    def test_valid_json_block(self):
+        """정상 <json> 블록 파싱 테스트"""
+        result = parse_scenario_json('<json>{"Test Cases": [{"ID": "TC001"}]}</json>')
+        assert result == {"Test Cases": [{"ID": "TC001"}]}
+
+    def test_trailing_comma_and_comment(self):
+        """후행 쉼표와 주석이 있는 JSON 복구 테스트"""
+        text = '{"Test Cases": [{"ID": "TC001",}, ], // 끝\n "Test Scenario Name": "x"}'
+        result = parse_scenario_json(text)
+        assert result == {"Test Cases": [{"ID": "TC001"}], "Test Scenario Name": "x"}
+
+    def test_raw_newline_in_string(self):
+        """문자열 안의 날것 줄바꿈 복구 테스트"""
+        result = parse_scenario_json('{"절차": "1. 실행\n2. 확인"}')
+        assert result == {"절차": "1. 실행\n2. 확인"}
+
+    def test_truncated_output(self):
+        """출력이 중간에 잘린 경우 완결된 부분까지 복구되는지 테스트"""
+        text = '<json>{"Test Cases": [{"ID": "TC001", "절차": "완료"}, {"ID": "TC0'
+        result = parse_scenario_json(text)
+        # 잘린 두 번째 테스트 케이스는 버림
+        assert result["Test Cases"] == [{"ID": "TC001", "절차": "완료"}]
+
+    def test_unparseable_raises(self):
+        """JSON이 없거나 객체가 아니면 JSONDecodeError 발생 테스트"""
+        with pytest.raises(json.JSONDecodeError):
+            parse_scenario_json("JSON 없음")
+        with pytest.raises(json.JSONDecodeError):
+            parse_scenario_json("<json>[1, 2]</json>")
+
+
+class TestRepairReport:
+    """복구 보고서 및 부분 복구(salvage) 테스트"""
+
+    def test_valid_json_has_no_report(self):
+        """정상 JSON은 복구 보고서 없이 파싱되는지 테스트"""
+        assert parse_scenario_json_with_report('{"Test Cases": []}') == ({"Test Cases": []}, None)
+
+    def test_report_lists_repairs(self):
+        """적용한 복구 종류를 보고하는지 테스트"""
+        text = '{"Test Scenario Name": "버튼 "저장" 클릭",\n "Test Cases": [{"ID": "TC001", "데이터": "C:\\Users\\qa"}\n{"ID": "TC002",},]}'
+
+        result, report = parse_scenario_json_with_report(text)
+
+        assert result["Test Scenario Name"] == '버튼 "저장" 클릭'
+        assert result["Test Cases"] == [{"ID": "TC001", "데이터": "C:\\Users\\qa"}, {"ID": "TC002"}]
+        assert report == {
+            "repairs": ["unescaped_quotes", "invalid_escapes", "missing_commas", "trailing_commas"],
+            "test_cases": 2,
+            "dropped_test_cases": 0
+        }
+
+    def test_truncated_output_drops_incomplete_test_case(self):
+        """잘린 출력에서 완결된 테스트 케이스만 남기고 버린 수를 보고하는지 테스트"""
+        text = ('<json>{"Scenario Description": "로그인", "Test Cases": ['
+                '{"ID": "TC001", "절차": "1. 실행\n2. 확인"}, {"ID": "TC002", "절차": "1. 입')
+
+        result, report = parse_scenario_json_with_report(text)
+
+        assert result["Test Cases"] == [{"ID": "TC001", "절차": "1. 실행\n2. 확인"}]
+        assert report["repairs"] == ["unescaped_control_chars", "truncated"]
+        assert report["dropped_test_cases"] == 1
+
+    def test_untagged_truncated_output_drops_incomplete_test_case(self):
+        """태그 없이 잘린 구조화 출력도 마지막 '}'에서 자르지 않고 잘린 케이스를 보고하는지 테스트"""
+        text = '{"Test Cases": [{"a": "x"}, {"b": tru'
+
+        assert extract_json_candidate(text) == text
+        result, report = parse_scenario_json_with_report(text)
+
+        assert result["Test Cases"] == [{"a": "x"}]
+        assert report["dropped_test_cases"] >= 1
+
+    def test_salvage_complete_test_cases(self):
+        """문서 전체가 복구되지 않아도 완결된 테스트 케이스를 항목 단위로 살리는지 테스트"""
+        text = ('{"Test Scenario Name": "결제", "Scenario Description": "결제 흐름",'
+                ' "Test Cases": [{"ID": "TC001"}, {"ID": "TC002", "절차": }, {"ID": "TC003"}]}')
+
+        result, report = parse_scenario_json_with_report(text)
+
+        assert result == {
+            "Scenario Description": "결제 흐름",
+            "Test Scenario Name": "결제",
+            "Test Cases": [{"ID": "TC001"}, {"ID": "TC003"}]
+        }
+        assert "salvaged_test_cases" in report["repairs"]
+        assert report["test_cases"] == 2
+        assert report["dropped_test_cases"] == 1
+
+    def test_nothing_to_salvage_raises(self):
+        """살릴 테스트 케이스가 없으면 원래 오류를 그대로 발생시키는지 테스트"""
+        with pytest.raises(json.JSONDecodeError):
+            parse_scenario_json('{"Test Cases": [{"ID": : }]}')
+
+    def test_merge_repair_reports(self):
+        """분할 생성 배치별 보고서 합치기 테스트"""
+        merged = merge_repair_reports([
+            None,
+            {"repairs": ["truncated"], "test_cases": 2, "dropped_test_cases": 1},
+            {"repairs": ["trailing_commas", "truncated"], "test_cases": 3, "dropped_test_cases": 0}
+        ])
+
+        assert merged == {
+            "repairs": ["truncated", "trailing_commas"],
+            "test_cases": 5,
+            "dropped_test_cases": 1,
+            "repaired_batches": 2
+        }
+        assert merge_repair_reports([None, None]) is None
+
+
+def test_scenario_output_schema():
+    """구조화 출력용 스키마가 LLM 출력 필드만 포함하는지 테스트"""
+    schema = get_scenario_output_schema()
+
+    assert schema['type'] == 'object'
+    assert 'Test Cases' in schema['required']
+    assert 'metadata' not in schema['properties']
+    json.dumps(schema)
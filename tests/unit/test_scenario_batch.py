@@ -0,0 +1,173 @@
+"""
+scenario_batch.py 모듈 및 일괄 생성 결과 저장 테스트
+"""
+import asyncio
+import json
+import os
+import zipfile
+from pathlib import Path
+
+import openpyxl
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from src.llm.model_router import ModelRouter
+from src.scenario_batch import run_scenario_batch
+from src.excel_writer import save_batch_results_to_excel, save_batch_results_to_zip, SUMMARY_SHEET_TITLE, SUMMARY_FILE_NAME
+
+
+@pytest.fixture
+def branch_repo(mock_git_repo, temp_dir):
+    """기본 브랜치 위에 feature 브랜치(및 같은 커밋을 가리키는 별칭)를 가진 저장소"""
+    base_branch = mock_git_repo.active_branch.name
+    feature = mock_git_repo.create_head("feature")
+    feature.checkout()
+    path = os.path.join(temp_dir, "feature.py")
+    with open(path, 'w') as f:
+        f.write("def feature():\n    return 1\n")
+    mock_git_repo.index.add([path])
+    mock_git_repo.index.commit("Add feature")
+    mock_git_repo.create_head("feature-alias", feature.commit)
+    return mock_git_repo, base_branch
+
+
+@pytest.fixture
+def batch_env():
+    """RAG와 LLM 생성을 대체한 일괄 생성 환경"""
+    generate = AsyncMock(return_value={"Test Cases": [{"ID": "TC_001"}]})
+    with patch('src.scenario_batch.get_rag_manager'), \
+         patch('src.scenario_batch.add_git_analysis_to_rag'), \
+         patch('src.scenario_batch.get_model_router', return_value=ModelRouter(enabled=False)), \
+         patch('src.scenario_batch.generate_scenario_from_analysis', generate):
+        yield generate
+
+
+class TestRunScenarioBatch:
+    """여러 브랜치 일괄 생성 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_same_commit_pair_generated_once(self, branch_repo, batch_env, temp_dir):
+        """같은 커밋 쌍을 가리키는 항목은 한 번만 생성하고 결과를 공유하는지 테스트"""
+        repo, base_branch = branch_repo
+        items = [
+            {"repo_path": temp_dir, "base_branch": base_branch, "head_branch": "feature"},
+            {"repo_path": temp_dir, "base_branch": base_branch, "head_branch": "feature-alias", "name": "별칭"}
+        ]
+
+        results = await run_scenario_batch(items, "qwen3:8b", 60, max_concurrent=2)
+
+        assert batch_env.await_count == 1
+        assert "Add feature" in batch_env.await_args.args[0]
+        assert [r["status"] for r in results] == ["completed", "completed"]
+        assert results[0]["head_sha"] == results[1]["head_sha"] == repo.heads["feature"].commit.hexsha
+        assert results[0]["shared_with"] is None
+        assert results[1]["shared_with"] == 0
+        assert results[1]["name"] == "별칭"
+        assert results[1]["llm_model"] == "qwen3:8b"
+
+    @pytest.mark.asyncio
+    async def test_invalid_branch_fails_only_that_item(self, branch_repo, batch_env, temp_dir):
+        """없는 브랜치 항목만 실패하고 나머지는 생성되는지 테스트"""
+        _, base_branch = branch_repo
+        items = [
+            {"repo_path": temp_dir, "base_branch": base_branch, "head_branch": "missing"},
+            {"repo_path": temp_dir, "base_branch": base_branch, "head_branch": "feature"}
+        ]
+        updates = []
+
+        async def on_item_update(index, status, details):
+            updates.append((index, status))
+
+        results = await run_scenario_batch(items, "qwen3:8b", 60, on_item_update=on_item_update)
+
+        assert results[0]["status"] == "failed"
+        assert "Git 분석 중 오류 발생" in results[0]["error"]
+        assert results[1]["status"] == "completed"
+        assert updates[0] == (0, "failed")
+        assert [status for index, status in updates if index == 1] == ["analyzing_git", "calling_llm", "completed"]
+
+    @pytest.mark.asyncio
+    async def test_rag_preload_failure_falls_back(self, branch_repo, batch_env, temp_dir):
+        """임베딩 모델 로드에 실패해도 작업 전체가 실패하지 않고 항목 생성을 계속하는지 테스트"""
+        _, base_branch = branch_repo
+        items = [{"repo_path": temp_dir, "base_branch": base_branch, "head_branch": "feature"}]
+
+        with patch('src.scenario_batch.get_rag_manager', side_effect=RuntimeError("embedding model missing")):
+            results = await run_scenario_batch(items, "qwen3:8b", 60)
+
+        assert results[0]["status"] == "completed"
+        assert batch_env.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, temp_dir, batch_env):
+        """동시에 생성하는 커밋 쌍 수가 max_concurrent를 넘지 않는지 테스트"""
+        import git
+
+        repo = git.Repo.init(temp_dir)
+        for i in range(5):
+            path = os.path.join(temp_dir, f"file_{i}.py")
+            with open(path, 'w') as f:
+                f.write(f"value = {i}\n")
+            repo.index.add([path])
+            repo.index.commit(f"commit {i}")
+        shas = [commit.hexsha for commit in repo.iter_commits()]
+        items = [{"repo_path": temp_dir, "base_branch": shas[-1], "head_branch": sha} for sha in shas[:-1]]
+
+        running, peak = 0, 0
+
+        async def generate(*args, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)  # 같은 저장소 분석은 순차 실행되므로 분석 시간보다 길게
+            running -= 1
+            return {"Test Cases": []}
+
+        batch_env.side_effect = generate
+        results = await run_scenario_batch(items, "qwen3:8b", 60, max_concurrent=2)
+
+        assert batch_env.await_count == 4
+        assert peak == 2
+        assert all(r["status"] == "completed" for r in results)
+
+
+class TestBatchResultFiles:
+    """일괄 생성 결과 파일 저장 테스트"""
+
+    @pytest.fixture
+    def batch_items(self, sample_result_json):
+        return [
+            {"index": 0, "name": None, "repo_path": "/repo", "base_branch": "develop", "head_branch": "feature/login",
+             "status": "completed", "result_json": sample_result_json, "error": None},
+            {"index": 1, "name": "결제", "repo_path": "/repo", "base_branch": "develop", "head_branch": "feature/pay",
+             "status": "failed", "result_json": None, "error": "LLM 응답 없음"}
+        ]
+
+    def test_workbook_has_item_sheets_and_summary(self, temp_dir, mock_excel_template, batch_items):
+        with patch('src.excel_writer.OUTPUT_DIR', Path(temp_dir)):
+            path = save_batch_results_to_excel(batch_items, mock_excel_template)
+
+        workbook = openpyxl.load_workbook(path)
+        assert workbook.sheetnames == [SUMMARY_SHEET_TITLE, "01_feature_login"]
+        assert workbook["01_feature_login"]["F4"].value == "사용자 생성 및 로그인 테스트"
+        summary = list(workbook[SUMMARY_SHEET_TITLE].values)
+        assert summary[1][5:8] == ("completed", 1, "01_feature_login")
+        assert summary[2][1] == "결제"
+        assert summary[2][8] == "LLM 응답 없음"
+
+    def test_zip_has_item_workbooks_and_summary(self, temp_dir, mock_excel_template, batch_items):
+        with patch('src.excel_writer.OUTPUT_DIR', Path(temp_dir)):
+            path = save_batch_results_to_zip(batch_items, mock_excel_template)
+
+        with zipfile.ZipFile(path) as archive:
+            assert sorted(archive.namelist()) == sorted(["01_feature_login.xlsx", SUMMARY_FILE_NAME])
+            summary = json.loads(archive.read(SUMMARY_FILE_NAME))
+        assert [item["상태"] for item in summary] == ["completed", "failed"]
+
+    def test_zip_removed_when_template_missing(self, temp_dir, batch_items):
+        """템플릿 복사에 실패하면 반쯤 쓴 zip 파일을 남기지 않는지 테스트"""
+        with patch('src.excel_writer.OUTPUT_DIR', Path(temp_dir)):
+            path = save_batch_results_to_zip(batch_items, os.path.join(temp_dir, "missing.xlsx"))
+
+        assert path is None
+        assert not [name for name in os.listdir(temp_dir) if name.endswith(".zip")]
@@ -0,0 +1,164 @@
+"""
+scenario_mapreduce.py 모듈 테스트
+"""
+import json
+import threading
+import pytest
+from unittest.mock import patch
+
+from src.scenario_mapreduce import (
+    split_git_analysis, build_batches, merge_scenarios, should_use_map_reduce, generate_scenario_map_reduce
+)
+
+ANALYSIS = "\n".join([
+    "### 커밋 메시지 목록:",
+    "- 로그인 개선",
+    "",
+    "### 주요 코드 변경 내용 (diff):",
+    "--- 파일: auth/login.py ---",
+    "+def login(): pass",
+    "--- 파일: auth/token.py ---",
+    "+def issue(): pass",
+    "--- 파일: billing/invoice.py ---",
+    "+def total(): return 0",
+])
+
+
+def _case(case_id, procedure, expected="정상 처리"):
+    return {"ID": case_id, "절차": procedure, "사전조건": "-", "데이터": "-", "예상결과": expected}
+
+
+class TestBatching:
+    """변경 내역 분할 테스트"""
+
+    def test_split_git_analysis(self):
+        """커밋 머리와 파일별 구간으로 나뉘는지 테스트"""
+        header, sections = split_git_analysis(ANALYSIS)
+
+        assert header.startswith("### 커밋 메시지 목록:")
+        assert header.endswith("### 주요 코드 변경 내용 (diff):")
+        assert [path for path, _ in sections] == ["auth/login.py", "auth/token.py", "billing/invoice.py"]
+
+    def test_batches_group_by_module(self):
+        """같은 디렉터리의 파일이 한 배치에 묶이고 모든 배치에 커밋 머리가 포함되는지 테스트"""
+        batches = build_batches(ANALYSIS, batch_chars=100)
+
+        assert len(batches) == 2
+        assert "auth/login.py" in batches[0] and "auth/token.py" in batches[0]
+        assert "billing/invoice.py" in batches[1]
+        assert all("- 로그인 개선" in batch for batch in batches)
+
+    def test_no_file_sections(self):
+        """파일 구간이 없으면 원문 하나만 반환하는지 테스트"""
+        assert build_batches("오류: 공통 조상을 찾을 수 없습니다.") == ["오류: 공통 조상을 찾을 수 없습니다."]
+
+    def test_max_batches_caps_fan_out(self):
+        """최대 배치 수를 넘지 않도록 배치 크기가 커지는지 테스트"""
+        assert len(build_batches(ANALYSIS, batch_chars=1, max_batches=2)) == 2
+        assert len(build_batches(ANALYSIS, batch_chars=1, max_batches=1)) == 1
+
+    def test_should_use_map_reduce(self):
+        """요청값/설정값과 배치 수에 따라 분할 생성 여부가 결정되는지 테스트"""
+        config = {"llm": {"map_reduce": {"enabled": True, "batch_chars": 100}}}
+
+        assert should_use_map_reduce(ANALYSIS) is False
+        with patch('src.scenario_mapreduce.load_config', return_value=config):
+            assert should_use_map_reduce(ANALYSIS) is True
+            assert should_use_map_reduce(ANALYSIS, requested=False) is False
+            assert should_use_map_reduce("--- 파일: a.py ---\n+x") is False
+
+
+class TestMergeScenarios:
+    """배치 결과 병합 테스트"""
+
+    def test_renumbers_and_removes_near_duplicates(self):
+        """ID 재부여와 유사 중복 제거 테스트"""
+        partials = [
+            {"Scenario Description": "로그인", "Test Scenario Name": "인증 테스트",
+             "Test Cases": [_case("TEST_001", "1. 로그인 화면 진입\n2. 로그인 버튼 클릭"), _case("TEST_002", "1. 토큰 발급")]},
+            {"Scenario Description": "청구", "Test Scenario Name": "청구 테스트",
+             "Test Cases": [_case("TEST_001", "1. 로그인 화면 진입 \n2. 로그인 버튼 클릭."), _case("TEST_002", "1. 청구서 합계 확인")]}
+        ]
+
+        merged = merge_scenarios(partials)
+
+        assert [case["ID"] for case in merged["Test Cases"]] == ["TEST_001", "TEST_002", "TEST_003"]
+        assert [case["절차"] for case in merged["Test Cases"]][-1] == "1. 청구서 합계 확인"
+        assert merged["Test Scenario Name"] == "인증 테스트"
+        assert merged["Scenario Description"] == "로그인\n청구"
+
+    def test_empty_partials(self):
+        """테스트 케이스가 없는 경우 테스트"""
+        assert merge_scenarios([{}])["Test Cases"] == []
+
+
+class TestGenerateMapReduce:
+    """분할 병렬 생성 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_fans_out_and_merges(self):
+        """배치별로 LLM을 호출하고 실패한 배치를 제외하고 병합하는지 테스트"""
+        prompts = []
+        progress = []
+
+        async def fake_llm(prompt, **kwargs):
+            prompts.append(prompt)
+            if "billing/invoice.py" in prompt:
+                # 후행 쉼표가 있는 응답도 복구해 병합
+                return "<json>" + json.dumps({"Test Cases": [_case("TEST_001", "1. 청구서 합계 확인")]})[:-1] + ",}</json>"
+            if "auth/login.py" in prompt:
+                return "<json>" + json.dumps({"Test Cases": [_case("TEST_001", "1. 로그인")]}) + "</json>"
+            return None
+
+        async def on_batch_done(completed, total):
+            progress.append((completed, total))
+
+        config = {"llm": {"map_reduce": {"batch_chars": 25, "max_batches": 8}}}
+        with patch('src.scenario_mapreduce.load_config', return_value=config), \
+                patch('src.scenario_mapreduce.acall_ollama_llm', side_effect=fake_llm):
+            merged, info = await generate_scenario_map_reduce(ANALYSIS, "qwen3:8b", 60, on_batch_done=on_batch_done)
+
+        assert info['batches'] == 3
+        assert info['failed_batches'] == 1
+        assert info['json_repair'] == {
+            'repairs': ['trailing_commas'], 'test_cases': 1, 'dropped_test_cases': 0, 'repaired_batches': 1
+        }
+        assert len(prompts) == 3
+        assert [case["ID"] for case in merged["Test Cases"]] == ["TEST_001", "TEST_002"]
+        assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+
+    @pytest.mark.asyncio
+    async def test_all_batches_failed(self):
+        """모든 배치가 실패하면 ValueError 발생 테스트"""
+        async def fake_llm(prompt, **kwargs):
+            return None
+
+        with patch('src.scenario_mapreduce.acall_ollama_llm', side_effect=fake_llm):
+            with pytest.raises(ValueError):
+                await generate_scenario_map_reduce(ANALYSIS, "qwen3:8b", 60)
+
+    @pytest.mark.asyncio
+    async def test_prompts_built_off_event_loop(self):
+        """배치 프롬프트를 작업자 스레드에서 만들고, 모든 배치가 캐시 적중이면 합친 지표도 캐시 적중인지 테스트"""
+        from src.scenario_mapreduce import build_prompt_parts
+        from src.llm.telemetry import build_call_stats
+
+        threads = []
+
+        def tracking_build(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return build_prompt_parts(*args, **kwargs)
+
+        async def fake_llm(prompt, on_stats=None, **kwargs):
+            on_stats(build_call_stats("qwen3:8b", None, cache_hit=True))
+            return "<json>" + json.dumps({"Test Cases": [_case("TEST_001", "1. 실행")]}) + "</json>"
+
+        config = {"llm": {"map_reduce": {"batch_chars": 25, "max_batches": 8}}}
+        with patch('src.scenario_mapreduce.load_config', return_value=config), \
+                patch('src.scenario_mapreduce.build_prompt_parts', side_effect=tracking_build), \
+                patch('src.scenario_mapreduce.acall_ollama_llm', side_effect=fake_llm):
+            _, info = await generate_scenario_map_reduce(ANALYSIS, "qwen3:8b", 60)
+
+        assert len(threads) == 3
+        assert threading.main_thread() not in threads
+        assert info['llm_telemetry']['cache_hit'] is True